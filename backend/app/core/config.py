@@ -22,6 +22,14 @@ class Settings(BaseSettings):
     lean_algorithm_path: str = ""
     lean_data_folder: str = ""
     data_root: str = ""
+    # Serve curated series from the columnar price_store mirror instead of re-parsing CSVs.
+    price_store_read_enabled: bool = False
+    # Data sync queue: post-processing threads per queue worker, and how many queue workers
+    # (processes/replicas) may drain the queue concurrently through row-level job claims.
+    data_sync_postprocess_workers: int = 2
+    data_sync_queue_workers: int = 1
+    # Append new bars to curated/adjusted series and patch Lean zips instead of rewriting them.
+    data_sync_incremental_enabled: bool = True
     lean_python_venv: str = ""
     python_dll: str = ""
     dotnet_path: str = "dotnet"
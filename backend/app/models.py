@@ -2,7 +2,7 @@
 
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Float, JSON, Date, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, BigInteger
+from sqlalchemy import Boolean, Float, JSON, Date, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, BigInteger
 from sqlalchemy.dialects.mysql import LONGTEXT
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -545,6 +545,42 @@ class PreTradeStep(Base):
     )
 
 
+class PipelineRun(Base):
+    __tablename__ = "pipeline_runs"
+    __table_args__ = (
+        Index("ix_pipeline_runs_project_sort", "project_id", "sort_at", "trace_id"),
+        Index("ix_pipeline_runs_project_type_status", "project_id", "run_type", "status"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    trace_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    run_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    source_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    project_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(32), nullable=False)
+    mode: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    listed: Mapped[bool] = mapped_column(Boolean, default=True)
+    created_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    ended_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    sort_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class PipelineRunTag(Base):
+    __tablename__ = "pipeline_run_tags"
+    __table_args__ = (
+        UniqueConstraint("trace_id", "kind", "tag", name="uq_pipeline_run_tag"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    trace_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    tag: Mapped[str] = mapped_column(String(64), nullable=False)
+
+
 class IBSettings(Base):
     __tablename__ = "ib_settings"
 
@@ -762,6 +798,8 @@ class TradeOrder(Base):
     __tablename__ = "trade_orders"
     __table_args__ = (
         UniqueConstraint("client_order_id", name="uq_trade_order_client_id"),
+        Index("ix_trade_orders_status_run", "status", "run_id"),
+        Index("ix_trade_orders_symbol_created", "symbol", "created_at"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -788,6 +826,10 @@ class TradeOrder(Base):
 
 class TradeFill(Base):
     __tablename__ = "trade_fills"
+    __table_args__ = (
+        UniqueConstraint("event_key", name="uq_trade_fill_event_key"),
+        Index("ix_trade_fills_order_fill_time", "order_id", "fill_time"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     order_id: Mapped[int] = mapped_column(ForeignKey("trade_orders.id"), nullable=False)
@@ -800,12 +842,46 @@ class TradeFill(Base):
     exchange: Mapped[str | None] = mapped_column(String(32), nullable=True)
     raw_payload: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     params: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    event_key: Mapped[str | None] = mapped_column(String(128), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime | None] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
 
+class TradeOrderTag(Base):
+    __tablename__ = "trade_order_tags"
+    __table_args__ = (
+        UniqueConstraint("tag", "kind", name="uq_trade_order_tag"),
+        UniqueConstraint("order_id", "kind", name="uq_trade_order_tag_order_kind"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tag: Mapped[str] = mapped_column(String(128), nullable=False)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    order_id: Mapped[int] = mapped_column(
+        ForeignKey("trade_orders.id", ondelete="CASCADE"), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class LeanEventCursor(Base):
+    __tablename__ = "lean_event_cursors"
+    __table_args__ = (
+        UniqueConstraint("path", name="uq_lean_event_cursor_path"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    path: Mapped[str] = mapped_column(String(512), nullable=False)
+    file_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    byte_offset: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
@@ -3,6 +3,7 @@
 import csv
 from bisect import bisect_right
 import threading
+import hashlib
 import json
 import math
 import re
@@ -14,12 +15,14 @@ import urllib.error
 import urllib.request
 from urllib.parse import urlencode
 import zipfile
-from datetime import date, datetime, timedelta, timezone
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Response
 from sqlalchemy import func, or_
 
 from app.db import SessionLocal, get_session
@@ -60,6 +63,7 @@ from app.schemas import (
     TradingCalendarPreviewDay,
     BulkAutoConfigOut,
     BulkAutoConfigUpdate,
+    CuratedVersionOut,
     DatasetCreate,
     DatasetDeleteOut,
     DatasetDeleteRequest,
@@ -93,6 +97,27 @@ from app.services.alpha_fetch import (
 )
 from app.services.bulk_auto import load_bulk_auto_config, write_bulk_auto_config
 from app.services.data_sync_orphan_guard import load_data_sync_orphan_guard_config
+from app.services.curated_versions import (
+    list_curated_versions,
+    load_curated_versions_config,
+    reconstruct_curated_version,
+    record_curated_version,
+)
+from app.services.latest_bars import record_latest_bar
+from app.services.price_store import (
+    PriceStore,
+    append_price_store,
+    price_store_files,
+    read_price_store_meta,
+    write_price_store,
+)
+from app.services.series_index import (
+    append_series_summary,
+    iter_series_rows,
+    read_series_summary,
+    series_index_path,
+    write_series_summary,
+)
 from app.services.project_symbols import collect_active_project_symbols, write_symbol_list
 from app.services import universe_exclude
 from app.services.trading_calendar import (
@@ -128,6 +153,10 @@ MAX_BULK_ERRORS = 200
 
 SYNC_QUEUE_LOCK = threading.Lock()
 SYNC_QUEUE_RUNNING = False
+# One lock per dataset: the fetch stage reads and the post-processing stage rewrites the
+# same curated/adjusted/price_store/Lean files, so two jobs of a dataset must not overlap.
+DATASET_SYNC_LOCKS: dict[int | None, threading.RLock] = {}
+DATASET_SYNC_LOCKS_GUARD = threading.Lock()
 
 BULK_SYNC_LOCK = threading.Lock()
 BULK_SYNC_RUNNING: set[int] = set()
@@ -259,6 +288,54 @@ def _count_pending_sync_jobs(session) -> int:
     )
 
 
+def _sync_queue_lock_keys() -> list[str]:
+    slots = max(int(settings.data_sync_queue_workers or 1), 1)
+    return ["data_sync_queue"] + [f"data_sync_queue_{slot}" for slot in range(1, slots)]
+
+
+def _acquire_sync_queue_lock(data_root: Path) -> JobLock | None:
+    for key in _sync_queue_lock_keys():
+        queue_lock = JobLock(key, data_root)
+        if queue_lock.acquire():
+            return queue_lock
+    return None
+
+
+def _dataset_sync_lock(dataset_id: int | None) -> threading.RLock:
+    with DATASET_SYNC_LOCKS_GUARD:
+        lock = DATASET_SYNC_LOCKS.get(dataset_id)
+        if lock is None:
+            lock = DATASET_SYNC_LOCKS[dataset_id] = threading.RLock()
+        return lock
+
+
+def _claim_next_sync_job(session) -> tuple[int, int] | None:
+    now = datetime.utcnow()
+    query = (
+        session.query(DataSyncJob)
+        .filter(
+            DataSyncJob.status.in_(("queued", "rate_limited")),
+            or_(
+                DataSyncJob.next_retry_at.is_(None),
+                DataSyncJob.next_retry_at <= now,
+            ),
+        )
+        .order_by(DataSyncJob.created_at.asc())
+    )
+    # Row-level claim so several queue workers (threads or replicas) can drain the queue
+    # without picking the same job; SQLite has no FOR UPDATE, the queue lock covers it there.
+    if session.bind and session.bind.dialect.name != "sqlite":
+        query = query.with_for_update(skip_locked=True)
+    job = query.first()
+    if not job:
+        session.rollback()
+        return None
+    job.status = "running"
+    job.next_retry_at = None
+    session.commit()
+    return job.id, job.dataset_id
+
+
 def _start_sync_queue_worker(max_jobs: int, min_delay_seconds: float) -> bool:
     global SYNC_QUEUE_RUNNING
     with SYNC_QUEUE_LOCK:
@@ -268,39 +345,48 @@ def _start_sync_queue_worker(max_jobs: int, min_delay_seconds: float) -> bool:
 
     def _worker():
         global SYNC_QUEUE_RUNNING
-        queue_lock = JobLock("data_sync_queue", _get_data_root())
-        if not queue_lock.acquire():
+        queue_lock = _acquire_sync_queue_lock(_get_data_root())
+        if not queue_lock:
             with SYNC_QUEUE_LOCK:
                 SYNC_QUEUE_RUNNING = False
             return
+        # The fetch stage stays on this thread (paced by alpha_rate and min_delay_seconds);
+        # normalized/curated/adjusted writes and Lean exports run on the post-processing pool.
+        # The semaphore bounds how many fetched payloads may wait for post-processing.
+        # A job whose dataset still has post-processing in flight waits for it before its
+        # fetch, so jobs of one dataset run strictly in claim order.
+        post_workers = max(int(settings.data_sync_postprocess_workers or 1), 1)
+        executor = ThreadPoolExecutor(max_workers=post_workers, thread_name_prefix="data-sync-post")
+        inflight = threading.BoundedSemaphore(post_workers * 2)
+        pending_by_dataset: dict[int, Future] = {}
         processed = 0
         try:
             while True:
                 with get_session() as session:
-                    now = datetime.utcnow()
-                    job = (
-                        session.query(DataSyncJob)
-                        .filter(
-                            DataSyncJob.status.in_(("queued", "rate_limited")),
-                            or_(
-                                DataSyncJob.next_retry_at.is_(None),
-                                DataSyncJob.next_retry_at <= now,
-                            ),
-                        )
-                        .order_by(DataSyncJob.created_at.asc())
-                        .first()
-                    )
-                    if not job:
-                        break
-                    job_id = job.id
-
-                run_data_sync(job_id, spawn_retry_thread=False)
+                    claimed = _claim_next_sync_job(session)
+                if claimed is None:
+                    break
+                job_id, dataset_id = claimed
+
+                pending = pending_by_dataset.pop(dataset_id, None)
+                if pending is not None:
+                    wait([pending])
+                inflight.acquire()
+                with _dataset_sync_lock(dataset_id):
+                    staged = _run_data_sync_fetch(job_id, spawn_retry_thread=False)
+                if staged is None:
+                    inflight.release()
+                else:
+                    future = executor.submit(_run_data_sync_postprocess, staged)
+                    future.add_done_callback(lambda _: inflight.release())
+                    pending_by_dataset[dataset_id] = future
                 processed += 1
                 if max_jobs and processed >= max_jobs:
                     break
                 if min_delay_seconds > 0:
                     time.sleep(min_delay_seconds)
         finally:
+            executor.shutdown(wait=True)
             queue_lock.release()
             with SYNC_QUEUE_LOCK:
                 SYNC_QUEUE_RUNNING = False
@@ -351,7 +437,9 @@ def _find_sync_job_evidence(
     if versions_dir.exists():
         version_dirs = [p for p in versions_dir.glob(f"{prefix}*") if p.is_dir()]
         if version_dirs:
-            snapshots = sorted(version_dirs[0].glob("*.csv"))
+            snapshots = sorted(
+                list(version_dirs[0].glob("*.csv")) + list(version_dirs[0].glob("*.delta"))
+            )
             if snapshots:
                 evidence.append(str(snapshots[-1]))
 
@@ -382,10 +470,11 @@ def _should_orphan_candidates(
 def _is_sync_queue_idle(data_root: Path) -> bool:
     if SYNC_QUEUE_RUNNING:
         return False
-    queue_lock = JobLock("data_sync_queue", data_root)
-    if not queue_lock.acquire():
-        return False
-    queue_lock.release()
+    for key in _sync_queue_lock_keys():
+        queue_lock = JobLock(key, data_root)
+        if not queue_lock.acquire():
+            return False
+        queue_lock.release()
     return True
 
 
@@ -977,13 +1066,21 @@ def list_datasets_page(
         if safe_page > total_pages:
             safe_page = total_pages
             offset = (safe_page - 1) * safe_page_size
-        items = (
+        datasets = (
             session.query(Dataset)
             .order_by(Dataset.updated_at.desc())
             .offset(offset)
             .limit(safe_page_size)
             .all()
         )
+        items: list[DatasetOut] = []
+        for dataset in datasets:
+            out = DatasetOut.model_validate(dataset, from_attributes=True)
+            # Only a fresh index entry is used here; listing never re-parses a series.
+            summary = read_series_summary(_series_path(dataset, adjusted=False))
+            if summary:
+                out.data_points = int(summary.get("rows") or 0)
+            items.append(out)
         return DatasetPageOut(
             items=items,
             total=total,
@@ -3399,29 +3496,31 @@ def _rename_dataset_storage_files(
     return {"moved": moved, "skipped": skipped, "missing": missing}
 
 
-def _scan_series_summary(path: Path) -> tuple[int, date | None, date | None]:
-    if not path.exists():
-        return 0, None, None
-    rows = 0
-    min_dt: date | None = None
-    max_dt: date | None = None
+def _scan_series_dates(path: Path) -> list[datetime]:
+    dates: list[datetime] = []
     with path.open("r", encoding="utf-8", errors="ignore", newline="") as handle:
         reader = csv.DictReader(handle)
         if not reader.fieldnames or "date" not in reader.fieldnames:
-            for _ in reader:
-                rows += 1
-            return rows, None, None
+            return dates
         for row in reader:
-            rows += 1
-            parsed = _parse_datetime(row.get("date", ""))
-            if not parsed:
-                continue
-            day = parsed.date()
-            if min_dt is None or day < min_dt:
-                min_dt = day
-            if max_dt is None or day > max_dt:
-                max_dt = day
-    return rows, min_dt, max_dt
+            parsed = _parse_datetime(str(row.get("date", "")).strip())
+            if parsed:
+                dates.append(parsed)
+    return dates
+
+
+def _series_summary(path: Path) -> dict[str, Any] | None:
+    """Summary of a curated series from the index, rebuilding a missing or stale entry once."""
+    if not path.exists():
+        return None
+    summary = read_series_summary(path)
+    if summary is None:
+        try:
+            write_series_summary(path, _scan_series_dates(path))
+        except OSError:
+            pass
+        summary = read_series_summary(path)
+    return summary
 
 
 def _dataset_series_summary(dataset: Dataset) -> dict[str, Any]:
@@ -3429,7 +3528,10 @@ def _dataset_series_summary(dataset: Dataset) -> dict[str, Any]:
     curated_path = _series_path(dataset, adjusted=False)
     has_adjusted = adjusted_path.exists()
     target_path = adjusted_path if has_adjusted else curated_path
-    rows, min_dt, max_dt = _scan_series_summary(target_path) if target_path.exists() else (0, None, None)
+    summary = _series_summary(target_path) or {}
+    rows = int(summary.get("rows") or 0)
+    min_dt = summary.get("first_date")
+    max_dt = summary.get("last_date")
     coverage_days = (max_dt - min_dt).days if min_dt and max_dt else 0
     return {
         "rows": rows,
@@ -3540,10 +3642,53 @@ def _format_price(value: float | None) -> str:
     return f"{value:.6f}".rstrip("0").rstrip(".")
 
 
+_CSV_TAIL_BYTES = 64 * 1024
+
+
+def _read_last_csv_row(path: Path) -> dict | None:
+    """Return the last row whose ``date`` parses, reading only the tail of the file when possible."""
+    if not path.exists():
+        return None
+    with path.open("rb") as handle:
+        header_line = handle.readline()
+        header_end = handle.tell()
+        fieldnames = next(csv.reader([header_line.decode("utf-8", errors="ignore").rstrip("\r\n")]), [])
+        if "date" not in fieldnames:
+            return None
+        size = path.stat().st_size
+        start = max(header_end, size - _CSV_TAIL_BYTES)
+        handle.seek(start)
+        lines = handle.read().split(b"\n")
+    if start > header_end:
+        lines = lines[1:]
+    for raw in reversed(lines):
+        text = raw.decode("utf-8", errors="ignore").rstrip("\r")
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]), [])
+        row = {name: values[idx] if idx < len(values) else None for idx, name in enumerate(fieldnames)}
+        if _parse_datetime(str(row.get("date") or "").strip()):
+            return row
+    if start == header_end:
+        return None
+    last_row: dict | None = None
+    with path.open("r", encoding="utf-8", errors="ignore", newline="") as handle:
+        for row in csv.DictReader(handle):
+            if _parse_datetime(str(row.get("date", "")).strip()):
+                last_row = row
+    return last_row
+
+
 def _get_last_date(path: Path) -> datetime | None:
+    row = _read_last_csv_row(path)
+    if not row:
+        return None
+    return _parse_datetime(str(row.get("date", "")).strip())
+
+
+def _get_first_date(path: Path) -> datetime | None:
     if not path.exists():
         return None
-    last_dt: datetime | None = None
     with path.open("r", encoding="utf-8", errors="ignore", newline="") as handle:
         reader = csv.DictReader(handle)
         if not reader.fieldnames or "date" not in reader.fieldnames:
@@ -3551,8 +3696,8 @@ def _get_last_date(path: Path) -> datetime | None:
         for row in reader:
             parsed = _parse_datetime(str(row.get("date", "")).strip())
             if parsed:
-                last_dt = parsed
-    return last_dt
+                return parsed
+    return None
 
 
 def _append_normalized(path: Path, records: list[dict]) -> None:
@@ -3585,27 +3730,21 @@ def _load_curated(path: Path) -> dict[datetime, dict]:
 
 
 def _calc_min_interval(path: Path) -> tuple[int | None, int]:
-    if not path.exists():
+    summary = _series_summary(path)
+    if not summary:
         return None, 0
-    min_gap: int | None = None
-    last_dt: datetime | None = None
-    points = 0
-    with path.open("r", encoding="utf-8", errors="ignore", newline="") as handle:
-        reader = csv.DictReader(handle)
-        if not reader.fieldnames or "date" not in reader.fieldnames:
-            return None, 0
-        for row in reader:
-            parsed = _parse_datetime(str(row.get("date", "")).strip())
-            if not parsed:
-                continue
-            points += 1
-            if last_dt is not None:
-                gap = (parsed.date() - last_dt.date()).days
-                if gap > 0:
-                    if min_gap is None or gap < min_gap:
-                        min_gap = gap
-            last_dt = parsed
-    return min_gap, points
+    return summary.get("min_interval_days"), int(summary.get("rows") or 0)
+
+
+def _read_store_columns(
+    path: Path,
+    columns: list[str],
+    start_dt: datetime | None,
+    end_dt: datetime | None,
+) -> dict[str, Any] | None:
+    if not settings.price_store_read_enabled:
+        return None
+    return PriceStore().read_columns(path, columns, start=start_dt, end=end_dt)
 
 
 def _load_candles(
@@ -3616,34 +3755,55 @@ def _load_candles(
     candles: list[dict] = []
     if not path.exists():
         return candles
-    with path.open("r", encoding="utf-8", errors="ignore", newline="") as handle:
-        reader = csv.DictReader(handle)
-        if not reader.fieldnames or "date" not in reader.fieldnames:
-            return candles
-        for row in reader:
-            parsed = _parse_datetime(str(row.get("date", "")).strip())
-            if not parsed:
-                continue
-            if start_dt and parsed < start_dt:
-                continue
-            if end_dt and parsed > end_dt:
-                continue
-            open_val = _parse_float(row.get("open"))
-            high_val = _parse_float(row.get("high"))
-            low_val = _parse_float(row.get("low"))
-            close_val = _parse_float(row.get("close"))
-            if open_val is None or high_val is None or low_val is None or close_val is None:
+    stored = _read_store_columns(
+        path, ["date", "open", "high", "low", "close", "volume"], start_dt, end_dt
+    )
+    if stored is not None:
+        for stamp, open_val, high_val, low_val, close_val, volume_val in zip(
+            stored["date"].astype("int64").tolist(),
+            stored["open"].tolist(),
+            stored["high"].tolist(),
+            stored["low"].tolist(),
+            stored["close"].tolist(),
+            stored["volume"].tolist(),
+        ):
+            if any(math.isnan(value) for value in (open_val, high_val, low_val, close_val)):
                 continue
             candles.append(
                 {
-                    "time": _to_unix_seconds(parsed),
+                    "time": int(stamp),
                     "open": open_val,
                     "high": high_val,
                     "low": low_val,
                     "close": close_val,
-                    "volume": _parse_float(row.get("volume")),
+                    "volume": None if math.isnan(volume_val) else volume_val,
                 }
             )
+        return candles
+    for row in iter_series_rows(path, start_dt, end_dt):
+        parsed = _parse_datetime(str(row.get("date") or "").strip())
+        if not parsed:
+            continue
+        if start_dt and parsed < start_dt:
+            continue
+        if end_dt and parsed > end_dt:
+            continue
+        open_val = _parse_float(row.get("open"))
+        high_val = _parse_float(row.get("high"))
+        low_val = _parse_float(row.get("low"))
+        close_val = _parse_float(row.get("close"))
+        if open_val is None or high_val is None or low_val is None or close_val is None:
+            continue
+        candles.append(
+            {
+                "time": _to_unix_seconds(parsed),
+                "open": open_val,
+                "high": high_val,
+                "low": low_val,
+                "close": close_val,
+                "volume": _parse_float(row.get("volume")),
+            }
+        )
     return candles
 
 
@@ -3655,22 +3815,27 @@ def _load_adjusted_line(
     points: list[dict] = []
     if not path.exists():
         return points
-    with path.open("r", encoding="utf-8", errors="ignore", newline="") as handle:
-        reader = csv.DictReader(handle)
-        if not reader.fieldnames or "date" not in reader.fieldnames:
-            return points
-        for row in reader:
-            parsed = _parse_datetime(str(row.get("date", "")).strip())
-            if not parsed:
-                continue
-            if start_dt and parsed < start_dt:
-                continue
-            if end_dt and parsed > end_dt:
-                continue
-            close_val = _parse_float(row.get("close"))
-            if close_val is None:
+    stored = _read_store_columns(path, ["date", "close"], start_dt, end_dt)
+    if stored is not None:
+        for stamp, close_val in zip(
+            stored["date"].astype("int64").tolist(), stored["close"].tolist()
+        ):
+            if math.isnan(close_val):
                 continue
-            points.append({"time": _to_unix_seconds(parsed), "value": close_val})
+            points.append({"time": int(stamp), "value": close_val})
+        return points
+    for row in iter_series_rows(path, start_dt, end_dt):
+        parsed = _parse_datetime(str(row.get("date") or "").strip())
+        if not parsed:
+            continue
+        if start_dt and parsed < start_dt:
+            continue
+        if end_dt and parsed > end_dt:
+            continue
+        close_val = _parse_float(row.get("close"))
+        if close_val is None:
+            continue
+        points.append({"time": _to_unix_seconds(parsed), "value": close_val})
     return points
 
 
@@ -3688,17 +3853,106 @@ def _write_curated(path: Path, records: dict[datetime, dict]) -> None:
             writer.writerow({key: row.get(key, "") for key in _NORMALIZED_HEADER})
 
 
-def _write_snapshot(
-    dataset_id: int, dataset_name: str, records: dict[datetime, dict]
-) -> Path | None:
+def _write_curated_series(path: Path, records: dict[datetime, dict]) -> None:
+    _write_curated(path, records)
+    try:
+        write_price_store(path, records)
+    except (OSError, ValueError):
+        # The columnar mirror is an accelerator; readers fall back to the CSV when stale.
+        for store_path in price_store_files(path):
+            store_path.unlink(missing_ok=True)
+    try:
+        write_series_summary(path, sorted(records))
+    except OSError:
+        series_index_path(path).unlink(missing_ok=True)
+    try:
+        record_latest_bar(path)
+    except OSError:
+        # Lookups re-read the CSV tail when an entry no longer matches the file.
+        pass
+
+
+def _append_curated_series(path: Path, records: dict[datetime, dict]) -> None:
+    """Append bars newer than the file's last row, keeping the price_store mirror in step."""
     if not records:
+        return
+    stat = path.stat()
+    with path.open("a", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=_NORMALIZED_HEADER)
+        for timestamp in sorted(records.keys()):
+            row = records[timestamp]
+            writer.writerow({key: row.get(key, "") for key in _NORMALIZED_HEADER})
+    try:
+        append_price_store(path, records, stat.st_size, stat.st_mtime_ns)
+    except (OSError, ValueError):
+        for store_path in price_store_files(path):
+            store_path.unlink(missing_ok=True)
+    try:
+        append_series_summary(path, sorted(records), stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        series_index_path(path).unlink(missing_ok=True)
+    try:
+        record_latest_bar(path)
+    except OSError:
+        pass
+
+
+def _count_curated_rows(path: Path) -> int:
+    summary = read_series_summary(path)
+    if summary:
+        return int(summary.get("rows") or 0)
+    if PriceStore().is_fresh(path):
+        meta = read_price_store_meta(path) or {}
+        return int(meta.get("rows") or 0)
+    if not path.exists():
+        return 0
+    with path.open("rb") as handle:
+        return max(sum(1 for line in handle if line.strip()) - 1, 0)
+
+
+def _curated_row_values(row: dict) -> tuple[str, ...]:
+    return tuple("" if row.get(key) is None else str(row.get(key)) for key in _NORMALIZED_HEADER)
+
+
+def _collect_curated_append(
+    path: Path, records: list[tuple[datetime, dict]], last_dt: datetime
+) -> dict[datetime, dict] | None:
+    """Return the bars to append after ``last_dt``.
+
+    ``None`` means the incoming rows would replace the existing last bar, which needs the
+    full merge-and-rewrite path instead of an append.
+    """
+    last_row = _read_last_csv_row(path)
+    if last_row is None:
+        return None
+    appended: dict[datetime, dict] = {}
+    for timestamp, row in records:
+        if timestamp < last_dt:
+            continue
+        if timestamp == last_dt:
+            if _row_score(row) >= _row_score(last_row) and _curated_row_values(
+                row
+            ) != _curated_row_values(last_row):
+                return None
+            continue
+        existing = appended.get(timestamp)
+        if existing is None or _row_score(row) >= _row_score(existing):
+            appended[timestamp] = row
+    return appended
+
+
+def _curated_versions_dir(dataset_id: int, dataset_name: str) -> Path:
+    return _get_data_root() / "curated_versions" / f"{dataset_id}_{_safe_name(dataset_name)}"
+
+
+def _write_snapshot(dataset_id: int, dataset_name: str, curated_path: Path) -> Path | None:
+    if not curated_path.exists():
         return None
-    version_dir = _get_data_root() / "curated_versions" / f"{dataset_id}_{_safe_name(dataset_name)}"
-    version_dir.mkdir(parents=True, exist_ok=True)
-    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
-    snapshot_path = version_dir / f"{stamp}.csv"
-    _write_curated(snapshot_path, records)
-    return snapshot_path
+    return record_curated_version(
+        _curated_versions_dir(dataset_id, dataset_name),
+        curated_path.read_bytes(),
+        load_curated_versions_config(_get_data_root()),
+    )
 
 
 def _resolve_symbol_name(dataset_name: str, records: dict[datetime, dict]) -> str:
@@ -3832,12 +4086,21 @@ def _apply_price_factors(
 def _sanitize_cliffs(
     records: dict[datetime, dict], threshold: float = 0.6
 ) -> tuple[dict[datetime, dict], int]:
+    sanitized, count, _, _ = _sanitize_cliffs_from(records, threshold)
+    return sanitized, count
+
+
+def _sanitize_cliffs_from(
+    records: dict[datetime, dict],
+    threshold: float = 0.6,
+    scale: float = 1.0,
+    prev_close: float | None = None,
+) -> tuple[dict[datetime, dict], int, float, float | None]:
+    """``_sanitize_cliffs`` resumable from a saved ``(scale, prev_close)`` state."""
     if not records:
-        return {}, 0
+        return {}, 0, scale, prev_close
     sanitized: dict[datetime, dict] = {}
     count = 0
-    prev_close: float | None = None
-    scale = 1.0
     for timestamp, row in sorted(records.items(), key=lambda item: item[0]):
         close_raw = _parse_float(row.get("close"))
         if close_raw is None:
@@ -3861,7 +4124,76 @@ def _sanitize_cliffs(
             "close": _format_price(scaled_close),
         }
         prev_close = scaled_close
-    return sanitized, count
+    return sanitized, count, scale, prev_close
+
+
+ADJUSTED_STATE_VERSION = 1
+
+
+def _adjusted_state_path(adjusted_path: Path) -> Path:
+    return adjusted_path.parent.parent / "curated_adjusted_state" / f"{adjusted_path.stem}.json"
+
+
+def _factor_history_digest(factors: list[tuple[date, float]], through: date) -> str:
+    # Factors dated after ``through`` only touch appended bars; the first factor also
+    # covers every bar before it, so it is always part of the history.
+    history = [item for item in factors if item[0] <= through] or factors[:1]
+    payload = "|".join(f"{day.isoformat()}:{factor!r}" for day, factor in history)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _write_adjusted_state(
+    adjusted_path: Path,
+    curated_last: datetime,
+    factors: list[tuple[date, float]],
+    scale: float,
+    prev_close: float | None,
+    cliff_count: int,
+) -> None:
+    state_path = _adjusted_state_path(adjusted_path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    stat = adjusted_path.stat()
+    payload = {
+        "version": ADJUSTED_STATE_VERSION,
+        "curated_last": curated_last.isoformat(),
+        "factor_digest": _factor_history_digest(factors, curated_last.date()),
+        "scale": scale,
+        "prev_close": prev_close,
+        "cliff_count": cliff_count,
+        "adjusted_size": stat.st_size,
+        "adjusted_mtime_ns": stat.st_mtime_ns,
+    }
+    tmp_path = state_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(state_path)
+
+
+def _load_adjusted_state(
+    adjusted_path: Path, curated_last: datetime, factors: list[tuple[date, float]]
+) -> dict[str, Any] | None:
+    """Return the saved sanitize state when the adjusted series can simply be extended.
+
+    That requires the adjusted file to be the one the state was written for, the curated
+    series to end where it ended then, and an unchanged factor history up to that bar.
+    """
+    state_path = _adjusted_state_path(adjusted_path)
+    if not factors or not state_path.exists() or not adjusted_path.exists():
+        return None
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != ADJUSTED_STATE_VERSION:
+        return None
+    stat = adjusted_path.stat()
+    if (
+        state.get("adjusted_size") != stat.st_size
+        or state.get("adjusted_mtime_ns") != stat.st_mtime_ns
+        or state.get("curated_last") != curated_last.isoformat()
+        or state.get("factor_digest") != _factor_history_digest(factors, curated_last.date())
+    ):
+        return None
+    return state
 
 
 def _should_export_lean(dataset: Dataset | None) -> bool:
@@ -3906,23 +4238,7 @@ def _export_lean_daily_to_root(
     daily_dir = equity_root / "daily"
     daily_dir.mkdir(parents=True, exist_ok=True)
 
-    lines: list[str] = []
-    for timestamp in sorted(records.keys()):
-        row = records[timestamp]
-        open_val = _to_scaled_int(row.get("open"))
-        high_val = _to_scaled_int(row.get("high"))
-        low_val = _to_scaled_int(row.get("low"))
-        close_val = _to_scaled_int(row.get("close"))
-        if None in {open_val, high_val, low_val, close_val}:
-            continue
-        volume_raw = str(row.get("volume", "")).strip()
-        try:
-            volume_val = int(float(volume_raw)) if volume_raw else 0
-        except ValueError:
-            volume_val = 0
-        line = f"{timestamp.strftime('%Y%m%d')} 00:00,{open_val},{high_val},{low_val},{close_val},{volume_val}"
-        lines.append(line)
-
+    lines = _lean_daily_lines(records)
     if not lines:
         return None
 
@@ -3965,6 +4281,75 @@ def _export_lean_daily(
     return _export_lean_daily_to_root(dataset, records, dataset_name, _get_lean_root())
 
 
+def _lean_daily_lines(records: dict[datetime, dict]) -> list[str]:
+    lines: list[str] = []
+    for timestamp in sorted(records.keys()):
+        row = records[timestamp]
+        open_val = _to_scaled_int(row.get("open"))
+        high_val = _to_scaled_int(row.get("high"))
+        low_val = _to_scaled_int(row.get("low"))
+        close_val = _to_scaled_int(row.get("close"))
+        if None in {open_val, high_val, low_val, close_val}:
+            continue
+        volume_raw = str(row.get("volume", "")).strip()
+        try:
+            volume_val = int(float(volume_raw)) if volume_raw else 0
+        except ValueError:
+            volume_val = 0
+        line = f"{timestamp.strftime('%Y%m%d')} 00:00,{open_val},{high_val},{low_val},{close_val},{volume_val}"
+        lines.append(line)
+    return lines
+
+
+def _patch_lean_daily_to_root(
+    dataset: Dataset | None,
+    appended: dict[datetime, dict],
+    dataset_name: str,
+    lean_root: Path,
+    source_path: Path,
+) -> Path | None:
+    """Append ``appended`` bars to an existing Lean daily zip.
+
+    Falls back to a full export from ``source_path`` (the curated CSV the bars were appended
+    to) when there is no zip, map or factor file to patch.
+    """
+    if not _should_export_lean(dataset):
+        return None
+    symbol_rows = appended or {datetime.min: _read_last_csv_row(source_path) or {}}
+    symbol = _normalize_symbol(_resolve_symbol_name(dataset_name, symbol_rows)).lower()
+    equity_root = lean_root / "equity" / "usa"
+    zip_path = equity_root / "daily" / f"{symbol}.zip"
+    patchable = (
+        symbol
+        and symbol != "unknown"
+        and zip_path.exists()
+        and (equity_root / "map_files" / f"{symbol}.csv").exists()
+        and (equity_root / "factor_files" / f"{symbol}.csv").exists()
+    )
+    existing: str | None = None
+    if patchable:
+        try:
+            with zipfile.ZipFile(zip_path) as zf:
+                existing = zf.read(f"{symbol}.csv").decode("utf-8")
+        except (KeyError, OSError, zipfile.BadZipFile):
+            existing = None
+    if existing is None:
+        return _export_lean_daily_to_root(
+            dataset, _load_curated(source_path), dataset_name, lean_root
+        )
+    new_lines = _lean_daily_lines(appended)
+    if not new_lines:
+        return zip_path
+    first_key = new_lines[0][:8]
+    lines = [line for line in existing.splitlines() if line and line[:8] < first_key]
+    lines.extend(new_lines)
+    tmp_path = zip_path.with_suffix(".zip.tmp")
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{symbol}.csv", "\n".join(lines) + "\n")
+    tmp_path.replace(zip_path)
+    return zip_path
+
+
 def _scan_csv_file(path: Path, date_column: str) -> tuple[int, datetime | None, datetime | None]:
     rows = 0
     min_dt: datetime | None = None
@@ -4018,7 +4403,61 @@ def _scan_path(path: Path, date_column: str) -> tuple[int, datetime | None, date
     return total_rows, min_dt, max_dt, issues
 
 
-def run_data_sync(job_id: int, spawn_retry_thread: bool = True) -> None:
+@dataclass
+class _DataSyncStaged:
+    """Output of the fetch stage handed to the post-processing stage of a sync job."""
+
+    job_id: int
+    dataset_id: int
+    dataset_name: str
+    source_label: str | None
+    normalized_path: Path
+    curated_path: Path
+    adjusted_path: Path
+    reset_history: bool
+    records: list[tuple[datetime, dict]]
+    raw_rows: int
+    map_path: Path | None
+    cache_factor_path: Path
+    factors: list[tuple[date, float]]
+    factor_source: str | None
+    alpha_meta: dict[str, Any] | None
+    issues: list[str] = field(default_factory=list)
+
+
+def _mark_data_sync_failed(session, job_id: int, exc: Exception) -> None:
+    job = session.get(DataSyncJob, job_id)
+    if job:
+        job.status = "failed"
+        job.message = str(exc)
+        job.ended_at = datetime.utcnow()
+        record_audit(
+            session,
+            action="data.sync.failed",
+            resource_type="data_sync_job",
+            resource_id=job.id,
+            detail={"dataset_id": job.dataset_id, "error": str(exc)},
+        )
+        session.commit()
+
+
+def run_data_sync(job_id: int, spawn_retry_thread: bool = True) -> None:
+    with get_session() as session:
+        job = session.get(DataSyncJob, job_id)
+        dataset_id = job.dataset_id if job else None
+    with _dataset_sync_lock(dataset_id):
+        staged = _run_data_sync_fetch(job_id, spawn_retry_thread=spawn_retry_thread)
+        if staged is not None:
+            _run_data_sync_postprocess(staged)
+
+
+def _run_data_sync_fetch(
+    job_id: int, spawn_retry_thread: bool = True
+) -> _DataSyncStaged | None:
+    """Network-bound half of a sync job: resolve the source, download and normalize it.
+
+    Returns ``None`` when the job finished here (skip, retry scheduled, blocked or failed).
+    """
     session = SessionLocal()
     try:
         job = session.get(DataSyncJob, job_id)
@@ -4112,7 +4551,7 @@ def run_data_sync(job_id: int, spawn_retry_thread: bool = True) -> None:
                     adjusted_records = _apply_price_factors(curated_records, factors)
                     adjusted_records, cliff_count = _sanitize_cliffs(adjusted_records)
                     if adjusted_records:
-                        _write_curated(adjusted_path, adjusted_records)
+                        _write_curated_series(adjusted_path, adjusted_records)
                         lean_adjusted_root = _get_data_root() / "lean_adjusted"
                         base_lean_root = _get_lean_root()
                         _ensure_support_directory(
@@ -4524,13 +4963,95 @@ def run_data_sync(job_id: int, spawn_retry_thread: bool = True) -> None:
                 records, raw_rows, _, _, issues = _normalize_records(
                     source_files, job.date_column, dataset_name, symbol_override
                 )
-        if not records:
-            raise RuntimeError("未找到可用记录")
+        if not records:
+            raise RuntimeError("未找到可用记录")
+        if is_alpha_source and alpha_outputsize == "compact":
+            # Decide on the full-history factor refetch here, from the curated file's first
+            # date, so the post-processing stage never has to go back to the network.
+            earliest_dt = None if reset_history else _get_first_date(curated_path)
+            if earliest_dt is None:
+                earliest_dt = min(timestamp for timestamp, _ in records)
+            earliest_data = earliest_dt.date()
+            earliest_factor = factors[0][0] if factors else None
+            if earliest_factor is None or earliest_factor > earliest_data:
+                full_path = _fetch_alpha_csv_with_retry(
+                    alpha_symbol,
+                    job.dataset_id,
+                    dataset_name,
+                    outputsize="full",
+                )
+                full_factors = _build_factors_from_alpha_csv(full_path)
+                if full_factors:
+                    factors = full_factors
+                    factor_source = "alpha_full"
+                    alpha_compact_fallback = True
+                    if alpha_meta is not None:
+                        alpha_meta["alpha_outputsize"] = "full"
+                        alpha_meta["alpha_compact_fallback"] = True
+
+        _set_job_stage(session, job, "postprocess", 0.7)
+        return _DataSyncStaged(
+            job_id=job.id,
+            dataset_id=job.dataset_id,
+            dataset_name=dataset_name,
+            source_label=source_label,
+            normalized_path=normalized_path,
+            curated_path=curated_path,
+            adjusted_path=adjusted_path,
+            reset_history=reset_history,
+            records=records,
+            raw_rows=raw_rows,
+            map_path=map_path,
+            cache_factor_path=cache_factor_path,
+            factors=factors,
+            factor_source=factor_source,
+            alpha_meta=alpha_meta,
+            issues=issues,
+        )
+    except Exception as exc:
+        _mark_data_sync_failed(session, job_id, exc)
+        return None
+    finally:
+        session.close()
+
+
+def _run_data_sync_postprocess(staged: _DataSyncStaged) -> None:
+    """CPU/IO half of a sync job: merge, adjust, write curated series and Lean exports."""
+    with _dataset_sync_lock(staged.dataset_id):
+        _write_data_sync_outputs(staged)
+
+
+def _write_data_sync_outputs(staged: _DataSyncStaged) -> None:
+    session = SessionLocal()
+    try:
+        job = session.get(DataSyncJob, staged.job_id)
+        if not job:
+            return
+        dataset = session.get(Dataset, job.dataset_id)
+        dataset_name = staged.dataset_name
+        source_label = staged.source_label
+        normalized_path = staged.normalized_path
+        curated_path = staged.curated_path
+        adjusted_path = staged.adjusted_path
+        reset_history = staged.reset_history
+        records = staged.records
+        raw_rows = staged.raw_rows
+        issues = staged.issues
+        map_path = staged.map_path
+        cache_factor_path = staged.cache_factor_path
+        factors = staged.factors
+        factor_source = staged.factor_source
+        alpha_meta = staged.alpha_meta
 
         if reset_history:
             normalized_path.unlink(missing_ok=True)
             curated_path.unlink(missing_ok=True)
             adjusted_path.unlink(missing_ok=True)
+            for store_path in price_store_files(curated_path) + price_store_files(adjusted_path):
+                store_path.unlink(missing_ok=True)
+            series_index_path(curated_path).unlink(missing_ok=True)
+            series_index_path(adjusted_path).unlink(missing_ok=True)
+            _adjusted_state_path(adjusted_path).unlink(missing_ok=True)
         last_norm_dt = _get_last_date(normalized_path)
         norm_records = [
             record for record in records if last_norm_dt is None or record[0] > last_norm_dt
@@ -4540,58 +5061,96 @@ def run_data_sync(job_id: int, spawn_retry_thread: bool = True) -> None:
         last_cur_dt = _get_last_date(curated_path)
         if reset_history:
             last_cur_dt = None
-        curated_records = {} if reset_history else _load_curated(curated_path)
-        for timestamp, row in records:
-            if last_cur_dt is not None and timestamp < last_cur_dt:
-                continue
-            existing = curated_records.get(timestamp)
-            if existing is None or _row_score(row) >= _row_score(existing):
-                curated_records[timestamp] = row
-        _write_curated(curated_path, curated_records)
-        if is_alpha_source and alpha_outputsize == "compact" and curated_records:
-            earliest_data = min(curated_records.keys()).date()
-            earliest_factor = factors[0][0] if factors else None
-            if earliest_factor is None or earliest_factor > earliest_data:
-                full_path = _fetch_alpha_csv_with_retry(
-                    alpha_symbol,
-                    job.dataset_id,
-                    dataset_name,
-                    outputsize="full",
-                )
-                full_factors = _build_factors_from_alpha_csv(full_path)
-                if full_factors:
-                    factors = full_factors
-                    factor_source = "alpha_full"
-                    alpha_compact_fallback = True
-                    if alpha_meta is not None:
-                        alpha_meta["alpha_outputsize"] = "full"
-                        alpha_meta["alpha_compact_fallback"] = True
-        if factors and factor_source in {
-            "alpha",
-            "alpha_compact_merge",
-            "alpha_compact_only",
-            "alpha_full",
-            "yahoo",
-        }:
-            _write_factor_file(cache_factor_path, factors)
-        adjusted_records = _apply_price_factors(curated_records, factors)
-        adjusted_records, cliff_count = _sanitize_cliffs(adjusted_records)
-        lean_adjusted_path = None
-        if adjusted_records:
-            _write_curated(adjusted_path, adjusted_records)
-            lean_adjusted_root = _get_data_root() / "lean_adjusted"
-            base_lean_root = _get_lean_root()
-            _ensure_support_directory(lean_adjusted_root, base_lean_root, "symbol-properties")
-            _ensure_support_directory(lean_adjusted_root, base_lean_root, "market-hours")
-            lean_adjusted_path = _export_lean_daily_to_root(
-                dataset, adjusted_records, dataset_name, lean_adjusted_root
-            )
-        _set_job_stage(session, job, "finalize", 0.9)
-        snapshot_path = _write_snapshot(job.dataset_id, dataset_name, curated_records)
-        lean_path = _export_lean_daily(dataset, curated_records, dataset_name)
-
-        coverage_start = min(curated_records.keys()).date().isoformat() if curated_records else None
-        coverage_end = max(curated_records.keys()).date().isoformat() if curated_records else None
+        # Incremental mode: when the sync only adds bars after the current last bar, append
+        # them (and their adjusted values) instead of rewriting the whole history.
+        appended: dict[datetime, dict] | None = None
+        if settings.data_sync_incremental_enabled and last_cur_dt is not None:
+            appended = _collect_curated_append(curated_path, records, last_cur_dt)
+        curated_records: dict[datetime, dict] | None = None
+        if appended is None:
+            curated_records = {} if reset_history else _load_curated(curated_path)
+            for timestamp, row in records:
+                if last_cur_dt is not None and timestamp < last_cur_dt:
+                    continue
+                existing = curated_records.get(timestamp)
+                if existing is None or _row_score(row) >= _row_score(existing):
+                    curated_records[timestamp] = row
+            _write_curated_series(curated_path, curated_records)
+        else:
+            _append_curated_series(curated_path, appended)
+        if factors and factor_source in {
+            "alpha",
+            "alpha_compact_merge",
+            "alpha_compact_only",
+            "alpha_full",
+            "yahoo",
+        }:
+            _write_factor_file(cache_factor_path, factors)
+        lean_adjusted_root = _get_data_root() / "lean_adjusted"
+        adjusted_state = (
+            _load_adjusted_state(adjusted_path, last_cur_dt, factors)
+            if appended is not None
+            else None
+        )
+        lean_adjusted_path = None
+        if adjusted_state is not None:
+            adjusted_records = _apply_price_factors(appended, factors)
+            adjusted_records, new_cliffs, scale, prev_close = _sanitize_cliffs_from(
+                adjusted_records,
+                scale=float(adjusted_state.get("scale") or 1.0),
+                prev_close=adjusted_state.get("prev_close"),
+            )
+            cliff_count = int(adjusted_state.get("cliff_count") or 0) + new_cliffs
+            adjusted_written = True
+            _append_curated_series(adjusted_path, adjusted_records)
+            lean_adjusted_path = _patch_lean_daily_to_root(
+                dataset, adjusted_records, dataset_name, lean_adjusted_root, adjusted_path
+            )
+            _write_adjusted_state(
+                adjusted_path,
+                max(appended) if appended else last_cur_dt,
+                factors,
+                scale,
+                prev_close,
+                cliff_count,
+            )
+        else:
+            if curated_records is None:
+                curated_records = _load_curated(curated_path)
+            adjusted_records = _apply_price_factors(curated_records, factors)
+            adjusted_records, cliff_count, scale, prev_close = _sanitize_cliffs_from(
+                adjusted_records
+            )
+            adjusted_written = bool(adjusted_records)
+            if adjusted_records:
+                _write_curated_series(adjusted_path, adjusted_records)
+                base_lean_root = _get_lean_root()
+                _ensure_support_directory(lean_adjusted_root, base_lean_root, "symbol-properties")
+                _ensure_support_directory(lean_adjusted_root, base_lean_root, "market-hours")
+                lean_adjusted_path = _export_lean_daily_to_root(
+                    dataset, adjusted_records, dataset_name, lean_adjusted_root
+                )
+                _write_adjusted_state(
+                    adjusted_path, max(curated_records), factors, scale, prev_close, cliff_count
+                )
+            else:
+                _adjusted_state_path(adjusted_path).unlink(missing_ok=True)
+        _set_job_stage(session, job, "finalize", 0.9)
+        snapshot_path = _write_snapshot(job.dataset_id, dataset_name, curated_path)
+        if curated_records is not None:
+            lean_path = _export_lean_daily(dataset, curated_records, dataset_name)
+            curated_rows = len(curated_records)
+            coverage_start = min(curated_records.keys()).date().isoformat() if curated_records else None
+            coverage_end = max(curated_records.keys()).date().isoformat() if curated_records else None
+        else:
+            lean_path = _patch_lean_daily_to_root(
+                dataset, appended, dataset_name, _get_lean_root(), curated_path
+            )
+            summary = _series_summary(curated_path) or {}
+            curated_rows = int(summary.get("rows") or 0)
+            first_day = summary.get("first_date")
+            coverage_start = first_day.isoformat() if first_day else None
+            coverage_end = (max(appended) if appended else last_cur_dt).date().isoformat()
 
         job.rows_scanned = raw_rows
         job.coverage_start = coverage_start
@@ -4600,12 +5159,12 @@ def run_data_sync(job_id: int, spawn_retry_thread: bool = True) -> None:
         job.output_path = str(curated_path)
         job.snapshot_path = str(snapshot_path) if snapshot_path else None
         job.lean_path = str(lean_path) if lean_path else None
-        job.adjusted_path = str(adjusted_path) if adjusted_records else None
+        job.adjusted_path = str(adjusted_path) if adjusted_written else None
         job.lean_adjusted_path = str(lean_adjusted_path) if lean_adjusted_path else None
         message_parts = [
             f"raw_rows={raw_rows}",
             f"normalized_new={len(norm_records)}",
-            f"curated_rows={len(curated_records)}",
+            f"curated_rows={curated_rows}",
         ]
         if source_label:
             message_parts.append(f"source={source_label}")
@@ -4640,7 +5199,7 @@ def run_data_sync(job_id: int, spawn_retry_thread: bool = True) -> None:
             message_parts.append("snapshot=ok")
         if lean_path:
             message_parts.append("lean=ok")
-        if adjusted_records:
+        if adjusted_written:
             message_parts.append("adjusted=ok")
         if lean_adjusted_path:
             message_parts.append("lean_adjusted=ok")
@@ -4685,19 +5244,7 @@ def run_data_sync(job_id: int, spawn_retry_thread: bool = True) -> None:
         )
         session.commit()
     except Exception as exc:
-        job = session.get(DataSyncJob, job_id)
-        if job:
-            job.status = "failed"
-            job.message = str(exc)
-            job.ended_at = datetime.utcnow()
-            record_audit(
-                session,
-                action="data.sync.failed",
-                resource_type="data_sync_job",
-                resource_id=job.id,
-                detail={"dataset_id": job.dataset_id, "error": str(exc)},
-            )
-            session.commit()
+        _mark_data_sync_failed(session, staged.job_id, exc)
     finally:
         session.close()
 
@@ -5204,6 +5751,38 @@ def get_dataset(dataset_id: int):
         return dataset
 
 
+@router.get("/{dataset_id}/versions", response_model=list[CuratedVersionOut])
+def list_dataset_versions(dataset_id: int):
+    with get_session() as session:
+        dataset = session.get(Dataset, dataset_id)
+        if not dataset:
+            raise HTTPException(status_code=404, detail="数据集不存在")
+        dataset_name = dataset.name
+    versions = list_curated_versions(_curated_versions_dir(dataset_id, dataset_name))
+    return [CuratedVersionOut(**item) for item in reversed(versions)]
+
+
+@router.get("/{dataset_id}/versions/{version}")
+def get_dataset_version(dataset_id: int, version: str):
+    with get_session() as session:
+        dataset = session.get(Dataset, dataset_id)
+        if not dataset:
+            raise HTTPException(status_code=404, detail="数据集不存在")
+        dataset_name = dataset.name
+    try:
+        content = reconstruct_curated_version(
+            _curated_versions_dir(dataset_id, dataset_name), version
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="版本不存在") from None
+    except (OSError, ValueError) as exc:
+        raise HTTPException(status_code=500, detail=f"版本重建失败: {exc}") from exc
+    headers = {
+        "Content-Disposition": f'attachment; filename="{dataset_id}_{_safe_name(dataset_name)}_{version}.csv"'
+    }
+    return Response(content=content, media_type="text/csv", headers=headers)
+
+
 @router.get("/{dataset_id}/series", response_model=DatasetSeriesOut)
 def get_dataset_series(
     dataset_id: int,
@@ -5287,6 +5866,10 @@ def delete_datasets(payload: DatasetDeleteRequest):
             output_name = f"{dataset.id}_{safe_name}.csv"
             for folder in ("normalized", "curated", "curated_adjusted"):
                 paths_to_delete.add(data_root / folder / output_name)
+            for folder in ("curated", "curated_adjusted"):
+                paths_to_delete.update(price_store_files(data_root / folder / output_name))
+                paths_to_delete.add(series_index_path(data_root / folder / output_name))
+            paths_to_delete.add(_adjusted_state_path(data_root / "curated_adjusted" / output_name))
             paths_to_delete.add(data_root / "raw" / "stooq" / output_name)
             paths_to_delete.add(data_root / "curated_versions" / f"{dataset.id}_{safe_name}")
 
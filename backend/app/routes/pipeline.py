@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 
 from app.db import get_session
 from app.schemas import PipelineRunDetailOut, PipelineRunListOut
 from app.services.pipeline_aggregator import build_pipeline_trace, list_pipeline_runs
+from app.services.pipeline_run_index import encode_cursor
 
 router = APIRouter(prefix="/api/pipeline", tags=["pipeline"])
 
@@ -20,18 +21,29 @@ def list_runs(
     started_from: datetime | None = Query(default=None),
     started_to: datetime | None = Query(default=None),
     keyword: str | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    response: Response = None,
 ):
     with get_session() as session:
-        return list_pipeline_runs(
-            session,
-            project_id=project_id,
-            status=status,
-            mode=mode,
-            run_type=run_type,
-            started_from=started_from,
-            started_to=started_to,
-            keyword=keyword,
-        )
+        try:
+            items = list_pipeline_runs(
+                session,
+                project_id=project_id,
+                status=status,
+                mode=mode,
+                run_type=run_type,
+                started_from=started_from,
+                started_to=started_to,
+                keyword=keyword,
+                limit=limit,
+                cursor=cursor,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if response is not None and limit and len(items) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(items[-1])
+    return items
 
 
 @router.get("/runs/{trace_id}", response_model=PipelineRunDetailOut)
@@ -79,7 +79,7 @@ from app.services.lean_bridge_paths import resolve_bridge_root
 from app.services.lean_bridge_reader import read_open_orders, read_positions
 from app.services.ib_settings import get_or_create_ib_settings
 from app.services.realized_pnl import compute_realized_pnl
-from app.services.realized_pnl_baseline import ensure_positions_baseline
+from app.services.realized_pnl_baseline import ensure_positions_baseline, realized_pnl_ledger_path
 from app.services.trade_order_intent import write_order_intent_manual
 from app.services import trade_executor
 from app.services.trade_run_summary import build_last_update_at, build_symbol_summary, build_trade_run_detail
@@ -1142,6 +1142,7 @@ def list_trade_orders(
                     cache_ttl_seconds=_TRADE_ORDERS_REALIZED_PNL_CACHE_TTL_SECONDS,
                     fast_cache_ttl_seconds=_TRADE_ORDERS_REALIZED_PNL_FAST_CACHE_TTL_SECONDS,
                     symbols=page_realized_symbols,
+                    ledger_path=realized_pnl_ledger_path(bridge_root),
                 )
                 realized_order_totals = dict(realized.order_totals)
             lap("realized_pnl")
@@ -1244,9 +1245,12 @@ def get_trade_run_orders(
             session.commit()
         if run is not None:
             trade_executor.recompute_trade_run_completion_summary(session, run)
-        positions_payload = read_positions(resolve_bridge_root())
-        baseline = ensure_positions_baseline(resolve_bridge_root(), positions_payload)
-        realized = compute_realized_pnl(session, baseline)
+        bridge_root = resolve_bridge_root()
+        positions_payload = read_positions(bridge_root)
+        baseline = ensure_positions_baseline(bridge_root, positions_payload)
+        realized = compute_realized_pnl(
+            session, baseline, ledger_path=realized_pnl_ledger_path(bridge_root)
+        )
         orders = (
             session.query(TradeOrder)
             .filter(TradeOrder.run_id == run_id)
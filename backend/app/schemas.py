@@ -593,6 +593,7 @@ class DatasetOut(BaseModel):
     coverage_end: str | None
     source_path: str | None
     updated_at: datetime
+    data_points: int | None = None
 
     class Config:
         from_attributes = True
@@ -621,6 +622,15 @@ class DatasetSeriesOut(BaseModel):
     adjusted: list[DatasetLinePointOut]
 
 
+class CuratedVersionOut(BaseModel):
+    version: str
+    kind: str
+    created_at: str | None = None
+    size: int | None = None
+    stored_bytes: int | None = None
+    sha256: str | None = None
+
+
 class DatasetThemeCoverageOut(BaseModel):
     theme_key: str
     theme_label: str | None = None
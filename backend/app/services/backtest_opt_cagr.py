@@ -61,6 +61,9 @@ def score_manifest(
             continue
         row = json.loads(line)
         run_id = row.get("id") or row.get("run_id")
+        if not run_id:
+            # Sweep screening rows (no Lean run).
+            continue
         params = row.get("params") or {}
         summary = artifacts_root / f"run_{run_id}" / "lean_results" / "-summary.json"
         if not summary.exists():
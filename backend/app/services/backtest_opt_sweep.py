@@ -0,0 +1,719 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.services.backtest_opt_cagr import is_acceptable
+
+# In-process screening for parameter sweeps of algorithms/ml_overlay_scores.py.
+#
+# Prices, scores and the benchmark calendar are loaded once per (score file, window,
+# benchmark, defensive basket) and every candidate is simulated against the same close
+# matrix: the daily mark-to-market, drawdown bookkeeping and drawdown guard run across
+# all candidates at once, only rebalance days step through candidates one by one.
+# The simulator mirrors the algorithm's rules (selection with retain buffer, score
+# weighting, max_weight cap, max_exposure, vol targeting, drawdown tiers/guard, market
+# filter, weekly turnover limit, risk-off to cash/benchmark/defensive) on daily closes:
+# orders fill at the previous close, fees are fee_bps on traded notional, idle
+# allocation and the income sleeve are ignored. Results are for ranking only; the top
+# candidates still go through a full Lean backtest.
+
+TRADING_DAYS = 252
+_DAY_OF_WEEK = {"monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3, "friday": 4}
+_TRUE_VALUES = {"1", "true", "yes", "y"}
+
+
+def _resolve_data_root() -> Path:
+    if settings.data_root:
+        return Path(settings.data_root)
+    env_root = os.getenv("DATA_ROOT")
+    if env_root:
+        return Path(env_root)
+    return Path("/data/share/stock/data")
+
+
+def _text(params: Dict[str, Any], key: str, default: str = "") -> str:
+    value = params.get(key)
+    if value in (None, ""):
+        return default
+    return str(value).strip()
+
+
+def _float(params: Dict[str, Any], key: str, default: float) -> float:
+    try:
+        return float(_text(params, key) or default)
+    except (TypeError, ValueError):
+        return default
+
+
+def _optional_float(params: Dict[str, Any], key: str) -> float | None:
+    text = _text(params, key)
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _int(params: Dict[str, Any], key: str, default: int) -> int:
+    try:
+        return int(float(_text(params, key) or default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _flag(params: Dict[str, Any], key: str, default: str) -> bool:
+    return _text(params, key, default).lower() in _TRUE_VALUES
+
+
+def _symbols(raw: str) -> List[str]:
+    parts = [item.strip().upper() for item in str(raw or "").replace(";", ",").split(",")]
+    return [item for item in parts if item]
+
+
+def _floats(raw: str) -> List[float]:
+    values: List[float] = []
+    for item in str(raw or "").replace(";", ",").split(","):
+        try:
+            values.append(float(item.strip()))
+        except ValueError:
+            continue
+    return values
+
+
+@dataclass(frozen=True)
+class SweepRules:
+    top_n: int
+    retain_top_n: int
+    weighting: str
+    min_score: float | None
+    max_weight: float | None
+    max_exposure: float
+    market_filter: bool
+    market_ma_window: int
+    score_delay_days: int
+    score_smoothing_alpha: float
+    score_smoothing_carry: bool
+    max_drawdown: float
+    max_drawdown_52w: float
+    drawdown_recovery_ratio: float
+    drawdown_exposure_floor: float
+    drawdown_tiers: tuple[tuple[float, float], ...]
+    dynamic_exposure: bool
+    max_turnover_week: float
+    vol_target: float
+    vol_window: int
+    risk_off_mode: str
+    risk_off_pick: str
+    risk_off_lookback_days: int
+    rebalance_frequency: str
+    rebalance_day: int
+    fee_bps: float
+    initial_cash: float
+
+
+def parse_rules(params: Dict[str, Any]) -> SweepRules:
+    """Algorithm parameters -> rules, with the defaults of MLOverlayScores.initialize."""
+    max_exposure = min(max(_float(params, "max_exposure", 1.0), 0.0), 1.0)
+    recovery = _float(params, "drawdown_recovery_ratio", 0.9)
+    if recovery <= 0 or recovery > 1:
+        recovery = 0.9
+    tier_values = _floats(_text(params, "drawdown_tiers"))
+    exposure_values = _floats(_text(params, "drawdown_exposures"))
+    tiers: List[tuple[float, float]] = []
+    if tier_values and exposure_values:
+        exposure_values = (exposure_values + [exposure_values[-1]] * len(tier_values))[: len(tier_values)]
+        tiers = sorted(
+            (threshold, min(max(exposure, 0.0), 1.0))
+            for threshold, exposure in zip(tier_values, exposure_values)
+            if threshold > 0
+        )
+    frequency = _text(params, "rebalance_frequency", "Daily").lower()
+    if frequency == "daily":
+        frequency = "weekly"
+    return SweepRules(
+        top_n=_int(params, "top_n", 10),
+        retain_top_n=max(_int(params, "retain_top_n", 0), 0),
+        weighting=_text(params, "weighting", "equal").lower(),
+        min_score=_optional_float(params, "min_score"),
+        max_weight=_optional_float(params, "max_weight"),
+        max_exposure=max_exposure,
+        market_filter=_flag(params, "market_filter", "true"),
+        market_ma_window=_int(params, "market_ma_window", 200),
+        score_delay_days=max(_int(params, "score_delay_days", 1), 0),
+        score_smoothing_alpha=min(max(_float(params, "score_smoothing_alpha", 0.0), 0.0), 1.0),
+        score_smoothing_carry=_flag(params, "score_smoothing_carry", "true"),
+        max_drawdown=max(_float(params, "max_drawdown", 0.12), 0.0),
+        max_drawdown_52w=max(_float(params, "max_drawdown_52w", 0.12), 0.0),
+        drawdown_recovery_ratio=recovery,
+        drawdown_exposure_floor=min(max(_float(params, "drawdown_exposure_floor", 0.05), 0.0), 1.0),
+        drawdown_tiers=tuple(tiers),
+        dynamic_exposure=_flag(params, "dynamic_exposure", "false"),
+        max_turnover_week=max(_float(params, "max_turnover_week", 0.08), 0.0),
+        vol_target=max(_float(params, "vol_target", 0.0), 0.0),
+        vol_window=max(_int(params, "vol_window", 20), 5),
+        risk_off_mode=_text(params, "risk_off_mode", "cash").lower(),
+        risk_off_pick=_text(params, "risk_off_pick", "best_momentum").lower(),
+        risk_off_lookback_days=max(_int(params, "risk_off_lookback_days", 20), 5),
+        rebalance_frequency=frequency,
+        rebalance_day=_DAY_OF_WEEK.get(_text(params, "rebalance_day", "Monday").lower(), 0),
+        fee_bps=max(_float(params, "fee_bps", 0.0), 0.0),
+        initial_cash=_float(params, "initial_cash", 30000.0),
+    )
+
+
+def _data_key(params: Dict[str, Any]) -> tuple[str, ...]:
+    benchmark = _text(params, "benchmark", "SPY").upper()
+    defensive = _symbols(_text(params, "risk_off_symbols")) or _symbols(
+        _text(params, "risk_off_symbol") or _text(params, "defensive_symbol") or "SGOV"
+    )
+    return (
+        _text(params, "score_csv_path"),
+        _text(params, "backtest_start") or _text(params, "start_date") or "2015-01-01",
+        _text(params, "backtest_end") or _text(params, "end_date") or "2025-12-31",
+        benchmark,
+        ",".join(defensive),
+        ",".join(_symbols(_text(params, "symbols"))),
+    )
+
+
+@dataclass
+class SweepData:
+    dates: pd.DatetimeIndex
+    start_index: int
+    symbols: List[str]
+    close: np.ndarray
+    returns: np.ndarray
+    benchmark: int
+    defensive: List[int]
+    eligible: np.ndarray
+    score_dates: List[pd.Timestamp]
+    scores: np.ndarray
+
+
+def _find_price_file(root: Path, symbol: str) -> Path | None:
+    matches = sorted(root.glob(f"*_{symbol}_Daily.csv")) or sorted(root.glob(f"*_{symbol}.csv"))
+    return matches[-1] if matches else None
+
+
+def _load_close(path: Path, price_store=None) -> pd.Series | None:
+    frame = price_store.read_frame(path) if price_store is not None else None
+    if frame is None:
+        try:
+            frame = pd.read_csv(path)
+        except (OSError, ValueError):
+            return None
+    frame.columns = [str(col).strip().lower() for col in frame.columns]
+    if "date" not in frame.columns or "close" not in frame.columns:
+        return None
+    dates = pd.to_datetime(frame["date"], errors="coerce").dt.normalize()
+    close = pd.Series(pd.to_numeric(frame["close"], errors="coerce").to_numpy(), index=dates)
+    close = close[close.index.notna()].dropna()
+    close = close[close > 0]
+    return close[~close.index.duplicated(keep="last")].sort_index()
+
+
+def load_sweep_data(
+    params: Dict[str, Any],
+    *,
+    data_root: Path | None = None,
+    price_store=None,
+) -> SweepData:
+    score_path, start_text, end_text, benchmark, defensive_text, universe_text = _data_key(params)
+    scores_frame = pd.read_csv(score_path, usecols=["date", "symbol", "score"])
+    scores_frame["symbol"] = scores_frame["symbol"].astype(str).str.strip().str.upper()
+    scores_frame["date"] = pd.to_datetime(scores_frame["date"], errors="coerce")
+    scores_frame["score"] = pd.to_numeric(scores_frame["score"], errors="coerce")
+    scores_frame = scores_frame.dropna()
+    defensive = defensive_text.split(",") if defensive_text else []
+    universe = universe_text.split(",") if universe_text else sorted(scores_frame["symbol"].unique())
+
+    price_root = (data_root or _resolve_data_root()) / "curated_adjusted"
+    series: Dict[str, pd.Series] = {}
+    for symbol in dict.fromkeys([benchmark, *defensive, *universe]):
+        path = _find_price_file(price_root, symbol)
+        close = _load_close(path, price_store) if path is not None else None
+        if close is not None and not close.empty:
+            series[symbol] = close
+    if benchmark not in series:
+        raise ValueError(f"benchmark prices missing: {benchmark}")
+
+    end = pd.Timestamp(end_text)
+    calendar = series[benchmark].index
+    calendar = calendar[calendar <= end]
+    symbols = list(series)
+    close = pd.DataFrame(series, columns=symbols).reindex(calendar)
+    filled = close.ffill().to_numpy(dtype=float)
+    returns = np.zeros_like(filled)
+    returns[1:] = filled[1:] / filled[:-1] - 1.0
+    returns[~np.isfinite(returns)] = 0.0
+
+    index = {symbol: idx for idx, symbol in enumerate(symbols)}
+    eligible = np.zeros(len(symbols), dtype=bool)
+    for symbol in universe:
+        if symbol in index and symbol != benchmark and symbol not in defensive:
+            eligible[index[symbol]] = True
+
+    pivot = (
+        scores_frame[scores_frame["symbol"].isin(index)]
+        .pivot_table(index="date", columns="symbol", values="score", aggfunc="last")
+        .reindex(columns=symbols)
+        .sort_index()
+    )
+    return SweepData(
+        dates=calendar,
+        start_index=int(calendar.searchsorted(pd.Timestamp(start_text))),
+        symbols=symbols,
+        close=filled,
+        returns=returns,
+        benchmark=index[benchmark],
+        defensive=[index[symbol] for symbol in defensive if symbol in index],
+        eligible=eligible,
+        score_dates=list(pivot.index),
+        scores=pivot.to_numpy(dtype=float),
+    )
+
+
+def _cap_and_normalize(weights: Dict[int, float], cap: float) -> Dict[int, float]:
+    capped: Dict[int, float] = {}
+    remaining = dict(weights)
+    for _ in range(len(remaining) + 1):
+        over = [key for key, weight in remaining.items() if weight > cap]
+        if not over:
+            break
+        for key in over:
+            capped[key] = cap
+            remaining.pop(key, None)
+        remainder = 1.0 - sum(capped.values())
+        if remainder <= 0 or not remaining:
+            remaining = {}
+            break
+        total = sum(remaining.values())
+        if total <= 0:
+            remaining = {}
+            break
+        for key in list(remaining):
+            remaining[key] = remaining[key] / total * remainder
+    merged = {**remaining, **capped}
+    total = sum(merged.values())
+    if total > 0:
+        merged = {key: weight / total for key, weight in merged.items()}
+    return merged
+
+
+class _Simulation:
+    def __init__(self, data: SweepData, rules: List[SweepRules]) -> None:
+        self.data = data
+        self.rules = rules
+        count = len(rules)
+        days = len(data.dates) - data.start_index
+        self.weights = np.zeros((count, len(data.symbols)))
+        self.equity = np.array([rule.initial_cash for rule in rules], dtype=float)
+        self.curve = np.zeros((max(days, 0), count))
+        self.peak = self.equity.copy()
+        self.dd_all = np.zeros(count)
+        self.dd_52w = np.zeros(count)
+        self.locked = np.zeros(count, dtype=bool)
+        self.max_dd = np.array([rule.max_drawdown for rule in rules])
+        self.max_dd_52w = np.array([rule.max_drawdown_52w for rule in rules])
+        self.recovery = np.array([rule.drawdown_recovery_ratio for rule in rules])
+        self.smoothed: List[np.ndarray | None] = [None] * count
+        self._defensive_pick: Dict[tuple[int, str, int], int | None] = {}
+        self._ranked: Dict[int, np.ndarray] = {}
+
+    # -- shared per-day views -------------------------------------------------------------
+
+    def _tradable(self, t: int, column: int) -> bool:
+        price = self.data.close[t, column]
+        return bool(np.isfinite(price) and price > 0)
+
+    def _pick_defensive(self, t: int, rule: SweepRules) -> int | None:
+        key = (t, rule.risk_off_pick, rule.risk_off_lookback_days)
+        if key in self._defensive_pick:
+            return self._defensive_pick[key]
+        columns = self.data.defensive
+        best = None
+        if len(columns) == 1:
+            best = columns[0]
+        elif columns:
+            window = self.data.close[max(0, t - rule.risk_off_lookback_days) : t + 1]
+            best_score = None
+            for column in columns:
+                closes = window[:, column]
+                closes = closes[np.isfinite(closes)]
+                if len(closes) < 2:
+                    continue
+                if rule.risk_off_pick == "lowest_vol":
+                    score = float(np.std(np.diff(closes) / closes[:-1], ddof=1)) if len(closes) > 2 else 0.0
+                    better = best_score is None or score < best_score
+                else:
+                    score = float(closes[-1] / closes[0] - 1.0)
+                    better = best_score is None or score > best_score
+                if better:
+                    best, best_score = column, score
+            if best is None:
+                best = next((column for column in columns if self._tradable(t, column)), columns[0])
+        self._defensive_pick[key] = best
+        return best
+
+    def _ranked_columns(self, row: int, scores: np.ndarray) -> np.ndarray:
+        if row >= 0 and row in self._ranked:
+            return self._ranked[row]
+        valid = np.flatnonzero(np.isfinite(scores))
+        ranked = valid[np.argsort(-scores[valid], kind="stable")]
+        if row >= 0:
+            self._ranked[row] = ranked
+        return ranked
+
+    def _vol_scale(self, t: int, rule: SweepRules) -> float:
+        if rule.vol_target <= 0:
+            return 1.0
+        closes = self.data.close[max(0, t - rule.vol_window) : t + 1, self.data.benchmark]
+        closes = closes[np.isfinite(closes)]
+        if len(closes) < 3:
+            return 1.0
+        vol = float(np.std(np.diff(closes) / closes[:-1], ddof=1)) * math.sqrt(TRADING_DAYS)
+        if vol <= 0:
+            return 1.0
+        return max(min(rule.vol_target / vol, 1.0), 0.0)
+
+    def _market_filter_hit(self, t: int, rule: SweepRules) -> bool | None:
+        """True below the SMA, False above it, None while the SMA is not ready."""
+        if t + 1 < rule.market_ma_window:
+            return None
+        closes = self.data.close[t + 1 - rule.market_ma_window : t + 1, self.data.benchmark]
+        return bool(closes[-1] < float(np.nanmean(closes)))
+
+    # -- per-candidate portfolio actions ---------------------------------------------------
+
+    def _exposure_cap(self, i: int) -> float:
+        rule = self.rules[i]
+        cap = rule.max_exposure
+        current = max(self.dd_all[i], self.dd_52w[i])
+        limit = None
+        for threshold, exposure in rule.drawdown_tiers:
+            if current >= threshold:
+                limit = exposure
+            else:
+                break
+        if limit is not None:
+            cap = min(cap, limit)
+            if rule.drawdown_exposure_floor > 0 and cap < rule.drawdown_exposure_floor:
+                cap = min(rule.drawdown_exposure_floor, rule.max_exposure)
+        return max(cap, 0.0)
+
+    def _trade(self, i: int, target: np.ndarray) -> None:
+        traded = float(np.abs(target - self.weights[i]).sum())
+        self.weights[i] = target
+        if traded > 0 and self.rules[i].fee_bps > 0:
+            self.equity[i] *= 1.0 - traded * self.rules[i].fee_bps / 10000.0
+
+    def _risk_off(self, i: int, t: int) -> None:
+        rule = self.rules[i]
+        exposure = min(self._exposure_cap(i), 1.0)
+        column = None
+        if exposure > 0 and rule.risk_off_mode == "benchmark":
+            column = self.data.benchmark
+        elif exposure > 0 and rule.risk_off_mode in ("defensive", "bond", "safe"):
+            column = self._pick_defensive(t, rule)
+            if column is not None and not self._tradable(t, column):
+                column = None
+        if column is None:
+            self._trade(i, np.zeros_like(self.weights[i]))
+            return
+        # set_holdings(symbol, exposure) only resizes that symbol; other holdings stay.
+        target = self.weights[i].copy()
+        target[column] = exposure
+        self._trade(i, target)
+
+    def _scores_for(self, i: int, t: int) -> tuple[int, np.ndarray] | None:
+        rule = self.rules[i]
+        target = self.data.dates[t] - pd.Timedelta(days=rule.score_delay_days)
+        row = bisect_right(self.data.score_dates, target) - 1
+        if row < 0:
+            return None
+        scores = self.data.scores[row]
+        if not np.isfinite(scores).any():
+            return None
+        if rule.score_smoothing_alpha <= 0:
+            return row, scores
+        alpha = rule.score_smoothing_alpha
+        previous = self.smoothed[i]
+        present = np.isfinite(scores)
+        prev = scores if previous is None else np.where(np.isfinite(previous), previous, scores)
+        updated = np.where(present, alpha * scores + (1 - alpha) * prev, np.nan)
+        if rule.score_smoothing_carry and previous is not None:
+            updated = np.where(present, updated, previous)
+        self.smoothed[i] = updated
+        return -1, updated
+
+    def _rebalance(self, i: int, t: int) -> None:
+        """Rebalance on trading day ``t`` using prices up to the previous close."""
+        rule = self.rules[i]
+        if self.locked[i]:
+            return
+        prev = t - 1
+        if rule.market_filter:
+            hit = self._market_filter_hit(prev, rule)
+            if hit is None:
+                return
+            if hit:
+                self._risk_off(i, prev)
+                return
+        resolved = self._scores_for(i, t)
+        if resolved is None:
+            return
+        row, scores = resolved
+        ranked = self._ranked_columns(row, scores)
+        limit = max(rule.top_n, 1)
+        selected: List[int] = []
+        if rule.retain_top_n > 0:
+            buffer = set(ranked[: max(rule.top_n + rule.retain_top_n, rule.top_n)].tolist())
+            for column in np.flatnonzero(self.data.eligible & (self.weights[i] != 0)):
+                if int(column) in buffer:
+                    selected.append(int(column))
+                    if len(selected) >= limit:
+                        break
+        for column in ranked.tolist():
+            if len(selected) >= limit:
+                break
+            if column in selected or not self.data.eligible[column]:
+                continue
+            if rule.min_score is not None and scores[column] < rule.min_score:
+                continue
+            selected.append(column)
+        selected = [column for column in selected if self._tradable(prev, column)]
+        if not selected:
+            return
+
+        if rule.weighting == "score":
+            floor = rule.min_score if rule.min_score is not None else 0.0
+            raw = [max(float(np.nan_to_num(scores[column])) - floor, 0.0) for column in selected]
+            total = sum(raw)
+            weights = (
+                {column: raw[idx] / total for idx, column in enumerate(selected)}
+                if total > 0
+                else {column: 1.0 / len(selected) for column in selected}
+            )
+        else:
+            weights = {column: 1.0 / len(selected) for column in selected}
+        if rule.max_weight and rule.max_weight > 0:
+            weights = _cap_and_normalize(weights, float(rule.max_weight))
+        if rule.max_exposure < 1.0:
+            weights = {column: weight * rule.max_exposure for column, weight in weights.items()}
+
+        vol_scale = self._vol_scale(prev, rule)
+        exposure_cap = self._exposure_cap(i)
+        if exposure_cap <= 0:
+            self._risk_off(i, prev)
+            return
+        if rule.dynamic_exposure:
+            exposure_cap = min(exposure_cap, rule.max_exposure * vol_scale)
+        elif vol_scale < 1.0:
+            weights = {column: weight * vol_scale for column, weight in weights.items()}
+        exposure = sum(weights.values())
+        if exposure > 0 and exposure_cap < exposure:
+            weights = {column: weight * exposure_cap / exposure for column, weight in weights.items()}
+
+        if rule.max_turnover_week > 0:
+            current = {
+                int(column): float(self.weights[i, column])
+                for column in np.flatnonzero(self.data.eligible & (self.weights[i] != 0))
+            }
+            keys = set(current) | set(weights)
+            turnover = 0.5 * sum(abs(weights.get(key, 0.0) - current.get(key, 0.0)) for key in keys)
+            if turnover > rule.max_turnover_week:
+                scale = rule.max_turnover_week / turnover
+                blended = {
+                    key: current.get(key, 0.0) + (weights.get(key, 0.0) - current.get(key, 0.0)) * scale
+                    for key in keys
+                }
+                weights = {key: weight for key, weight in blended.items() if weight != 0.0}
+        if not weights:
+            return
+        target = np.zeros_like(self.weights[i])
+        for column, weight in weights.items():
+            target[column] = weight
+        self._trade(i, target)
+
+    # -- daily loop -------------------------------------------------------------------------
+
+    def _is_rebalance_day(self, t: int, rule: SweepRules) -> bool:
+        day = self.data.dates[t]
+        if rule.rebalance_frequency == "weekly":
+            return day.weekday() == rule.rebalance_day
+        if rule.rebalance_frequency == "monthly":
+            return t == 0 or self.data.dates[t - 1].month != day.month
+        return True
+
+    def _guard(self, t: int) -> None:
+        trigger = ((self.max_dd > 0) & (self.dd_all >= self.max_dd)) | (
+            (self.max_dd_52w > 0) & (self.dd_52w >= self.max_dd_52w)
+        )
+        recovered = ((self.max_dd <= 0) | (self.dd_all <= self.max_dd * self.recovery)) & (
+            (self.max_dd_52w <= 0) | (self.dd_52w <= self.max_dd_52w * self.recovery)
+        )
+        self.locked &= ~recovered
+        trigger |= self.locked
+        self.locked |= trigger
+        for i in np.flatnonzero(trigger):
+            self._risk_off(int(i), t)
+
+    def run(self) -> np.ndarray:
+        data = self.data
+        for step, t in enumerate(range(data.start_index, len(data.dates))):
+            # Scheduled rebalances trade on the previous close, before today's bar.
+            for i, rule in enumerate(self.rules):
+                if t > 0 and self._is_rebalance_day(t, rule):
+                    self._rebalance(i, t)
+            growth = self.weights @ data.returns[t]
+            gross = 1.0 + growth
+            safe = np.where(gross > 0, gross, 1.0)
+            self.weights *= (1.0 + data.returns[t])[None, :] / safe[:, None]
+            self.equity *= gross
+            self.curve[step] = self.equity
+            self.peak = np.maximum(self.peak, self.equity)
+            positive = self.equity > 0
+            self.dd_all = np.where(positive, np.maximum(0.0, 1.0 - self.equity / self.peak), self.dd_all)
+            peak_52w = self.curve[max(0, step - TRADING_DAYS + 1) : step + 1].max(axis=0)
+            self.dd_52w = np.where(positive, np.maximum(0.0, 1.0 - self.equity / peak_52w), self.dd_52w)
+            self._guard(t)
+            self.curve[step] = self.equity
+        return self.curve
+
+
+def _curve_stats(curve: np.ndarray, initial: float, years: float) -> Dict[str, float]:
+    if len(curve) == 0 or initial <= 0:
+        return {"cagr": 0.0, "dd": 0.0, "sharpe": 0.0, "sortino": 0.0}
+    final = float(curve[-1])
+    cagr = (final / initial) ** (1.0 / years) - 1.0 if years > 0 and final > 0 else -1.0
+    series = np.concatenate([[initial], curve])
+    drawdown = 1.0 - series / np.maximum.accumulate(series)
+    daily = series[1:] / series[:-1] - 1.0
+    std = float(np.std(daily, ddof=1)) if len(daily) > 1 else 0.0
+    downside = daily[daily < 0]
+    down_std = float(np.sqrt(np.mean(downside**2))) if len(downside) else 0.0
+    mean = float(np.mean(daily)) if len(daily) else 0.0
+    return {
+        "cagr": float(cagr),
+        "dd": float(drawdown.max()),
+        "sharpe": mean / std * math.sqrt(TRADING_DAYS) if std > 0 else 0.0,
+        "sortino": mean / down_std * math.sqrt(TRADING_DAYS) if down_std > 0 else 0.0,
+    }
+
+
+def simulate_candidates(data: SweepData, candidates: Iterable[Dict[str, Any]]) -> List[Dict[str, float]]:
+    """Simulate algorithm parameter sets over shared data; stats keyed like parse_summary."""
+    rules = [parse_rules(params) for params in candidates]
+    if not rules:
+        return []
+    curve = _Simulation(data, rules).run()
+    if len(curve):
+        years = (data.dates[-1] - data.dates[data.start_index]).days / 365.25
+    else:
+        years = 0.0
+    return [_curve_stats(curve[:, idx], rule.initial_cash, years) for idx, rule in enumerate(rules)]
+
+
+def screen_sweep_candidates(
+    candidates: List[Dict[str, Any]],
+    algorithm_parameters: Callable[[Dict[str, Any]], Dict[str, Any]],
+    *,
+    data_root: Path | None = None,
+    price_store=None,
+) -> List[Dict[str, float]]:
+    """Simulated stats for every candidate, in input order.
+
+    ``algorithm_parameters`` maps a candidate to the full algorithm parameters its backtest
+    would be submitted with; candidates sharing scores/window/benchmark share one load.
+    """
+    groups: Dict[tuple[str, ...], List[int]] = {}
+    resolved = [algorithm_parameters(item) for item in candidates]
+    for idx, params in enumerate(resolved):
+        groups.setdefault(_data_key(params), []).append(idx)
+    stats: List[Dict[str, float]] = [{} for _ in candidates]
+    for indices in groups.values():
+        data = load_sweep_data(resolved[indices[0]], data_root=data_root, price_store=price_store)
+        for idx, item in zip(indices, simulate_candidates(data, [resolved[idx] for idx in indices])):
+            stats[idx] = item
+    return stats
+
+
+def _rank(
+    candidates: List[Dict[str, Any]], stats: List[Dict[str, float]], *, top_k: int, max_dd: float
+) -> List[tuple[Dict[str, Any], Dict[str, float]]]:
+    ranked = [row for row in zip(candidates, stats) if is_acceptable(row[1], max_dd=max_dd)]
+    ranked.sort(key=lambda row: row[1]["cagr"], reverse=True)
+    return ranked[: max(int(top_k), 0)]
+
+
+def select_sweep_candidates(
+    candidates: List[Dict[str, Any]],
+    algorithm_parameters: Callable[[Dict[str, Any]], Dict[str, Any]],
+    *,
+    top_k: int,
+    max_dd: float = 0.15,
+    data_root: Path | None = None,
+    price_store=None,
+) -> List[tuple[Dict[str, Any], Dict[str, float]]]:
+    """Screen ``candidates`` in-process and return the ``top_k`` by CAGR within ``max_dd``."""
+    stats = screen_sweep_candidates(
+        candidates, algorithm_parameters, data_root=data_root, price_store=price_store
+    )
+    return _rank(candidates, stats, top_k=top_k, max_dd=max_dd)
+
+
+def add_sweep_arguments(parser: argparse.ArgumentParser) -> None:
+    """``--sweep-top-k`` / ``--max-dd`` shared by the opt scripts."""
+    parser.add_argument(
+        "--sweep-top-k",
+        type=int,
+        default=0,
+        help="先在进程内批量模拟全部候选，仅提交 CAGR 前K条做 Lean 验证，0为关闭",
+    )
+    parser.add_argument("--max-dd", type=float, default=0.15, help="批量模拟筛选的回撤上限")
+
+
+def promote_sweep_candidates(
+    candidates: List[Dict[str, Any]],
+    algorithm_parameters: Callable[[Dict[str, Any]], Dict[str, Any]],
+    args: argparse.Namespace,
+    *,
+    manifest: Path,
+    data_root: Path | None = None,
+    price_store=None,
+) -> List[Dict[str, Any]]:
+    """Candidates to submit to Lean: all of them, or the screened top ``--sweep-top-k``.
+
+    Pass candidates already filtered against the manifest so reruns do not spend slots on
+    submitted ones. Every screened candidate is appended to ``manifest`` as
+    ``{"sweep": stats, "promoted": bool, "params": candidate}``; the rows carry no run id,
+    so ``score_manifest`` and the scripts' resume logic skip them.
+    """
+    top_k = int(getattr(args, "sweep_top_k", 0) or 0)
+    if top_k <= 0 or not candidates:
+        return candidates
+    stats = screen_sweep_candidates(
+        candidates, algorithm_parameters, data_root=data_root, price_store=price_store
+    )
+    promoted = _rank(candidates, stats, top_k=top_k, max_dd=float(args.max_dd))
+    promoted_ids = {id(item) for item, _ in promoted}
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    with manifest.open("a", encoding="utf-8") as handle:
+        for item, item_stats in zip(candidates, stats):
+            row = {"sweep": item_stats, "promoted": id(item) in promoted_ids, "params": item}
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+    for item, item_stats in promoted:
+        print(f"sweep cagr={item_stats['cagr']:.4f} dd={item_stats['dd']:.4f} -> {item}")
+    return [item for item, _ in promoted]
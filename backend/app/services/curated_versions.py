@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+
+# Versioned history of a curated series under `curated_versions/{id}_{name}/`.
+#
+# Each sync records one version. A version is either a full checkpoint (`{version}.csv`,
+# the same layout older releases wrote on every sync) or an append-only delta
+# (`{version}.delta`) meaning "keep the first `keep_bytes` of the previous version and
+# append these bytes". Curated files only grow at the tail (or have their last bar
+# revised), so a delta costs about as much as the bars a sync added. `manifest.json` lists
+# the versions in order with the size and sha256 of each reconstructed version.
+#
+# Retention is opt-in: pruned versions cannot be recovered, so nothing is deleted unless
+# `config/curated_versions.json` sets `max_versions` or `max_age_days`.
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+DELTA_SUFFIX = ".delta"
+CHECKPOINT_SUFFIX = ".csv"
+
+DEFAULT_CURATED_VERSIONS = {
+    "checkpoint_interval": 30,
+    "max_versions": 0,
+    "max_age_days": 0,
+}
+
+_MANIFEST_LOCK = threading.Lock()
+_LOG = logging.getLogger(__name__)
+
+
+def _resolve_data_root() -> Path:
+    if settings.data_root:
+        return Path(settings.data_root)
+    env_root = os.getenv("DATA_ROOT")
+    if env_root:
+        return Path(env_root)
+    return Path("/data/share/stock/data")
+
+
+def curated_versions_config_path(data_root: Path | None = None) -> Path:
+    root = data_root or _resolve_data_root()
+    return root / "config" / "curated_versions.json"
+
+
+def _coerce_int(value: Any, default: int) -> int:
+    try:
+        num = int(value)
+    except (TypeError, ValueError):
+        return default
+    return num if num >= 0 else default
+
+
+def load_curated_versions_config(data_root: Path | None = None) -> dict[str, Any]:
+    """Load checkpoint/retention settings; ``0`` disables a retention limit."""
+    path = curated_versions_config_path(data_root)
+    config = dict(DEFAULT_CURATED_VERSIONS)
+    if path.exists():
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            payload = None
+        if isinstance(payload, dict):
+            for key, default in DEFAULT_CURATED_VERSIONS.items():
+                config[key] = _coerce_int(payload.get(key), default)
+    config["checkpoint_interval"] = max(int(config["checkpoint_interval"]), 1)
+    return config
+
+
+def _sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _tail_offset(content: bytes) -> int:
+    """Byte offset where the last line starts (the bar a later sync may revise)."""
+    body = content[:-1] if content.endswith(b"\n") else content
+    return body.rfind(b"\n") + 1
+
+
+def _manifest_path(version_dir: Path) -> Path:
+    return version_dir / MANIFEST_NAME
+
+
+def _write_manifest(version_dir: Path, manifest: dict[str, Any]) -> None:
+    path = _manifest_path(version_dir)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _legacy_entries(version_dir: Path) -> list[dict[str, Any]]:
+    # Directories written before the manifest existed only hold full `{stamp}.csv` copies;
+    # adopt them as checkpoints so they stay readable and fall under retention.
+    entries = []
+    for path in sorted(version_dir.glob(f"*{CHECKPOINT_SUFFIX}")):
+        stat = path.stat()
+        entries.append(
+            {
+                "version": path.stem,
+                "kind": "full",
+                "file": path.name,
+                "size": stat.st_size,
+                "sha256": None,
+                "created_at": datetime.utcfromtimestamp(stat.st_mtime).isoformat(),
+            }
+        )
+    return entries
+
+
+def _load_manifest(version_dir: Path) -> dict[str, Any]:
+    path = _manifest_path(version_dir)
+    if path.exists():
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            payload = None
+        if isinstance(payload, dict) and isinstance(payload.get("entries"), list):
+            return payload
+    return {"version": MANIFEST_VERSION, "entries": _legacy_entries(version_dir)}
+
+
+def list_curated_versions(version_dir: Path) -> list[dict[str, Any]]:
+    if not version_dir.exists():
+        return []
+    entries = _load_manifest(version_dir)["entries"]
+    return [
+        {
+            "version": entry["version"],
+            "kind": entry["kind"],
+            "created_at": entry.get("created_at"),
+            "size": entry.get("size"),
+            "stored_bytes": _stored_bytes(version_dir, entry),
+            "sha256": entry.get("sha256"),
+        }
+        for entry in entries
+    ]
+
+
+def _stored_bytes(version_dir: Path, entry: dict[str, Any]) -> int | None:
+    path = version_dir / entry["file"]
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def _reconstruct(version_dir: Path, entries: list[dict[str, Any]], index: int) -> bytes:
+    start = index
+    while start >= 0 and entries[start]["kind"] != "full":
+        start -= 1
+    if start < 0:
+        raise ValueError("curated version has no checkpoint")
+    content = (version_dir / entries[start]["file"]).read_bytes()
+    for entry in entries[start + 1 : index + 1]:
+        delta = (version_dir / entry["file"]).read_bytes()
+        content = content[: int(entry["keep_bytes"])] + delta
+    expected = entries[index].get("sha256")
+    if expected and _sha256(content) != expected:
+        raise ValueError(f"curated version checksum mismatch: {entries[index]['version']}")
+    return content
+
+
+def reconstruct_curated_version(version_dir: Path, version: str) -> bytes:
+    """Return the curated CSV bytes exactly as they were when ``version`` was recorded."""
+    entries = _load_manifest(version_dir)["entries"]
+    for index, entry in enumerate(entries):
+        if entry["version"] == version:
+            return _reconstruct(version_dir, entries, index)
+    raise KeyError(version)
+
+
+def _next_version_id(entries: list[dict[str, Any]], now: datetime) -> str:
+    stamp = now.strftime("%Y%m%dT%H%M%S")
+    existing = {entry["version"] for entry in entries}
+    version = stamp
+    suffix = 1
+    while version in existing:
+        version = f"{stamp}_{suffix}"
+        suffix += 1
+    return version
+
+
+def _delta_keep_bytes(
+    version_dir: Path, entries: list[dict[str, Any]], content: bytes, interval: int
+) -> int | None:
+    if not entries:
+        return None
+    latest = entries[-1]
+    if not latest.get("sha256"):
+        # Legacy checkpoint: hash it once so the next version can be a delta against it.
+        try:
+            previous = (version_dir / latest["file"]).read_bytes()
+        except OSError:
+            return None
+        latest["sha256"] = _sha256(previous)
+        latest["tail_offset"] = _tail_offset(previous)
+        latest["tail_prefix_sha256"] = _sha256(previous[: latest["tail_offset"]])
+    deltas = 0
+    for entry in reversed(entries):
+        if entry["kind"] == "full":
+            break
+        deltas += 1
+    if deltas + 1 >= interval:
+        return None
+    size = int(latest.get("size") or 0)
+    if len(content) >= size and _sha256(content[:size]) == latest["sha256"]:
+        return size
+    offset = latest.get("tail_offset")
+    if offset is not None and _sha256(content[: int(offset)]) == latest.get("tail_prefix_sha256"):
+        return int(offset)
+    return None
+
+
+def _materialize(version_dir: Path, entries: list[dict[str, Any]], index: int) -> None:
+    entry = entries[index]
+    if entry["kind"] == "full":
+        return
+    content = _reconstruct(version_dir, entries, index)
+    path = version_dir / f"{entry['version']}{CHECKPOINT_SUFFIX}"
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(content)
+    tmp_path.replace(path)
+    (version_dir / entry["file"]).unlink(missing_ok=True)
+    entry["kind"] = "full"
+    entry["file"] = path.name
+    entry.pop("keep_bytes", None)
+
+
+def _prune(
+    version_dir: Path, entries: list[dict[str, Any]], config: dict[str, Any], now: datetime
+) -> list[dict[str, Any]]:
+    cut = 0
+    max_versions = int(config.get("max_versions") or 0)
+    if max_versions and len(entries) > max_versions:
+        cut = len(entries) - max_versions
+    max_age_days = int(config.get("max_age_days") or 0)
+    if max_age_days:
+        threshold = (now - timedelta(days=max_age_days)).isoformat()
+        while cut < len(entries) - 1 and str(entries[cut].get("created_at") or "") < threshold:
+            cut += 1
+    if cut <= 0:
+        return entries
+    _LOG.info(
+        "curated_versions prune dir=%s versions=%s max_versions=%s max_age_days=%s",
+        version_dir,
+        ",".join(str(entry.get("version")) for entry in entries[:cut]),
+        max_versions,
+        max_age_days,
+    )
+    # The oldest surviving version must not depend on pruned files.
+    _materialize(version_dir, entries, cut)
+    for entry in entries[:cut]:
+        (version_dir / entry["file"]).unlink(missing_ok=True)
+    return entries[cut:]
+
+
+def record_curated_version(
+    version_dir: Path,
+    content: bytes,
+    config: dict[str, Any] | None = None,
+    now: datetime | None = None,
+) -> Path | None:
+    """Record ``content`` as the newest version and apply retention.
+
+    Returns the file holding the new version (a checkpoint or a delta).
+    """
+    if not content:
+        return None
+    config = config or load_curated_versions_config()
+    now = now or datetime.utcnow()
+    with _MANIFEST_LOCK:
+        version_dir.mkdir(parents=True, exist_ok=True)
+        manifest = _load_manifest(version_dir)
+        entries: list[dict[str, Any]] = manifest["entries"]
+        version = _next_version_id(entries, now)
+        keep_bytes = _delta_keep_bytes(
+            version_dir, entries, content, int(config["checkpoint_interval"])
+        )
+        tail_offset = _tail_offset(content)
+        entry: dict[str, Any] = {
+            "version": version,
+            "size": len(content),
+            "sha256": _sha256(content),
+            "tail_offset": tail_offset,
+            "tail_prefix_sha256": _sha256(content[:tail_offset]),
+            "created_at": now.isoformat(),
+        }
+        if keep_bytes is None:
+            entry.update({"kind": "full", "file": f"{version}{CHECKPOINT_SUFFIX}"})
+            payload = content
+        else:
+            entry.update(
+                {"kind": "delta", "file": f"{version}{DELTA_SUFFIX}", "keep_bytes": keep_bytes}
+            )
+            payload = content[keep_bytes:]
+        path = version_dir / entry["file"]
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(payload)
+        tmp_path.replace(path)
+        entries.append(entry)
+        manifest["version"] = MANIFEST_VERSION
+        manifest["entries"] = _prune(version_dir, entries, config, now)
+        _write_manifest(version_dir, manifest)
+    return version_dir / entry["file"]
@@ -4,7 +4,7 @@ import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Iterable
 from zoneinfo import ZoneInfo
 
 from app.models import TradeOrder
@@ -16,6 +16,7 @@ from app.services.ib_read_session import (
     resolve_ib_transient_client_id,
 )
 from app.services.lean_execution import apply_execution_events
+from app.services.trade_order_tags import resolve_order_ids_by_tags
 from app.services.trade_orders import update_trade_order_status
 
 
@@ -207,20 +208,36 @@ def _collect_candidate_orders(
     limit: int,
     lookback_hours: int,
     statuses: tuple[str, ...] = _CANDIDATE_STATUSES,
+    orders: Iterable[TradeOrder] | None = None,
 ) -> list[_CandidateOrder]:
     hours = max(1, int(lookback_hours))
     window_start = (datetime.utcnow() - timedelta(hours=hours)).replace(tzinfo=None)
-    rows = (
-        session.query(TradeOrder)
-        .filter(
-            TradeOrder.updated_at >= window_start,
-            TradeOrder.status.in_(tuple(statuses)),
-            TradeOrder.ib_order_id.isnot(None),
+    if orders is not None:
+        # Same window/status/ordering as the query below, applied to rows the caller already holds.
+        rows = sorted(
+            (
+                order
+                for order in orders
+                if order.updated_at is not None
+                and order.updated_at >= window_start
+                and order.status in statuses
+                and order.ib_order_id is not None
+            ),
+            key=lambda order: (order.updated_at, order.id),
+            reverse=True,
+        )[: max(1, int(limit))]
+    else:
+        rows = (
+            session.query(TradeOrder)
+            .filter(
+                TradeOrder.updated_at >= window_start,
+                TradeOrder.status.in_(tuple(statuses)),
+                TradeOrder.ib_order_id.isnot(None),
+            )
+            .order_by(TradeOrder.updated_at.desc(), TradeOrder.id.desc())
+            .limit(max(1, int(limit)))
+            .all()
         )
-        .order_by(TradeOrder.updated_at.desc(), TradeOrder.id.desc())
-        .limit(max(1, int(limit)))
-        .all()
-    )
     candidates: list[_CandidateOrder] = []
     for order in rows:
         side = _normalize_side(order.side)
@@ -526,6 +543,23 @@ def _terminalize_candidates_from_completed_orders(
         if int(row.order_id or 0) > 0:
             by_order_id.setdefault(int(row.order_id), []).append(row)
 
+    # Rows whose orderRef is one of the order's other tags, or whose permId is known,
+    # resolve to the local order through trade_order_tags.
+    by_local_id: dict[int, list[_IBCompletedOrderRow]] = {}
+    by_perm: dict[str, list[_IBCompletedOrderRow]] = {}
+    for row in completed_rows:
+        if int(row.perm_id or 0) > 0:
+            by_perm.setdefault(str(int(row.perm_id)), []).append(row)
+    resolved_tags = resolve_order_ids_by_tags(session, list(by_tag) + list(by_perm))
+    for tag, rows in by_tag.items():
+        for kind, local_id in resolved_tags.get(tag, {}).items():
+            if kind != "perm":
+                by_local_id.setdefault(local_id, []).extend(rows)
+    for perm_key, rows in by_perm.items():
+        local_id = resolved_tags.get(perm_key, {}).get("perm")
+        if local_id is not None:
+            by_local_id.setdefault(local_id, []).extend(rows)
+
     active_statuses = set(_COMPLETED_CANDIDATE_STATUSES)
     for candidate in candidates:
         matches: list[_IBCompletedOrderRow] = []
@@ -533,6 +567,7 @@ def _terminalize_candidates_from_completed_orders(
             matches.extend(by_tag[candidate.tag])
         if candidate.ib_order_id in by_order_id:
             matches.extend(by_order_id[candidate.ib_order_id])
+        matches.extend(by_local_id.get(candidate.order_id, []))
         if not matches:
             continue
 
@@ -620,6 +655,7 @@ def reconcile_orders_with_ib_completed_status(
     open_tags: set[str] | None = None,
     missing_min_age_seconds: int = 0,
     leader_submitted_only: bool = False,
+    orders: Iterable[TradeOrder] | None = None,
 ) -> dict[str, int]:
     summary = {
         "candidates": 0,
@@ -638,6 +674,7 @@ def reconcile_orders_with_ib_completed_status(
         limit=limit,
         lookback_hours=lookback_hours,
         statuses=_COMPLETED_CANDIDATE_STATUSES,
+        orders=orders,
     )
     if run_id is not None:
         try:
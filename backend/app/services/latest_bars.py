@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Iterable
+
+# Latest-bar index of a curated folder. `series_index/latest_bars/{folder}.jsonl` is an
+# append-only journal of `{name, date, close, volume, size, mtime_ns}` entries, one per
+# refreshed `{id}_{name}_Daily.csv`; the last line for a file wins. Data sync appends an
+# entry after every write, so the trade fallback valuation reads one small file instead
+# of globbing the folder and parsing every CSV per symbol. Entries are pinned to the CSV
+# size/mtime and re-read from the CSV tail when they no longer match, so the CSVs stay the
+# source of truth.
+
+LATEST_BARS_DIRNAME = "latest_bars"
+LATEST_BARS_VERSION = 1
+_TAIL_BYTES = 8192
+_FILE_SUFFIX = "_Daily.csv"
+
+
+@dataclass
+class LatestBar:
+    name: str
+    date: str | None
+    close: float | None
+    volume: float | None
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class _FolderIndex:
+    journal_stamp: tuple[int, int] | None
+    dir_mtime_ns: int
+    entries: dict[str, LatestBar]
+    lookup: dict[str, str]
+
+
+_CACHE: dict[str, _FolderIndex] = {}
+_CACHE_LOCK = Lock()
+
+
+def latest_bars_path(folder: Path) -> Path:
+    folder = Path(folder)
+    return folder.parent / "series_index" / LATEST_BARS_DIRNAME / f"{folder.name}.jsonl"
+
+
+def normalize_symbol(symbol: str) -> str:
+    cleaned = re.sub(r"[^A-Z0-9]+", "_", str(symbol or "").strip().upper())
+    return cleaned.strip("_")
+
+
+def _symbol_keys(name: str) -> list[str]:
+    """Every symbol whose `*_{symbol}_Daily.csv` glob matches ``name``."""
+    if not name.endswith(_FILE_SUFFIX):
+        return []
+    parts = name[: -len(_FILE_SUFFIX)].split("_")
+    return ["_".join(parts[idx:]).upper() for idx in range(1, len(parts))]
+
+
+def _parse_number(value: str | None) -> float | None:
+    if value is None or not str(value).strip():
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def read_latest_bar(path: Path) -> LatestBar | None:
+    """Read the last data row of a curated CSV from its tail."""
+    try:
+        stat = path.stat()
+        with path.open("rb") as handle:
+            header_line = handle.readline()
+            header_end = handle.tell()
+            start = max(header_end, stat.st_size - _TAIL_BYTES)
+            handle.seek(start)
+            lines = handle.read().split(b"\n")
+            if start > header_end:
+                lines = lines[1:]
+            if not any(line.strip() for line in lines) and start > header_end:
+                handle.seek(header_end)
+                lines = handle.read().split(b"\n")
+    except OSError:
+        return None
+    fieldnames = next(csv.reader([header_line.decode("utf-8-sig", errors="ignore").rstrip("\r\n")]), [])
+    row: dict[str, str] = {}
+    for raw in reversed(lines):
+        text = raw.decode("utf-8", errors="ignore").rstrip("\r")
+        if text.strip():
+            values = next(csv.reader([text]), [])
+            row = {name: values[idx] for idx, name in enumerate(fieldnames) if idx < len(values)}
+            break
+    return LatestBar(
+        name=path.name,
+        date=(row.get("date") or "").strip() or None,
+        close=_parse_number(row.get("close")),
+        volume=_parse_number(row.get("volume")),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+    )
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _read_journal(path: Path) -> tuple[dict[str, LatestBar], int]:
+    entries: dict[str, LatestBar] = {}
+    lines = 0
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                lines += 1
+                try:
+                    payload = json.loads(line)
+                except ValueError:
+                    continue
+                if payload.get("version") != LATEST_BARS_VERSION:
+                    continue
+                try:
+                    bar = LatestBar(
+                        name=str(payload["name"]),
+                        date=payload.get("date"),
+                        close=payload.get("close"),
+                        volume=payload.get("volume"),
+                        size=int(payload["size"]),
+                        mtime_ns=int(payload["mtime_ns"]),
+                    )
+                except (KeyError, TypeError, ValueError):
+                    continue
+                entries[bar.name] = bar
+    except OSError:
+        return {}, 0
+    return entries, lines
+
+
+def _encode(bar: LatestBar) -> str:
+    return json.dumps({"version": LATEST_BARS_VERSION, **asdict(bar)}, ensure_ascii=False) + "\n"
+
+
+def _append_journal(path: Path, bars: Iterable[LatestBar]) -> None:
+    payload = "".join(_encode(bar) for bar in bars)
+    if not payload:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(payload)
+
+
+def _write_journal(path: Path, entries: dict[str, LatestBar]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text("".join(_encode(entries[name]) for name in sorted(entries)), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _build_lookup(entries: dict[str, LatestBar]) -> dict[str, str]:
+    # The glob fallback picked the lexically last matching file; keep that choice.
+    lookup: dict[str, str] = {}
+    for name in sorted(entries):
+        for key in _symbol_keys(name):
+            lookup[key] = name
+    return lookup
+
+
+def _sync_folder(folder: Path, entries: dict[str, LatestBar]) -> list[LatestBar]:
+    """Add files the journal has not seen yet and drop the ones that are gone."""
+    with os.scandir(folder) as scan:
+        names = {entry.name for entry in scan if entry.name.endswith(_FILE_SUFFIX) and entry.is_file()}
+    for name in set(entries) - names:
+        del entries[name]
+    added: list[LatestBar] = []
+    for name in sorted(names - set(entries)):
+        bar = read_latest_bar(folder / name)
+        if bar is not None:
+            entries[name] = bar
+            added.append(bar)
+    return added
+
+
+def _load_folder(folder: Path) -> _FolderIndex | None:
+    try:
+        dir_mtime_ns = folder.stat().st_mtime_ns
+    except OSError:
+        return None
+    journal = latest_bars_path(folder)
+    key = str(folder)
+    stamp = _stamp(journal)
+    cached = _CACHE.get(key)
+    if cached and cached.journal_stamp == stamp and cached.dir_mtime_ns == dir_mtime_ns:
+        return cached
+    entries, lines = _read_journal(journal) if stamp else ({}, 0)
+    added = _sync_folder(folder, entries)
+    try:
+        if stamp is None or lines > 2 * max(len(entries), 1):
+            _write_journal(journal, entries)
+        elif added:
+            _append_journal(journal, added)
+    except OSError:
+        pass
+    index = _FolderIndex(
+        journal_stamp=_stamp(journal),
+        dir_mtime_ns=dir_mtime_ns,
+        entries=entries,
+        lookup=_build_lookup(entries),
+    )
+    _CACHE[key] = index
+    return index
+
+
+def _fresh_bar(folder: Path, index: _FolderIndex, name: str) -> LatestBar | None:
+    bar = index.entries.get(name)
+    if bar is None:
+        return None
+    stamp = _stamp(folder / name)
+    if stamp == (bar.size, bar.mtime_ns):
+        return bar
+    refreshed = read_latest_bar(folder / name) if stamp else None
+    if refreshed is None:
+        return None
+    index.entries[name] = refreshed
+    try:
+        _append_journal(latest_bars_path(folder), [refreshed])
+        index.journal_stamp = _stamp(latest_bars_path(folder))
+    except OSError:
+        pass
+    return refreshed
+
+
+def lookup_latest_bars(folder: Path, symbols: Iterable[str]) -> dict[str, LatestBar]:
+    """Latest bar per requested symbol, keyed by the symbol as given."""
+    folder = Path(folder)
+    result: dict[str, LatestBar] = {}
+    with _CACHE_LOCK:
+        index = _load_folder(folder)
+        if index is None:
+            return result
+        for symbol in symbols:
+            name = index.lookup.get(normalize_symbol(symbol))
+            if not name:
+                continue
+            bar = _fresh_bar(folder, index, name)
+            if bar is not None:
+                result[symbol] = bar
+    return result
+
+
+def load_latest_closes(folder: Path, symbols: Iterable[str]) -> dict[str, float]:
+    """Last positive close per symbol, for valuing positions without a live quote."""
+    closes: dict[str, float] = {}
+    for symbol, bar in lookup_latest_bars(folder, symbols).items():
+        if bar.close is not None and bar.close > 0:
+            closes[symbol] = bar.close
+    return closes
+
+
+def record_latest_bar(csv_path: Path) -> LatestBar | None:
+    """Refresh the index entry of a curated CSV that was just written or appended to."""
+    csv_path = Path(csv_path)
+    if not csv_path.name.endswith(_FILE_SUFFIX):
+        return None
+    bar = read_latest_bar(csv_path)
+    if bar is None:
+        return None
+    _append_journal(latest_bars_path(csv_path.parent), [bar])
+    return bar
+
+
+def clear_latest_bars_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
@@ -1,19 +1,112 @@
 from __future__ import annotations
 
 import json
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from threading import Lock
+from typing import Any
 
 from app.core.config import settings
 
 _HEARTBEAT_STALE_SECONDS = 10
 
+# Parsed bridge snapshots, reused while the file's (inode, size, mtime_ns) are unchanged.
+# Staleness is not cached: the readers below derive it from the payload on every call.
+_SNAPSHOT_CACHE_MAX_ENTRIES = 64
+# A file modified this close to when it was parsed may be rewritten again within the same
+# mtime tick without changing size, so such entries are re-read until the file settles.
+_SNAPSHOT_RACY_WINDOW_NS = 50_000_000
+_SNAPSHOT_CACHE_LOCK = Lock()
+# path -> (inode, size, mtime_ns, parsed at ns, last used, payload)
+_SNAPSHOT_CACHE: dict[str, tuple[int, int, int, int, float, Any]] = {}
+_SNAPSHOT_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+def clear_bridge_snapshot_cache() -> None:
+    with _SNAPSHOT_CACHE_LOCK:
+        _SNAPSHOT_CACHE.clear()
+        _SNAPSHOT_CACHE_STATS["hits"] = 0
+        _SNAPSHOT_CACHE_STATS["misses"] = 0
+
+
+def bridge_snapshot_cache_stats() -> dict[str, int]:
+    with _SNAPSHOT_CACHE_LOCK:
+        return {**_SNAPSHOT_CACHE_STATS, "entries": len(_SNAPSHOT_CACHE)}
+
+
+def bridge_file_token(path: Path, *, settled: bool = False) -> tuple[int, int, int] | None:
+    """(inode, size, mtime_ns) of a bridge file, or ``None`` when it is missing.
+
+    With ``settled`` the token is also ``None`` while the file was modified too recently for
+    the token to identify its content, so callers keying derived data on it can skip caching.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if settled and time.time_ns() - stat.st_mtime_ns <= _SNAPSHOT_RACY_WINDOW_NS:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _copy_payload(data: Any) -> Any:
+    # Readers and their callers add keys to the payload and to its list items (e.g. "items"),
+    # so hand out copies two levels deep; deeper values are shared and must not be mutated.
+    if isinstance(data, dict):
+        return {
+            key: [dict(item) if isinstance(item, dict) else item for item in value]
+            if isinstance(value, list)
+            else dict(value)
+            if isinstance(value, dict)
+            else value
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [dict(item) if isinstance(item, dict) else item for item in data]
+    return data
+
 
 def _read_json(path: Path):
+    key = str(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        with _SNAPSHOT_CACHE_LOCK:
+            _SNAPSHOT_CACHE.pop(key, None)
+        return None
+    with _SNAPSHOT_CACHE_LOCK:
+        cached = _SNAPSHOT_CACHE.get(key)
+        if (
+            cached is not None
+            and cached[:3] == (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            and cached[3] - stat.st_mtime_ns > _SNAPSHOT_RACY_WINDOW_NS
+        ):
+            _SNAPSHOT_CACHE_STATS["hits"] += 1
+            _SNAPSHOT_CACHE[key] = (*cached[:4], time.monotonic(), cached[5])
+            return _copy_payload(cached[5])
+        _SNAPSHOT_CACHE_STATS["misses"] += 1
+    parsed_at_ns = time.time_ns()
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_text(encoding="utf-8"))
     except Exception:
         return None
+    with _SNAPSHOT_CACHE_LOCK:
+        _SNAPSHOT_CACHE[key] = (
+            stat.st_ino,
+            stat.st_size,
+            stat.st_mtime_ns,
+            parsed_at_ns,
+            time.monotonic(),
+            data,
+        )
+        if len(_SNAPSHOT_CACHE) > _SNAPSHOT_CACHE_MAX_ENTRIES:
+            stale_keys = sorted(_SNAPSHOT_CACHE.items(), key=lambda item: item[1][4])[
+                : len(_SNAPSHOT_CACHE) - _SNAPSHOT_CACHE_MAX_ENTRIES
+            ]
+            for stale_key, _ in stale_keys:
+                _SNAPSHOT_CACHE.pop(stale_key, None)
+    return _copy_payload(data)
 
 
 def _parse_iso(ts: str | None) -> datetime | None:
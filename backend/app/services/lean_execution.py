@@ -13,6 +13,7 @@ from app.core.config import settings
 from app.db import SessionLocal
 from app.models import TradeFill, TradeOrder, TradeRun
 from app.services.ib_settings import derive_client_id
+from app.services.trade_order_tags import resolve_order_by_tag, resolve_order_ids_by_tags
 from app.services.trade_orders import (
     create_trade_order,
     force_update_trade_order_status,
@@ -477,7 +478,14 @@ def _apply_fill_to_order(
     fill_price: float,
     fill_time: datetime,
     exec_id: str | None = None,
+    known_fills: list[TradeFill] | None = None,
 ) -> TradeFill | None:
+    """Record one fill on ``order`` unless it is already there.
+
+    ``known_fills`` is the order's full fill list (persisted and pending) when the caller
+    prefetched it for a batch; duplicate checks and totals then read it instead of the
+    database, and a newly created fill is appended to it.
+    """
     if not exec_id:
         exec_id = f"lean:{order.id}:{int(fill_time.timestamp() * 1000)}"
     fill_qty_abs = abs(float(fill_qty))
@@ -519,21 +527,26 @@ def _apply_fill_to_order(
         return abs((candidate_time - target_time).total_seconds()) <= 2.0
 
     def _sync_order_from_recorded_fills() -> None:
-        persisted = (
-            session.query(
-                func.coalesce(func.sum(TradeFill.fill_quantity), 0.0),
-                func.coalesce(func.sum(TradeFill.fill_quantity * TradeFill.fill_price), 0.0),
+        if known_fills is not None:
+            persisted_qty = abs(sum(float(f.fill_quantity or 0.0) for f in known_fills))
+            weighted_value = sum(float(f.fill_quantity or 0.0) * float(f.fill_price or 0.0) for f in known_fills)
+            pending_fills = []
+        else:
+            persisted = (
+                session.query(
+                    func.coalesce(func.sum(TradeFill.fill_quantity), 0.0),
+                    func.coalesce(func.sum(TradeFill.fill_quantity * TradeFill.fill_price), 0.0),
+                )
+                .filter(TradeFill.order_id == order.id)
+                .one()
             )
-            .filter(TradeFill.order_id == order.id)
-            .one()
-        )
-        persisted_qty = abs(float(persisted[0] or 0.0))
-        weighted_value = float(persisted[1] or 0.0)
-        pending_fills = [
-            pending
-            for pending in session.new
-            if isinstance(pending, TradeFill) and pending.order_id == order.id
-        ]
+            persisted_qty = abs(float(persisted[0] or 0.0))
+            weighted_value = float(persisted[1] or 0.0)
+            pending_fills = [
+                pending
+                for pending in session.new
+                if isinstance(pending, TradeFill) and pending.order_id == order.id
+            ]
         if pending_fills:
             persisted_qty += sum(abs(float(p.fill_quantity or 0.0)) for p in pending_fills)
             weighted_value += sum(
@@ -558,27 +571,30 @@ def _apply_fill_to_order(
             else:
                 raise
 
-    # Session autoflush is disabled for this app's SessionLocal, so ensure we don't
-    # create duplicates within one ingestion pass by checking pending instances.
-    for pending in session.new:
-        if not isinstance(pending, TradeFill) or pending.order_id != order.id:
-            continue
-        if pending.exec_id == exec_id:
-            _sync_order_from_recorded_fills()
-            return pending
-        if (incoming_synthetic or _is_synthetic(pending.exec_id)) and _same_fill_signature(pending):
+    if known_fills is not None:
+        existing_fills = known_fills
+    else:
+        # Session autoflush is disabled for this app's SessionLocal, so ensure we don't
+        # create duplicates within one ingestion pass by checking pending instances.
+        for pending in session.new:
+            if not isinstance(pending, TradeFill) or pending.order_id != order.id:
+                continue
+            if pending.exec_id == exec_id:
+                _sync_order_from_recorded_fills()
+                return pending
+            if (incoming_synthetic or _is_synthetic(pending.exec_id)) and _same_fill_signature(pending):
+                _sync_order_from_recorded_fills()
+                return pending
+        existing = (
+            session.query(TradeFill)
+            .filter(TradeFill.order_id == order.id, TradeFill.exec_id == exec_id)
+            .first()
+        )
+        if existing:
             _sync_order_from_recorded_fills()
-            return pending
-    existing = (
-        session.query(TradeFill)
-        .filter(TradeFill.order_id == order.id, TradeFill.exec_id == exec_id)
-        .first()
-    )
-    if existing:
-        _sync_order_from_recorded_fills()
-        return existing
+            return existing
 
-    existing_fills = session.query(TradeFill).filter(TradeFill.order_id == order.id).all()
+        existing_fills = session.query(TradeFill).filter(TradeFill.order_id == order.id).all()
     for candidate in existing_fills:
         if candidate.exec_id == exec_id:
             _sync_order_from_recorded_fills()
@@ -623,11 +639,14 @@ def _apply_fill_to_order(
     if total_prev_raw > 0:
         total_prev = total_prev_raw
     else:
-        historical_total = (
-            session.query(func.coalesce(func.sum(TradeFill.fill_quantity), 0.0))
-            .filter(TradeFill.order_id == order.id)
-            .scalar()
-        )
+        if known_fills is not None:
+            historical_total = sum(float(f.fill_quantity or 0.0) for f in known_fills)
+        else:
+            historical_total = (
+                session.query(func.coalesce(func.sum(TradeFill.fill_quantity), 0.0))
+                .filter(TradeFill.order_id == order.id)
+                .scalar()
+            )
         try:
             total_prev = float(historical_total or 0.0)
         except (TypeError, ValueError):
@@ -679,6 +698,8 @@ def _apply_fill_to_order(
         params={"source": "lean_bridge"},
     )
     session.add(fill)
+    if known_fills is not None:
+        known_fills.append(fill)
     return fill
 
 
@@ -771,35 +792,118 @@ def _apply_rejected_event_to_order(
     return True
 
 
-def _resolve_direct_or_manual_order_by_tag(session, tag: str) -> TradeOrder | None:
+def _chunks(values: list, size: int = 500):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+class _EventBatch:
+    """Orders and fills referenced by one apply_execution_events call.
+
+    Orders are loaded with one query (by direct id, client_order_id and event/broker tag)
+    and their fills with another, so applying the events reads from memory. Fills created
+    while applying are appended to the per-order lists; everything is written back by the
+    single flush/commit at the end of the call.
+    """
+
+    def __init__(self, session, events: list[dict]):
+        self.session = session
+        direct_ids: set[int] = set()
+        tags: set[str] = set()
+        for event in events:
+            tag = str(event.get("tag") or "").strip()
+            if tag.startswith("direct:"):
+                try:
+                    direct_ids.add(int(tag[len("direct:") :].strip()))
+                except ValueError:
+                    continue
+            elif tag:
+                tags.add(tag)
+        self._aliases: dict[str, int] = {}
+        alias_tags = [tag for tag in tags if not tag.startswith("oi_")]
+        for tag, by_kind in resolve_order_ids_by_tags(session, alias_tags, kinds=("event", "broker")).items():
+            self._aliases[tag] = by_kind.get("event", by_kind.get("broker"))
+        order_ids = sorted(direct_ids | set(self._aliases.values()))
+        self._by_client_id: dict[str, TradeOrder | None] = {tag: None for tag in tags}
+        orders: list[TradeOrder] = []
+        for chunk in _chunks(order_ids):
+            orders.extend(session.query(TradeOrder).filter(TradeOrder.id.in_(chunk)).all())
+        for chunk in _chunks(sorted(tags)):
+            orders.extend(session.query(TradeOrder).filter(TradeOrder.client_order_id.in_(chunk)).all())
+        self._orders: dict[int, TradeOrder] = {int(order.id): order for order in orders}
+        for order in orders:
+            if order.client_order_id in self._by_client_id:
+                self._by_client_id[order.client_order_id] = order
+        self._fills: dict[int, list[TradeFill]] = {int(order.id): [] for order in orders}
+        for chunk in _chunks(sorted(self._fills)):
+            rows = (
+                session.query(TradeFill)
+                .filter(TradeFill.order_id.in_(chunk))
+                .order_by(TradeFill.id.asc())
+                .all()
+            )
+            for fill in rows:
+                self._fills[int(fill.order_id)].append(fill)
+        for pending in session.new:
+            if isinstance(pending, TradeFill) and pending.order_id in self._fills:
+                self._fills[int(pending.order_id)].append(pending)
+
+    def order_by_id(self, order_id: int) -> TradeOrder | None:
+        order = self._orders.get(int(order_id))
+        return order if order is not None else self.session.get(TradeOrder, order_id)
+
+    def order_by_client_id(self, tag: str) -> TradeOrder | None:
+        if tag in self._by_client_id:
+            return self._by_client_id[tag]
+        order = self.session.query(TradeOrder).filter(TradeOrder.client_order_id == tag).one_or_none()
+        self._by_client_id[tag] = order
+        return order
+
+    def order_by_alias(self, tag: str) -> TradeOrder | None:
+        order_id = self._aliases.get(tag)
+        return self.order_by_id(order_id) if order_id is not None else None
+
+    def fills(self, order: TradeOrder) -> list[TradeFill]:
+        order_id = int(order.id)
+        if order_id not in self._fills:
+            fills = (
+                self.session.query(TradeFill)
+                .filter(TradeFill.order_id == order_id)
+                .order_by(TradeFill.id.asc())
+                .all()
+            )
+            fills.extend(
+                pending
+                for pending in self.session.new
+                if isinstance(pending, TradeFill) and pending.order_id == order_id and pending not in fills
+            )
+            self._fills[order_id] = fills
+        return self._fills[order_id]
+
+    def forget(self, *, client_id: str | None = None, order_ids: tuple[int, ...] = ()) -> None:
+        if client_id is not None:
+            self._by_client_id.pop(client_id, None)
+        for order_id in order_ids:
+            self._orders.pop(int(order_id), None)
+            self._fills.pop(int(order_id), None)
+
+
+def _resolve_direct_or_manual_order_by_tag(
+    session, tag: str, batch: _EventBatch | None = None
+) -> TradeOrder | None:
     normalized = str(tag or "").strip()
     if not normalized:
         return None
 
-    order = (
-        session.query(TradeOrder)
-        .filter(TradeOrder.client_order_id == normalized)
-        .order_by(TradeOrder.id.desc())
-        .first()
-    )
+    if batch is not None:
+        return batch.order_by_client_id(normalized) or batch.order_by_alias(normalized)
+
+    order = session.query(TradeOrder).filter(TradeOrder.client_order_id == normalized).first()
     if order is not None:
         return order
 
-    # Fallback for historical inconsistent rows where event/client tags diverged.
-    candidates = (
-        session.query(TradeOrder)
-        .filter(TradeOrder.run_id.is_(None))
-        .order_by(TradeOrder.id.desc())
-        .limit(4000)
-        .all()
-    )
-    for candidate in candidates:
-        params = candidate.params if isinstance(candidate.params, dict) else {}
-        event_tag = str(params.get("event_tag") or "").strip()
-        broker_tag = str(params.get("broker_order_tag") or "").strip()
-        if normalized and (normalized == event_tag or normalized == broker_tag):
-            return candidate
-    return None
+    # Historical inconsistent rows where event/client tags diverged.
+    return resolve_order_by_tag(session, normalized, kinds=("event", "broker"))
 
 
 def _apply_event_to_existing_order(
@@ -810,6 +914,7 @@ def _apply_event_to_existing_order(
     event_params: dict[str, object],
     status: str,
     filled_abs_value: float,
+    batch: _EventBatch | None = None,
 ) -> bool:
     lean_order_id = event.get("order_id")
     if lean_order_id is not None and order.ib_order_id is None:
@@ -913,6 +1018,7 @@ def _apply_event_to_existing_order(
                 fill_price=fill_price,
                 fill_time=fill_time,
                 exec_id=exec_id,
+                known_fills=batch.fills(order) if batch is not None else None,
             )
             filled_params = dict(event_params)
             filled_params["sync_reason"] = "execution_fill"
@@ -932,14 +1038,34 @@ def _apply_event_to_existing_order(
     return False
 
 
-def apply_execution_events(events: list[dict], *, session=None) -> dict:
+def _group_events_by_tag(events: list[dict]) -> list[dict]:
+    # Stable: events of one order keep their relative order, orders keep first-seen order.
+    first_seen: dict[str, int] = {}
+    for index, event in enumerate(events):
+        first_seen.setdefault(str(event.get("tag") or "").strip(), index)
+    return sorted(events, key=lambda event: first_seen[str(event.get("tag") or "").strip()])
+
+
+def apply_execution_events(events: list[dict], *, session=None, batch: bool = True) -> dict:
+    """Apply Lean execution events to their trade orders in one transaction.
+
+    In batch mode (the default) events are grouped by tag and the referenced orders and
+    fills are prefetched with one query each, so a burst of fills costs a few queries plus
+    the final flush instead of several round trips per event. ``batch=False`` resolves
+    every event with its own queries. Both modes share the same idempotency rules.
+    """
     own_session = False
     summary = {"processed": 0, "skipped_invalid_tag": 0, "skipped_not_found": 0}
     if session is None:
         session = SessionLocal()
         own_session = True
     try:
-        for event in events or []:
+        events = [event for event in events or [] if isinstance(event, dict)]
+        event_batch: _EventBatch | None = None
+        if batch and events:
+            events = _group_events_by_tag(events)
+            event_batch = _EventBatch(session, events)
+        for event in events:
             tag = str(event.get("tag") or "").strip()
             if not tag:
                 summary["skipped_invalid_tag"] += 1
@@ -969,7 +1095,10 @@ def apply_execution_events(events: list[dict], *, session=None) -> dict:
                 except ValueError:
                     summary["skipped_invalid_tag"] += 1
                     continue
-                order = session.get(TradeOrder, order_id)
+                if event_batch is not None:
+                    order = event_batch.order_by_id(order_id)
+                else:
+                    order = session.get(TradeOrder, order_id)
                 if order is None:
                     summary["skipped_not_found"] += 1
                     continue
@@ -980,6 +1109,7 @@ def apply_execution_events(events: list[dict], *, session=None) -> dict:
                     event_params=event_params,
                     status=status,
                     filled_abs_value=filled_abs_value,
+                    batch=event_batch,
                 ):
                     summary["processed"] += 1
                     continue
@@ -987,7 +1117,7 @@ def apply_execution_events(events: list[dict], *, session=None) -> dict:
                 continue
 
             if not tag.startswith("oi_"):
-                order = _resolve_direct_or_manual_order_by_tag(session, tag)
+                order = _resolve_direct_or_manual_order_by_tag(session, tag, event_batch)
                 if order is None:
                     summary["skipped_not_found"] += 1
                     continue
@@ -998,6 +1128,7 @@ def apply_execution_events(events: list[dict], *, session=None) -> dict:
                     event_params=event_params,
                     status=status,
                     filled_abs_value=filled_abs_value,
+                    batch=event_batch,
                 ):
                     summary["processed"] += 1
                     continue
@@ -1007,7 +1138,10 @@ def apply_execution_events(events: list[dict], *, session=None) -> dict:
             intent_id = tag
             run_id_hint = _parse_intent_run_id(intent_id)
             duplicate_order = None
-            order = session.query(TradeOrder).filter(TradeOrder.client_order_id == intent_id).one_or_none()
+            if event_batch is not None:
+                order = event_batch.order_by_client_id(intent_id)
+            else:
+                order = session.query(TradeOrder).filter(TradeOrder.client_order_id == intent_id).one_or_none()
             if order is not None and run_id_hint and order.run_id != run_id_hint:
                 duplicate_order = order
                 order = None
@@ -1079,6 +1213,11 @@ def apply_execution_events(events: list[dict], *, session=None) -> dict:
 
                     if duplicate_order is not None and order.id != duplicate_order.id:
                         _merge_duplicate_order(session, target=order, duplicate=duplicate_order)
+                        if event_batch is not None:
+                            event_batch.forget(order_ids=(order.id, duplicate_order.id))
+                    if event_batch is not None:
+                        # The intent may now map to a created order; look it up again next time.
+                        event_batch.forget(client_id=intent_id)
 
             order_id = event.get("order_id")
             if order_id is not None and order.ib_order_id is None:
@@ -1197,6 +1336,7 @@ def apply_execution_events(events: list[dict], *, session=None) -> dict:
                                 fill_price=fill_price,
                                 fill_time=fill_time,
                                 exec_id=exec_id,
+                                known_fills=event_batch.fills(order) if event_batch is not None else None,
                             )
                             filled_params = dict(event_params)
                             filled_params["sync_reason"] = "execution_fill_no_exec_id_run_scoped"
@@ -1256,6 +1396,7 @@ def apply_execution_events(events: list[dict], *, session=None) -> dict:
                         fill_price=fill_price,
                         fill_time=fill_time,
                         exec_id=exec_id,
+                        known_fills=event_batch.fills(order) if event_batch is not None else None,
                     )
                     # Preserve event metadata on the order for UI/debugging.
                     filled_params = dict(event_params)
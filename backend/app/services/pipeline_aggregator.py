@@ -3,10 +3,13 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
+from sqlalchemy import func
+
 from app.models import (
     AuditLog,
     AutoWeeklyJob,
     DecisionSnapshot,
+    PipelineRun,
     PitFundamentalJob,
     PitWeeklyJob,
     PreTradeRun,
@@ -15,6 +18,7 @@ from app.models import (
     TradeOrder,
     TradeRun,
 )
+from app.services import pipeline_run_index
 
 
 def list_pipeline_runs(
@@ -27,186 +31,56 @@ def list_pipeline_runs(
     started_from: datetime | None = None,
     started_to: datetime | None = None,
     keyword: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
 ) -> list[dict[str, Any]]:
-    pretrade_runs = (
-        session.query(PreTradeRun)
-        .filter(PreTradeRun.project_id == project_id)
-        .order_by(PreTradeRun.created_at.desc())
-        .all()
-    )
-    trade_runs = (
-        session.query(TradeRun)
-        .filter(TradeRun.project_id == project_id)
-        .order_by(TradeRun.created_at.desc())
-        .all()
-    )
-    weekly_jobs = (
-        session.query(AutoWeeklyJob)
-        .filter(AutoWeeklyJob.project_id == project_id)
-        .order_by(AutoWeeklyJob.created_at.desc())
-        .all()
-    )
+    """Newest-first page of pipeline traces from the `pipeline_runs` index.
 
-    items: list[dict[str, Any]] = []
-    for run in pretrade_runs:
-        items.append(
-            {
-                "trace_id": f"pretrade:{run.id}",
-                "run_type": "pretrade",
-                "project_id": run.project_id,
-                "status": run.status,
-                "started_at": run.started_at,
-                "ended_at": run.ended_at,
-                "created_at": run.created_at,
-            }
-        )
-    for job in weekly_jobs:
-        items.append(
-            {
-                "trace_id": f"auto:{job.id}",
-                "run_type": "auto_weekly",
-                "project_id": job.project_id,
-                "status": job.status,
-                "started_at": job.started_at,
-                "ended_at": job.ended_at,
-                "created_at": job.created_at,
-            }
-        )
-    for run in trade_runs:
-        if (run.params or {}).get("pretrade_run_id"):
-            continue
-        items.append(
-            {
-                "trace_id": f"trade:{run.id}",
-                "run_type": "trade",
-                "project_id": run.project_id,
-                "status": run.status,
-                "mode": run.mode,
-                "started_at": run.started_at,
-                "ended_at": run.ended_at,
-                "created_at": run.created_at,
-            }
-        )
-    filtered = _filter_pipeline_runs(
-        session,
-        items,
-        status=status,
-        mode=mode,
-        run_type=run_type,
-        started_from=started_from,
-        started_to=started_to,
-        keyword=keyword,
+    ``cursor`` continues after the last item of a previous page (see
+    ``pipeline_run_index.encode_cursor``); an unreadable cursor raises ``ValueError``.
+    """
+    query = session.query(PipelineRun).filter(
+        PipelineRun.project_id == project_id,
+        PipelineRun.listed.is_(True),
     )
-    filtered.sort(key=_run_sort_key, reverse=True)
-    return filtered
-
-
-def _run_sort_key(item: dict[str, Any]) -> tuple[datetime, str]:
-    when = item.get("created_at") or item.get("started_at") or item.get("ended_at")
-    if when is None:
-        when = datetime.min
-    return when, item.get("trace_id", "")
-
-
-def _filter_pipeline_runs(
-    session,
-    items: list[dict[str, Any]],
-    *,
-    status: str | None,
-    mode: str | None,
-    run_type: str | None,
-    started_from: datetime | None,
-    started_to: datetime | None,
-    keyword: str | None,
-) -> list[dict[str, Any]]:
     normalized_status = str(status or "").strip().lower()
     normalized_mode = str(mode or "").strip().lower()
     normalized_type = str(run_type or "").strip().lower()
     normalized_keyword = str(keyword or "").strip().lower()
-    tags_cache: dict[str, list[str]] = {}
-
-    filtered: list[dict[str, Any]] = []
-    for item in items:
-        item_status = str(item.get("status") or "").strip().lower()
-        item_mode = str(item.get("mode") or "").strip().lower()
-        item_type = str(item.get("run_type") or "").strip().lower()
-        if normalized_status and item_status != normalized_status:
-            continue
-        if normalized_mode and item_mode != normalized_mode:
-            continue
-        if normalized_type and item_type != normalized_type:
-            continue
-
-        when = item.get("created_at") or item.get("started_at") or item.get("ended_at")
-        if started_from and (when is None or when < started_from):
-            continue
-        if started_to and (when is None or when > started_to):
-            continue
-
-        if normalized_keyword:
-            trace_id = str(item.get("trace_id") or "")
-            trace_match = normalized_keyword in trace_id.lower()
-            if not trace_match:
-                if trace_id not in tags_cache:
-                    tags_cache[trace_id] = _collect_trace_tags(session, trace_id)
-                tag_match = any(
-                    normalized_keyword in tag.lower() for tag in tags_cache[trace_id]
-                )
-                if not tag_match:
-                    continue
-        filtered.append(item)
-    return filtered
-
+    if normalized_status:
+        query = query.filter(func.lower(PipelineRun.status) == normalized_status)
+    if normalized_mode:
+        query = query.filter(func.lower(PipelineRun.mode) == normalized_mode)
+    if normalized_type:
+        query = query.filter(PipelineRun.run_type == normalized_type)
+    if started_from:
+        query = query.filter(PipelineRun.sort_at >= started_from)
+    if started_to:
+        query = query.filter(PipelineRun.sort_at <= started_to)
+    if normalized_keyword:
+        query = query.filter(pipeline_run_index.keyword_condition(normalized_keyword))
+    if cursor:
+        query = query.filter(pipeline_run_index.cursor_condition(cursor))
+    query = query.order_by(PipelineRun.sort_at.desc(), PipelineRun.trace_id.desc())
+    if limit:
+        query = query.limit(limit)
 
-def _collect_trace_tags(session, trace_id: str) -> list[str]:
-    if trace_id.startswith("pretrade:"):
-        return _collect_pretrade_tags(session, int(trace_id.split(":", 1)[1]))
-    if trace_id.startswith("trade:"):
-        return _collect_trade_tags(session, int(trace_id.split(":", 1)[1]))
-    if trace_id.startswith("auto:"):
-        return _collect_auto_tags(session, int(trace_id.split(":", 1)[1]))
-    return []
-
-
-def _collect_pretrade_tags(session, run_id: int) -> list[str]:
-    tags: set[str] = {str(run_id)}
-    steps = session.query(PreTradeStep).filter(PreTradeStep.run_id == run_id).all()
-    trade_run_ids: set[int] = set()
-    for step in steps:
-        tags.add(str(step.id))
-        if isinstance(step.artifacts, dict):
-            snapshot_id = step.artifacts.get("decision_snapshot_id")
-            trade_run_id = step.artifacts.get("trade_run_id")
-            if snapshot_id:
-                tags.add(str(snapshot_id))
-            if trade_run_id:
-                trade_run_ids.add(int(trade_run_id))
-                tags.add(str(trade_run_id))
-    for trade_run_id in trade_run_ids:
-        tags.update(_collect_trade_tags(session, trade_run_id))
-    return sorted(tags)
-
-
-def _collect_trade_tags(session, run_id: int) -> list[str]:
-    tags: set[str] = {str(run_id)}
-    orders = session.query(TradeOrder).filter(TradeOrder.run_id == run_id).all()
-    order_ids = [order.id for order in orders]
-    tags.update(str(order_id) for order_id in order_ids)
-    if order_ids:
-        fills = session.query(TradeFill).filter(TradeFill.order_id.in_(order_ids)).all()
-        tags.update(str(fill.id) for fill in fills)
-    return sorted(tags)
-
-
-def _collect_auto_tags(session, job_id: int) -> list[str]:
-    tags: set[str] = {str(job_id)}
-    job = session.get(AutoWeeklyJob, job_id)
-    if job:
-        if job.pit_weekly_job_id:
-            tags.add(str(job.pit_weekly_job_id))
-        if job.pit_fundamental_job_id:
-            tags.add(str(job.pit_fundamental_job_id))
-    return sorted(tags)
+    items: list[dict[str, Any]] = []
+    for row in query.all():
+        item = {
+            "trace_id": row.trace_id,
+            "run_type": row.run_type,
+            "project_id": row.project_id,
+            "status": row.status,
+            "started_at": row.started_at,
+            "ended_at": row.ended_at,
+            "created_at": row.created_at,
+            "sort_at": row.sort_at,
+        }
+        if row.run_type == "trade":
+            item["mode"] = row.mode
+        items.append(item)
+    return items
 
 
 def build_pipeline_trace(session, *, trace_id: str) -> dict[str, Any]:
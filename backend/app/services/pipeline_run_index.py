@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import and_, delete, event, exists, inspect, or_, select, update
+from sqlalchemy.orm import aliased, object_session
+from sqlalchemy.orm.util import identity_key
+
+from app.models import (
+    AutoWeeklyJob,
+    PipelineRun,
+    PipelineRunTag,
+    PreTradeRun,
+    PreTradeStep,
+    TradeFill,
+    TradeOrder,
+    TradeRun,
+)
+
+# One `pipeline_runs` row per pipeline trace (pretrade run, trade run, auto weekly job),
+# plus the ids the list keyword filter searches in `pipeline_run_tags`, so listing runs is
+# one indexed query instead of loading every run and walking its steps, orders and fills.
+# Rows are written by mapper events whenever a source row is inserted, deleted or one of
+# its listed columns changes.
+#
+# Tag kinds:
+#   run        - the trace's own id
+#   step       - PreTradeStep ids of a pretrade run
+#   snapshot   - decision_snapshot_id from pretrade step artifacts
+#   trade_run  - trade_run_id from pretrade step artifacts; also links the pretrade trace to
+#                `trade:{tag}` so its order/fill ids match the pretrade run
+#   order      - TradeOrder ids of a trade run
+#   fill       - TradeFill ids of a trade run
+#   pit        - pit_weekly_job_id / pit_fundamental_job_id of an auto weekly job
+
+_RUNS = PipelineRun.__table__
+_TAGS = PipelineRunTag.__table__
+_STEPS = PreTradeStep.__table__
+_ORDERS = TradeOrder.__table__
+
+_SOURCES: dict[type, tuple[str, str]] = {
+    PreTradeRun: ("pretrade", "pretrade"),
+    TradeRun: ("trade", "trade"),
+    AutoWeeklyJob: ("auto_weekly", "auto"),
+}
+_TRACKED_ATTRS = ("project_id", "status", "created_at", "started_at", "ended_at")
+_STEP_TAG_KINDS = ("step", "snapshot", "trade_run")
+
+
+def trace_id_for(target: Any) -> str:
+    _, prefix = _SOURCES[type(target)]
+    return f"{prefix}:{target.id}"
+
+
+def _is_listed(run_type: str, params: Any) -> bool:
+    # Trade runs started by a pretrade run are shown through that pretrade trace.
+    if run_type != "trade" or not isinstance(params, dict):
+        return True
+    return not params.get("pretrade_run_id")
+
+
+def _run_values(target: Any) -> dict[str, Any]:
+    run_type, _ = _SOURCES[type(target)]
+    return {
+        "run_type": run_type,
+        "source_id": target.id,
+        "project_id": target.project_id,
+        "status": target.status,
+        "mode": target.mode if run_type == "trade" else None,
+        "listed": _is_listed(run_type, getattr(target, "params", None)),
+        "created_at": target.created_at,
+        "started_at": target.started_at,
+        "ended_at": target.ended_at,
+        "sort_at": target.created_at or target.started_at or target.ended_at or datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def _add_tags(connection, trace_id: str, kind: str, tags: Iterable[Any]) -> None:
+    rows = [
+        {"trace_id": trace_id, "kind": kind, "tag": str(tag)}
+        for tag in sorted({str(tag) for tag in tags if tag})
+    ]
+    if rows:
+        connection.execute(
+            _TAGS.insert().prefix_with("OR IGNORE", dialect="sqlite").prefix_with("IGNORE", dialect="mysql"),
+            rows,
+        )
+
+
+def _remove_tags(connection, trace_id: str, kinds: Iterable[str], tag: Any | None = None) -> None:
+    condition = and_(_TAGS.c.trace_id == trace_id, _TAGS.c.kind.in_(list(kinds)))
+    if tag is not None:
+        condition = and_(condition, _TAGS.c.tag == str(tag))
+    connection.execute(delete(_TAGS).where(condition))
+
+
+def _pit_tags(job: AutoWeeklyJob) -> list[Any]:
+    return [job.pit_weekly_job_id, job.pit_fundamental_job_id]
+
+
+def _run_changed(target: Any) -> bool:
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _TRACKED_ATTRS):
+        return True
+    if isinstance(target, TradeRun):
+        if state.attrs.mode.history.has_changes():
+            return True
+        params = state.attrs.params.history
+        if params.has_changes():
+            previous = params.deleted[0] if params.deleted else None
+            return _is_listed("trade", previous) != _is_listed("trade", target.params)
+    return False
+
+
+def _run_after_insert(_mapper, connection, target: Any) -> None:
+    trace_id = trace_id_for(target)
+    connection.execute(_RUNS.insert().values(trace_id=trace_id, **_run_values(target)))
+    _add_tags(connection, trace_id, "run", [target.id])
+    if isinstance(target, AutoWeeklyJob):
+        _add_tags(connection, trace_id, "pit", _pit_tags(target))
+
+
+def _run_after_update(_mapper, connection, target: Any) -> None:
+    trace_id = trace_id_for(target)
+    if _run_changed(target):
+        values = _run_values(target)
+        result = connection.execute(update(_RUNS).where(_RUNS.c.trace_id == trace_id).values(**values))
+        if not result.rowcount:
+            # Source row predates the index (not yet backfilled).
+            _run_after_insert(_mapper, connection, target)
+    if isinstance(target, AutoWeeklyJob):
+        state = inspect(target)
+        if any(state.attrs[name].history.has_changes() for name in ("pit_weekly_job_id", "pit_fundamental_job_id")):
+            _remove_tags(connection, trace_id, ["pit"])
+            _add_tags(connection, trace_id, "pit", _pit_tags(target))
+
+
+def _run_before_delete(_mapper, connection, target: Any) -> None:
+    trace_id = trace_id_for(target)
+    connection.execute(delete(_TAGS).where(_TAGS.c.trace_id == trace_id))
+    connection.execute(delete(_RUNS).where(_RUNS.c.trace_id == trace_id))
+
+
+for _model in _SOURCES:
+    event.listen(_model, "after_insert", _run_after_insert)
+    event.listen(_model, "after_update", _run_after_update)
+    event.listen(_model, "before_delete", _run_before_delete)
+
+
+def _sync_pretrade_step_tags(connection, run_id: int | None, *, excluded_step_id: int | None = None) -> None:
+    """Rebuild the step-derived tags of one pretrade trace from its current steps."""
+    if run_id is None:
+        return
+    trace_id = f"pretrade:{run_id}"
+    tags: dict[str, set[str]] = {kind: set() for kind in _STEP_TAG_KINDS}
+    rows = connection.execute(select(_STEPS.c.id, _STEPS.c.artifacts).where(_STEPS.c.run_id == run_id))
+    for step_id, artifacts in rows:
+        if step_id == excluded_step_id:
+            continue
+        tags["step"].add(str(step_id))
+        if isinstance(artifacts, dict):
+            if artifacts.get("decision_snapshot_id"):
+                tags["snapshot"].add(str(artifacts["decision_snapshot_id"]))
+            if artifacts.get("trade_run_id"):
+                tags["trade_run"].add(str(int(artifacts["trade_run_id"])))
+    _remove_tags(connection, trace_id, _STEP_TAG_KINDS)
+    for kind, values in tags.items():
+        _add_tags(connection, trace_id, kind, values)
+
+
+@event.listens_for(PreTradeStep, "after_insert")
+def _step_after_insert(_mapper, connection, target: PreTradeStep) -> None:
+    _sync_pretrade_step_tags(connection, target.run_id)
+
+
+@event.listens_for(PreTradeStep, "after_update")
+def _step_after_update(_mapper, connection, target: PreTradeStep) -> None:
+    state = inspect(target)
+    if state.attrs.artifacts.history.has_changes() or state.attrs.run_id.history.has_changes():
+        history = state.attrs.run_id.history
+        if history.deleted and history.deleted[0] != target.run_id:
+            _sync_pretrade_step_tags(connection, history.deleted[0])
+        _sync_pretrade_step_tags(connection, target.run_id)
+
+
+@event.listens_for(PreTradeStep, "before_delete")
+def _step_before_delete(_mapper, connection, target: PreTradeStep) -> None:
+    _sync_pretrade_step_tags(connection, target.run_id, excluded_step_id=target.id)
+
+
+@event.listens_for(TradeOrder, "after_insert")
+def _order_after_insert(_mapper, connection, target: TradeOrder) -> None:
+    if target.run_id is not None:
+        _add_tags(connection, f"trade:{target.run_id}", "order", [target.id])
+
+
+@event.listens_for(TradeOrder, "after_update")
+def _order_after_update(_mapper, connection, target: TradeOrder) -> None:
+    history = inspect(target).attrs.run_id.history
+    if not history.has_changes():
+        return
+    for previous in history.deleted:
+        if previous is not None:
+            _remove_tags(connection, f"trade:{previous}", ["order"], target.id)
+    _order_after_insert(_mapper, connection, target)
+
+
+@event.listens_for(TradeOrder, "before_delete")
+def _order_before_delete(_mapper, connection, target: TradeOrder) -> None:
+    if target.run_id is not None:
+        _remove_tags(connection, f"trade:{target.run_id}", ["order"], target.id)
+
+
+def _fill_run_id(connection, fill: TradeFill) -> int | None:
+    session = object_session(fill)
+    if session is not None:
+        order = session.identity_map.get(identity_key(TradeOrder, fill.order_id))
+        if order is not None and "run_id" in order.__dict__:
+            return order.run_id
+    return connection.execute(select(_ORDERS.c.run_id).where(_ORDERS.c.id == fill.order_id)).scalar()
+
+
+@event.listens_for(TradeFill, "after_insert")
+def _fill_after_insert(_mapper, connection, target: TradeFill) -> None:
+    run_id = _fill_run_id(connection, target)
+    if run_id is not None:
+        _add_tags(connection, f"trade:{run_id}", "fill", [target.id])
+
+
+@event.listens_for(TradeFill, "before_delete")
+def _fill_before_delete(_mapper, connection, target: TradeFill) -> None:
+    run_id = _fill_run_id(connection, target)
+    if run_id is not None:
+        _remove_tags(connection, f"trade:{run_id}", ["fill"], target.id)
+
+
+def _like_pattern(keyword: str) -> str:
+    escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def keyword_condition(keyword: str):
+    """Trace id or any tag of the trace (and of the trade runs a pretrade run links to)."""
+    pattern = _like_pattern(keyword)
+    own = aliased(PipelineRunTag)
+    link = aliased(PipelineRunTag)
+    linked = aliased(PipelineRunTag)
+    return or_(
+        PipelineRun.trace_id.like(pattern, escape="\\"),
+        exists().where(own.trace_id == PipelineRun.trace_id, own.tag.like(pattern, escape="\\")),
+        exists().where(
+            link.trace_id == PipelineRun.trace_id,
+            link.kind == "trade_run",
+            linked.trace_id == "trade:" + link.tag,
+            linked.kind.in_(["order", "fill"]),
+            linked.tag.like(pattern, escape="\\"),
+        ),
+    )
+
+
+def encode_cursor(item: dict[str, Any]) -> str:
+    return f"{item['sort_at'].isoformat()}|{item['trace_id']}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    sort_text, sep, trace_id = str(cursor or "").partition("|")
+    if not sep or not trace_id:
+        raise ValueError("cursor_invalid")
+    try:
+        return datetime.fromisoformat(sort_text), trace_id
+    except ValueError as exc:
+        raise ValueError("cursor_invalid") from exc
+
+
+def cursor_condition(cursor: str):
+    sort_at, trace_id = decode_cursor(cursor)
+    return or_(
+        PipelineRun.sort_at < sort_at,
+        and_(PipelineRun.sort_at == sort_at, PipelineRun.trace_id < trace_id),
+    )
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+# Consolidated columnar copy of the weekly PIT fundamentals snapshots. Next to the
+# `pit_fundamentals_YYYYMMDD.csv` files the PIT fundamentals job keeps
+#   pit_fundamentals_panel.json          meta: version, source CSV stats, symbols, offsets
+#   pit_fundamentals_panel_{token}.npy   one structured record per (symbol, snapshot_date)
+# Records are sorted by symbol then snapshot date, so a symbol is the contiguous slice
+# `offsets[i]:offsets[i + 1]` and a date range inside it is a searchsorted. Readers
+# memory-map the array and only trust it while the source stats still match the CSVs,
+# so the CSVs stay the source of truth.
+
+PIT_PANEL_VERSION = 1
+PIT_PANEL_META_NAME = "pit_fundamentals_panel.json"
+PIT_PANEL_FIELDS = (
+    "has_fundamentals",
+    "lag_days",
+    "filled_forward",
+    "shares_outstanding",
+    "pit_market_cap",
+    "total_revenue",
+    "gross_profit",
+    "operating_income",
+    "net_income",
+    "eps",
+    "reported_eps",
+    "total_assets",
+    "total_liabilities",
+    "total_shareholder_equity",
+    "cash_and_cash_equivalents",
+    "operating_cashflow",
+    "capital_expenditures",
+    "cashflow_from_investment",
+    "cashflow_from_financing",
+    "free_cashflow",
+)
+PIT_PANEL_DTYPE = np.dtype(
+    [("snapshot_date", "<i8"), ("source", "<i4")]
+    + [(field, "<f8") for field in PIT_PANEL_FIELDS]
+)
+
+
+def pit_panel_meta_path(pit_dir: Path) -> Path:
+    return Path(pit_dir) / PIT_PANEL_META_NAME
+
+
+def _source_stats(pit_dir: Path) -> dict[str, dict[str, int]]:
+    stats: dict[str, dict[str, int]] = {}
+    try:
+        entries = list(os.scandir(pit_dir))
+    except OSError:
+        return stats
+    for entry in entries:
+        name = entry.name
+        if not (name.startswith("pit_fundamentals_") and name.endswith(".csv")):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        stats[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return stats
+
+
+def read_pit_panel_meta(pit_dir: Path) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(pit_panel_meta_path(pit_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != PIT_PANEL_VERSION:
+        return None
+    return payload
+
+
+def _read_snapshot_csv(path: Path) -> pd.DataFrame:
+    wanted = {"symbol", "snapshot_date", *PIT_PANEL_FIELDS}
+    frame = pd.read_csv(path, usecols=lambda col: col in wanted)
+    if "symbol" not in frame.columns or "snapshot_date" not in frame.columns:
+        return pd.DataFrame(columns=["symbol", "snapshot_date", *PIT_PANEL_FIELDS])
+    frame["symbol"] = frame["symbol"].astype(str).str.upper()
+    frame["snapshot_date"] = pd.to_datetime(frame["snapshot_date"], errors="coerce")
+    frame = frame.dropna(subset=["symbol", "snapshot_date"])
+    for field in PIT_PANEL_FIELDS:
+        if field in frame.columns:
+            frame[field] = pd.to_numeric(frame[field], errors="coerce").astype(float)
+        else:
+            frame[field] = np.nan
+    return frame[["symbol", "snapshot_date", *PIT_PANEL_FIELDS]]
+
+
+def _panel_to_frame(array: np.ndarray, symbols: list[str], offsets: list[int]) -> pd.DataFrame:
+    counts = np.diff(np.asarray(offsets, dtype=np.int64))
+    frame = pd.DataFrame({field: np.asarray(array[field]) for field in PIT_PANEL_FIELDS})
+    frame.insert(0, "snapshot_date", np.asarray(array["snapshot_date"]).astype("datetime64[ns]"))
+    frame.insert(0, "symbol", np.repeat(np.asarray(symbols, dtype=object), counts))
+    frame["source"] = np.asarray(array["source"])
+    return frame
+
+
+def build_pit_panel(pit_dir: Path) -> dict[str, int]:
+    """Bring the panel in line with the snapshot CSVs, re-parsing only new or changed files.
+
+    Rows of a (symbol, snapshot_date) seen in several files keep the one from the last file
+    in name order, like the CSV loader does.
+    """
+    pit_dir = Path(pit_dir)
+    sources = _source_stats(pit_dir)
+    names = sorted(sources)
+    meta = read_pit_panel_meta(pit_dir)
+    panel = PitPanel.open(pit_dir, require_fresh=False, meta=meta) if meta else None
+
+    frames: list[pd.DataFrame] = []
+    reused = 0
+    parsed = 0
+    unchanged: set[str] = set()
+    if panel is not None:
+        previous_sources = panel.meta.get("sources") or {}
+        unchanged = {
+            name for name in names if previous_sources.get(name) == sources[name]
+        }
+        if unchanged:
+            old = _panel_to_frame(panel.array, panel.symbols, panel.offsets)
+            old_names = list(panel.meta.get("source_names") or [])
+            old["source_name"] = [old_names[idx] for idx in old["source"]]
+            old = old[old["source_name"].isin(unchanged)].drop(columns=["source"])
+            frames.append(old)
+            reused = len(unchanged)
+    for name in names:
+        if name in unchanged:
+            continue
+        frame = _read_snapshot_csv(pit_dir / name)
+        frames.append(frame.assign(source_name=name))
+        parsed += 1
+
+    if frames:
+        combined = pd.concat(frames, ignore_index=True)
+    else:
+        combined = pd.DataFrame(columns=["symbol", "snapshot_date", *PIT_PANEL_FIELDS, "source_name"])
+    source_index = {name: idx for idx, name in enumerate(names)}
+    combined["source"] = combined["source_name"].map(source_index).astype("int64")
+    # Later files win; the stable sort then keeps (symbol, date) order deterministic.
+    combined = combined.sort_values("source", kind="stable")
+    combined = combined.drop_duplicates(subset=["symbol", "snapshot_date"], keep="last")
+    combined = combined.sort_values(["symbol", "snapshot_date"], kind="stable")
+
+    array = np.zeros(len(combined), dtype=PIT_PANEL_DTYPE)
+    array["snapshot_date"] = (
+        pd.to_datetime(combined["snapshot_date"]).to_numpy(dtype="datetime64[ns]").astype("<i8")
+    )
+    array["source"] = combined["source"].to_numpy(dtype="<i4")
+    for field in PIT_PANEL_FIELDS:
+        array[field] = combined[field].to_numpy(dtype="<f8")
+    symbol_values = combined["symbol"].to_numpy()
+    symbols, starts = np.unique(symbol_values, return_index=True)
+    offsets = [int(value) for value in starts] + [int(len(combined))]
+
+    token = uuid.uuid4().hex[:12]
+    array_path = pit_dir / f"pit_fundamentals_panel_{token}.npy"
+    tmp_array = array_path.with_suffix(".tmp")
+    with tmp_array.open("wb") as handle:
+        np.save(handle, array, allow_pickle=False)
+    tmp_array.replace(array_path)
+    payload = {
+        "version": PIT_PANEL_VERSION,
+        "array": array_path.name,
+        "rows": int(len(combined)),
+        "fields": list(PIT_PANEL_FIELDS),
+        "source_names": names,
+        "sources": sources,
+        "symbols": [str(symbol) for symbol in symbols],
+        "offsets": offsets,
+        "built_at": datetime.utcnow().isoformat(),
+    }
+    meta_path = pit_panel_meta_path(pit_dir)
+    tmp_meta = meta_path.with_suffix(".tmp")
+    tmp_meta.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    tmp_meta.replace(meta_path)
+    # Readers that already mapped an older array keep their mapping after the unlink.
+    for stale in pit_dir.glob("pit_fundamentals_panel_*.npy"):
+        if stale.name != array_path.name:
+            stale.unlink(missing_ok=True)
+    return {
+        "rows": int(len(combined)),
+        "symbols": len(symbols),
+        "reused": reused,
+        "parsed": parsed,
+    }
+
+
+class PitPanel:
+    """Memory-mapped view of the PIT fundamentals panel of one snapshot directory."""
+
+    def __init__(self, meta: dict[str, Any], array: np.ndarray) -> None:
+        self.meta = meta
+        self.array = array
+        self.symbols: list[str] = list(meta.get("symbols") or [])
+        self.offsets: list[int] = list(meta.get("offsets") or [0])
+        self._positions = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def open(
+        cls,
+        pit_dir: Path,
+        require_fresh: bool = True,
+        meta: dict[str, Any] | None = None,
+    ) -> PitPanel | None:
+        """Return the panel, or ``None`` when it is missing, unreadable or (by default) stale."""
+        pit_dir = Path(pit_dir)
+        meta = meta or read_pit_panel_meta(pit_dir)
+        if not meta:
+            return None
+        if require_fresh and meta.get("sources") != _source_stats(pit_dir):
+            return None
+        try:
+            array = np.load(pit_dir / str(meta.get("array") or ""), mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        if array.dtype != PIT_PANEL_DTYPE or array.shape[0] != meta.get("rows"):
+            return None
+        if len(meta.get("offsets") or []) != len(meta.get("symbols") or []) + 1:
+            return None
+        return cls(meta, array)
+
+    def read(
+        self,
+        symbols: Iterable[str] | None = None,
+        start: datetime | pd.Timestamp | None = None,
+        end: datetime | pd.Timestamp | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> dict[str, pd.DataFrame]:
+        """Per-symbol frames indexed by ``snapshot_date``, restricted to symbols and dates."""
+        selected = [field for field in (fields or PIT_PANEL_FIELDS) if field in PIT_PANEL_FIELDS]
+        if symbols is None:
+            wanted = range(len(self.symbols))
+        else:
+            wanted = sorted(
+                self._positions[symbol]
+                for symbol in {str(item).strip().upper() for item in symbols}
+                if symbol in self._positions
+            )
+        start_ns = pd.Timestamp(start).value if start is not None else None
+        end_ns = pd.Timestamp(end).value if end is not None else None
+        result: dict[str, pd.DataFrame] = {}
+        for position in wanted:
+            lo, hi = self.offsets[position], self.offsets[position + 1]
+            window = self.array[lo:hi]
+            dates = window["snapshot_date"]
+            if start_ns is not None or end_ns is not None:
+                first = int(np.searchsorted(dates, start_ns, side="left")) if start_ns is not None else 0
+                last = (
+                    int(np.searchsorted(dates, end_ns, side="right"))
+                    if end_ns is not None
+                    else int(dates.shape[0])
+                )
+                window = window[first:last]
+            if not window.shape[0]:
+                continue
+            index = pd.DatetimeIndex(
+                np.asarray(window["snapshot_date"]).astype("datetime64[ns]"), name="snapshot_date"
+            )
+            result[self.symbols[position]] = pd.DataFrame(
+                {field: np.asarray(window[field]) for field in selected}, index=index
+            )
+        return result
@@ -121,6 +121,8 @@ def _build_command(params: dict[str, Any], output_dir: str | None) -> list[str]:
     vendor_preference = str(params.get("vendor_preference") or "").strip()
     if vendor_preference:
         cmd.extend(["--vendor-preference", vendor_preference])
+    if params.get("incremental"):
+        cmd.append("--incremental")
 
     return cmd
 
@@ -256,6 +258,11 @@ def _build_fundamental_command(params: dict[str, Any], output_dir: str | None) -
     asset_types = str(params.get("asset_types") or "").strip()
     if asset_types:
         cmd.extend(["--asset-types", asset_types])
+    if params.get("incremental"):
+        cmd.append("--incremental")
+    workers = int(params.get("workers") or 0)
+    if workers > 0:
+        cmd.extend(["--workers", str(workers)])
 
     return cmd
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import csv
 import json
+import math
 import os
 import subprocess
 import sys
@@ -10,6 +11,7 @@ import traceback
 from dataclasses import dataclass
 from datetime import date, datetime, time as time_cls, timedelta, timezone
 from pathlib import Path
+from threading import Lock
 from typing import Any, Callable
 
 import urllib.request
@@ -53,6 +55,7 @@ from app.services.decision_snapshot import (
 from app.services.factor_score_runner import run_factor_score_job
 from app.services.lean_bridge_paths import resolve_bridge_root
 from app.services.lean_bridge_reader import (
+    bridge_file_token,
     parse_bridge_timestamp,
     read_bridge_payload,
     read_positions,
@@ -172,22 +175,45 @@ def _quote_timestamp(item: dict[str, Any], fallback: str | None) -> datetime | N
     return _parse_timestamp(fallback)
 
 
+_QUOTES_WATCH_INTERVAL_SECONDS = 0.05
+_QUOTES_INDEX_LOCK = Lock()
+# quotes.json path -> (file token, symbol -> quote item)
+_QUOTES_INDEX: dict[str, tuple[tuple[int, int, int], dict[str, dict]]] = {}
+
+
+def _read_quotes_index(root: Path) -> tuple[dict, dict[str, dict]]:
+    """quotes.json plus its symbol map; the map is rebuilt only when the file changes."""
+    path = root / "quotes.json"
+    token = bridge_file_token(path, settled=True)
+    quotes = read_quotes(root)
+    if token is not None:
+        with _QUOTES_INDEX_LOCK:
+            cached = _QUOTES_INDEX.get(str(path))
+        if cached is not None and cached[0] == token:
+            return quotes, cached[1]
+    items = quotes.get("items") if isinstance(quotes.get("items"), list) else []
+    quotes_map = {
+        _normalize_symbol(item.get("symbol")): item
+        for item in items
+        if isinstance(item, dict) and _normalize_symbol(item.get("symbol"))
+    }
+    # Only keep the map when the file did not change while it was being read.
+    if token is not None and bridge_file_token(path, settled=True) == token:
+        with _QUOTES_INDEX_LOCK:
+            _QUOTES_INDEX[str(path)] = (token, quotes_map)
+    return quotes, quotes_map
+
+
 def _quotes_ready(symbols: list[str], ttl_seconds: int | None) -> tuple[bool, list[str], list[str]]:
     if ttl_seconds is None:
         return False, symbols, []
-    quotes = read_quotes(_resolve_bridge_root())
-    items = quotes.get("items") if isinstance(quotes.get("items"), list) else []
+    quotes, quotes_map = _read_quotes_index(_resolve_bridge_root())
     stale = bool(quotes.get("stale", False))
     updated_at = quotes.get("updated_at") or quotes.get("refreshed_at")
     now = datetime.utcnow()
     ttl = max(0, int(ttl_seconds))
     effective_ttl = max(ttl, 120)
     updated_ts = _parse_timestamp(updated_at) if isinstance(updated_at, str) else None
-    quotes_map = {
-        _normalize_symbol(item.get("symbol")): item
-        for item in items
-        if isinstance(item, dict) and _normalize_symbol(item.get("symbol"))
-    }
     missing: list[str] = []
     stale_symbols: list[str] = []
     for symbol in symbols:
@@ -218,19 +244,36 @@ def _wait_for_quotes_ready(
     wait_seconds: int,
     poll_interval_seconds: int,
 ) -> tuple[bool, list[str], list[str], int]:
+    quotes_path = _resolve_bridge_root() / "quotes.json"
+    token = bridge_file_token(quotes_path)
     ok, missing, stale_symbols = _quotes_ready(symbols, ttl_seconds)
     if ok or wait_seconds <= 0:
         return ok, missing, stale_symbols, 0
     poll = max(1, int(poll_interval_seconds or 1))
-    max_attempts = max(1, int(wait_seconds // poll))
-    waited = 0
-    for _ in range(max_attempts):
-        time.sleep(poll)
-        waited += poll
+    budget = max(1, int(wait_seconds // poll)) * poll
+    waited = 0.0
+    # Quotes only turn fresh when the bridge rewrites quotes.json, so re-check as soon as the
+    # file changes; the poll interval remains as a fallback (e.g. same-tick rewrites).
+    while waited < budget:
+        waited += _wait_for_file_change(quotes_path, token, min(poll, budget - waited))
+        token = bridge_file_token(quotes_path)
         ok, missing, stale_symbols = _quotes_ready(symbols, ttl_seconds)
         if ok:
-            return ok, missing, stale_symbols, waited
-    return ok, missing, stale_symbols, waited
+            break
+    return ok, missing, stale_symbols, int(math.ceil(waited))
+
+
+def _wait_for_file_change(
+    path: Path, token: tuple[int, int, int] | None, timeout_seconds: float
+) -> float:
+    waited = 0.0
+    while waited < timeout_seconds:
+        interval = min(_QUOTES_WATCH_INTERVAL_SECONDS, timeout_seconds - waited)
+        time.sleep(interval)
+        waited += interval
+        if bridge_file_token(path) != token:
+            break
+    return waited
 
 
 def _coerce_ttl(value: int | None, default: int) -> int:
@@ -980,6 +1023,8 @@ def step_fundamentals_refresh(ctx: StepContext, params: dict[str, Any]) -> StepR
 
 
 def step_pit_weekly(ctx: StepContext, params: dict[str, Any]) -> StepResult:
+    # PreTrade only needs the newest week; unchanged snapshots are kept as they are.
+    params = {"incremental": True, **(params or {})}
     job = PitWeeklyJob(status="queued", params=params)
     ctx.session.add(job)
     ctx.session.commit()
@@ -1004,7 +1049,7 @@ def step_pit_weekly(ctx: StepContext, params: dict[str, Any]) -> StepResult:
 
 def step_pit_fundamentals(ctx: StepContext, params: dict[str, Any]) -> StepResult:
     settings_row = _get_or_create_settings(ctx.session)
-    cmd_params = dict(params or {})
+    cmd_params = {"incremental": True, **(params or {})}
     # Avoid spamming PitFundamentalJob rows when another job holds the lock.
     # PreTrade will retry this step, so we only proceed once the lock is available.
     lock_root_raw = str(cmd_params.get("data_root") or settings.data_root or os.getenv("DATA_ROOT") or "").strip()
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
-import csv
+import math
 import os
+import time
 from dataclasses import dataclass
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
+from threading import Lock
 from typing import Any
 
 from app.core.config import settings
 from app.services.ib_market import fetch_historical_bars
+from app.services.price_store import PriceStore, read_price_store_meta
+from app.services.series_index import iter_series_rows, read_series_summary
 
 
 @dataclass(frozen=True)
@@ -20,6 +24,7 @@ class ChartHistoryRequest:
     range_label: str
     allow_local_fallback: bool
     local_granularity: str | None = None
+    local_lookback_days: int | None = None
 
 
 _INTERVAL_CONFIG: dict[str, dict[str, Any]] = {
@@ -53,6 +58,7 @@ _INTERVAL_CONFIG: dict[str, dict[str, Any]] = {
         "range_label": "6M",
         "allow_local_fallback": True,
         "local_granularity": "day",
+        "local_lookback_days": 183,
     },
     "1W": {
         "ib_bar_size": "1 week",
@@ -60,6 +66,7 @@ _INTERVAL_CONFIG: dict[str, dict[str, Any]] = {
         "range_label": "2Y",
         "allow_local_fallback": True,
         "local_granularity": "week",
+        "local_lookback_days": 731,
     },
     "1M": {
         "ib_bar_size": "1 month",
@@ -67,9 +74,15 @@ _INTERVAL_CONFIG: dict[str, dict[str, Any]] = {
         "range_label": "5Y",
         "allow_local_fallback": True,
         "local_granularity": "month",
+        "local_lookback_days": 1827,
     },
 }
 
+_LOCAL_BARS_CACHE_MAX_ENTRIES = 64
+_LOCAL_BARS_CACHE_LOCK = Lock()
+# (path, size, mtime_ns, granularity, window start) -> (last used, chart bars)
+_LOCAL_BARS_CACHE: dict[tuple[str, int, int, str, date | None], tuple[float, list[dict[str, Any]]]] = {}
+
 
 def _resolve_data_root() -> Path:
     if settings.data_root:
@@ -113,6 +126,7 @@ def build_chart_request(*, symbol: str, interval: str) -> ChartHistoryRequest:
         range_label=str(config["range_label"]),
         allow_local_fallback=bool(config["allow_local_fallback"]),
         local_granularity=str(config.get("local_granularity") or "") or None,
+        local_lookback_days=int(config["local_lookback_days"]) if config.get("local_lookback_days") else None,
     )
 
 
@@ -169,25 +183,83 @@ def _parse_daily_row(row: dict[str, Any]) -> dict[str, Any] | None:
     }
 
 
-def _read_local_daily_rows(symbol: str) -> list[dict[str, Any]]:
-    root = _resolve_data_root() / "curated_adjusted"
-    path = _find_latest_price_file(root, symbol)
-    if path is None:
-        return []
+def _read_store_daily_rows(path: Path, start: date | None = None) -> list[dict[str, Any]] | None:
+    columns = PriceStore().read_columns(
+        path,
+        ["date", "open", "high", "low", "close", "volume"],
+        start=datetime(start.year, start.month, start.day) if start else None,
+    )
+    if columns is None:
+        return None
+    rows: list[dict[str, Any]] = []
+    for stamp, open_, high, low, close, volume in zip(
+        columns["date"].astype("datetime64[D]").tolist(),
+        columns["open"].tolist(),
+        columns["high"].tolist(),
+        columns["low"].tolist(),
+        columns["close"].tolist(),
+        columns["volume"].tolist(),
+    ):
+        if any(math.isnan(value) for value in (open_, high, low, close)):
+            continue
+        rows.append(
+            {
+                "date": stamp,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": None if math.isnan(volume) else volume,
+            }
+        )
+    return rows
+
+
+def _read_daily_rows(path: Path, start: date | None = None) -> list[dict[str, Any]]:
+    if settings.price_store_read_enabled:
+        stored = _read_store_daily_rows(path, start)
+        if stored is not None:
+            return stored
     rows: list[dict[str, Any]] = []
     try:
-        with path.open("r", encoding="utf-8-sig", newline="") as handle:
-            reader = csv.DictReader(handle)
-            for row in reader:
-                parsed = _parse_daily_row(row)
-                if parsed is not None:
-                    rows.append(parsed)
+        for row in iter_series_rows(path, start):
+            parsed = _parse_daily_row(row)
+            if parsed is not None and (start is None or parsed["date"] >= start):
+                rows.append(parsed)
     except OSError:
         return []
     rows.sort(key=lambda item: item["date"])
     return rows
 
 
+def _read_local_daily_rows(symbol: str, start: date | None = None) -> list[dict[str, Any]]:
+    root = _resolve_data_root() / "curated_adjusted"
+    path = _find_latest_price_file(root, symbol)
+    if path is None:
+        return []
+    return _read_daily_rows(path, start)
+
+
+def _window_start(last_date: date, lookback_days: int, granularity: str | None) -> date:
+    start = last_date - timedelta(days=lookback_days)
+    # Widen to the start of the first period so the oldest aggregated bar is complete.
+    if granularity == "week":
+        return start - timedelta(days=start.weekday())
+    if granularity == "month":
+        return start.replace(day=1)
+    return start
+
+
+def _local_last_date(path: Path) -> date | None:
+    summary = read_series_summary(path)
+    if summary and summary.get("last_date"):
+        return summary["last_date"]
+    if settings.price_store_read_enabled and PriceStore().is_fresh(path):
+        meta = read_price_store_meta(path) or {}
+        return _parse_date(meta.get("last_date"))
+    return None
+
+
 def _group_key(row_date: date, granularity: str) -> tuple[int, int]:
     if granularity == "week":
         iso_year, iso_week, _ = row_date.isocalendar()
@@ -247,14 +319,52 @@ def _normalize_local_bars(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return bars
 
 
+def clear_local_bars_cache() -> None:
+    with _LOCAL_BARS_CACHE_LOCK:
+        _LOCAL_BARS_CACHE.clear()
+
+
 def load_local_adjusted_bars(symbol: str, interval: str) -> list[dict[str, Any]]:
+    """Local chart bars for the interval's range, aggregated to its granularity.
+
+    Only the tail window the chart shows is read. Results are cached per file size/mtime, so
+    repeated requests skip both the read and the weekly/monthly aggregation.
+    """
     request = build_chart_request(symbol=symbol, interval=interval)
-    rows = _read_local_daily_rows(request.symbol)
+    path = _find_latest_price_file(_resolve_data_root() / "curated_adjusted", request.symbol)
+    if path is None:
+        return []
+    try:
+        stat = path.stat()
+    except OSError:
+        return []
+    lookback_days = request.local_lookback_days
+    last_date = _local_last_date(path) if lookback_days else None
+    start = _window_start(last_date, lookback_days, request.local_granularity) if last_date else None
+    cache_key = (str(path), stat.st_size, stat.st_mtime_ns, request.local_granularity or "day", start)
+    with _LOCAL_BARS_CACHE_LOCK:
+        cached = _LOCAL_BARS_CACHE.get(cache_key)
+        if cached is not None:
+            _LOCAL_BARS_CACHE[cache_key] = (time.monotonic(), cached[1])
+            return [dict(bar) for bar in cached[1]]
+    rows = _read_daily_rows(path, start)
+    if lookback_days and start is None and rows:
+        # No index to find the last bar up front; trim after the full read instead.
+        window_start = _window_start(rows[-1]["date"], lookback_days, request.local_granularity)
+        rows = [row for row in rows if row["date"] >= window_start]
     if request.local_granularity == "week":
         rows = aggregate_daily_bars(rows, granularity="week")
     elif request.local_granularity == "month":
         rows = aggregate_daily_bars(rows, granularity="month")
-    return _normalize_local_bars(rows)
+    bars = _normalize_local_bars(rows)
+    with _LOCAL_BARS_CACHE_LOCK:
+        _LOCAL_BARS_CACHE[cache_key] = (time.monotonic(), bars)
+        overflow = len(_LOCAL_BARS_CACHE) - _LOCAL_BARS_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            stale_keys = sorted(_LOCAL_BARS_CACHE.items(), key=lambda item: item[1][0])[:overflow]
+            for stale_key, _entry in stale_keys:
+                _LOCAL_BARS_CACHE.pop(stale_key, None)
+    return [dict(bar) for bar in bars]
 
 
 def _normalize_ib_bars(payload: dict[str, Any]) -> list[dict[str, Any]]:
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import calendar
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+# Columnar mirror of the curated CSV series. Every `{folder}/{id}_{name}.csv` under the
+# data root gets a sibling `price_store/{folder}/{id}_{name}.npy` holding one structured
+# record per bar (int64 epoch seconds + float64 OHLCV) plus a small `.json` meta file that
+# pins the CSV size/mtime it was built from. Readers memory-map the `.npy` and fall back to
+# the CSV whenever the meta no longer matches, so the CSV stays the source of truth.
+
+PRICE_STORE_DIRNAME = "price_store"
+PRICE_STORE_VERSION = 1
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+PRICE_STORE_DTYPE = np.dtype(
+    [("date", "<i8")] + [(column, "<f8") for column in PRICE_COLUMNS]
+)
+_TRUTHY = {"1", "true", "yes", "y", "on"}
+
+
+def price_store_path(csv_path: Path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.parent.parent / PRICE_STORE_DIRNAME / csv_path.parent.name / f"{csv_path.stem}.npy"
+
+
+def price_store_meta_path(csv_path: Path) -> Path:
+    return price_store_path(csv_path).with_suffix(".json")
+
+
+def price_store_files(csv_path: Path) -> list[Path]:
+    return [price_store_path(csv_path), price_store_meta_path(csv_path)]
+
+
+def _to_epoch_seconds(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return calendar.timegm(value.timetuple())
+
+
+def _parse_number(value: Any) -> float:
+    if value is None:
+        return np.nan
+    text = str(value).strip()
+    if not text:
+        return np.nan
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def _records_to_array(records: dict[datetime, dict] | Iterable[tuple[datetime, dict]]) -> np.ndarray:
+    items = records.items() if isinstance(records, dict) else records
+    by_second: dict[int, dict] = {}
+    for timestamp, row in items:
+        by_second[_to_epoch_seconds(timestamp)] = row
+    array = np.empty(len(by_second), dtype=PRICE_STORE_DTYPE)
+    for idx, second in enumerate(sorted(by_second)):
+        row = by_second[second]
+        array[idx] = (second,) + tuple(_parse_number(row.get(column)) for column in PRICE_COLUMNS)
+    return array
+
+
+def _resolve_symbol(records: dict[datetime, dict] | Iterable[tuple[datetime, dict]]) -> str:
+    items = records.values() if isinstance(records, dict) else (row for _, row in records)
+    for row in items:
+        symbol = str(row.get("symbol") or "").strip()
+        if symbol:
+            return symbol
+    return ""
+
+
+def _write_array(csv_path: Path, array: np.ndarray, symbol: str) -> Path | None:
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        return None
+    store_path = price_store_path(csv_path)
+    meta_path = price_store_meta_path(csv_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    stat = csv_path.stat()
+    tmp_store = store_path.with_name(f"{store_path.stem}.tmp.npy")
+    with tmp_store.open("wb") as handle:
+        np.save(handle, array, allow_pickle=False)
+    meta = {
+        "version": PRICE_STORE_VERSION,
+        "symbol": symbol,
+        "rows": int(array.shape[0]),
+        "first_date": _format_epoch(array["date"][0]) if array.shape[0] else None,
+        "last_date": _format_epoch(array["date"][-1]) if array.shape[0] else None,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "updated_at": datetime.utcnow().isoformat(),
+    }
+    tmp_meta = meta_path.with_suffix(".tmp")
+    tmp_meta.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    # Replace the payload before the meta so a crash in between leaves a stale meta,
+    # which readers reject, rather than a fresh meta pointing at an old payload.
+    tmp_store.replace(store_path)
+    tmp_meta.replace(meta_path)
+    return store_path
+
+
+def _format_epoch(value: int) -> str:
+    return datetime.fromtimestamp(int(value), tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def write_price_store(
+    csv_path: Path, records: dict[datetime, dict] | Iterable[tuple[datetime, dict]]
+) -> Path | None:
+    """Mirror freshly written curated records into the columnar store.
+
+    Must be called after the CSV itself has been written so the recorded size/mtime
+    match the file readers will compare against.
+    """
+    if not isinstance(records, dict):
+        records = list(records)
+    return _write_array(csv_path, _records_to_array(records), _resolve_symbol(records))
+
+
+def append_price_store(
+    csv_path: Path,
+    records: dict[datetime, dict] | Iterable[tuple[datetime, dict]],
+    source_size: int,
+    source_mtime_ns: int,
+) -> Path | None:
+    """Extend the mirror after ``records`` were appended to the curated CSV.
+
+    ``source_size``/``source_mtime_ns`` describe the CSV before the append. When the existing
+    mirror was not built from exactly that file it is rebuilt from the CSV instead.
+    """
+    meta = read_price_store_meta(csv_path)
+    array = None
+    if (
+        meta
+        and meta.get("version") == PRICE_STORE_VERSION
+        and meta.get("source_size") == source_size
+        and meta.get("source_mtime_ns") == source_mtime_ns
+    ):
+        try:
+            array = np.load(price_store_path(csv_path), allow_pickle=False)
+        except (OSError, ValueError):
+            array = None
+        if array is not None and array.dtype != PRICE_STORE_DTYPE:
+            array = None
+    if array is None:
+        return build_price_store_from_csv(csv_path)
+    if not isinstance(records, dict):
+        records = list(records)
+    tail = _records_to_array(records)
+    if tail.shape[0]:
+        array = np.concatenate([array[array["date"] < tail["date"][0]], tail])
+    symbol = str(meta.get("symbol") or "") or _resolve_symbol(records)
+    return _write_array(csv_path, array, symbol)
+
+
+def build_price_store_from_csv(csv_path: Path) -> Path | None:
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        return None
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    df.columns = [str(col).strip().lower() for col in df.columns]
+    if "date" not in df.columns:
+        return None
+    dates = pd.to_datetime(df["date"], errors="coerce", utc=True).dt.tz_convert(None)
+    valid = dates.notna().to_numpy()
+    df = df.loc[valid]
+    seconds = (dates[valid].astype("datetime64[s]").astype("int64")).to_numpy()
+    frame = pd.DataFrame({"date": seconds})
+    for column in PRICE_COLUMNS:
+        if column in df.columns:
+            frame[column] = pd.to_numeric(df[column], errors="coerce").to_numpy()
+        else:
+            frame[column] = np.nan
+    frame = frame.drop_duplicates(subset=["date"], keep="last").sort_values("date")
+    array = np.empty(len(frame), dtype=PRICE_STORE_DTYPE)
+    for column in PRICE_STORE_DTYPE.names:
+        array[column] = frame[column].to_numpy()
+    symbol = ""
+    if "symbol" in df.columns:
+        non_empty = df["symbol"].astype(str).str.strip()
+        non_empty = non_empty[non_empty != ""]
+        if not non_empty.empty:
+            symbol = str(non_empty.iloc[0])
+    return _write_array(csv_path, array, symbol)
+
+
+def read_price_store_meta(csv_path: Path) -> dict[str, Any] | None:
+    meta_path = price_store_meta_path(csv_path)
+    if not meta_path.exists():
+        return None
+    try:
+        payload = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class PriceStore:
+    """Read API over the columnar curated mirror.
+
+    Every method takes the path of the curated CSV a caller would otherwise parse and
+    returns ``None`` when no fresh columnar copy exists, so loaders can keep their CSV
+    code path as the fallback.
+    """
+
+    def __init__(self, mmap: bool = True) -> None:
+        self.mmap = mmap
+
+    def is_fresh(self, csv_path: Path) -> bool:
+        csv_path = Path(csv_path)
+        meta = read_price_store_meta(csv_path)
+        if not meta or meta.get("version") != PRICE_STORE_VERSION:
+            return False
+        if not price_store_path(csv_path).exists():
+            return False
+        try:
+            stat = csv_path.stat()
+        except OSError:
+            return False
+        return (
+            meta.get("source_size") == stat.st_size
+            and meta.get("source_mtime_ns") == stat.st_mtime_ns
+        )
+
+    def read_array(self, csv_path: Path) -> np.ndarray | None:
+        if not self.is_fresh(csv_path):
+            return None
+        try:
+            array = np.load(
+                price_store_path(csv_path),
+                mmap_mode="r" if self.mmap else None,
+                allow_pickle=False,
+            )
+        except (OSError, ValueError):
+            return None
+        if array.dtype != PRICE_STORE_DTYPE:
+            return None
+        return array
+
+    def read_columns(
+        self,
+        csv_path: Path,
+        columns: Iterable[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[str, np.ndarray] | None:
+        array = self.read_array(csv_path)
+        if array is None:
+            return None
+        seconds = array["date"]
+        lo = int(np.searchsorted(seconds, _to_epoch_seconds(start), side="left")) if start else 0
+        hi = (
+            int(np.searchsorted(seconds, _to_epoch_seconds(end), side="right"))
+            if end
+            else int(seconds.shape[0])
+        )
+        window = array[lo:hi]
+        selected = list(columns) if columns is not None else list(PRICE_STORE_DTYPE.names)
+        result: dict[str, np.ndarray] = {}
+        for column in selected:
+            if column not in PRICE_STORE_DTYPE.names:
+                continue
+            if column == "date":
+                result[column] = window["date"].astype("datetime64[s]")
+            else:
+                result[column] = np.asarray(window[column])
+        return result
+
+    def read_frame(
+        self,
+        csv_path: Path,
+        columns: Iterable[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> pd.DataFrame | None:
+        """Return the series as a frame with a ``date`` column, mirroring ``pd.read_csv``."""
+        wanted = ["date"] + [
+            column for column in (columns or PRICE_COLUMNS) if column != "date"
+        ]
+        payload = self.read_columns(csv_path, wanted, start=start, end=end)
+        if payload is None:
+            return None
+        frame = pd.DataFrame(payload)
+        frame["date"] = frame["date"].astype("datetime64[ns]")
+        return frame
+
+
+def load_price_store(enabled: object = None) -> PriceStore | None:
+    """Reader for loaders outside the API process, or ``None`` when reads are disabled.
+
+    ``enabled`` is the caller's config flag; ``None`` falls back to PRICE_STORE_READ_ENABLED.
+    """
+    if enabled is None:
+        enabled = os.environ.get("PRICE_STORE_READ_ENABLED", "")
+    if str(enabled).strip().lower() not in _TRUTHY:
+        return None
+    return PriceStore()
+
+
+def rebuild_price_store(data_root: Path, folders: Iterable[str] = ("curated", "curated_adjusted")) -> dict[str, int]:
+    store = PriceStore(mmap=False)
+    counts = {"built": 0, "fresh": 0, "failed": 0}
+    for folder in folders:
+        root = Path(data_root) / folder
+        if not root.exists():
+            continue
+        for csv_path in sorted(root.glob("*.csv")):
+            if store.is_fresh(csv_path):
+                counts["fresh"] += 1
+                continue
+            try:
+                built = build_price_store_from_csv(csv_path)
+            except (OSError, ValueError):
+                built = None
+            if built is None:
+                counts["failed"] += 1
+            else:
+                counts["built"] += 1
+    return counts
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import json
+from pathlib import Path
 from threading import Lock
 import time as time_module
 from typing import Iterable
@@ -72,6 +73,8 @@ def clear_realized_pnl_cache() -> None:
     with _REALIZED_PNL_CACHE_LOCK:
         _REALIZED_PNL_CACHE.clear()
         _REALIZED_PNL_FAST_CACHE.clear()
+    with _LEDGER_LOCK:
+        _LEDGERS.clear()
 
 
 def _normalize_symbols(symbols: Iterable[str] | None) -> tuple[str, ...]:
@@ -108,7 +111,7 @@ def _build_baseline_cache_key(baseline: dict) -> str:
     return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
 
 
-def _resolve_fill_revision_token(session) -> str | None:
+def _query_fill_stats(session) -> tuple[int, int, datetime | None] | None:
     try:
         count_value, max_id, max_updated_at = (
             session.query(
@@ -120,6 +123,13 @@ def _resolve_fill_revision_token(session) -> str | None:
         )
     except Exception:
         return None
+    return int(count_value or 0), int(max_id or 0), max_updated_at
+
+
+def _resolve_fill_revision_token(stats: tuple[int, int, datetime | None] | None) -> str | None:
+    if stats is None:
+        return None
+    count_value, max_id, max_updated_at = stats
     updated_token = ""
     if isinstance(max_updated_at, datetime):
         updated_token = max_updated_at.isoformat()
@@ -146,6 +156,385 @@ def _query_fill_rows(
     return query.all()
 
 
+def _query_new_fill_rows(
+    session, *, after_id: int, through_id: int
+) -> list[tuple[TradeFill, TradeOrder]]:
+    return (
+        session.query(TradeFill, TradeOrder)
+        .join(TradeOrder, TradeFill.order_id == TradeOrder.id)
+        .filter(TradeFill.id > after_id, TradeFill.id <= through_id)
+        .order_by(func.coalesce(TradeFill.fill_time, TradeFill.created_at).asc(), TradeFill.id.asc())
+        .all()
+    )
+
+
+# Incremental FIFO ledger.
+#
+# For one baseline the ledger keeps, per symbol, the open FIFO lots and the realized totals
+# per order and fill, plus a watermark over trade_fills (highest fill id applied, fill count,
+# latest updated_at). A call only reads fills past the watermark and applies them to their
+# symbol. A symbol is replayed from the baseline when one of its fills was updated or a new
+# fill sorts before fills already applied; deleted fills force a full rebuild. With
+# ``ledger_path`` the ledger is also kept as JSON (next to the positions baseline) so a
+# restart resumes from the watermark instead of replaying every fill.
+
+REALIZED_PNL_LEDGER_VERSION = 1
+_LEDGER_MAX_ENTRIES = 8
+_LEDGER_LOCK = Lock()
+
+
+@dataclass
+class _SymbolLedger:
+    lots: list[Lot] = field(default_factory=list)
+    total: float = 0.0
+    order_totals: dict[int, float] = field(default_factory=dict)
+    fill_totals: dict[int, float] = field(default_factory=dict)
+    last: tuple[datetime, int] | None = None
+
+
+@dataclass
+class _Ledger:
+    baseline_key: str
+    symbols: dict[str, _SymbolLedger] = field(default_factory=dict)
+    last_fill_id: int = 0
+    fill_count: int = 0
+    updated_at: datetime | None = None
+    updated_ids: set[int] = field(default_factory=set)
+    file_mtime_ns: int | None = None
+
+
+_LEDGERS: dict[str, _Ledger] = {}
+
+_MIN_TIME = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _baseline_lots(baseline: dict) -> dict[str, list[Lot]]:
+    lots: dict[str, list[Lot]] = {}
+    for item in baseline.get("items") or []:
+        symbol = str(item.get("symbol") or "").strip().upper()
+        if not symbol:
+            continue
+        qty = float(item.get("position") or 0.0)
+        if qty == 0:
+            continue
+        cost = float(item.get("avg_cost") or 0.0)
+        lots.setdefault(symbol, []).append(Lot(qty=qty, cost=cost))
+    return lots
+
+
+def _fill_sort_key(fill: TradeFill) -> tuple[datetime, int]:
+    return _ensure_aware(fill.fill_time or fill.created_at) or _MIN_TIME, int(fill.id)
+
+
+def _fill_symbol(fill: TradeFill, order: TradeOrder, baseline_at: datetime | None) -> str | None:
+    """Symbol whose FIFO the fill belongs to, or ``None`` when it does not count."""
+    symbol = (order.symbol or "").strip().upper()
+    if not symbol:
+        return None
+    dt = _ensure_aware(fill.fill_time or fill.created_at)
+    if baseline_at and dt and dt < baseline_at:
+        return None
+    if abs(float(fill.fill_quantity or 0.0)) <= 0:
+        return None
+    return symbol
+
+
+def _apply_fill(state: _SymbolLedger, fill: TradeFill, order: TradeOrder) -> None:
+    side = (order.side or "").strip().upper()
+    qty = abs(float(fill.fill_quantity or 0.0))
+    price = float(fill.fill_price or 0.0)
+    commission = float(fill.commission or 0.0)
+    commission_per_share = commission / qty if qty else 0.0
+
+    state.order_totals.setdefault(order.id, 0.0)
+    state.last = _fill_sort_key(fill)
+
+    def realize(amount: float) -> None:
+        state.total += amount
+        state.order_totals[order.id] += amount
+        state.fill_totals[fill.id] = state.fill_totals.get(fill.id, 0.0) + amount
+
+    fifo = state.lots
+    remaining = qty
+
+    if side == "BUY":
+        while remaining > 0 and fifo and fifo[0].qty < 0:
+            lot = fifo[0]
+            match_qty = min(remaining, abs(lot.qty))
+            realized = (lot.cost - price) * match_qty - commission_per_share * match_qty
+            realize(realized)
+            lot.qty += match_qty
+            remaining -= match_qty
+            if abs(lot.qty) < 1e-9:
+                fifo.pop(0)
+        if remaining > 0:
+            open_cost = price + commission_per_share
+            fifo.append(Lot(qty=remaining, cost=open_cost))
+    elif side == "SELL":
+        while remaining > 0 and fifo and fifo[0].qty > 0:
+            lot = fifo[0]
+            match_qty = min(remaining, lot.qty)
+            realized = (price - lot.cost) * match_qty - commission_per_share * match_qty
+            realize(realized)
+            lot.qty -= match_qty
+            remaining -= match_qty
+            if lot.qty <= 1e-9:
+                fifo.pop(0)
+        if remaining > 0:
+            open_cost = price - commission_per_share
+            fifo.append(Lot(qty=-remaining, cost=open_cost))
+
+
+def _replay(
+    session,
+    ledger: _Ledger,
+    baseline: dict,
+    baseline_at: datetime | None,
+    through_id: int,
+    symbols: set[str] | None = None,
+) -> None:
+    """Rebuild ``symbols`` (all when ``None``) from the baseline and every fill up to ``through_id``."""
+    seeds = _baseline_lots(baseline)
+    targets = set(seeds) if symbols is None else set(symbols)
+    if symbols is None:
+        ledger.symbols = {}
+    for symbol in targets:
+        ledger.symbols.pop(symbol, None)
+        if symbol in seeds:
+            ledger.symbols[symbol] = _SymbolLedger(
+                lots=[Lot(qty=lot.qty, cost=lot.cost) for lot in seeds[symbol]]
+            )
+    rows = _query_fill_rows(
+        session,
+        baseline_at=baseline_at,
+        symbols=tuple(sorted(symbols)) if symbols is not None else None,
+    )
+    for fill, order in rows:
+        if fill.id > through_id:
+            continue
+        symbol = _fill_symbol(fill, order, baseline_at)
+        if symbol is None or (symbols is not None and symbol not in symbols):
+            continue
+        _apply_fill(ledger.symbols.setdefault(symbol, _SymbolLedger()), fill, order)
+
+
+def _updated_fill_ids(session, ledger: _Ledger, through_id: int) -> list[tuple[int, str | None]]:
+    if ledger.updated_at is None:
+        return []
+    rows = (
+        session.query(TradeFill.id, TradeFill.updated_at, TradeOrder.symbol)
+        .join(TradeOrder, TradeFill.order_id == TradeOrder.id)
+        .filter(TradeFill.id <= min(ledger.last_fill_id, through_id))
+        .filter(TradeFill.updated_at >= ledger.updated_at)
+        .all()
+    )
+    return [
+        (int(fill_id), symbol)
+        for fill_id, updated_at, symbol in rows
+        if updated_at != ledger.updated_at or int(fill_id) not in ledger.updated_ids
+    ]
+
+
+def _advance_ledger(
+    session,
+    ledger: _Ledger,
+    baseline: dict,
+    baseline_at: datetime | None,
+    stats: tuple[int, int, datetime | None],
+) -> bool:
+    """Bring the ledger up to ``stats``; returns whether anything changed."""
+    count_value, max_id, max_updated_at = stats
+    if (
+        ledger.last_fill_id == max_id
+        and ledger.fill_count == count_value
+        and ledger.updated_at == max_updated_at
+    ):
+        return False
+    rebuild_all = ledger.fill_count == 0 and ledger.last_fill_id == 0 and not ledger.symbols
+    if not rebuild_all and ledger.last_fill_id:
+        applied_count = (
+            session.query(func.count(TradeFill.id))
+            .filter(TradeFill.id <= ledger.last_fill_id)
+            .scalar()
+        )
+        # Fewer fills under the watermark than were applied: something was deleted.
+        rebuild_all = int(applied_count or 0) != ledger.fill_count
+    if rebuild_all:
+        _replay(session, ledger, baseline, baseline_at, max_id)
+    else:
+        dirty = {
+            str(symbol or "").strip().upper()
+            for _, symbol in _updated_fill_ids(session, ledger, max_id)
+            if str(symbol or "").strip()
+        }
+        pending: list[tuple[TradeFill, TradeOrder, str]] = []
+        for fill, order in _query_new_fill_rows(
+            session, after_id=ledger.last_fill_id, through_id=max_id
+        ):
+            symbol = _fill_symbol(fill, order, baseline_at)
+            if symbol is None or symbol in dirty:
+                continue
+            state = ledger.symbols.get(symbol)
+            if state is not None and state.last is not None and _fill_sort_key(fill) < state.last:
+                # Arrived out of order (e.g. a late fill with an earlier fill_time).
+                dirty.add(symbol)
+                continue
+            pending.append((fill, order, symbol))
+        for fill, order, symbol in pending:
+            if symbol not in dirty:
+                _apply_fill(ledger.symbols.setdefault(symbol, _SymbolLedger()), fill, order)
+        if dirty:
+            _replay(session, ledger, baseline, baseline_at, max_id, dirty)
+    ledger.last_fill_id = max_id
+    ledger.fill_count = count_value
+    ledger.updated_at = max_updated_at
+    ledger.updated_ids = (
+        {
+            int(row[0])
+            for row in session.query(TradeFill.id).filter(TradeFill.updated_at == max_updated_at)
+        }
+        if max_updated_at is not None
+        else set()
+    )
+    return True
+
+
+def _format_time(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _load_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _ledger_to_payload(ledger: _Ledger) -> dict:
+    return {
+        "version": REALIZED_PNL_LEDGER_VERSION,
+        "baseline_key": ledger.baseline_key,
+        "last_fill_id": ledger.last_fill_id,
+        "fill_count": ledger.fill_count,
+        "updated_at": _format_time(ledger.updated_at),
+        "updated_ids": sorted(ledger.updated_ids),
+        "symbols": {
+            symbol: {
+                "lots": [[lot.qty, lot.cost] for lot in state.lots],
+                "total": state.total,
+                "orders": {str(key): value for key, value in state.order_totals.items()},
+                "fills": {str(key): value for key, value in state.fill_totals.items()},
+                "last": [state.last[0].isoformat(), state.last[1]] if state.last else None,
+            }
+            for symbol, state in ledger.symbols.items()
+        },
+    }
+
+
+def _ledger_from_payload(payload: dict) -> _Ledger:
+    symbols: dict[str, _SymbolLedger] = {}
+    for symbol, item in (payload.get("symbols") or {}).items():
+        last = item.get("last")
+        last_time = _load_time(last[0]) if last else None
+        symbols[symbol] = _SymbolLedger(
+            lots=[Lot(qty=float(qty), cost=float(cost)) for qty, cost in item.get("lots") or []],
+            total=float(item.get("total") or 0.0),
+            order_totals={int(key): float(value) for key, value in (item.get("orders") or {}).items()},
+            fill_totals={int(key): float(value) for key, value in (item.get("fills") or {}).items()},
+            last=(last_time, int(last[1])) if last and last_time else None,
+        )
+    return _Ledger(
+        baseline_key=str(payload.get("baseline_key") or ""),
+        symbols=symbols,
+        last_fill_id=int(payload.get("last_fill_id") or 0),
+        fill_count=int(payload.get("fill_count") or 0),
+        updated_at=_load_time(payload.get("updated_at")),
+        updated_ids={int(value) for value in payload.get("updated_ids") or []},
+    )
+
+
+def _read_ledger_file(path: Path, baseline_key: str) -> _Ledger | None:
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != REALIZED_PNL_LEDGER_VERSION
+        or payload.get("baseline_key") != baseline_key
+    ):
+        return None
+    try:
+        ledger = _ledger_from_payload(payload)
+    except (TypeError, ValueError, IndexError):
+        return None
+    ledger.file_mtime_ns = mtime_ns
+    return ledger
+
+
+def _write_ledger_file(path: Path, ledger: _Ledger) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(_ledger_to_payload(ledger), ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+        ledger.file_mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _current_ledger(session, baseline_key: str, ledger_path: Path | None) -> _Ledger:
+    # Ledgers describe one database; keep engines apart so they never share a watermark.
+    bind = session.get_bind()
+    cache_key = f"{id(bind)}|{ledger_path or ''}|{baseline_key}"
+    ledger = _LEDGERS.get(cache_key)
+    if ledger_path is not None:
+        try:
+            mtime_ns = ledger_path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is not None and (ledger is None or ledger.file_mtime_ns != mtime_ns):
+            # Written by another process (or a previous run); it is at least as fresh.
+            ledger = _read_ledger_file(ledger_path, baseline_key) or ledger
+    if ledger is None:
+        ledger = _Ledger(baseline_key=baseline_key)
+    # Re-insert so eviction below drops the least recently used ledgers.
+    _LEDGERS.pop(cache_key, None)
+    _LEDGERS[cache_key] = ledger
+    if len(_LEDGERS) > _LEDGER_MAX_ENTRIES:
+        for stale_key in list(_LEDGERS)[: len(_LEDGERS) - _LEDGER_MAX_ENTRIES]:
+            _LEDGERS.pop(stale_key, None)
+    return ledger
+
+
+def _evict_ledger(ledger: _Ledger) -> None:
+    for key in [key for key, cached in _LEDGERS.items() if cached is ledger]:
+        _LEDGERS.pop(key, None)
+
+
+def _ledger_result(
+    ledger: _Ledger, baseline_at: datetime | None, symbol_set: set[str]
+) -> RealizedPnlResult:
+    symbol_totals: dict[str, float] = {}
+    order_totals: dict[int, float] = {}
+    fill_totals: dict[int, float] = {}
+    for symbol, state in ledger.symbols.items():
+        if symbol_set and symbol not in symbol_set:
+            continue
+        symbol_totals[symbol] = state.total
+        order_totals.update(state.order_totals)
+        fill_totals.update(state.fill_totals)
+    return RealizedPnlResult(
+        symbol_totals=symbol_totals,
+        order_totals=order_totals,
+        fill_totals=fill_totals,
+        baseline_at=baseline_at,
+    )
+
+
 def compute_realized_pnl(
     session,
     baseline: dict,
@@ -154,6 +543,7 @@ def compute_realized_pnl(
     cache_ttl_seconds: float = _REALIZED_PNL_CACHE_TTL_SECONDS,
     fast_cache_ttl_seconds: float = _REALIZED_PNL_FAST_CACHE_TTL_SECONDS,
     symbols: Iterable[str] | None = None,
+    ledger_path: Path | None = None,
 ) -> RealizedPnlResult:
     cache_key: str | None = None
     ttl_seconds = max(0.0, float(cache_ttl_seconds))
@@ -161,8 +551,8 @@ def compute_realized_pnl(
     normalized_symbols = _normalize_symbols(symbols)
     symbol_set = set(normalized_symbols)
     fast_cache_key: str | None = None
+    baseline_token = _build_baseline_cache_key(baseline)
     if use_cache:
-        baseline_token = _build_baseline_cache_key(baseline)
         symbol_token = ",".join(normalized_symbols) if normalized_symbols else "*"
         fast_cache_key = f"{baseline_token}|symbols={symbol_token}"
         now_mono = time_module.monotonic()
@@ -173,7 +563,9 @@ def compute_realized_pnl(
                 cached_at, cached_result = fast_cached
                 if now_mono - cached_at <= fast_ttl_seconds:
                     return _clone_result(cached_result)
-        fill_revision = _resolve_fill_revision_token(session)
+    stats = _query_fill_stats(session)
+    if use_cache:
+        fill_revision = _resolve_fill_revision_token(stats)
         if fill_revision:
             cache_key = f"{fast_cache_key}|{fill_revision}"
             with _REALIZED_PNL_CACHE_LOCK:
@@ -184,96 +576,24 @@ def compute_realized_pnl(
                     return _clone_result(cached_result)
 
     baseline_at = _parse_time(str(baseline.get("created_at") or ""))
-    symbol_totals: dict[str, float] = {}
-    order_totals: dict[int, float] = {}
-    fill_totals: dict[int, float] = {}
-    lots: dict[str, list[Lot]] = {}
-
-    for item in baseline.get("items") or []:
-        symbol = str(item.get("symbol") or "").strip().upper()
-        if not symbol:
-            continue
-        if symbol_set and symbol not in symbol_set:
-            continue
-        qty = float(item.get("position") or 0.0)
-        if qty == 0:
-            continue
-        cost = float(item.get("avg_cost") or 0.0)
-        lots.setdefault(symbol, []).append(Lot(qty=qty, cost=cost))
-        symbol_totals.setdefault(symbol, 0.0)
-
-    rows = _query_fill_rows(
-        session,
-        baseline_at=baseline_at,
-        symbols=normalized_symbols or None,
-    )
-
-    def effective_time(fill: TradeFill) -> datetime | None:
-        return _ensure_aware(fill.fill_time or fill.created_at)
-
-    for fill, order in rows:
-        symbol = (order.symbol or "").strip().upper()
-        if not symbol:
-            continue
-        if symbol_set and symbol not in symbol_set:
-            continue
-        dt = effective_time(fill)
-        if baseline_at and dt and dt < baseline_at:
-            continue
-        side = (order.side or "").strip().upper()
-        qty = abs(float(fill.fill_quantity or 0.0))
-        if qty <= 0:
-            continue
-        price = float(fill.fill_price or 0.0)
-        commission = float(fill.commission or 0.0)
-        commission_per_share = commission / qty if qty else 0.0
-
-        symbol_totals.setdefault(symbol, 0.0)
-        order_totals.setdefault(order.id, 0.0)
-
-        def realize(amount: float) -> None:
-            symbol_totals[symbol] += amount
-            order_totals[order.id] += amount
-            fill_totals[fill.id] = fill_totals.get(fill.id, 0.0) + amount
-
-        fifo = lots.setdefault(symbol, [])
-        remaining = qty
-
-        if side == "BUY":
-            while remaining > 0 and fifo and fifo[0].qty < 0:
-                lot = fifo[0]
-                match_qty = min(remaining, abs(lot.qty))
-                realized = (lot.cost - price) * match_qty - commission_per_share * match_qty
-                realize(realized)
-                lot.qty += match_qty
-                remaining -= match_qty
-                if abs(lot.qty) < 1e-9:
-                    fifo.pop(0)
-            if remaining > 0:
-                open_cost = price + commission_per_share
-                fifo.append(Lot(qty=remaining, cost=open_cost))
-        elif side == "SELL":
-            while remaining > 0 and fifo and fifo[0].qty > 0:
-                lot = fifo[0]
-                match_qty = min(remaining, lot.qty)
-                realized = (price - lot.cost) * match_qty - commission_per_share * match_qty
-                realize(realized)
-                lot.qty -= match_qty
-                remaining -= match_qty
-                if lot.qty <= 1e-9:
-                    fifo.pop(0)
-            if remaining > 0:
-                open_cost = price - commission_per_share
-                fifo.append(Lot(qty=-remaining, cost=open_cost))
-        else:
-            continue
-
-    result = RealizedPnlResult(
-        symbol_totals=symbol_totals,
-        order_totals=order_totals,
-        fill_totals=fill_totals,
-        baseline_at=baseline_at,
-    )
+    if stats is None:
+        # No watermark available: replay into a throwaway ledger.
+        ledger = _Ledger(baseline_key=baseline_token)
+        _replay(session, ledger, baseline, baseline_at, through_id=2**63 - 1)
+        result = _ledger_result(ledger, baseline_at, symbol_set)
+    else:
+        with _LEDGER_LOCK:
+            ledger = _current_ledger(session, baseline_token, ledger_path)
+            try:
+                advanced = _advance_ledger(session, ledger, baseline, baseline_at, stats)
+            except Exception:
+                # Fills may already be applied in place without the watermark moving; drop
+                # the ledger so the next call starts over from the file or the baseline.
+                _evict_ledger(ledger)
+                raise
+            if advanced and ledger_path is not None:
+                _write_ledger_file(ledger_path, ledger)
+            result = _ledger_result(ledger, baseline_at, symbol_set)
     if use_cache and cache_key:
         now_mono = time_module.monotonic()
         with _REALIZED_PNL_CACHE_LOCK:
@@ -9,6 +9,10 @@ def _baseline_path(root: Path) -> Path:
     return root / "positions_baseline.json"
 
 
+def realized_pnl_ledger_path(root: Path) -> Path:
+    return root / "realized_pnl_ledger.json"
+
+
 def _parse_time(value: str | None) -> str:
     if not value:
         return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from bisect import bisect_left
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+# Per-series summary index. Every curated `{folder}/{id}_{name}.csv` can have a sibling
+# `series_index/{folder}/{id}_{name}.json` with its row count, first/last date, minimum
+# bar interval and a CRC32 of the file, pinned to the CSV size/mtime it describes. Writers
+# refresh it next to the CSV so listing and quality endpoints never have to re-parse the
+# series; a summary whose size/mtime no longer match the CSV is treated as missing.
+#
+# For files whose first column is `date` the summary also keeps a sparse offset index
+# (the date text and byte offset of every OFFSET_STRIDE-th line), so range reads can seek
+# close to the requested start instead of parsing the whole history.
+
+SERIES_INDEX_DIRNAME = "series_index"
+SERIES_INDEX_VERSION = 2
+OFFSET_STRIDE = 256
+
+
+def series_index_path(csv_path: Path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.parent.parent / SERIES_INDEX_DIRNAME / csv_path.parent.name / f"{csv_path.stem}.json"
+
+
+def _scan_lines(
+    path: Path, offset: int = 0, crc: int = 0, lines: int = 0, with_offsets: bool = True
+) -> tuple[int, int, list[list[Any]]]:
+    """CRC32 and sparse date offsets of the data lines from ``offset`` on.
+
+    CRC32 can be continued from a previous value, so appends only scan the new bytes.
+    ``lines`` is the number of data lines before ``offset``.
+    """
+    offsets: list[list[Any]] = []
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        position = offset
+        if offset == 0:
+            header = handle.readline()
+            crc = zlib.crc32(header, crc)
+            position += len(header)
+        for line in handle:
+            crc = zlib.crc32(line, crc)
+            if line.strip():
+                if with_offsets and lines % OFFSET_STRIDE == 0:
+                    date_text = line.split(b",", 1)[0].decode("utf-8", errors="ignore").strip()
+                    offsets.append([date_text, position])
+                lines += 1
+            position += len(line)
+    return crc, lines, offsets
+
+
+def _has_leading_date_column(path: Path) -> bool:
+    with path.open("rb") as handle:
+        header = handle.readline().decode("utf-8-sig", errors="ignore")
+    return header.split(",", 1)[0].strip().lower() == "date"
+
+
+def _to_days(dates: Iterable[datetime | date]) -> list[date]:
+    return [value.date() if isinstance(value, datetime) else value for value in dates]
+
+
+def _is_sorted(days: list[date]) -> bool:
+    return all(prev <= day for prev, day in zip(days, days[1:]))
+
+
+def _min_interval(days: list[date], previous: date | None = None) -> int | None:
+    min_gap: int | None = None
+    last = previous
+    for day in days:
+        if last is not None:
+            gap = (day - last).days
+            if gap > 0 and (min_gap is None or gap < min_gap):
+                min_gap = gap
+        last = day
+    return min_gap
+
+
+def _write_summary(csv_path: Path, summary: dict[str, Any]) -> dict[str, Any]:
+    stat = csv_path.stat()
+    summary.update(
+        {
+            "version": SERIES_INDEX_VERSION,
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+    )
+    path = series_index_path(csv_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(summary, ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(path)
+    return summary
+
+
+def write_series_summary(csv_path: Path, dates: Iterable[datetime | date]) -> dict[str, Any] | None:
+    """Record the summary of a freshly written CSV.
+
+    ``dates`` are the bar dates in file order; range reads only seek and stop early when
+    they are non-decreasing.
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        return None
+    days = _to_days(dates)
+    ordered = _is_sorted(days)
+    indexed = ordered and _has_leading_date_column(csv_path)
+    crc, lines, offsets = _scan_lines(csv_path, with_offsets=indexed)
+    days.sort()
+    return _write_summary(
+        csv_path,
+        {
+            "rows": len(days),
+            "first_date": days[0].isoformat() if days else None,
+            "last_date": days[-1].isoformat() if days else None,
+            "min_interval_days": _min_interval(days),
+            "crc32": crc,
+            "sorted": ordered,
+            "lines": lines,
+            "offsets": offsets if indexed else None,
+        },
+    )
+
+
+def append_series_summary(
+    csv_path: Path,
+    dates: Iterable[datetime | date],
+    source_size: int,
+    source_mtime_ns: int,
+) -> dict[str, Any] | None:
+    """Extend the summary after bars dated ``dates`` were appended to the CSV.
+
+    ``source_size``/``source_mtime_ns`` describe the CSV before the append. When the stored
+    summary does not describe exactly that file it is dropped, and readers rebuild it.
+    """
+    csv_path = Path(csv_path)
+    summary = _read_summary(csv_path)
+    if (
+        not summary
+        or summary.get("source_size") != source_size
+        or summary.get("source_mtime_ns") != source_mtime_ns
+    ):
+        series_index_path(csv_path).unlink(missing_ok=True)
+        return None
+    days = _to_days(dates)
+    if not days:
+        return summary
+    last_date = _parse_day(summary.get("last_date"))
+    ordered = bool(summary.get("sorted")) and _is_sorted(days) and (
+        last_date is None or days[0] >= last_date
+    )
+    offsets = summary.get("offsets") if ordered else None
+    crc, lines, new_offsets = _scan_lines(
+        csv_path,
+        source_size,
+        int(summary.get("crc32") or 0),
+        int(summary.get("lines") or 0),
+        with_offsets=offsets is not None,
+    )
+    gaps = [
+        gap
+        for gap in (summary.get("min_interval_days"), _min_interval(days, last_date))
+        if gap is not None
+    ]
+    summary.update(
+        {
+            "rows": int(summary.get("rows") or 0) + len(days),
+            "first_date": summary.get("first_date") or min(days).isoformat(),
+            "last_date": max([*days, *([last_date] if last_date else [])]).isoformat(),
+            "min_interval_days": min(gaps) if gaps else None,
+            "crc32": crc,
+            "sorted": ordered,
+            "lines": lines,
+            "offsets": offsets + new_offsets if offsets is not None else None,
+        }
+    )
+    return _write_summary(csv_path, summary)
+
+
+def _parse_day(value: Any) -> date | None:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _read_summary(csv_path: Path) -> dict[str, Any] | None:
+    path = series_index_path(csv_path)
+    if not path.exists():
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != SERIES_INDEX_VERSION:
+        return None
+    return payload
+
+
+def read_series_summary(csv_path: Path) -> dict[str, Any] | None:
+    """Return the stored summary when it still matches the CSV on disk, else ``None``."""
+    csv_path = Path(csv_path)
+    summary = _read_summary(csv_path)
+    if not summary:
+        return None
+    try:
+        stat = csv_path.stat()
+    except OSError:
+        return None
+    if summary.get("source_size") != stat.st_size or summary.get("source_mtime_ns") != stat.st_mtime_ns:
+        return None
+    summary["first_date"] = _parse_day(summary.get("first_date"))
+    summary["last_date"] = _parse_day(summary.get("last_date"))
+    return summary
+
+
+def _seek_offset(summary: dict[str, Any], start: date) -> int | None:
+    offsets = summary.get("offsets")
+    if not summary.get("sorted") or not offsets:
+        return None
+    keys = [str(item[0]) for item in offsets]
+    # Last indexed line dated strictly before ``start``; every line from there on is a
+    # candidate, earlier ones cannot be in range.
+    index = bisect_left(keys, start.isoformat()) - 1
+    if index < 0:
+        return None
+    return int(offsets[index][1])
+
+
+def iter_series_rows(
+    csv_path: Path,
+    start: datetime | date | None = None,
+    end: datetime | date | None = None,
+) -> Iterator[dict[str, str]]:
+    """Yield CSV rows that may fall in ``[start, end]``, seeking via the offset index.
+
+    Pruning is by calendar day and only applied when a fresh index says the file is sorted,
+    so callers still filter the rows they get back on the exact bounds.
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        return
+    start_day = start.date() if isinstance(start, datetime) else start
+    end_day = end.date() if isinstance(end, datetime) else end
+    summary = read_series_summary(csv_path)
+    ordered = bool(summary and summary.get("sorted"))
+    offset = _seek_offset(summary, start_day) if summary and start_day else None
+    end_text = end_day.isoformat() if end_day and ordered else None
+    with csv_path.open("rb") as raw:
+        header = raw.readline()
+        fieldnames = next(csv.reader([header.decode("utf-8-sig", errors="ignore")]), None)
+        if not fieldnames:
+            return
+        if offset is not None:
+            raw.seek(offset)
+        handle = io.TextIOWrapper(raw, encoding="utf-8", errors="ignore", newline="")
+        for row in csv.DictReader(handle, fieldnames=fieldnames):
+            if end_text is not None and str(row.get("date") or "")[:10] > end_text:
+                break
+            yield row
@@ -20,6 +20,7 @@ from app.services.job_lock import JobLock
 from app.services.ib_settings import derive_client_id, get_or_create_ib_settings
 from app.services.lean_execution import launch_execution_async
 from app.services.trade_orders import update_trade_order_status
+from app.services.trade_run_reconcile import TradeRunReconcileContext
 
 
 _TERMINAL_ORDER_STATUSES = {"FILLED", "CANCELED", "CANCELLED", "REJECTED", "INVALID", "SKIPPED"}
@@ -90,6 +91,7 @@ def reconcile_cancel_requested_orders(
     run_id: int | None = None,
     limit: int = 200,
     now: datetime | None = None,
+    context: TradeRunReconcileContext | None = None,
 ) -> dict[str, int]:
     """Finalize CANCEL_REQUESTED orders based on Lean bridge command_results.
 
@@ -97,16 +99,21 @@ def reconcile_cancel_requested_orders(
     may execute the cancel and write `{output_dir}/command_results/{command_id}.json`.
 
     Without reconciling these results, orders can remain stuck in CANCEL_REQUESTED indefinitely.
+
+    With a run ``context`` the run's preloaded orders are used and left for the caller to commit.
     """
 
     summary = {"checked": 0, "updated": 0, "missing_result": 0, "skipped": 0}
     if session is None:
         return summary
 
-    query = session.query(TradeOrder).filter(TradeOrder.status == "CANCEL_REQUESTED")
-    if run_id is not None:
-        query = query.filter(TradeOrder.run_id == int(run_id))
-    orders = query.order_by(TradeOrder.id.asc()).limit(max(1, int(limit))).all()
+    if context is not None:
+        orders = context.orders_with_status({"CANCEL_REQUESTED"})[: max(1, int(limit))]
+    else:
+        query = session.query(TradeOrder).filter(TradeOrder.status == "CANCEL_REQUESTED")
+        if run_id is not None:
+            query = query.filter(TradeOrder.run_id == int(run_id))
+        orders = query.order_by(TradeOrder.id.asc()).limit(max(1, int(limit))).all()
     if not orders:
         return summary
 
@@ -166,6 +173,7 @@ def reconcile_cancel_requested_orders(
                         "user_cancel_completed_at": event_time,
                     },
                 },
+                commit=context is None,
             )
         except ValueError:
             summary["skipped"] += 1
@@ -19,6 +19,7 @@ from app.models import DecisionSnapshot, TradeFill, TradeOrder, TradeRun, TradeS
 from pathlib import Path
 
 from app.services.job_lock import JobLock
+from app.services.latest_bars import load_latest_closes
 from app.services.trade_guard import (
     evaluate_intraday_guard,
     get_or_create_guard_state,
@@ -53,6 +54,7 @@ from app.services.audit_log import record_audit
 from app.services.trade_execution_targets import resolve_snapshot_execution_targets
 from app.services.trade_open_orders_sync import sync_trade_orders_from_open_orders
 from app.services.trade_run_progress import is_market_open, is_trade_run_stalled, update_trade_run_progress
+from app.services.trade_run_reconcile import TradeRunReconcileContext
 
 
 ARTIFACT_ROOT = Path(settings.artifact_root) if settings.artifact_root else Path("/app/stocklean/artifacts")
@@ -406,52 +408,8 @@ def _quote_price(item: dict[str, Any]) -> float | None:
     return _pick_price(payload if isinstance(payload, dict) else None)
 
 
-def _normalize_symbol_for_filename(symbol: str) -> str:
-    cleaned = re.sub(r"[^A-Z0-9]+", "_", symbol.upper())
-    return cleaned.strip("_")
-
-
-def _find_latest_price_file(root: Path, symbol: str) -> Path | None:
-    if not root.exists():
-        return None
-    normalized = _normalize_symbol_for_filename(symbol)
-    if not normalized:
-        return None
-    matches = sorted(root.glob(f"*_{normalized}_Daily.csv"))
-    if not matches:
-        return None
-    return matches[-1]
-
-
-def _read_latest_close(path: Path) -> float | None:
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            last_row: dict[str, Any] | None = None
-            for row in reader:
-                last_row = row
-        if not last_row:
-            return None
-        close_value = last_row.get("close")
-        if close_value is None or close_value == "":
-            return None
-        return float(close_value)
-    except (OSError, ValueError, TypeError):
-        return None
-
-
 def _load_fallback_prices(symbols: list[str]) -> dict[str, float]:
-    root = _resolve_data_root() / "curated_adjusted"
-    prices: dict[str, float] = {}
-    for symbol in symbols:
-        path = _find_latest_price_file(root, symbol)
-        if not path:
-            continue
-        price = _read_latest_close(path)
-        if price is None or price <= 0:
-            continue
-        prices[symbol] = price
-    return prices
+    return load_latest_closes(_resolve_data_root() / "curated_adjusted", symbols)
 
 
 def _build_price_map(symbols: list[str]) -> dict[str, float]:
@@ -834,6 +792,7 @@ def _dispatch_next_leader_submit_batch(
     run: TradeRun,
     *,
     bridge_root: Path,
+    context: TradeRunReconcileContext | None = None,
 ) -> bool:
     params = dict(run.params or {})
     lean_exec = params.get("lean_execution") if isinstance(params.get("lean_execution"), dict) else {}
@@ -843,12 +802,15 @@ def _dispatch_next_leader_submit_batch(
     if isinstance(fallback_meta, dict) and bool(fallback_meta.get("triggered")):
         return False
 
-    orders = (
-        session.query(TradeOrder)
-        .filter(TradeOrder.run_id == run.id)
-        .order_by(TradeOrder.id.asc())
-        .all()
-    )
+    if context is not None:
+        orders = list(context.orders)
+    else:
+        orders = (
+            session.query(TradeOrder)
+            .filter(TradeOrder.run_id == run.id)
+            .order_by(TradeOrder.id.asc())
+            .all()
+        )
     if not orders:
         return False
     if any(_is_leader_submit_pending_order(order) for order in orders):
@@ -892,14 +854,24 @@ def _dispatch_next_leader_submit_batch(
     return True
 
 
-def _reconcile_submit_command_results(session, run: TradeRun, *, bridge_root: Path) -> int:
+def _reconcile_submit_command_results(
+    session,
+    run: TradeRun,
+    *,
+    bridge_root: Path,
+    context: TradeRunReconcileContext | None = None,
+) -> int:
     updated = 0
-    orders = (
-        session.query(TradeOrder)
-        .filter(TradeOrder.run_id == run.id)
-        .order_by(TradeOrder.id.asc())
-        .all()
-    )
+    commit = context is None
+    if context is not None:
+        orders = list(context.orders)
+    else:
+        orders = (
+            session.query(TradeOrder)
+            .filter(TradeOrder.run_id == run.id)
+            .order_by(TradeOrder.id.asc())
+            .all()
+        )
     for order in orders:
         params = dict(order.params or {})
         submit_meta = params.get("submit_command")
@@ -941,18 +913,21 @@ def _reconcile_submit_command_results(session, run: TradeRun, *, bridge_root: Pa
                         session,
                         order,
                         {"status": "SUBMITTED", "params": payload_params},
+                        commit=commit,
                     )
                 except ValueError:
                     force_update_trade_order_status(
                         session,
                         order,
                         {"status": "SUBMITTED", "params": payload_params},
+                        commit=commit,
                     )
             else:
                 force_update_trade_order_status(
                     session,
                     order,
                     {"status": current or "SUBMITTED", "params": payload_params},
+                    commit=commit,
                 )
             updated += 1
             continue
@@ -974,12 +949,14 @@ def _reconcile_submit_command_results(session, run: TradeRun, *, bridge_root: Pa
                     session,
                     order,
                     {"status": "REJECTED", "params": {**payload_params, "reason": reason}},
+                    commit=commit,
                 )
             except ValueError:
                 force_update_trade_order_status(
                     session,
                     order,
                     {"status": "REJECTED", "params": {**payload_params, "reason": reason}, "rejected_reason": reason},
+                    commit=commit,
                 )
             updated += 1
     return updated
@@ -991,6 +968,7 @@ def _collect_timed_out_submit_pending_orders(
     *,
     now: datetime,
     timeout_seconds: int = _SUBMIT_COMMAND_PENDING_STALLED_SECONDS,
+    context: TradeRunReconcileContext | None = None,
 ) -> dict[str, Any]:
     summary: dict[str, Any] = {
         "checked": 0,
@@ -1023,12 +1001,15 @@ def _collect_timed_out_submit_pending_orders(
                 current_batch_ids = lean_exec.get("current_batch_order_ids")
                 if isinstance(current_batch_ids, list):
                     current_batch_size = len([item for item in current_batch_ids if item is not None])
-    orders = (
-        session.query(TradeOrder)
-        .filter(TradeOrder.run_id == run.id, TradeOrder.status == "NEW")
-        .order_by(TradeOrder.id.asc())
-        .all()
-    )
+    if context is not None:
+        orders = context.orders_with_status({"NEW"})
+    else:
+        orders = (
+            session.query(TradeOrder)
+            .filter(TradeOrder.run_id == run.id, TradeOrder.status == "NEW")
+            .order_by(TradeOrder.id.asc())
+            .all()
+        )
     leader_pending_count = 0
     for order in orders:
         params = dict(order.params or {})
@@ -1104,6 +1085,7 @@ def _clear_leader_submit_pending_after_fallback(
     *,
     resolved_at: datetime,
     reason: str,
+    context: TradeRunReconcileContext | None = None,
 ) -> int:
     resolved = resolved_at
     if resolved.tzinfo is None:
@@ -1112,12 +1094,15 @@ def _clear_leader_submit_pending_after_fallback(
         resolved = resolved.astimezone(timezone.utc)
     resolved_text = resolved.isoformat().replace("+00:00", "Z")
     updated = 0
-    orders = (
-        session.query(TradeOrder)
-        .filter(TradeOrder.run_id == run.id, TradeOrder.status == "NEW")
-        .order_by(TradeOrder.id.asc())
-        .all()
-    )
+    if context is not None:
+        orders = context.orders_with_status({"NEW"})
+    else:
+        orders = (
+            session.query(TradeOrder)
+            .filter(TradeOrder.run_id == run.id, TradeOrder.status == "NEW")
+            .order_by(TradeOrder.id.asc())
+            .all()
+        )
     for order in orders:
         params = dict(order.params or {})
         submit_meta = params.get("submit_command")
@@ -1726,6 +1711,7 @@ def reconcile_run_with_positions(
     positions_payload: dict | None,
     *,
     open_tags: set[str] | None = None,
+    context: TradeRunReconcileContext | None = None,
 ) -> dict[str, int]:
     summary = {"checked": 0, "reconciled": 0, "skipped": 0}
     if run is None or not isinstance(positions_payload, dict):
@@ -1740,7 +1726,11 @@ def reconcile_run_with_positions(
     positions = _build_positions_map(positions_payload)
     if not positions:
         return summary
-    orders = session.query(TradeOrder).filter(TradeOrder.run_id == run.id).all()
+    commit = context is None
+    if context is not None:
+        orders = list(context.orders)
+    else:
+        orders = session.query(TradeOrder).filter(TradeOrder.run_id == run.id).all()
     for order in orders:
         status = _normalize_order_status(order.status)
         params = order.params if isinstance(order.params, dict) else {}
@@ -1793,12 +1783,16 @@ def reconcile_run_with_positions(
         # Idempotency: exec_id is deterministic for a given reconciled filled-quantity watermark.
         watermark = int(round(target_filled * 1_000_000))
         exec_id = f"positions_reconcile:{order.id}:{watermark}"
-        if (
-            session.query(TradeFill)
-            .filter(TradeFill.order_id == order.id, TradeFill.exec_id == exec_id)
-            .first()
-            is not None
-        ):
+        if context is not None:
+            already_reconciled = any(fill.exec_id == exec_id for fill in context.fills(order))
+        else:
+            already_reconciled = (
+                session.query(TradeFill)
+                .filter(TradeFill.order_id == order.id, TradeFill.exec_id == exec_id)
+                .first()
+                is not None
+            )
+        if already_reconciled:
             summary["skipped"] += 1
             continue
         fill_price = pos.get("avg_cost")
@@ -1811,7 +1805,7 @@ def reconcile_run_with_positions(
             continue
         current_status = _normalize_order_status(order.status)
         if current_status == "NEW":
-            update_trade_order_status(session, order, {"status": "SUBMITTED"})
+            update_trade_order_status(session, order, {"status": "SUBMITTED"}, commit=commit)
         total_new = target_filled
         avg_prev = float(order.avg_fill_price or 0.0)
         avg_new = (avg_prev * prev_filled + float(fill_price) * incremental) / total_new
@@ -1839,6 +1833,7 @@ def reconcile_run_with_positions(
                 "avg_fill_price": avg_new,
                 "params": reconcile_params,
             },
+            commit=commit,
         )
         fill = TradeFill(
             order_id=order.id,
@@ -1853,8 +1848,11 @@ def reconcile_run_with_positions(
                 "current_position_quantity": pos_qty,
             },
         )
-        session.add(fill)
-        session.commit()
+        if context is not None:
+            context.add_fill(order, fill)
+        else:
+            session.add(fill)
+            session.commit()
         summary["reconciled"] += 1
     return summary
 
@@ -2210,7 +2208,6 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
         events_path = Path(str(exec_output_dir)) / "execution_events.jsonl"
         if events_path.exists():
             ingest_execution_events(str(events_path), session=session)
-    _reconcile_submit_command_results(session, run, bridge_root=bridge_root)
     # Prefer run-scoped open orders snapshot (correct client-id coverage). Fallback to the
     # leader snapshot when the run snapshot is missing/stale.
     run_root = Path(str(exec_output_dir)) if exec_output_dir else None
@@ -2218,6 +2215,15 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
     leader_open_orders = read_open_orders(bridge_root)
     run_payload_fresh = _is_open_orders_payload_fresh(run_open_orders)
     open_orders_payload = run_open_orders if run_payload_fresh else leader_open_orders
+    # Every reconciliation stage below works on this one load of the run's orders and the
+    # bridge snapshots; their changes are committed together once the stages are done.
+    context = TradeRunReconcileContext(
+        session,
+        run,
+        open_orders_payload=open_orders_payload,
+        positions_payload=read_positions(bridge_root),
+    )
+    _reconcile_submit_command_results(session, run, bridge_root=bridge_root, context=context)
     open_tags = (
         _extract_open_tags(open_orders_payload)
         if _is_open_orders_payload_fresh(open_orders_payload)
@@ -2249,15 +2255,18 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
             run_id=run.id,
             include_new=include_new,
             run_executor_active=executor_alive,
+            context=context,
         )
     # Finalize CANCEL_REQUESTED orders when a cancel worker already processed the request.
     from app.services.trade_cancel import reconcile_cancel_requested_orders
 
-    reconcile_cancel_requested_orders(session, run_id=run.id)
-    positions_payload = read_positions(_resolve_bridge_root())
-    reconcile_run_with_positions(session, run, positions_payload, open_tags=open_tags)
+    reconcile_cancel_requested_orders(session, run_id=run.id, context=context)
+    positions_payload = context.positions_payload
+    reconcile_run_with_positions(session, run, positions_payload, open_tags=open_tags, context=context)
     ib_completed_summary: dict[str, int] = {}
     if _is_open_orders_payload_fresh(open_orders_payload):
+        # Terminalizing resolves IB order refs through the order-tag table.
+        context.flush()
         ib_completed_summary = reconcile_orders_with_ib_completed_status(
             session,
             limit=300,
@@ -2267,6 +2276,7 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
             open_tags=open_tags,
             missing_min_age_seconds=_IB_COMPLETED_RECONCILE_MISSING_MIN_AGE_SECONDS,
             leader_submitted_only=True,
+            orders=context.orders,
         )
     if any(int(ib_completed_summary.get(key) or 0) > 0 for key in ("candidates", "terminalized", "errors")):
         params = dict(run.params or {})
@@ -2281,7 +2291,9 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
         run,
         now=now,
         timeout_seconds=_SUBMIT_COMMAND_PENDING_STALLED_SECONDS,
+        context=context,
     )
+    context.commit()
     if pending_summary["timed_out"] > 0 and active_status in {"running", "stalled"}:
         params = dict(run.params or {})
         lean_exec = params.get("lean_execution") if isinstance(params.get("lean_execution"), dict) else {}
@@ -2348,6 +2360,7 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
         session,
         run,
         bridge_root=bridge_root,
+        context=context,
     ):
         return True
     if active_status == "stalled":
@@ -2374,6 +2387,7 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
                 run,
                 resolved_at=resumed_at,
                 reason="fallback_auto_resume",
+                context=context,
             )
             fallback_payload = dict(fallback_meta)
             fallback_payload["auto_resumed_at"] = resumed_at.isoformat().replace("+00:00", "Z")
@@ -2401,12 +2415,7 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
         cancelled = 0
         filled = 0
         update_trade_run_progress(session, run, "order_rejected", reason=reason, commit=True)
-        for order in (
-            session.query(TradeOrder)
-            .filter(TradeOrder.run_id == run.id)
-            .order_by(TradeOrder.id.asc())
-            .all()
-        ):
+        for order in context.orders:
             status = str(order.status or "").strip().upper()
             if status == "FILLED":
                 filled += 1
@@ -2530,12 +2539,7 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
             # for the purpose of detecting already-held targets.
             baseline = {symbol: float(item.get("quantity") or 0.0) for symbol, item in positions_map.items()}
         update_trade_run_progress(session, run, "no_orders_submitted", reason="lean_execution", commit=True)
-        for order in (
-            session.query(TradeOrder)
-            .filter(TradeOrder.run_id == run.id)
-            .order_by(TradeOrder.id.asc())
-            .all()
-        ):
+        for order in context.orders:
             status = str(order.status or "").strip().upper()
             if isinstance(order.params, dict) and order.params.get("already_held") is True:
                 symbol = str(order.symbol or "").strip().upper()
@@ -2626,10 +2630,7 @@ def refresh_trade_run_status(session, run: TradeRun) -> bool:
             detail={"cancelled": cancelled},
         )
         return True
-    statuses = [
-        row[0]
-        for row in session.query(TradeOrder.status).filter(TradeOrder.run_id == run.id).all()
-    ]
+    statuses = [order.status for order in context.orders]
     status, summary = determine_run_status(statuses)
     if status is None:
         if active_status != "running":
@@ -5,6 +5,7 @@ from typing import Any
 
 from app.models import TradeOrder, TradeRun
 from app.services.trade_orders import force_update_trade_order_status, update_trade_order_status
+from app.services.trade_run_reconcile import TradeRunReconcileContext
 
 
 _ACTIVE_ORDER_STATUSES = {"SUBMITTED", "PARTIAL", "CANCEL_REQUESTED"}
@@ -271,6 +272,7 @@ def _persist_order_params(
     *,
     updates: dict[str, Any] | None = None,
     remove_keys: set[str] | None = None,
+    commit: bool = True,
 ) -> bool:
     merged = dict(order.params or {})
     changed = False
@@ -286,8 +288,9 @@ def _persist_order_params(
         return False
     order.params = merged
     order.updated_at = datetime.utcnow()
-    session.commit()
-    session.refresh(order)
+    if commit:
+        session.commit()
+        session.refresh(order)
     return True
 
 
@@ -301,12 +304,16 @@ def sync_trade_orders_from_open_orders(
     include_new: bool = False,
     now: datetime | None = None,
     run_executor_active: bool | None = None,
+    context: TradeRunReconcileContext | None = None,
 ) -> dict[str, Any]:
     """Reconcile TradeOrder.status with IB open orders snapshot from Lean bridge.
 
     If an order is ACTIVE in DB but its tag is absent from the open-orders snapshot,
     we treat it as canceled (covers manual cancellations from TWS when execution client
     is no longer connected).
+
+    With a run ``context`` the run's preloaded orders are reconciled in memory and left
+    for the caller to commit.
     """
     mode_value = str(mode or "").strip().lower()
     summary: dict[str, Any] = {
@@ -370,12 +377,16 @@ def sync_trade_orders_from_open_orders(
     # Recovery: if we previously marked orders as canceled due to a stale/empty open-orders snapshot,
     # but IB still reports them as open now, we need to reconcile back to SUBMITTED.
     statuses.update(_RECOVERABLE_TERMINAL_STATUSES)
-    query = session.query(TradeOrder).filter(TradeOrder.status.in_(sorted(statuses)))
-    if run_id is not None:
-        query = query.filter(TradeOrder.run_id == int(run_id))
-    elif manual_only:
-        query = query.filter(TradeOrder.run_id.is_(None))
-    orders = query.order_by(TradeOrder.id.asc()).all()
+    commit = context is None
+    if context is not None:
+        orders = context.orders_with_status(statuses)
+    else:
+        query = session.query(TradeOrder).filter(TradeOrder.status.in_(sorted(statuses)))
+        if run_id is not None:
+            query = query.filter(TradeOrder.run_id == int(run_id))
+        elif manual_only:
+            query = query.filter(TradeOrder.run_id.is_(None))
+        orders = query.order_by(TradeOrder.id.asc()).all()
 
     # IB "GetOpenOrders" is client-id scoped. When listing orders across all runs, we can't
     # safely infer broker-side cancels from missing tags because the snapshot may omit orders
@@ -402,7 +413,12 @@ def sync_trade_orders_from_open_orders(
     run_modes: dict[int, str] = {}
     run_statuses: dict[int, str] = {}
     if run_ids:
-        for run in session.query(TradeRun).filter(TradeRun.id.in_(sorted(run_ids))).all():
+        runs = (
+            [context.run]
+            if context is not None
+            else session.query(TradeRun).filter(TradeRun.id.in_(sorted(run_ids))).all()
+        )
+        for run in runs:
             run_id_value = int(run.id)
             run_modes[run_id_value] = str(run.mode or "").strip().lower()
             run_statuses[run_id_value] = str(run.status or "").strip().upper()
@@ -457,9 +473,10 @@ def sync_trade_orders_from_open_orders(
                         _OPEN_ORDERS_MISSING_LAST_SEEN_KEY,
                         _OPEN_ORDERS_MISSING_UNCONFIRMED_KEY,
                     },
+                    commit=commit,
                 )
             elif direct_seen_updates:
-                _persist_order_params(session, order, updates=direct_seen_updates)
+                _persist_order_params(session, order, updates=direct_seen_updates, commit=commit)
             open_item = open_by_tag.get(tag) or {}
             open_status = _normalize_open_order_status(open_item.get("status"))
             if open_status in _CANCELED_OPEN_ORDER_STATUSES:
@@ -489,6 +506,7 @@ def sync_trade_orders_from_open_orders(
                                     "sync_reason": "open_order_reports_canceled",
                                 },
                             },
+                            commit=commit,
                         )
                     except ValueError:
                         summary["skipped"] += 1
@@ -512,6 +530,7 @@ def sync_trade_orders_from_open_orders(
                                 "sync_reason": "present_in_open_orders",
                             },
                         },
+                        commit=commit,
                     )
                 except ValueError:
                     summary["skipped"] += 1
@@ -535,6 +554,7 @@ def sync_trade_orders_from_open_orders(
                                 "sync_reason": "present_in_open_orders_recovered",
                             },
                         },
+                        commit=commit,
                     )
                 except ValueError:
                     summary["skipped"] += 1
@@ -570,6 +590,7 @@ def sync_trade_orders_from_open_orders(
                             _OPEN_ORDERS_MISSING_UNCONFIRMED_KEY: True,
                         },
                     },
+                    commit=commit,
                 )
             except ValueError:
                 summary["skipped"] += 1
@@ -712,6 +733,7 @@ def sync_trade_orders_from_open_orders(
                                     "open_orders_missing_age_seconds": round(float(order_age), 3),
                                 },
                             },
+                            commit=commit,
                         )
                     except ValueError:
                         summary["skipped"] += 1
@@ -724,6 +746,7 @@ def sync_trade_orders_from_open_orders(
                     session,
                     order,
                     updates={_OPEN_ORDERS_MISSING_SINCE_KEY: event_time},
+                    commit=commit,
                 )
                 summary["skipped"] += 1
                 summary["skipped_missing_grace"] += 1
@@ -756,6 +779,7 @@ def sync_trade_orders_from_open_orders(
                                 "open_orders_missing_age_seconds": round(float(missing_age), 3),
                             },
                         },
+                        commit=commit,
                     )
                 except ValueError:
                     summary["skipped"] += 1
@@ -780,6 +804,7 @@ def sync_trade_orders_from_open_orders(
                     session,
                     order,
                     updates=unconfirmed_updates,
+                    commit=commit,
                 )
             summary["skipped"] += 1
             summary["skipped_missing_unconfirmed"] += 1
@@ -817,6 +842,7 @@ def sync_trade_orders_from_open_orders(
                                 _OPEN_ORDERS_MISSING_UNCONFIRMED_KEY: True,
                             },
                         },
+                        commit=commit,
                     )
                 except ValueError:
                     summary["skipped"] += 1
@@ -847,6 +873,7 @@ def sync_trade_orders_from_open_orders(
                         "sync_reason": "missing_from_open_orders",
                     },
                 },
+                commit=commit,
             )
         except ValueError:
             summary["skipped"] += 1
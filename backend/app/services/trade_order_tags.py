@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import and_, delete, event, func, inspect, or_, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, object_session
+
+from app.models import TradeOrder, TradeOrderTag
+
+# Every tag an execution event may carry for an order, normalized into `trade_order_tags`
+# so resolving an event is one probe on (tag, kind) instead of scanning order params.
+# Rows are written by mapper events whenever a TradeOrder is inserted or its tag-bearing
+# columns change, so every ORM write path keeps the table current.
+#
+# Kinds:
+#   client  - TradeOrder.client_order_id (intent ids `oi_*`, manual ids, direct tags)
+#   event   - params["event_tag"], for orders outside a trade run
+#   broker  - params["broker_order_tag"], for orders outside a trade run
+#   intent  - params["order_intent_id"] (snapshot tagged runs)
+#   perm    - TradeOrder.ib_perm_id
+#
+# A (tag, kind) pair points at the newest (highest id) order carrying it, matching the
+# newest-first scans this table replaces and the backfill in the MySQL patch. The takeover
+# is an upsert on the (tag, kind) key that never moves a tag to an older order, so updating
+# an older order leaves the tag alone, a write only ever deletes its own order's rows and
+# concurrent flushes never delete each other's. app.services.trade_orders imports this module, which registers
+# the listeners.
+
+TAG_KINDS = ("client", "event", "broker", "intent", "perm")
+_TAG_MAX_LEN = 128
+# Positional order matches _tags_from_values.
+_TRACKED_ATTRS = ("client_order_id", "params", "ib_perm_id", "run_id")
+_TAGS = TradeOrderTag.__table__
+# session.info key of the orders _repair_unchanged_tags checks after a flush.
+_UNCHANGED_KEY = "trade_order_tags_unchanged"
+
+
+def _normalize_tag(value: object) -> str:
+    text = str(value or "").strip()
+    if not text or len(text) > _TAG_MAX_LEN:
+        return ""
+    return text
+
+
+def _tags_from_values(client_order_id, params, ib_perm_id, run_id) -> dict[str, str]:
+    params = params if isinstance(params, dict) else {}
+    tags = {
+        "client": _normalize_tag(client_order_id),
+        "intent": _normalize_tag(params.get("order_intent_id")),
+    }
+    if run_id is None:
+        tags["event"] = _normalize_tag(params.get("event_tag"))
+        tags["broker"] = _normalize_tag(params.get("broker_order_tag"))
+    try:
+        perm_id = int(ib_perm_id or 0)
+    except (TypeError, ValueError):
+        perm_id = 0
+    if perm_id > 0:
+        tags["perm"] = str(perm_id)
+    return {kind: tag for kind, tag in tags.items() if tag}
+
+
+def order_tags(order: TradeOrder) -> dict[str, str]:
+    return _tags_from_values(order.client_order_id, order.params, order.ib_perm_id, order.run_id)
+
+
+def _previous_tags(order: TradeOrder) -> dict[str, str] | None:
+    """Tags before the pending update, from attribute history; None when not loaded."""
+    state = inspect(order)
+    values = []
+    for name in _TRACKED_ATTRS:
+        history = state.attrs[name].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            # Never loaded, or set without loading the previous value.
+            return None
+    return _tags_from_values(*values)
+
+
+def _claim_tags(connection, rows: list[dict[str, object]]) -> None:
+    """Insert tag rows; a (tag, kind) held by an older order moves, one held by a newer stays."""
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(_TAGS).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            order_id=func.greatest(_TAGS.c.order_id, stmt.inserted.order_id)
+        )
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(_TAGS).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tag", "kind"],
+            set_={"order_id": stmt.excluded.order_id, "updated_at": stmt.excluded.updated_at},
+            where=stmt.excluded.order_id > _TAGS.c.order_id,
+        )
+    else:
+        holders = _tag_holders(connection, [(row["tag"], row["kind"]) for row in rows])
+        rows = [row for row in rows if holders.get((row["tag"], row["kind"]), 0) < row["order_id"]]
+        if not rows:
+            return
+        connection.execute(
+            delete(_TAGS).where(
+                or_(*(and_(_TAGS.c.tag == row["tag"], _TAGS.c.kind == row["kind"]) for row in rows))
+            )
+        )
+        stmt = _TAGS.insert().values(rows)
+    connection.execute(stmt)
+
+
+def _tag_holders(connection, pairs: list[tuple[str, str]]) -> dict[tuple[str, str], int]:
+    """`{(tag, kind): order_id}` of the rows currently holding ``pairs``."""
+    wanted = set(pairs)
+    holders: dict[tuple[str, str], int] = {}
+    tags = sorted({tag for tag, _ in wanted})
+    for start in range(0, len(tags), 500):
+        rows = connection.execute(
+            select(_TAGS.c.tag, _TAGS.c.kind, _TAGS.c.order_id).where(
+                _TAGS.c.tag.in_(tags[start : start + 500])
+            )
+        )
+        for tag, kind, order_id in rows:
+            if (tag, kind) in wanted:
+                holders[(tag, kind)] = int(order_id)
+    return holders
+
+
+def sync_order_tags(
+    connection,
+    order: TradeOrder,
+    previous: dict[str, str] | None = None,
+    desired: dict[str, str] | None = None,
+) -> None:
+    """Bring the order's rows in line with its current tags.
+
+    ``previous`` is what the table holds for the order (known on insert or from attribute
+    history); without it the rows are read first. ``desired`` defaults to the order's tags.
+    """
+    if order.id is None:
+        return
+    if desired is None:
+        desired = order_tags(order)
+    if previous is not None:
+        existing = previous
+    else:
+        existing = {
+            row.kind: row.tag
+            for row in connection.execute(
+                select(_TAGS.c.kind, _TAGS.c.tag).where(_TAGS.c.order_id == order.id)
+            )
+        }
+    stale = [kind for kind, tag in existing.items() if desired.get(kind) != tag]
+    added = {kind: tag for kind, tag in desired.items() if existing.get(kind) != tag}
+    if not stale and not added:
+        return
+    # Clears the order's own slot for every changed kind (order_id, kind is unique too).
+    connection.execute(
+        delete(_TAGS).where(_TAGS.c.order_id == order.id, _TAGS.c.kind.in_(stale + list(added)))
+    )
+    if added:
+        now = datetime.utcnow()
+        _claim_tags(
+            connection,
+            [
+                {"tag": tag, "kind": kind, "order_id": order.id, "updated_at": now}
+                for kind, tag in added.items()
+            ],
+        )
+
+
+@event.listens_for(TradeOrder, "after_insert")
+def _tags_after_insert(_mapper, connection, target: TradeOrder) -> None:
+    sync_order_tags(connection, target, previous={})
+
+
+@event.listens_for(TradeOrder, "after_update")
+def _tags_after_update(_mapper, connection, target: TradeOrder) -> None:
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in _TRACKED_ATTRS):
+        return
+    previous = _previous_tags(target)
+    if previous is not None and previous == order_tags(target):
+        # History says nothing changed, which only holds if the rows exist. Orders whose rows
+        # may be missing (written before the table, or lost) are checked together after the
+        # flush, one query for the whole batch instead of one per order.
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_UNCHANGED_KEY, {})[target.id] = target
+            return
+    sync_order_tags(connection, target, previous=previous)
+
+
+@event.listens_for(Session, "after_flush")
+def _repair_unchanged_tags(session, _flush_context) -> None:
+    orders = session.info.pop(_UNCHANGED_KEY, None) or {}
+    orders = {order_id: order for order_id, order in orders.items() if not inspect(order).was_deleted}
+    if not orders:
+        return
+    connection = session.connection()
+    ids = sorted(orders)
+    desired = {order_id: order_tags(orders[order_id]) for order_id in ids}
+    held: dict[int, dict[str, str]] = {}
+    for start in range(0, len(ids), 500):
+        rows = connection.execute(
+            select(_TAGS.c.order_id, _TAGS.c.kind, _TAGS.c.tag).where(
+                _TAGS.c.order_id.in_(ids[start : start + 500])
+            )
+        )
+        for order_id, kind, tag in rows:
+            held.setdefault(order_id, {})[kind] = tag
+    missing = {
+        order_id: {kind: tag for kind, tag in tags.items() if held.get(order_id, {}).get(kind) != tag}
+        for order_id, tags in desired.items()
+    }
+    holders = _tag_holders(
+        connection,
+        [(tag, kind) for tags in missing.values() for kind, tag in tags.items()],
+    )
+    for order_id in ids:
+        # A tag a newer order holds stays with that order.
+        claimed = {
+            kind for kind, tag in missing[order_id].items() if holders.get((tag, kind), 0) > order_id
+        }
+        tags = {kind: tag for kind, tag in desired[order_id].items() if kind not in claimed}
+        sync_order_tags(connection, orders[order_id], previous=held.get(order_id, {}), desired=tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_unchanged_tags(session, _previous_transaction) -> None:
+    session.info.pop(_UNCHANGED_KEY, None)
+
+
+@event.listens_for(TradeOrder, "before_delete")
+def _tags_before_delete(_mapper, connection, target: TradeOrder) -> None:
+    connection.execute(delete(_TAGS).where(_TAGS.c.order_id == target.id))
+
+
+def resolve_order_ids_by_tags(
+    session, tags: Iterable[str], kinds: Iterable[str] = TAG_KINDS
+) -> dict[str, dict[str, int]]:
+    """`{tag: {kind: order_id}}` for every known tag among ``tags``."""
+    wanted = sorted({tag for tag in (_normalize_tag(value) for value in tags) if tag})
+    kind_list = list(kinds)
+    resolved: dict[str, dict[str, int]] = {}
+    for start in range(0, len(wanted), 500):
+        rows = (
+            session.query(TradeOrderTag.tag, TradeOrderTag.kind, TradeOrderTag.order_id)
+            .filter(TradeOrderTag.tag.in_(wanted[start : start + 500]), TradeOrderTag.kind.in_(kind_list))
+            .all()
+        )
+        for tag, kind, order_id in rows:
+            resolved.setdefault(tag, {})[kind] = int(order_id)
+    return resolved
+
+
+def resolve_order_by_tag(session, tag: str, kinds: Iterable[str] = ("client", "event", "broker")) -> TradeOrder | None:
+    """First order matching ``tag``, trying ``kinds`` in order."""
+    normalized = _normalize_tag(tag)
+    if not normalized:
+        return None
+    kind_list = list(kinds)
+    rows = (
+        session.query(TradeOrderTag.kind, TradeOrderTag.order_id)
+        .filter(TradeOrderTag.tag == normalized, TradeOrderTag.kind.in_(kind_list))
+        .all()
+    )
+    by_kind = {kind: order_id for kind, order_id in rows}
+    for kind in kind_list:
+        if kind in by_kind:
+            return session.get(TradeOrder, by_kind[kind])
+    return None
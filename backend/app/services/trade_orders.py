@@ -8,6 +8,8 @@ from typing import Any
 from sqlalchemy import func
 
 from app.models import TradeOrder, TradeOrderClientIdSeq, TradeRun
+from app.services import trade_order_tags  # noqa: F401 - keeps trade_order_tags in sync on flush
+from app.services import pipeline_run_index  # noqa: F401 - keeps pipeline_runs in sync on flush
 from app.services.trade_run_progress import update_trade_run_progress
 from app.services.trade_order_types import is_limit_like, validate_order_type
 
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import csv
 import os
-import re
 from pathlib import Path
 from typing import Any
 
 from app.core.config import settings
+from app.services.latest_bars import load_latest_closes
 from app.services.lean_bridge_paths import resolve_bridge_root
 from app.services.lean_bridge_reader import read_quotes
 
@@ -36,54 +35,8 @@ def _resolve_data_root() -> Path:
     return Path("/data/share/stock/data")
 
 
-def _normalize_symbol_for_filename(symbol: str) -> str:
-    cleaned = re.sub(r"[^A-Z0-9]+", "_", str(symbol or "").strip().upper())
-    return cleaned.strip("_")
-
-
-def _find_latest_price_file(root: Path, symbol: str) -> Path | None:
-    if not root.exists():
-        return None
-    normalized = _normalize_symbol_for_filename(symbol)
-    if not normalized:
-        return None
-    matches = sorted(root.glob(f"*_{normalized}_Daily.csv"))
-    if not matches:
-        return None
-    return matches[-1]
-
-
-def _read_latest_close(path: Path) -> float | None:
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            last_row: dict[str, Any] | None = None
-            for row in reader:
-                last_row = row
-        if not last_row:
-            return None
-        close_value = last_row.get("close")
-        if close_value in (None, ""):
-            return None
-        picked = float(close_value)
-        if picked <= 0:
-            return None
-        return picked
-    except (OSError, TypeError, ValueError):
-        return None
-
-
 def _load_fallback_prices(symbols: list[str]) -> dict[str, float]:
-    root = _resolve_data_root() / "curated_adjusted"
-    prices: dict[str, float] = {}
-    for symbol in symbols:
-        path = _find_latest_price_file(root, symbol)
-        if not path:
-            continue
-        picked = _read_latest_close(path)
-        if picked is not None and picked > 0:
-            prices[symbol] = picked
-    return prices
+    return load_latest_closes(_resolve_data_root() / "curated_adjusted", symbols)
 
 
 def build_price_seed_map(symbols: list[str]) -> dict[str, float]:
@@ -4,17 +4,25 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 import json
 from pathlib import Path
+import threading
 from typing import Iterable
 
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.exc import IntegrityError
+
 from app.core.config import settings
-from app.models import TradeFill, TradeOrder, TradeRun
+from app.models import LeanEventCursor, TradeFill, TradeOrder, TradeRun
 from app.services.ib_orders import apply_fill_to_order
 from app.services.trade_orders import create_trade_order
 from app.services.trade_orders import update_trade_order_status
+from app.services.trade_order_tags import resolve_order_ids_by_tags
 from app.services.lean_bridge_paths import resolve_bridge_root
 from app.services.lean_bridge_reader import read_positions
 from app.services.realized_pnl import compute_realized_pnl
-from app.services.realized_pnl_baseline import ensure_positions_baseline
+from app.services.realized_pnl_baseline import ensure_positions_baseline, realized_pnl_ledger_path
+
+
+_INGEST_LOCK = threading.Lock()
 
 
 @dataclass
@@ -133,19 +141,19 @@ def _resolve_snapshot_order_id(
     run_ids = [row[0] for row in query.order_by(TradeRun.id.desc()).all()]
     if not run_ids:
         return None
-    order_query = session.query(TradeOrder).filter(TradeOrder.run_id.in_(run_ids))
+    order_query = session.query(TradeOrder.id).filter(TradeOrder.run_id.in_(run_ids))
     if symbol:
         order_query = order_query.filter(TradeOrder.symbol == symbol)
     if side:
         order_query = order_query.filter(TradeOrder.side == side)
-    candidates = order_query.order_by(TradeOrder.created_at.desc(), TradeOrder.id.desc()).all()
-    for order in candidates:
-        params = order.params or {}
-        if tag and params.get("order_intent_id") == tag:
-            return order.id
-    if candidates:
-        return candidates[0].id
-    return None
+    if tag:
+        intent_ids = resolve_order_ids_by_tags(session, [tag], kinds=("intent",)).get(str(tag).strip())
+        if intent_ids:
+            matched = order_query.filter(TradeOrder.id == intent_ids["intent"]).first()
+            if matched:
+                return int(matched[0])
+    latest = order_query.order_by(TradeOrder.created_at.desc(), TradeOrder.id.desc()).first()
+    return int(latest[0]) if latest else None
 
 
 def _resolve_order_id(event_path: Path, payload: dict, session=None) -> int | None:
@@ -255,17 +263,30 @@ def _iter_event_files(root: Path) -> Iterable[Path]:
     return root.glob("**/execution_events.jsonl")
 
 
+def _fill_event_key(order_id: int, event_time_iso: str) -> str:
+    return f"lean:{order_id}:{event_time_iso}"
+
+
 def _fill_exists(
     session,
     *,
     order_id: int,
+    event_key: str,
     fill_qty: float,
     fill_price: float,
     event_time_iso: str,
 ) -> bool:
+    if session.query(TradeFill.id).filter(TradeFill.event_key == event_key).first() is not None:
+        return True
+    # Fills without a key (IB callbacks, rows ingested before keys existed) are matched the
+    # old way; only those rows of the order are scanned.
     incoming_qty = abs(float(fill_qty or 0.0))
     incoming_price = float(fill_price or 0.0)
-    fills = session.query(TradeFill).filter(TradeFill.order_id == order_id).all()
+    fills = (
+        session.query(TradeFill)
+        .filter(TradeFill.order_id == order_id, TradeFill.event_key.is_(None))
+        .all()
+    )
     for fill in fills:
         params = fill.params or {}
         if event_time_iso and params.get("event_time") == event_time_iso:
@@ -290,229 +311,402 @@ def _append_warning(warnings: list[str], code: str) -> None:
         warnings.append(code)
 
 
-def _ingest_lean_events(session, warnings: list[str]) -> None:
-    bridge_root = resolve_bridge_root()
-    if not bridge_root.exists():
-        _append_warning(warnings, "lean_logs_missing")
-        return
-
-    seen_fill_keys: set[str] = set()
-
-    for event_path in _iter_event_files(bridge_root):
-        try:
-            raw_lines = event_path.read_text(encoding="utf-8").splitlines()
-        except OSError:
-            _append_warning(warnings, "lean_logs_read_error")
-            continue
-        for line in raw_lines:
-            text = line.strip()
-            if not text:
-                continue
-            try:
-                payload = json.loads(text)
-            except json.JSONDecodeError:
-                _append_warning(warnings, "lean_logs_parse_error")
-                continue
+def _ingest_event(
+    session,
+    event_path: Path,
+    payload: dict,
+    warnings: list[str],
+    seen_fill_keys: set[str],
+) -> bool:
+    """Apply one execution event; ``False`` when its transaction had to be rolled back."""
+    order_id = _resolve_order_id(event_path, payload, session=session)
+    if order_id is None:
+        # Only warn when the event carries a non-empty tag we failed to resolve.
+        # Some legacy logs (and certain edge cases) omit tags entirely; those cannot be
+        # reliably linked back to a local TradeOrder and should not spam the UI.
+        tag_value = str(payload.get("tag") or "").strip()
+        if not tag_value:
+            return True
+        if tag_value.startswith("oi_"):
+            # Older runs might have lean execution events before TradeOrder rows existed.
+            # If we can infer the run, create a placeholder order so receipts stay consistent.
+            created_id = _ensure_order_for_intent_tag(
+                session,
+                intent_id=tag_value,
+                payload=payload,
+            )
+            if created_id is not None:
+                order_id = created_id
+            else:
+                # Ignore orphan intent tags from deleted runs to keep UI warnings actionable.
+                return True
+        else:
+            _append_warning(warnings, "lean_event_missing_order")
+        return True
 
-            order_id = _resolve_order_id(event_path, payload, session=session)
-            if order_id is None:
-                # Only warn when the event carries a non-empty tag we failed to resolve.
-                # Some legacy logs (and certain edge cases) omit tags entirely; those cannot be
-                # reliably linked back to a local TradeOrder and should not spam the UI.
-                tag_value = str(payload.get("tag") or "").strip()
-                if not tag_value:
-                    continue
-                if tag_value.startswith("oi_"):
-                    # Older runs might have lean execution events before TradeOrder rows existed.
-                    # If we can infer the run, create a placeholder order so receipts stay consistent.
-                    created_id = _ensure_order_for_intent_tag(
-                        session,
-                        intent_id=tag_value,
-                        payload=payload,
-                    )
-                    if created_id is not None:
-                        order_id = created_id
-                    else:
-                        # Ignore orphan intent tags from deleted runs to keep UI warnings actionable.
-                        continue
-                else:
-                    _append_warning(warnings, "lean_event_missing_order")
-                continue
+    order = session.get(TradeOrder, order_id)
+    if order is None:
+        _append_warning(warnings, "lean_event_order_not_found")
+        return True
 
-            order = session.get(TradeOrder, order_id)
-            if order is None:
-                _append_warning(warnings, "lean_event_order_not_found")
-                continue
+    status = _normalize_status(payload.get("status"))
+    filled = payload.get("filled")
+    try:
+        fill_qty = abs(float(filled or 0.0))
+    except (TypeError, ValueError):
+        fill_qty = 0.0
+    fill_price = payload.get("fill_price")
+    try:
+        fill_price_value = float(fill_price) if fill_price is not None else 0.0
+    except (TypeError, ValueError):
+        fill_price_value = 0.0
+    event_time = _parse_time(payload.get("time")) or datetime.utcnow().replace(tzinfo=timezone.utc)
+    event_time_iso = _to_iso(event_time)
+    event_tag = payload.get("tag")
+    reason = payload.get("reason") or payload.get("message")
 
-            status = _normalize_status(payload.get("status"))
-            filled = payload.get("filled")
-            try:
-                fill_qty = abs(float(filled or 0.0))
-            except (TypeError, ValueError):
-                fill_qty = 0.0
-            fill_price = payload.get("fill_price")
+    if status in {"SUBMITTED", "NEW"}:
+        if str(order.status or "").strip().upper() in {"NEW", "SUBMITTED"}:
             try:
-                fill_price_value = float(fill_price) if fill_price is not None else 0.0
-            except (TypeError, ValueError):
-                fill_price_value = 0.0
-            event_time = _parse_time(payload.get("time")) or datetime.utcnow().replace(tzinfo=timezone.utc)
-            event_time_iso = _to_iso(event_time)
-            event_tag = payload.get("tag")
-            reason = payload.get("reason") or payload.get("message")
-
-            if status in {"SUBMITTED", "NEW"}:
-                if str(order.status or "").strip().upper() in {"NEW", "SUBMITTED"}:
-                    try:
-                        update_trade_order_status(
-                            session,
-                            order,
-                            {
-                                "status": "SUBMITTED",
-                                "params": {
-                                    "event_time": event_time_iso,
-                                    "event_status": status,
-                                    "event_source": "lean",
-                                    "event_tag": event_tag,
-                                },
-                            },
-                        )
-                    except ValueError:
-                        _append_warning(warnings, "lean_event_status_transition")
-                continue
-
-            if status in {"CANCELED", "CANCELLED"}:
-                if str(order.status or "").strip().upper() not in {"CANCELED", "CANCELLED", "REJECTED"}:
-                    try:
-                        update_trade_order_status(
-                            session,
-                            order,
-                            {
-                                "status": "CANCELED",
-                                "params": {
-                                    "event_time": event_time_iso,
-                                    "event_status": status,
-                                    "event_source": "lean",
-                                    "event_tag": event_tag,
-                                },
-                            },
-                        )
-                    except ValueError:
-                        _append_warning(warnings, "lean_event_status_transition")
-                continue
-
-            if status in {"REJECTED", "INVALID"}:
-                if str(order.status or "").strip().upper() != "REJECTED":
-                    try:
-                        update_payload = {
-                            "status": "REJECTED",
-                            "params": {
-                                "event_time": event_time_iso,
-                                "event_status": status,
-                                "event_source": "lean",
-                                "event_tag": event_tag,
-                            },
-                        }
-                        if reason:
-                            update_payload["params"]["reason"] = reason
-                        update_trade_order_status(session, order, update_payload)
-                    except ValueError:
-                        _append_warning(warnings, "lean_event_status_transition")
-                continue
-
-            if status in {"FILLED", "PARTIALLYFILLED", "PARTIAL"} or fill_qty > 0:
-                current_filled = abs(float(order.filled_quantity or 0.0))
-                fill_delta = fill_qty
-                # Lean bridge direct events report cumulative filled quantity. Convert to
-                # incremental delta against the currently persisted order quantity.
-                if current_filled > 0 and fill_qty > current_filled:
-                    fill_delta = fill_qty - current_filled
-                elif current_filled > 0 and fill_qty <= current_filled:
-                    fill_delta = 0.0
-
-                if fill_delta <= 0:
-                    if status == "FILLED" and str(order.status or "").strip().upper() != "FILLED":
-                        filled_total = max(current_filled, float(fill_qty or 0.0))
-                        try:
-                            update_trade_order_status(
-                                session,
-                                order,
-                                {
-                                    "status": "FILLED",
-                                    "filled_quantity": filled_total,
-                                    "params": {
-                                        "event_time": event_time_iso,
-                                        "event_status": status,
-                                        "event_source": "lean",
-                                        "event_tag": event_tag,
-                                    },
-                                },
-                            )
-                        except ValueError:
-                            _append_warning(warnings, "lean_event_status_transition")
-                    continue
-                fill_key = f"{order_id}:{fill_delta}:{fill_price_value}:{event_time_iso}"
-                if fill_key in seen_fill_keys:
-                    continue
-                seen_fill_keys.add(fill_key)
-                if _fill_exists(
-                    session,
-                    order_id=order_id,
-                    fill_qty=fill_delta,
-                    fill_price=fill_price_value,
-                    event_time_iso=event_time_iso,
-                ):
-                    if status == "FILLED" and str(order.status or "").strip().upper() != "FILLED":
-                        filled_total = max(float(order.filled_quantity or 0.0), float(fill_qty or 0.0))
-                        update_payload = {"status": "FILLED", "filled_quantity": filled_total}
-                        if order.avg_fill_price is None and fill_price_value:
-                            update_payload["avg_fill_price"] = float(fill_price_value)
-                        try:
-                            update_trade_order_status(session, order, update_payload)
-                        except ValueError:
-                            _append_warning(warnings, "lean_event_status_transition")
-                    continue
-                if str(order.status or "").strip().upper() == "FILLED":
-                    _append_warning(warnings, "lean_event_duplicate_fill")
-                    continue
-                fill = apply_fill_to_order(
+                update_trade_order_status(
                     session,
                     order,
-                    fill_qty=fill_delta,
-                    fill_price=fill_price_value,
-                    fill_time=_ensure_aware(event_time) or datetime.utcnow().replace(tzinfo=timezone.utc),
-                )
-                fill_params = dict(fill.params or {})
-                fill_params.update(
                     {
-                        "event_time": event_time_iso,
-                        "event_source": "lean",
-                        "event_tag": event_tag,
-                    }
+                        "status": "SUBMITTED",
+                        "params": {
+                            "event_time": event_time_iso,
+                            "event_status": status,
+                            "event_source": "lean",
+                            "event_tag": event_tag,
+                        },
+                    },
                 )
-                if reason:
-                    fill_params["reason"] = reason
-                fill.params = fill_params
-                _update_order_params(
+            except ValueError:
+                _append_warning(warnings, "lean_event_status_transition")
+        return True
+
+    if status in {"CANCELED", "CANCELLED"}:
+        if str(order.status or "").strip().upper() not in {"CANCELED", "CANCELLED", "REJECTED"}:
+            try:
+                update_trade_order_status(
+                    session,
                     order,
                     {
+                        "status": "CANCELED",
+                        "params": {
+                            "event_time": event_time_iso,
+                            "event_status": status,
+                            "event_source": "lean",
+                            "event_tag": event_tag,
+                        },
+                    },
+                )
+            except ValueError:
+                _append_warning(warnings, "lean_event_status_transition")
+        return True
+
+    if status in {"REJECTED", "INVALID"}:
+        if str(order.status or "").strip().upper() != "REJECTED":
+            try:
+                update_payload = {
+                    "status": "REJECTED",
+                    "params": {
                         "event_time": event_time_iso,
                         "event_status": status,
                         "event_source": "lean",
                         "event_tag": event_tag,
                     },
-                )
-                if status == "FILLED" and str(order.status or "").strip().upper() != "FILLED":
-                    filled_total = max(float(order.filled_quantity or 0.0), float(fill_qty or 0.0))
-                    update_payload = {"status": "FILLED", "filled_quantity": filled_total}
-                    if order.avg_fill_price is None and fill_price_value:
-                        update_payload["avg_fill_price"] = float(fill_price_value)
-                    try:
-                        update_trade_order_status(session, order, update_payload)
-                    except ValueError:
-                        _append_warning(warnings, "lean_event_status_transition")
+                }
+                if reason:
+                    update_payload["params"]["reason"] = reason
+                update_trade_order_status(session, order, update_payload)
+            except ValueError:
+                _append_warning(warnings, "lean_event_status_transition")
+        return True
+
+    if status in {"FILLED", "PARTIALLYFILLED", "PARTIAL"} or fill_qty > 0:
+        current_filled = abs(float(order.filled_quantity or 0.0))
+        fill_delta = fill_qty
+        # Lean bridge direct events report cumulative filled quantity. Convert to
+        # incremental delta against the currently persisted order quantity.
+        if current_filled > 0 and fill_qty > current_filled:
+            fill_delta = fill_qty - current_filled
+        elif current_filled > 0 and fill_qty <= current_filled:
+            fill_delta = 0.0
+
+        if fill_delta <= 0:
+            if status == "FILLED" and str(order.status or "").strip().upper() != "FILLED":
+                filled_total = max(current_filled, float(fill_qty or 0.0))
+                try:
+                    update_trade_order_status(
+                        session,
+                        order,
+                        {
+                            "status": "FILLED",
+                            "filled_quantity": filled_total,
+                            "params": {
+                                "event_time": event_time_iso,
+                                "event_status": status,
+                                "event_source": "lean",
+                                "event_tag": event_tag,
+                            },
+                        },
+                    )
+                except ValueError:
+                    _append_warning(warnings, "lean_event_status_transition")
+            return True
+        fill_key = f"{order_id}:{fill_delta}:{fill_price_value}:{event_time_iso}"
+        if fill_key in seen_fill_keys:
+            return True
+        seen_fill_keys.add(fill_key)
+        event_key = _fill_event_key(order_id, event_time_iso)
+        if _fill_exists(
+            session,
+            order_id=order_id,
+            event_key=event_key,
+            fill_qty=fill_delta,
+            fill_price=fill_price_value,
+            event_time_iso=event_time_iso,
+        ):
+            if status == "FILLED" and str(order.status or "").strip().upper() != "FILLED":
+                filled_total = max(float(order.filled_quantity or 0.0), float(fill_qty or 0.0))
+                update_payload = {"status": "FILLED", "filled_quantity": filled_total}
+                if order.avg_fill_price is None and fill_price_value:
+                    update_payload["avg_fill_price"] = float(fill_price_value)
+                try:
+                    update_trade_order_status(session, order, update_payload)
+                except ValueError:
+                    _append_warning(warnings, "lean_event_status_transition")
+            return True
+        if str(order.status or "").strip().upper() == "FILLED":
+            _append_warning(warnings, "lean_event_duplicate_fill")
+            return True
+        fill = apply_fill_to_order(
+            session,
+            order,
+            fill_qty=fill_delta,
+            fill_price=fill_price_value,
+            fill_time=_ensure_aware(event_time) or datetime.utcnow().replace(tzinfo=timezone.utc),
+        )
+        fill_params = dict(fill.params or {})
+        fill_params.update(
+            {
+                "event_time": event_time_iso,
+                "event_source": "lean",
+                "event_tag": event_tag,
+            }
+        )
+        if reason:
+            fill_params["reason"] = reason
+        fill.params = fill_params
+        fill.event_key = event_key
+        _update_order_params(
+            order,
+            {
+                "event_time": event_time_iso,
+                "event_status": status,
+                "event_source": "lean",
+                "event_tag": event_tag,
+            },
+        )
+        if status == "FILLED" and str(order.status or "").strip().upper() != "FILLED":
+            filled_total = max(float(order.filled_quantity or 0.0), float(fill_qty or 0.0))
+            update_payload = {"status": "FILLED", "filled_quantity": filled_total}
+            if order.avg_fill_price is None and fill_price_value:
+                update_payload["avg_fill_price"] = float(fill_price_value)
+            try:
+                update_trade_order_status(session, order, update_payload)
+            except ValueError:
+                _append_warning(warnings, "lean_event_status_transition")
+        try:
+            session.commit()
+        except IntegrityError:
+            # Another ingester recorded the same event first.
+            session.rollback()
+            _append_warning(warnings, "lean_event_duplicate_fill")
+            return False
+    return True
+
+
+def _event_cursor(session, key: str) -> LeanEventCursor:
+    cursor = session.query(LeanEventCursor).filter(LeanEventCursor.path == key).first()
+    if cursor is None:
+        cursor = LeanEventCursor(path=key, byte_offset=0)
+        session.add(cursor)
+    return cursor
+
+
+def _read_new_events(event_path: Path, cursor: LeanEventCursor) -> tuple[list[str], int, int]:
+    """Lines appended since the cursor, the offset to resume from and the file id.
+
+    A trailing line without a newline is only consumed once it parses, so a line that is
+    still being written is read again on the next pass.
+    """
+    stat = event_path.stat()
+    offset = int(cursor.byte_offset or 0)
+    if (cursor.file_id is not None and cursor.file_id != stat.st_ino) or stat.st_size < offset:
+        # Rotated or truncated: start over, fills are deduplicated by event key.
+        offset = 0
+    with event_path.open("rb") as handle:
+        handle.seek(offset)
+        data = handle.read()
+    complete = data.rfind(b"\n") + 1
+    lines = data[:complete].decode("utf-8", errors="ignore").splitlines()
+    partial = data[complete:].decode("utf-8", errors="ignore").strip()
+    if partial:
+        try:
+            json.loads(partial)
+        except json.JSONDecodeError:
+            return lines, offset + complete, stat.st_ino
+        lines.append(partial)
+    return lines, offset + len(data), stat.st_ino
+
+
+def _ingest_lean_events(session, warnings: list[str]) -> None:
+    """Apply execution events appended since the last pass.
+
+    A per-file byte offset is kept in ``lean_event_cursors`` and committed with the events it
+    covers, so each line is parsed once across requests and restarts.
+    """
+    bridge_root = resolve_bridge_root()
+    if not bridge_root.exists():
+        _append_warning(warnings, "lean_logs_missing")
+        return
+
+    seen_fill_keys: set[str] = set()
+
+    with _INGEST_LOCK:
+        for event_path in _iter_event_files(bridge_root):
+            key = event_path.relative_to(bridge_root).as_posix()
+            cursor = _event_cursor(session, key)
+            try:
+                raw_lines, end_offset, file_id = _read_new_events(event_path, cursor)
+            except OSError:
+                _append_warning(warnings, "lean_logs_read_error")
+                continue
+            rolled_back = False
+            for line in raw_lines:
+                text = line.strip()
+                if not text:
+                    continue
+                try:
+                    payload = json.loads(text)
+                except json.JSONDecodeError:
+                    _append_warning(warnings, "lean_logs_parse_error")
+                    continue
+                if not _ingest_event(session, event_path, payload, warnings, seen_fill_keys):
+                    rolled_back = True
+            if rolled_back:
+                # Uncommitted status updates went with the rollback; replay this file next
+                # pass (applied events are skipped by their status checks and event keys).
                 session.commit()
+                continue
+            cursor.byte_offset = end_offset
+            cursor.file_id = file_id
+            session.commit()
+
+
+
+def _order_receipt(order: TradeOrder, realized) -> TradeReceipt:
+    return TradeReceipt(
+        time=_ensure_aware(order.created_at),
+        kind="order",
+        order_id=order.id,
+        client_order_id=order.client_order_id,
+        symbol=order.symbol,
+        side=order.side,
+        quantity=order.quantity,
+        filled_quantity=order.filled_quantity,
+        fill_price=order.avg_fill_price,
+        exec_id=None,
+        status=order.status,
+        commission=None,
+        realized_pnl=realized.order_totals.get(order.id, 0.0),
+        source="db",
+    )
 
 
+def _fill_receipt(fill: TradeFill, order: TradeOrder | None, realized) -> TradeReceipt:
+    return TradeReceipt(
+        time=_ensure_aware(fill.fill_time or fill.created_at),
+        kind="fill",
+        order_id=fill.order_id,
+        client_order_id=order.client_order_id if order else None,
+        symbol=order.symbol if order else None,
+        side=order.side if order else None,
+        quantity=order.quantity if order else None,
+        filled_quantity=fill.fill_quantity,
+        fill_price=fill.fill_price,
+        exec_id=fill.exec_id,
+        status=order.status if order else None,
+        commission=fill.commission,
+        realized_pnl=realized.fill_totals.get(fill.id, 0.0),
+        source="db",
+    )
+
+
+def _page_db_receipts(
+    session,
+    realized,
+    warnings: list[str],
+    *,
+    limit: int,
+    offset: int,
+    mode: str,
+) -> TradeReceiptPage:
+    """Page DB order/fill receipts in SQL, in the same order as the merged listing."""
+    parts = []
+    if mode != "fills":
+        parts.append(
+            select(
+                TradeOrder.id.label("order_id"),
+                TradeOrder.created_at.label("event_time"),
+                literal(0).label("kind_rank"),
+                TradeOrder.id.label("row_id"),
+            )
+        )
+    if mode != "orders":
+        parts.append(
+            select(
+                TradeFill.order_id.label("order_id"),
+                func.coalesce(TradeFill.fill_time, TradeFill.created_at).label("event_time"),
+                literal(1).label("kind_rank"),
+                TradeFill.id.label("row_id"),
+            ).join(TradeOrder, TradeFill.order_id == TradeOrder.id)
+        )
+    receipts = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery()
+    total = int(session.execute(select(func.count()).select_from(receipts)).scalar_one())
+    rows = session.execute(
+        select(receipts.c.kind_rank, receipts.c.row_id, receipts.c.order_id)
+        .order_by(
+            receipts.c.order_id.desc(),
+            receipts.c.event_time.desc(),
+            receipts.c.kind_rank,
+            receipts.c.row_id.desc(),
+        )
+        .limit(limit)
+        .offset(offset)
+    ).all()
+    order_ids = {int(row.order_id) for row in rows}
+    fill_ids = [int(row.row_id) for row in rows if row.kind_rank == 1]
+    orders = (
+        {order.id: order for order in session.query(TradeOrder).filter(TradeOrder.id.in_(order_ids))}
+        if order_ids
+        else {}
+    )
+    fills = (
+        {fill.id: fill for fill in session.query(TradeFill).filter(TradeFill.id.in_(fill_ids))}
+        if fill_ids
+        else {}
+    )
+    items = [
+        _order_receipt(orders[row.row_id], realized)
+        if row.kind_rank == 0
+        else _fill_receipt(fills[row.row_id], orders.get(row.order_id), realized)
+        for row in rows
+    ]
+    return TradeReceiptPage(items=items, total=total, warnings=warnings)
+
 
 def list_trade_receipts(
     session,
@@ -528,33 +722,21 @@ def list_trade_receipts(
     if ingest_lean_events:
         _ingest_lean_events(session, warnings)
 
-    positions_payload = read_positions(resolve_bridge_root())
-    baseline = ensure_positions_baseline(resolve_bridge_root(), positions_payload)
-    realized = compute_realized_pnl(session, baseline)
+    bridge_root = resolve_bridge_root()
+    positions_payload = read_positions(bridge_root)
+    baseline = ensure_positions_baseline(bridge_root, positions_payload)
+    realized = compute_realized_pnl(
+        session, baseline, ledger_path=realized_pnl_ledger_path(bridge_root)
+    )
+
+    if not include_lean_events:
+        return _page_db_receipts(
+            session, realized, warnings, limit=limit, offset=offset, mode=mode
+        )
 
     order_rows = session.query(TradeOrder).order_by(TradeOrder.created_at.desc()).all()
     order_map = {order.id: order for order in order_rows}
-    items: list[TradeReceipt] = []
-
-    for order in order_rows:
-        items.append(
-            TradeReceipt(
-                time=_ensure_aware(order.created_at),
-                kind="order",
-                order_id=order.id,
-                client_order_id=order.client_order_id,
-                symbol=order.symbol,
-                side=order.side,
-                quantity=order.quantity,
-                filled_quantity=order.filled_quantity,
-                fill_price=order.avg_fill_price,
-                exec_id=None,
-                status=order.status,
-                commission=None,
-                realized_pnl=realized.order_totals.get(order.id, 0.0),
-                source="db",
-            )
-        )
+    items: list[TradeReceipt] = [_order_receipt(order, realized) for order in order_rows]
 
     fill_rows = (
         session.query(TradeFill)
@@ -565,25 +747,7 @@ def list_trade_receipts(
 
     db_fill_keys: set[tuple[int, float, float, str]] = set()
     for fill in fill_rows:
-        order = order_map.get(fill.order_id)
-        items.append(
-            TradeReceipt(
-                time=_ensure_aware(fill.fill_time or fill.created_at),
-                kind="fill",
-                order_id=fill.order_id,
-                client_order_id=order.client_order_id if order else None,
-                symbol=order.symbol if order else None,
-                side=order.side if order else None,
-                quantity=order.quantity if order else None,
-                filled_quantity=fill.fill_quantity,
-                fill_price=fill.fill_price,
-                exec_id=fill.exec_id,
-                status=order.status if order else None,
-                commission=fill.commission,
-                realized_pnl=realized.fill_totals.get(fill.id, 0.0),
-                source="db",
-            )
-        )
+        items.append(_fill_receipt(fill, order_map.get(fill.order_id), realized))
         db_fill_keys.add(
             (
                 fill.order_id,
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from app.models import TradeFill, TradeOrder, TradeRun
+
+
+class TradeRunReconcileContext:
+    """In-memory view of one trade run shared by the refresh stages.
+
+    The run's orders are loaded once (their fills on first use) and every stage works on
+    the same rows instead of re-querying them. Stages mutate without committing; the caller
+    persists the whole pass with ``commit()``.
+    """
+
+    def __init__(
+        self,
+        session,
+        run: TradeRun,
+        *,
+        open_orders_payload: dict[str, Any] | None = None,
+        positions_payload: dict[str, Any] | None = None,
+    ) -> None:
+        self.session = session
+        self.run = run
+        self.open_orders_payload = open_orders_payload
+        self.positions_payload = positions_payload
+        self.orders: list[TradeOrder] = (
+            session.query(TradeOrder)
+            .filter(TradeOrder.run_id == run.id)
+            .order_by(TradeOrder.id.asc())
+            .all()
+        )
+        self._fills: dict[int, list[TradeFill]] | None = None
+
+    def orders_with_status(self, statuses: Iterable[str]) -> list[TradeOrder]:
+        wanted = set(statuses)
+        return [order for order in self.orders if order.status in wanted]
+
+    def fills(self, order: TradeOrder) -> list[TradeFill]:
+        if self._fills is None:
+            self._fills = {int(item.id): [] for item in self.orders}
+            if self._fills:
+                rows = (
+                    self.session.query(TradeFill)
+                    .join(TradeOrder, TradeFill.order_id == TradeOrder.id)
+                    .filter(TradeOrder.run_id == self.run.id)
+                    .order_by(TradeFill.id.asc())
+                    .all()
+                )
+                for fill in rows:
+                    self._fills.setdefault(int(fill.order_id), []).append(fill)
+        return self._fills.setdefault(int(order.id), [])
+
+    def add_fill(self, order: TradeOrder, fill: TradeFill) -> None:
+        self.session.add(fill)
+        self.fills(order).append(fill)
+
+    def flush(self) -> None:
+        """Make pending changes visible to stages that still issue their own SQL."""
+        self.session.flush()
+
+    def commit(self) -> None:
+        self.session.commit()
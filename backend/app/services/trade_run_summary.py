@@ -9,10 +9,11 @@ from typing import Any
 from app.core.config import settings
 from app.models import DecisionSnapshot, TradeFill, TradeGuardState, TradeOrder, TradeRun
 from app.services.ib_account import fetch_account_summary, get_account_positions_cached
+from app.services.latest_bars import load_latest_closes
 from app.services.lean_bridge_paths import resolve_bridge_root
 from app.services.lean_bridge_reader import read_positions, read_quotes
 from app.services.realized_pnl import compute_realized_pnl
-from app.services.realized_pnl_baseline import ensure_positions_baseline
+from app.services.realized_pnl_baseline import ensure_positions_baseline, realized_pnl_ledger_path
 
 _PRECISE_POSITIONS_SOURCE_DETAILS = {
     "ib_holdings",
@@ -83,52 +84,8 @@ def _resolve_data_root() -> Path:
     return Path("/data/share/stock/data")
 
 
-def _normalize_symbol_for_filename(symbol: str) -> str:
-    return "".join(ch if ch.isalnum() else "_" for ch in symbol.upper()).strip("_")
-
-
-def _find_latest_price_file(root: Path, symbol: str) -> Path | None:
-    if not root.exists():
-        return None
-    normalized = _normalize_symbol_for_filename(symbol)
-    if not normalized:
-        return None
-    matches = sorted(root.glob(f"*_{normalized}_Daily.csv"))
-    if not matches:
-        return None
-    return matches[-1]
-
-
-def _read_latest_close(path: Path) -> float | None:
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            last_row: dict[str, Any] | None = None
-            for row in reader:
-                last_row = row
-        if not last_row:
-            return None
-        close_value = last_row.get("close")
-        if close_value is None or close_value == "":
-            return None
-        value = float(close_value)
-        return value if value > 0 else None
-    except (OSError, ValueError, TypeError):
-        return None
-
-
 def _load_fallback_prices(symbols: list[str]) -> dict[str, float]:
-    root = _resolve_data_root() / "curated_adjusted"
-    prices: dict[str, float] = {}
-    for symbol in symbols:
-        path = _find_latest_price_file(root, symbol)
-        if not path:
-            continue
-        value = _read_latest_close(path)
-        if value is None:
-            continue
-        prices[symbol] = value
-    return prices
+    return load_latest_closes(_resolve_data_root() / "curated_adjusted", symbols)
 
 
 def _build_price_map(symbols: list[str]) -> dict[str, float]:
@@ -308,9 +265,12 @@ def build_trade_run_detail(session, run_id: int, *, limit: int = 200, offset: in
     )
     order_map = {order.id: order for order in orders}
 
-    positions_payload = read_positions(resolve_bridge_root())
-    baseline = ensure_positions_baseline(resolve_bridge_root(), positions_payload)
-    realized = compute_realized_pnl(session, baseline)
+    bridge_root = resolve_bridge_root()
+    positions_payload = read_positions(bridge_root)
+    baseline = ensure_positions_baseline(bridge_root, positions_payload)
+    realized = compute_realized_pnl(
+        session, baseline, ledger_path=realized_pnl_ledger_path(bridge_root)
+    )
 
     order_payloads: list[dict[str, Any]] = []
     for order in orders:
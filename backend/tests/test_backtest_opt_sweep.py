@@ -0,0 +1,135 @@
+import argparse
+import json
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services.backtest_opt_cagr import build_grid, score_manifest
+from app.services.backtest_opt_sweep import (
+    add_sweep_arguments,
+    load_sweep_data,
+    promote_sweep_candidates,
+    select_sweep_candidates,
+    simulate_candidates,
+)
+
+
+def _write_prices(root: Path, symbol: str, dates: pd.DatetimeIndex, drift: float, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1.0 + drift + rng.normal(0.0, 0.01, len(dates)))
+    folder = root / "curated_adjusted"
+    folder.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({"date": dates.strftime("%Y-%m-%d"), "close": close}).to_csv(
+        folder / f"{seed}_Alpha_{symbol}_Daily.csv", index=False
+    )
+
+
+def _setup(tmp_path: Path) -> dict:
+    dates = pd.bdate_range("2021-01-01", "2023-06-30")
+    drifts = {"SPY": 0.0004, "SGOV": 0.0001, "AAA": 0.0010, "BBB": 0.0002, "CCC": -0.0005, "DDD": 0.0006}
+    for seed, (symbol, drift) in enumerate(drifts.items(), start=1):
+        _write_prices(tmp_path, symbol, dates, drift, seed)
+    score_dates = dates[dates.weekday == 4]
+    rows = [
+        {"date": day.strftime("%Y-%m-%d"), "symbol": symbol, "score": score}
+        for day in score_dates
+        for symbol, score in (("AAA", 0.9), ("DDD", 0.6), ("BBB", 0.3), ("CCC", 0.1))
+    ]
+    score_path = tmp_path / "scores.csv"
+    pd.DataFrame(rows).to_csv(score_path, index=False)
+    return {
+        "top_n": "2",
+        "retain_top_n": "1",
+        "weighting": "score",
+        "min_score": "0",
+        "market_filter": "True",
+        "market_ma_window": "50",
+        "rebalance_frequency": "Weekly",
+        "rebalance_day": "Monday",
+        "dynamic_exposure": "True",
+        "drawdown_tiers": "0.08,0.12,0.15",
+        "drawdown_exposures": "0.80,0.60,0.40",
+        "max_drawdown": "0.15",
+        "max_drawdown_52w": "0.15",
+        "risk_off_mode": "defensive",
+        "risk_off_pick": "lowest_vol",
+        "benchmark": "SPY",
+        "risk_off_symbols": "SGOV",
+        "score_csv_path": str(score_path),
+        "initial_cash": "30000.0",
+        "fee_bps": "10.0",
+        "backtest_start": "2021-06-01",
+        "backtest_end": "2023-06-30",
+    }
+
+
+def test_sweep_batch_matches_single_candidate_runs(tmp_path):
+    base = _setup(tmp_path)
+    grid = build_grid({"max_exposure": 0.45, "vol_target": 0.055, "max_weight": 0.6})
+    candidates = [{**base, **item} for item in grid]
+    data = load_sweep_data(candidates[0], data_root=tmp_path)
+
+    batch = simulate_candidates(data, candidates)
+    single = [simulate_candidates(data, [item])[0] for item in candidates[:3]]
+
+    assert len(batch) == len(grid)
+    for expected, actual in zip(single, batch[:3]):
+        assert actual == pytest.approx(expected)
+    assert all(row["cagr"] > -1.0 and 0.0 <= row["dd"] < 1.0 for row in batch)
+    # More exposure to an uptrending selection earns more.
+    assert batch[-1]["cagr"] > batch[0]["cagr"]
+
+
+def test_select_sweep_candidates_returns_top_k_by_cagr(tmp_path):
+    base = _setup(tmp_path)
+    grid = build_grid({"max_exposure": 0.45, "vol_target": 0.055, "max_weight": 0.6})
+
+    promoted = select_sweep_candidates(
+        grid,
+        lambda item: {**base, **item},
+        top_k=3,
+        max_dd=0.5,
+        data_root=tmp_path,
+    )
+
+    assert len(promoted) == 3
+    cagrs = [stats["cagr"] for _, stats in promoted]
+    assert cagrs == sorted(cagrs, reverse=True)
+    assert all(item in grid for item, _ in promoted)
+
+
+def test_promote_sweep_candidates_records_every_screened_candidate(tmp_path):
+    base = _setup(tmp_path)
+    grid = build_grid({"max_exposure": 0.45, "vol_target": 0.055, "max_weight": 0.6})
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(json.dumps({"id": 7, "params": grid[0]}) + "\n", encoding="utf-8")
+    parser = argparse.ArgumentParser()
+    add_sweep_arguments(parser)
+
+    disabled = promote_sweep_candidates(
+        grid, lambda item: {**base, **item}, parser.parse_args([]), manifest=manifest
+    )
+    assert disabled == grid
+    assert len(manifest.read_text(encoding="utf-8").splitlines()) == 1
+
+    args = parser.parse_args(["--sweep-top-k", "2", "--max-dd", "0.5"])
+    promoted = promote_sweep_candidates(
+        grid[1:], lambda item: {**base, **item}, args, manifest=manifest, data_root=tmp_path
+    )
+    rows = [json.loads(line) for line in manifest.read_text(encoding="utf-8").splitlines()[1:]]
+    assert len(promoted) == 2
+    assert [row["params"] for row in rows] == grid[1:]
+    assert [row["params"] for row in rows if row["promoted"]] == [
+        item for item in grid[1:] if item in promoted
+    ]
+    assert all(set(row["sweep"]) == {"cagr", "dd", "sharpe", "sortino"} for row in rows)
+    # Screening rows have no Lean run to score.
+    assert score_manifest(manifest, artifacts_root=tmp_path) == []
+
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+BACKEND_ROOT = ROOT / "backend"
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.core.config import settings
+from scripts import benchmark_hot_paths as bench
+
+benchmark_data = bench.benchmark_data
+
+
+def test_dataset_is_reproducible_and_reused(tmp_path: Path) -> None:
+    first = benchmark_data.generate_dataset(tmp_path / "a", symbols=3, years=1, seed=3, orders=20)
+    second = benchmark_data.generate_dataset(tmp_path / "b", symbols=3, years=1, seed=3, orders=20)
+
+    assert first["symbols"] == ["S0001", "S0002", "S0003"]
+    path_a = benchmark_data.price_path(tmp_path / "a", 2, "S0001")
+    path_b = benchmark_data.price_path(tmp_path / "b", 2, "S0001")
+    assert path_a.read_bytes() == path_b.read_bytes()
+    pit_dir = tmp_path / "a" / "factors" / "pit_weekly_fundamentals"
+    assert len(list(pit_dir.glob("pit_fundamentals_*.csv"))) == first["snapshots"]
+
+    marker = tmp_path / "a" / "marker.txt"
+    marker.write_text("keep", encoding="utf-8")
+    again = benchmark_data.generate_dataset(tmp_path / "a", symbols=3, years=1, seed=3, orders=20)
+    assert again["generated_at"] == first["generated_at"]
+    assert marker.exists()
+    assert second["params"] == first["params"]
+
+
+def test_run_case_reports_throughput_and_rss(monkeypatch, tmp_path: Path) -> None:
+    # The trade cases point settings.data_root at the synthetic root; restore it afterwards.
+    monkeypatch.setattr(settings, "data_root", settings.data_root)
+    meta = benchmark_data.generate_dataset(tmp_path / "data", symbols=3, years=1, orders=20)
+    env = bench._Env(tmp_path / "data", tmp_path / "work", meta, workers=1)
+    env.work_dir.mkdir()
+
+    result = bench.run_case("realized_pnl", env, repeat=2)
+    assert result["items"] == 20
+    assert result["unit"] == "fills"
+    assert len(result["seconds_all"]) == 2
+    assert result["seconds"] == min(result["seconds_all"])
+    assert result["peak_rss_mb"] is None or result["peak_rss_mb"] > 0
+
+    scores = bench.run_case("factor_scores", env, repeat=1)
+    pit_weekly = env.root / "universe" / "pit_weekly"
+    expected = sum(len(pd.read_csv(path)) for path in pit_weekly.glob("pit_*.csv"))
+    assert 0 < scores["items"] <= expected
+
+
+def test_compare_flags_slowdowns_only() -> None:
+    before = {"dataset": {"symbols": 3}, "cases": {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}}
+    after = {
+        "dataset": {"symbols": 3},
+        "cases": {"a": {"seconds": 1.2}, "b": {"seconds": 2.0}, "c": {"seconds": 1.0}},
+    }
+
+    lines, regressions = bench.compare_results(before, after, max_regression=0.25)
+
+    assert regressions == ["b"]
+    assert len(lines) == 4
+    assert not any(line.startswith("warning") for line in lines)
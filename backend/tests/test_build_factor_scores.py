@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import build_factor_scores as bfs
+
+D1 = date(2024, 1, 5)
+D2 = date(2024, 1, 12)
+
+
+def test_zscore_by_date_handles_nan_single_symbol_and_flat_dates():
+    frame = pd.DataFrame(
+        {
+            "date": ["d1", "d1", "d1", "d1", "d2", "d3", "d3"],
+            "value": [1.0, 2.0, 3.0, np.nan, 5.0, 4.0, 4.0],
+        }
+    )
+
+    z = bfs._zscore_by_date(frame, "value", winsor_z=3.0)
+    assert z.iloc[:3].tolist() == [-1.0, 0.0, 1.0]
+    # A missing value stays missing on a date that has a spread ...
+    assert math.isnan(z.iloc[3])
+    # ... while single-symbol and zero-spread dates score 0.0.
+    assert z.iloc[4:].tolist() == [0.0, 0.0, 0.0]
+
+    clipped = bfs._zscore_by_date(frame, "value", winsor_z=0.5)
+    assert clipped.iloc[:3].tolist() == [-0.5, 0.0, 0.5]
+
+
+def _write_prices(adjusted_dir: Path, symbol: str, rows: list[tuple[str, float, float]]) -> None:
+    frame = pd.DataFrame(rows, columns=["date", "close", "volume"])
+    frame.to_csv(adjusted_dir / f"1_Alpha_{symbol}_Daily.csv", index=False)
+
+
+def _seed(tmp_path: Path) -> tuple[Path, Path]:
+    adjusted_dir = tmp_path / "curated_adjusted"
+    pit_dir = tmp_path / "pit_fundamentals"
+    adjusted_dir.mkdir()
+    pit_dir.mkdir()
+    # ret_1 on D1: AAA 0.25, BBB 0.0, CCC 0.25; close * volume is 1000 for everyone.
+    _write_prices(
+        adjusted_dir,
+        "AAA",
+        [("2024-01-04", 8.0, 125.0), ("2024-01-05", 10.0, 100.0), ("2024-01-11", 10.0, 100.0), ("2024-01-12", 11.0, 100.0)],
+    )
+    _write_prices(adjusted_dir, "BBB", [("2024-01-04", 20.0, 50.0), ("2024-01-05", 20.0, 50.0)])
+    _write_prices(adjusted_dir, "CCC", [("2024-01-04", 8.0, 125.0), ("2024-01-05", 10.0, 100.0)])
+    pd.DataFrame(
+        {
+            "symbol": ["AAA", "BBB", "CCC"],
+            "total_revenue": [10.0, 10.0, 10.0],
+            "net_income": [1.0, 3.0, 2.0],
+            "eps": [1.0, 4.0, np.nan],
+        }
+    ).to_csv(pit_dir / "pit_fundamentals_20240105.csv", index=False)
+    pd.DataFrame({"symbol": ["AAA"], "total_revenue": [12.0], "net_income": [2.0], "eps": [1.5]}).to_csv(
+        pit_dir / "pit_fundamentals_20240112.csv", index=False
+    )
+    return adjusted_dir, pit_dir
+
+
+def _config() -> bfs.FactorConfig:
+    return bfs.FactorConfig(
+        momentum_windows=[1],
+        vol_window=2,
+        liquidity_window=1,
+        winsor_z=3.0,
+        weights={"momentum": 1.0, "quality": 1.0, "value": 1.0, "low_vol": 1.0, "liquidity": 1.0},
+    )
+
+
+def test_build_scores_pins_per_date_zscores(tmp_path):
+    adjusted_dir, pit_dir = _seed(tmp_path)
+
+    scores = bfs.build_scores(
+        [D1, D2],
+        {"AAA": [D1, D2], "BBB": [D1], "CCC": [D1]},
+        adjusted_dir,
+        pit_dir,
+        {},
+        set(),
+        _config(),
+    )
+
+    assert list(scores.columns) == ["date", "symbol", *bfs.SCORE_FIELDS]
+    assert [(row.date.date(), row.symbol) for row in scores.itertuples()] == [
+        (D1, "AAA"),
+        (D1, "BBB"),
+        (D1, "CCC"),
+        (D2, "AAA"),
+    ]
+    root3 = math.sqrt(3.0)
+    root_half = math.sqrt(0.5)
+    expected = {
+        "score_momentum": [1 / root3, -2 / root3, 1 / root3, 0.0],
+        # Only net margin has a spread; quality fields missing on a date score 0.0 and
+        # still count in the average.
+        "score_quality": [-1 / 6, 1 / 6, 0.0, 0.0],
+        # CCC has no eps, so its earnings yield is missing and scores 0.0.
+        "score_value": [-root_half, root_half, 0.0, 0.0],
+        # vol needs two returns, so it is undefined on every date.
+        "score_low_vol": [0.0, 0.0, 0.0, 0.0],
+        # Equal dollar volume: zero spread.
+        "score_liquidity": [0.0, 0.0, 0.0, 0.0],
+    }
+    for column, values in expected.items():
+        assert scores[column].tolist() == pytest.approx(values), column
+    parts = scores[list(expected)].sum(axis=1) / 5
+    assert scores["score"].tolist() == pytest.approx(parts.tolist())
+
+
+def test_write_scores_csv_output(tmp_path):
+    adjusted_dir, pit_dir = _seed(tmp_path)
+    scores = bfs.build_scores(
+        [D1, D2],
+        {"AAA": [D1, D2], "BBB": [D1], "CCC": [D1]},
+        adjusted_dir,
+        pit_dir,
+        {},
+        set(),
+        _config(),
+    )
+    output_path = tmp_path / "out" / "factor_scores.csv"
+
+    bfs.write_scores(scores, output_path)
+
+    assert output_path.read_bytes().decode("utf-8").split("\r\n") == [
+        "date,symbol,score,score_momentum,score_quality,score_value,score_low_vol,score_liquidity",
+        "2024-01-05,AAA,-0.05928464,0.57735027,-0.16666667,-0.70710678,0.00000000,0.00000000",
+        "2024-01-05,BBB,-0.05618542,-1.15470054,0.16666667,0.70710678,0.00000000,0.00000000",
+        "2024-01-05,CCC,0.11547005,0.57735027,0.00000000,0.00000000,0.00000000,0.00000000",
+        "2024-01-12,AAA,0.00000000,0.00000000,0.00000000,0.00000000,0.00000000,0.00000000",
+        "",
+    ]
+    assert not output_path.with_suffix(".parquet").exists()
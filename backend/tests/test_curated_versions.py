@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services import curated_versions
+
+HEADER = b"date,open,high,low,close,volume,symbol\r\n"
+NOW = datetime(2024, 3, 1, 12, 0, 0)
+
+
+def _content(days: int, last_close: str | None = None) -> bytes:
+    lines = [HEADER]
+    for day in range(days):
+        close = last_close if last_close is not None and day == days - 1 else f"{10 + day}"
+        lines.append(f"2024-01-{day + 1:02d},1,2,0.5,{close},100,AAA\r\n".encode())
+    return b"".join(lines)
+
+
+def _config(**overrides):
+    config = dict(curated_versions.DEFAULT_CURATED_VERSIONS)
+    config.update(overrides)
+    return config
+
+
+def _record(version_dir: Path, content: bytes, step: int, **config) -> Path:
+    return curated_versions.record_curated_version(
+        version_dir, content, _config(**config), now=NOW + timedelta(days=step)
+    )
+
+
+def test_appends_and_tail_revisions_are_stored_as_deltas(tmp_path):
+    contents = [_content(3), _content(5), _content(5, last_close="99.5"), _content(5, "99.5")]
+    paths = [_record(tmp_path, content, step) for step, content in enumerate(contents)]
+
+    assert [path.suffix for path in paths] == [".csv", ".delta", ".delta", ".delta"]
+    assert paths[1].read_bytes() == _content(5)[len(_content(3)) :]
+    assert paths[2].read_bytes().startswith(b"2024-01-05,")
+    assert paths[3].read_bytes() == b""
+    for path, content in zip(paths, contents):
+        assert curated_versions.reconstruct_curated_version(tmp_path, path.stem) == content
+
+
+def test_rewritten_history_and_interval_force_checkpoints(tmp_path):
+    first = _record(tmp_path, _content(4), 0, checkpoint_interval=3)
+    rewritten = _content(4).replace(b"2024-01-01,1,2,0.5,10", b"2024-01-01,1,2,0.5,11")
+    second = _record(tmp_path, rewritten, 1, checkpoint_interval=3)
+    kinds = [
+        _record(tmp_path, rewritten + _content(4 + step)[len(_content(4)) :], step + 2, checkpoint_interval=3).suffix
+        for step in range(1, 5)
+    ]
+
+    assert first.suffix == ".csv"
+    assert second.suffix == ".csv"
+    assert kinds == [".delta", ".delta", ".csv", ".delta"]
+
+
+def test_retention_materializes_oldest_kept_version(tmp_path):
+    contents = [_content(day) for day in range(2, 8)]
+    for step, content in enumerate(contents):
+        _record(tmp_path, content, step, max_versions=3)
+
+    versions = curated_versions.list_curated_versions(tmp_path)
+    assert len(versions) == 3
+    assert [item["kind"] for item in versions] == ["full", "delta", "delta"]
+    assert sorted(path.name for path in tmp_path.glob("*.csv")) == [f"{versions[0]['version']}.csv"]
+    for item, content in zip(versions, contents[-3:]):
+        assert curated_versions.reconstruct_curated_version(tmp_path, item["version"]) == content
+
+
+def test_retention_is_disabled_by_default(tmp_path, caplog):
+    assert curated_versions.load_curated_versions_config(tmp_path)["max_versions"] == 0
+    for step in range(5):
+        _record(tmp_path, _content(step + 2), step * 10)
+    versions = [item["version"] for item in curated_versions.list_curated_versions(tmp_path)]
+    assert len(versions) == 5
+
+    with caplog.at_level("INFO", logger=curated_versions.__name__):
+        _record(tmp_path, _content(8), 60, max_versions=2)
+    assert len(curated_versions.list_curated_versions(tmp_path)) == 2
+    assert f"versions={','.join(versions[:4])} " in caplog.text
+
+
+def test_retention_by_age_keeps_latest(tmp_path):
+    for step in range(4):
+        _record(tmp_path, _content(step + 2), step * 10, max_versions=0, max_age_days=15)
+
+    versions = curated_versions.list_curated_versions(tmp_path)
+    assert [item["version"] for item in versions] == ["20240321T120000", "20240331T120000"]
+
+
+def test_legacy_snapshots_are_adopted_as_checkpoints(tmp_path):
+    (tmp_path / "20240101T000000.csv").write_bytes(_content(3))
+    path = _record(tmp_path, _content(4), 0)
+
+    assert path.suffix == ".delta"
+    versions = curated_versions.list_curated_versions(tmp_path)
+    assert [item["version"] for item in versions] == ["20240101T000000", path.stem]
+    assert curated_versions.reconstruct_curated_version(tmp_path, "20240101T000000") == _content(3)
+    assert curated_versions.reconstruct_curated_version(tmp_path, path.stem) == _content(4)
+
+
+def test_reconstruct_detects_corruption_and_unknown_versions(tmp_path):
+    _record(tmp_path, _content(3), 0)
+    delta = _record(tmp_path, _content(4), 1)
+    delta.write_bytes(b"garbage\r\n")
+
+    with pytest.raises(ValueError):
+        curated_versions.reconstruct_curated_version(tmp_path, delta.stem)
+    with pytest.raises(KeyError):
+        curated_versions.reconstruct_curated_version(tmp_path, "19990101T000000")
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["entries"][1]["keep_bytes"] == len(_content(3))
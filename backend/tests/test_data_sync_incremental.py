@@ -0,0 +1,182 @@
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import sys
+import zipfile
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.models import Base, DataSyncJob, Dataset
+from app.routes import datasets as datasets_routes
+from app.services import curated_versions
+from app.services.price_store import PriceStore
+from app.services.series_index import read_series_summary
+
+START = datetime(2024, 1, 1)
+
+
+def _bar(day: int, close: float) -> tuple[datetime, dict]:
+    timestamp = START + timedelta(days=day)
+    return timestamp, {
+        "date": timestamp.strftime("%Y-%m-%d"),
+        "open": f"{close - 0.5:g}",
+        "high": f"{close + 1:g}",
+        "low": f"{close - 1:g}",
+        "close": f"{close:g}",
+        "volume": str(1000 + day),
+        "symbol": "AAA",
+    }
+
+
+# Day 3 doubles the close so the cliff sanitizer carries a non-trivial scale forward.
+CLOSES = [10.0, 10.5, 11.0, 22.0, 22.5, 23.0, 22.0, 24.0]
+
+
+def _factors(days: int, bump_day: int | None = None) -> list[tuple[date, float]]:
+    factors = []
+    for day in range(days):
+        factor = 0.5 if bump_day is None or day >= bump_day else 0.4
+        factors.append(((START + timedelta(days=day)).date(), factor))
+    return factors
+
+
+def _setup(tmp_path: Path, monkeypatch, incremental: bool):
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    session = factory()
+    dataset = Dataset(
+        name="Alpha_AAA_Daily",
+        vendor="Alpha",
+        frequency="daily",
+        region="US",
+        asset_class="Equity",
+        source_path="alpha:aaa",
+    )
+    session.add(dataset)
+    session.commit()
+    dataset_id = dataset.id
+    session.close()
+    monkeypatch.setattr(datasets_routes, "SessionLocal", factory)
+    monkeypatch.setattr(datasets_routes.settings, "data_root", str(tmp_path))
+    monkeypatch.setattr(datasets_routes.settings, "lean_data_folder", str(tmp_path / "lean"))
+    monkeypatch.setattr(datasets_routes.settings, "data_sync_incremental_enabled", incremental)
+    return factory, dataset_id
+
+
+def _sync(tmp_path: Path, factory, dataset_id: int, days: range, factors) -> DataSyncJob:
+    session = factory()
+    job = DataSyncJob(dataset_id=dataset_id, source_path="alpha:aaa", status="running")
+    session.add(job)
+    session.commit()
+    job_id = job.id
+    session.close()
+    output_name = f"{dataset_id}_Alpha_AAA_Daily.csv"
+    staged = datasets_routes._DataSyncStaged(
+        job_id=job_id,
+        dataset_id=dataset_id,
+        dataset_name="Alpha_AAA_Daily",
+        source_label="alpha:AAA",
+        normalized_path=tmp_path / "normalized" / output_name,
+        curated_path=tmp_path / "curated" / output_name,
+        adjusted_path=tmp_path / "curated_adjusted" / output_name,
+        reset_history=False,
+        records=[_bar(day, CLOSES[day]) for day in days],
+        raw_rows=len(days),
+        map_path=None,
+        cache_factor_path=tmp_path / "factors" / "aaa.csv",
+        factors=factors,
+        factor_source="alpha",
+        alpha_meta=None,
+    )
+    datasets_routes._run_data_sync_postprocess(staged)
+    session = factory()
+    job = session.get(DataSyncJob, job_id)
+    session.close()
+    return job
+
+
+def _outputs(root: Path, dataset_id: int) -> dict[str, object]:
+    name = f"{dataset_id}_Alpha_AAA_Daily.csv"
+    result: dict[str, object] = {}
+    for folder in ("curated", "curated_adjusted"):
+        csv_path = root / folder / name
+        result[folder] = csv_path.read_bytes()
+        result[f"{folder}_store"] = PriceStore(mmap=False).read_array(csv_path).tolist()
+        summary = read_series_summary(csv_path)
+        result[f"{folder}_summary"] = {
+            key: summary[key]
+            for key in ("rows", "first_date", "last_date", "min_interval_days", "crc32")
+        }
+    for lean_root in ("lean", "lean_adjusted"):
+        with zipfile.ZipFile(root / lean_root / "equity" / "usa" / "daily" / "aaa.zip") as zf:
+            result[lean_root] = zf.read("aaa.csv")
+    return result
+
+
+def _run(tmp_path: Path, monkeypatch, incremental: bool, second_factors):
+    factory, dataset_id = _setup(tmp_path, monkeypatch, incremental)
+    _sync(tmp_path, factory, dataset_id, range(0, 5), _factors(5))
+    job = _sync(tmp_path, factory, dataset_id, range(3, 8), second_factors)
+    return job, _outputs(tmp_path, dataset_id)
+
+
+def test_incremental_sync_matches_full_rewrite(tmp_path, monkeypatch):
+    full_job, full = _run(tmp_path / "full", monkeypatch, False, _factors(8))
+    calls: list[int] = []
+    original_load = datasets_routes._load_curated
+    monkeypatch.setattr(
+        datasets_routes,
+        "_load_curated",
+        lambda path: calls.append(1) or original_load(path),
+    )
+    inc_job, inc = _run(tmp_path / "inc", monkeypatch, True, _factors(8))
+
+    assert inc == full
+    assert inc_job.status == full_job.status == "success"
+    assert inc_job.coverage_start == full_job.coverage_start == "2024-01-01"
+    assert inc_job.coverage_end == full_job.coverage_end == "2024-01-08"
+    assert "curated_rows=8" in inc_job.message
+    assert "cliff_sanitized=1" in inc_job.message
+    assert inc_job.message.split("; ") == full_job.message.split("; ")
+    # Only the first (empty-history) sync parses the curated CSV.
+    assert len(calls) == 1
+    snapshot = Path(inc_job.snapshot_path)
+    assert snapshot.suffix == ".delta"
+    assert curated_versions.reconstruct_curated_version(snapshot.parent, snapshot.stem) == inc["curated"]
+
+
+def test_incremental_sync_recomputes_adjusted_when_factor_history_changes(tmp_path, monkeypatch):
+    _, full = _run(tmp_path / "full", monkeypatch, False, _factors(8, bump_day=2))
+    _, inc = _run(tmp_path / "inc", monkeypatch, True, _factors(8, bump_day=2))
+
+    assert inc == full
+    adjusted = np.array(
+        [row[4] for row in inc["curated_adjusted_store"]],
+    )
+    assert adjusted[0] == 10.0 * 0.4
+
+
+def test_collect_curated_append_rejects_changed_last_bar(tmp_path):
+    path = tmp_path / "curated" / "1_AAA.csv"
+    datasets_routes._write_curated(path, dict(_bar(day, CLOSES[day]) for day in range(3)))
+    last_dt, last_row = _bar(2, CLOSES[2])
+
+    appended = datasets_routes._collect_curated_append(
+        path, [(last_dt, dict(last_row)), _bar(3, CLOSES[3])], last_dt
+    )
+    assert list(appended) == [_bar(3, CLOSES[3])[0]]
+
+    revised = {**last_row, "close": "11.25"}
+    assert datasets_routes._collect_curated_append(path, [(last_dt, revised)], last_dt) is None
+    assert datasets_routes._get_last_date(path) == last_dt
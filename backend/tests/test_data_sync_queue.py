@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.models import Base, DataSyncJob, Dataset
+from app.routes import datasets as datasets_routes
+from app.services.job_lock import JobLock
+
+
+def _make_session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def _add_jobs(factory, count: int, **overrides) -> list[int]:
+    session = factory()
+    try:
+        dataset = Dataset(name="Local_AAA_Daily", vendor="Local", frequency="daily")
+        session.add(dataset)
+        session.commit()
+        base = datetime.utcnow() - timedelta(minutes=10)
+        jobs = []
+        for idx in range(count):
+            job = DataSyncJob(
+                dataset_id=dataset.id,
+                source_path="raw/aaa.csv",
+                status="queued",
+                created_at=base + timedelta(seconds=idx),
+                **overrides,
+            )
+            session.add(job)
+            jobs.append(job)
+        session.commit()
+        return [job.id for job in jobs]
+    finally:
+        session.close()
+
+
+def test_claim_next_sync_job_marks_oldest_due_job_running():
+    factory = _make_session_factory()
+    first, second = _add_jobs(factory, 2)
+    session = factory()
+    future = session.get(DataSyncJob, first)
+    future.next_retry_at = datetime.utcnow() + timedelta(hours=1)
+    session.commit()
+
+    assert datasets_routes._claim_next_sync_job(session) == (second, session.get(DataSyncJob, second).dataset_id)
+    assert session.get(DataSyncJob, second).status == "running"
+    assert datasets_routes._claim_next_sync_job(session) is None
+    session.close()
+
+
+def test_run_data_sync_splits_fetch_and_postprocess(tmp_path, monkeypatch):
+    factory = _make_session_factory()
+    (job_id,) = _add_jobs(factory, 1)
+    raw_path = tmp_path / "raw" / "aaa.csv"
+    raw_path.parent.mkdir(parents=True)
+    raw_path.write_text(
+        "date,open,high,low,close,volume\n"
+        "2024-01-02,10,11,9,10.5,100\n"
+        "2024-01-03,10.5,12,10,11.5,200\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(datasets_routes, "SessionLocal", factory)
+    monkeypatch.setattr(datasets_routes.settings, "data_root", str(tmp_path))
+    monkeypatch.setattr(datasets_routes.settings, "lean_data_folder", str(tmp_path / "lean"))
+
+    staged = datasets_routes._run_data_sync_fetch(job_id)
+    assert staged is not None
+    assert len(staged.records) == 2
+    assert not staged.curated_path.exists()
+    session = factory()
+    assert session.get(DataSyncJob, job_id).message.startswith("stage=postprocess")
+    session.close()
+
+    datasets_routes._run_data_sync_postprocess(staged)
+    session = factory()
+    job = session.get(DataSyncJob, job_id)
+    assert job.status == "success"
+    assert job.coverage_start == "2024-01-02"
+    assert job.coverage_end == "2024-01-03"
+    assert staged.curated_path.exists()
+    session.close()
+
+
+def test_sync_queue_worker_overlaps_fetch_with_postprocess(tmp_path, monkeypatch):
+    factory = _make_session_factory()
+    job_ids = [job_id for _ in range(3) for job_id in _add_jobs(factory, 1)]
+    monkeypatch.setattr(datasets_routes, "get_session", factory)
+    monkeypatch.setattr(datasets_routes.settings, "data_root", str(tmp_path))
+    monkeypatch.setattr(datasets_routes.settings, "data_sync_postprocess_workers", 2)
+    fetched: list[int] = []
+    processed: list[int] = []
+
+    def _fetch(job_id, spawn_retry_thread=True):
+        assert spawn_retry_thread is False
+        fetched.append(job_id)
+        return None if job_id == job_ids[1] else job_id
+
+    def _postprocess(staged):
+        # The fetch stage keeps draining the queue while post-processing is still busy.
+        time.sleep(0.05)
+        processed.append(staged)
+
+    monkeypatch.setattr(datasets_routes, "_run_data_sync_fetch", _fetch)
+    monkeypatch.setattr(datasets_routes, "_run_data_sync_postprocess", _postprocess)
+
+    assert datasets_routes._start_sync_queue_worker(0, 0.0) is True
+    deadline = time.time() + 5
+    while datasets_routes.SYNC_QUEUE_RUNNING and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert datasets_routes.SYNC_QUEUE_RUNNING is False
+    assert fetched == job_ids
+    assert sorted(processed) == [job_ids[0], job_ids[2]]
+    session = factory()
+    assert {session.get(DataSyncJob, job_id).status for job_id in job_ids} == {"running"}
+    session.close()
+
+
+def test_sync_queue_worker_serializes_jobs_of_one_dataset(tmp_path, monkeypatch):
+    factory = _make_session_factory()
+    first, second = _add_jobs(factory, 2)
+    (other,) = _add_jobs(factory, 1)
+    session = factory()
+    session.get(DataSyncJob, other).created_at = datetime.utcnow() - timedelta(minutes=30)
+    session.commit()
+    session.close()
+    monkeypatch.setattr(datasets_routes, "get_session", factory)
+    monkeypatch.setattr(datasets_routes.settings, "data_root", str(tmp_path))
+    monkeypatch.setattr(datasets_routes.settings, "data_sync_postprocess_workers", 2)
+    events: list[tuple[str, int]] = []
+    dataset_of = {first: "a", second: "a", other: "b"}
+
+    def _fetch(job_id, spawn_retry_thread=True):
+        events.append(("fetch", job_id))
+        return datasets_routes._DataSyncStaged(
+            job_id=job_id,
+            dataset_id=0,
+            dataset_name=dataset_of[job_id],
+            source_label=None,
+            normalized_path=tmp_path,
+            curated_path=tmp_path,
+            adjusted_path=tmp_path,
+            reset_history=False,
+            records=[],
+            raw_rows=0,
+            map_path=None,
+            cache_factor_path=tmp_path,
+            factors=[],
+            factor_source=None,
+            alpha_meta=None,
+        )
+
+    def _postprocess(staged):
+        time.sleep(0.05)
+        events.append(("post", staged.job_id))
+
+    monkeypatch.setattr(datasets_routes, "_run_data_sync_fetch", _fetch)
+    monkeypatch.setattr(datasets_routes, "_run_data_sync_postprocess", _postprocess)
+
+    assert datasets_routes._start_sync_queue_worker(0, 0.0) is True
+    deadline = time.time() + 5
+    while datasets_routes.SYNC_QUEUE_RUNNING and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert datasets_routes.SYNC_QUEUE_RUNNING is False
+    # The other dataset's job still overlaps with post-processing, but the second job of
+    # dataset "a" is only fetched once the first one's outputs are written.
+    assert events.index(("fetch", first)) < events.index(("post", other))
+    assert events.index(("post", first)) < events.index(("fetch", second))
+
+
+def test_sync_queue_idle_checks_every_worker_slot(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets_routes.settings, "data_sync_queue_workers", 2)
+    assert datasets_routes._is_sync_queue_idle(tmp_path) is True
+
+    slot = JobLock("data_sync_queue_1", tmp_path)
+    held = datasets_routes._acquire_sync_queue_lock(tmp_path)
+    try:
+        assert held is not None and held.key == "data_sync_queue"
+        assert slot.acquire() is True
+        assert datasets_routes._acquire_sync_queue_lock(tmp_path) is None
+    finally:
+        slot.release()
+        held.release()
+    assert datasets_routes._is_sync_queue_idle(tmp_path) is True
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import sys
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services import latest_bars
+from app.services.latest_bars import latest_bars_path, load_latest_closes, lookup_latest_bars, record_latest_bar
+
+
+def _write_prices(path: Path, closes: list[float]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["date,open,high,low,close,volume,symbol"]
+    for idx, close in enumerate(closes, start=1):
+        lines.append(f"2026-01-{idx:02d},{close},{close},{close},{close},{idx * 100},X")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_lookup_builds_index_and_matches_glob_semantics(tmp_path: Path) -> None:
+    latest_bars.clear_latest_bars_cache()
+    folder = tmp_path / "curated_adjusted"
+    _write_prices(folder / "1_Alpha_AAA_Daily.csv", [10.0, 11.0])
+    _write_prices(folder / "2_Alpha_BRK_B_Daily.csv", [400.0])
+    _write_prices(folder / "3_Alpha_ZERO_Daily.csv", [0.0])
+
+    bars = lookup_latest_bars(folder, ["aaa", "BRK.B", "MISSING"])
+    assert sorted(bars) == ["BRK.B", "aaa"]
+    assert bars["aaa"].date == "2026-01-02"
+    assert bars["aaa"].close == 11.0
+    assert bars["aaa"].volume == 200.0
+    assert latest_bars_path(folder).exists()
+
+    # "B" also matched `*_B_Daily.csv` under the old glob lookup.
+    assert load_latest_closes(folder, ["BRK.B", "B", "ZERO"]) == {"BRK.B": 400.0, "B": 400.0}
+
+
+def test_lookup_follows_sync_writes_and_direct_edits(tmp_path: Path) -> None:
+    latest_bars.clear_latest_bars_cache()
+    folder = tmp_path / "curated_adjusted"
+    path = folder / "1_Alpha_AAA_Daily.csv"
+    _write_prices(path, [10.0])
+    assert load_latest_closes(folder, ["AAA"]) == {"AAA": 10.0}
+
+    _write_prices(path, [10.0, 12.5])
+    record_latest_bar(path)
+    assert load_latest_closes(folder, ["AAA"]) == {"AAA": 12.5}
+
+    # Edits that bypass data sync are caught by the size/mtime pin.
+    _write_prices(path, [10.0, 12.5, 13.0])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_latest_closes(folder, ["AAA"]) == {"AAA": 13.0}
+
+    _write_prices(folder / "2_Alpha_BBB_Daily.csv", [5.0])
+    path.unlink()
+    latest_bars.clear_latest_bars_cache()
+    assert load_latest_closes(folder, ["AAA", "BBB"]) == {"BBB": 5.0}
@@ -1,10 +1,14 @@
 from pathlib import Path
+import json
+import os
 import sys
+import time
 
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
 if str(BACKEND_ROOT) not in sys.path:
     sys.path.insert(0, str(BACKEND_ROOT))
 
+from app.services import lean_bridge_reader
 from app.services.lean_bridge_reader import _parse_iso
 
 
@@ -13,3 +17,40 @@ def test_parse_iso_supports_high_precision_fraction():
     assert parsed is not None
     assert parsed.tzinfo is not None
     assert parsed.isoformat().startswith("2026-01-30T23:01:36.491396")
+
+
+def _write_settled(path: Path, payload: dict, age_seconds: float = 5.0) -> None:
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    settled = time.time() - age_seconds
+    os.utime(path, (settled, settled))
+
+
+def test_bridge_snapshot_cache_reuses_parsed_payload_until_file_changes(tmp_path):
+    lean_bridge_reader.clear_bridge_snapshot_cache()
+    quotes_path = tmp_path / "quotes.json"
+    _write_settled(quotes_path, {"items": [{"symbol": "AAPL", "last": 1.0}]})
+
+    first = lean_bridge_reader.read_quotes(tmp_path)
+    first["items"][0]["last"] = 99.0
+    first["items"].append({"symbol": "MSFT"})
+    second = lean_bridge_reader.read_quotes(tmp_path)
+
+    assert second["items"] == [{"symbol": "AAPL", "last": 1.0}]
+    assert lean_bridge_reader.bridge_snapshot_cache_stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    _write_settled(quotes_path, {"items": [{"symbol": "AAPL", "last": 2.0}]}, age_seconds=1.0)
+    third = lean_bridge_reader.read_quotes(tmp_path)
+
+    assert third["items"] == [{"symbol": "AAPL", "last": 2.0}]
+    assert lean_bridge_reader.bridge_snapshot_cache_stats()["misses"] == 2
+
+
+def test_bridge_snapshot_cache_rereads_recently_modified_file(tmp_path):
+    lean_bridge_reader.clear_bridge_snapshot_cache()
+    quotes_path = tmp_path / "quotes.json"
+    quotes_path.write_text(json.dumps({"items": [], "source": "a"}), encoding="utf-8")
+    assert lean_bridge_reader.read_quotes(tmp_path)["source"] == "a"
+
+    # Same size, possibly within the same mtime tick: must not be served from the cache.
+    quotes_path.write_text(json.dumps({"items": [], "source": "b"}), encoding="utf-8")
+    assert lean_bridge_reader.read_quotes(tmp_path)["source"] == "b"
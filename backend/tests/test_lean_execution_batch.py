@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.models import Base, TradeFill, TradeOrder
+from app.services.lean_execution import apply_execution_events
+
+
+def _seed(session, count: int) -> list[int]:
+    ids = []
+    for idx in range(count):
+        order = TradeOrder(
+            client_order_id=f"manual-{idx}",
+            symbol=f"S{idx}",
+            side="BUY",
+            quantity=10,
+            status="SUBMITTED",
+            params={},
+        )
+        session.add(order)
+        session.flush()
+        ids.append(order.id)
+    session.commit()
+    return ids
+
+
+def _burst(order_ids: list[int]) -> list[dict]:
+    events = []
+    for step in range(2):
+        for idx, order_id in enumerate(order_ids):
+            tag = f"direct:{order_id}" if idx % 2 == 0 else f"manual-{idx}"
+            events.append(
+                {
+                    "order_id": 100 + idx,
+                    "symbol": f"S{idx}",
+                    "status": "PartiallyFilled" if step == 0 else "Filled",
+                    "filled": 5.0,
+                    "fill_price": 10.0 + step,
+                    "direction": "Buy",
+                    "time": f"2026-02-13T14:2{step}:00Z",
+                    "tag": tag,
+                    "exec_id": f"exec-{order_id}-{step}",
+                }
+            )
+    return events
+
+
+def _state(session) -> list[tuple]:
+    orders = [
+        (order.id, order.status, order.filled_quantity, round(order.avg_fill_price or 0.0, 6))
+        for order in session.query(TradeOrder).order_by(TradeOrder.id)
+    ]
+    fills = sorted((fill.order_id, fill.exec_id, fill.fill_quantity) for fill in session.query(TradeFill))
+    return orders + fills
+
+
+def _apply(batch: bool, replay: bool = False) -> tuple[list[tuple], dict, int]:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    order_ids = _seed(session, 6)
+    events = _burst(order_ids)
+    if replay:
+        apply_execution_events(events, session=session, batch=batch)
+    selects = []
+
+    def _count(_conn, _cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    summary = apply_execution_events(events, session=session, batch=batch)
+    event.remove(engine, "before_cursor_execute", _count)
+    state = _state(session)
+    session.close()
+    return state, summary, len(selects)
+
+
+def test_batch_matches_per_event_application_with_fewer_queries():
+    batch_state, batch_summary, batch_selects = _apply(batch=True)
+    single_state, single_summary, single_selects = _apply(batch=False)
+
+    assert batch_state == single_state
+    assert batch_summary == single_summary == {"processed": 12, "skipped_invalid_tag": 0, "skipped_not_found": 0}
+    assert all(row[1] == "FILLED" and row[2] == 10 for row in batch_state[:6])
+    assert batch_selects < single_selects
+    assert batch_selects <= 6
+
+
+def test_batch_replay_is_idempotent():
+    replayed_state, summary, _ = _apply(batch=True, replay=True)
+    once_state, _, _ = _apply(batch=True)
+
+    assert replayed_state == once_state
+    assert summary["processed"] == 12
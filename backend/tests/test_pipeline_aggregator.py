@@ -2,6 +2,7 @@ from datetime import datetime
 from pathlib import Path
 import sys
 
+import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -14,6 +15,8 @@ from app.models import (
     AutoWeeklyJob,
     Base,
     DecisionSnapshot,
+    PipelineRun,
+    PipelineRunTag,
     PitFundamentalJob,
     PitWeeklyJob,
     PreTradeRun,
@@ -23,6 +26,7 @@ from app.models import (
     TradeRun,
 )
 from app.services.pipeline_aggregator import build_pipeline_trace, list_pipeline_runs
+from app.services.pipeline_run_index import encode_cursor
 
 
 def _make_session():
@@ -303,3 +307,97 @@ def test_trade_trace_includes_fills_and_audit():
     assert "trade_order" in task_types
     assert "trade_fill" in task_types
     assert "audit_log" in task_types
+
+
+def test_list_pipeline_runs_keyset_pages():
+    session = _make_session()
+    session.add_all(
+        [TradeRun(project_id=1, status="queued", mode="paper", created_at=datetime(2026, 1, day)) for day in range(1, 6)]
+    )
+    session.commit()
+
+    first = list_pipeline_runs(session, project_id=1, limit=2)
+    assert [item["trace_id"] for item in first] == ["trade:5", "trade:4"]
+    second = list_pipeline_runs(session, project_id=1, limit=2, cursor=encode_cursor(first[-1]))
+    assert [item["trace_id"] for item in second] == ["trade:3", "trade:2"]
+    last = list_pipeline_runs(session, project_id=1, limit=2, cursor=encode_cursor(second[-1]))
+    assert [item["trace_id"] for item in last] == ["trade:1"]
+
+    with pytest.raises(ValueError):
+        list_pipeline_runs(session, project_id=1, cursor="not-a-cursor")
+
+
+def test_list_pipeline_runs_keyword_matches_linked_tags():
+    session = _make_session()
+    pretrade = PreTradeRun(project_id=1, status="success", created_at=datetime(2026, 1, 1))
+    other = TradeRun(project_id=1, status="queued", mode="paper", created_at=datetime(2026, 1, 2))
+    session.add_all([pretrade, other])
+    session.commit()
+    trade_run = TradeRun(
+        project_id=1,
+        status="done",
+        mode="paper",
+        params={"pretrade_run_id": pretrade.id},
+    )
+    session.add(trade_run)
+    session.commit()
+    session.add(
+        PreTradeStep(
+            run_id=pretrade.id,
+            step_key="create_trade_run",
+            step_order=1,
+            status="success",
+            artifacts={"trade_run_id": trade_run.id},
+        )
+    )
+    for idx in range(12):
+        session.add(
+            TradeOrder(
+                run_id=trade_run.id,
+                client_order_id=f"oi_{idx}",
+                symbol="AAPL",
+                side="BUY",
+                quantity=1,
+                order_type="MKT",
+                status="FILLED",
+            )
+        )
+    session.commit()
+    order = session.query(TradeOrder).filter(TradeOrder.client_order_id == "oi_11").one()
+    session.add(TradeFill(order_id=order.id, fill_quantity=1, fill_price=10.0))
+    session.commit()
+
+    # Trade runs started by a pretrade run are only listed through the pretrade trace.
+    assert [item["trace_id"] for item in list_pipeline_runs(session, project_id=1)] == [
+        f"trade:{other.id}",
+        f"pretrade:{pretrade.id}",
+    ]
+    runs = list_pipeline_runs(session, project_id=1, keyword=str(order.id))
+    assert [item["trace_id"] for item in runs] == [f"pretrade:{pretrade.id}"]
+    runs = list_pipeline_runs(session, project_id=1, keyword="%")
+    assert runs == []
+
+
+def test_list_pipeline_runs_follows_state_changes():
+    session = _make_session()
+    run = TradeRun(project_id=1, status="queued", mode="paper", created_at=datetime(2026, 1, 1))
+    session.add(run)
+    session.commit()
+    assert list_pipeline_runs(session, project_id=1, status="running") == []
+
+    run.status = "running"
+    session.commit()
+    runs = list_pipeline_runs(session, project_id=1, status="running")
+    assert [item["trace_id"] for item in runs] == [f"trade:{run.id}"]
+
+    run.params = {"pretrade_run_id": 7}
+    session.commit()
+    assert list_pipeline_runs(session, project_id=1) == []
+
+    run.params = {}
+    session.commit()
+    session.delete(run)
+    session.commit()
+    assert list_pipeline_runs(session, project_id=1) == []
+    assert session.query(PipelineRun).count() == 0
+    assert session.query(PipelineRunTag).count() == 0
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+ML_ROOT = BACKEND_ROOT.parent / "ml"
+if str(ML_ROOT) not in sys.path:
+    sys.path.insert(0, str(ML_ROOT))
+
+from app.services.pit_fundamentals_panel import PitPanel, build_pit_panel
+from pit_features import load_pit_fundamentals
+
+
+def _write_snapshot(pit_dir: Path, snapshot_date: str, rows: list[dict]) -> None:
+    frame = pd.DataFrame(rows)
+    frame.insert(0, "snapshot_date", snapshot_date)
+    stamp = snapshot_date.replace("-", "")
+    frame.to_csv(pit_dir / f"pit_fundamentals_{stamp}.csv", index=False)
+
+
+def _seed(pit_dir: Path) -> None:
+    _write_snapshot(
+        pit_dir,
+        "2024-01-05",
+        [
+            {"symbol": "aaa", "has_fundamentals": 1, "net_income": 10.0, "pit_market_cap": 100.0},
+            {"symbol": "BBB", "has_fundamentals": 0, "net_income": "", "pit_market_cap": ""},
+        ],
+    )
+    _write_snapshot(
+        pit_dir,
+        "2024-01-12",
+        [
+            {"symbol": "AAA", "has_fundamentals": 1, "net_income": 11.0, "pit_market_cap": 110.0},
+            {"symbol": "BBB", "has_fundamentals": 1, "net_income": 5.0, "pit_market_cap": 50.0},
+        ],
+    )
+
+
+def test_panel_reads_symbol_and_date_slices(tmp_path: Path) -> None:
+    _seed(tmp_path)
+    stats = build_pit_panel(tmp_path)
+    assert stats == {"rows": 4, "symbols": 2, "reused": 0, "parsed": 2}
+
+    panel = PitPanel.open(tmp_path)
+    assert panel is not None
+    frames = panel.read(symbols=["aaa"], start="2024-01-06", fields=["net_income"])
+    assert list(frames) == ["AAA"]
+    assert list(frames["AAA"].columns) == ["net_income"]
+    assert frames["AAA"].index.tolist() == [pd.Timestamp("2024-01-12")]
+    assert frames["AAA"]["net_income"].tolist() == [11.0]
+
+
+def test_panel_goes_stale_and_rebuilds_changed_files_only(tmp_path: Path) -> None:
+    _seed(tmp_path)
+    build_pit_panel(tmp_path)
+    _write_snapshot(
+        tmp_path,
+        "2024-01-19",
+        [{"symbol": "CCC", "has_fundamentals": 1, "net_income": 7.0, "pit_market_cap": 70.0}],
+    )
+    assert PitPanel.open(tmp_path) is None
+
+    stats = build_pit_panel(tmp_path)
+    assert stats == {"rows": 5, "symbols": 3, "reused": 2, "parsed": 1}
+    assert len(list(tmp_path.glob("pit_fundamentals_panel_*.npy"))) == 1
+    frames = PitPanel.open(tmp_path).read()
+    assert sorted(frames) == ["AAA", "BBB", "CCC"]
+    assert frames["AAA"]["net_income"].tolist() == [10.0, 11.0]
+
+
+def test_load_pit_fundamentals_matches_csv_reader(tmp_path: Path) -> None:
+    _seed(tmp_path)
+    expected, fields, expected_summary = load_pit_fundamentals(
+        tmp_path, ["AAA", "BBB"], end="2024-01-10", use_panel=False
+    )
+    build_pit_panel(tmp_path)
+    actual, panel_fields, summary = load_pit_fundamentals(tmp_path, ["AAA", "BBB"], end="2024-01-10")
+
+    assert panel_fields == fields
+    assert summary == expected_summary
+    assert sorted(actual) == sorted(expected)
+    for symbol, frame in expected.items():
+        pd.testing.assert_frame_equal(
+            actual[symbol], frame.astype(float), check_freq=False, check_names=False
+        )
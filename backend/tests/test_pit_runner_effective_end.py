@@ -54,3 +54,10 @@ def test_resolve_latest_trading_day_end_uses_latest_non_future(monkeypatch, tmp_
 
     params = {"data_root": str(data_root), "benchmark": "SPY", "vendor_preference": "Alpha"}
     assert pit_runner._resolve_latest_trading_day_end(params) == "2026-02-17"
+
+
+def test_build_commands_pass_incremental_flag(monkeypatch):
+    monkeypatch.setattr(pit_runner, "_resolve_latest_trading_day_end", lambda _p: "2026-02-17")
+    assert "--incremental" not in pit_runner._build_command({}, None)
+    assert "--incremental" in pit_runner._build_command({"incremental": True}, None)
+    assert "--incremental" in pit_runner._build_fundamental_command({"incremental": True}, None)
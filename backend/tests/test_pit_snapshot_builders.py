@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+import csv
+import json
+import sys
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_ROOT = BACKEND_ROOT.parent / "scripts"
+for path in (BACKEND_ROOT, SCRIPTS_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import build_pit_fundamentals_snapshots as pit_fundamentals
+import build_pit_weekly_snapshots as pit_weekly
+
+
+def _trading_days() -> list[date]:
+    day = date(2024, 1, 2)
+    days = []
+    while day <= date(2024, 2, 29):
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _write_csv(path: Path, header: list[str], rows: list[list[object]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _write_reports(data_root: Path, symbol: str, reports: list[dict]) -> None:
+    symbol_dir = data_root / "fundamentals" / "alpha" / symbol
+    symbol_dir.mkdir(parents=True, exist_ok=True)
+    (symbol_dir / "income_statement.json").write_text(
+        json.dumps({"quarterlyReports": reports}), encoding="utf-8"
+    )
+
+
+def _write_shares(data_root: Path, symbol: str, shares: float) -> None:
+    symbol_dir = data_root / "fundamentals" / "alpha" / symbol
+    symbol_dir.mkdir(parents=True, exist_ok=True)
+    payload = {"data": [{"date": "2023-09-30", "shares_outstanding_diluted": str(shares)}]}
+    (symbol_dir / "shares_outstanding.json").write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _seed_data_root(data_root: Path) -> None:
+    days = _trading_days()
+    _write_csv(
+        data_root / "curated_adjusted" / "1_Alpha_SPY_Daily.csv",
+        ["date", "close"],
+        [[day.isoformat(), 400 + idx] for idx, day in enumerate(days)],
+    )
+    _write_csv(
+        data_root / "universe" / "alpha_symbol_life.csv",
+        ["symbol", "assetType", "ipoDate", "delistingDate"],
+        [
+            ["AAA", "Stock", "2010-01-04", "null"],
+            ["BBB", "Stock", "2012-06-01", "null"],
+            ["CCC", "Stock", "2024-01-20", "null"],
+        ],
+    )
+    for offset, symbol in enumerate(("AAA", "BBB", "CCC")):
+        _write_csv(
+            data_root / "curated" / f"{offset + 2}_Alpha_{symbol}_Daily.csv",
+            ["date", "close"],
+            [[day.isoformat(), 10 * (offset + 1) + idx * 0.5] for idx, day in enumerate(days)],
+        )
+    _write_reports(
+        data_root,
+        "AAA",
+        [
+            {"fiscalDateEnding": "2023-09-30", "reportedDate": "2023-11-01", "totalRevenue": "100", "netIncome": "10"},
+            {"fiscalDateEnding": "2023-12-31", "reportedDate": "2024-01-25", "totalRevenue": "120", "netIncome": "12"},
+        ],
+    )
+    _write_reports(
+        data_root,
+        "BBB",
+        [{"fiscalDateEnding": "2023-09-30", "reportedDate": "2023-11-08", "totalRevenue": "50", "netIncome": "-5"}],
+    )
+    _write_shares(data_root, "AAA", 1000)
+    _write_shares(data_root, "BBB", 400)
+
+
+def _run(module, monkeypatch, *args: str) -> None:
+    monkeypatch.setattr(sys, "argv", [f"{module.__name__}.py", *args])
+    assert module.main() == 0
+
+
+def _build_weekly(data_root: Path, monkeypatch, *extra: str) -> None:
+    _run(pit_weekly, monkeypatch, "--data-root", str(data_root), "--calendar-source", "spy", *extra)
+
+
+def _build_fundamentals(data_root: Path, monkeypatch, *extra: str) -> None:
+    _run(
+        pit_fundamentals,
+        monkeypatch,
+        "--data-root",
+        str(data_root),
+        "--calendar-source",
+        "spy",
+        "--skip-panel",
+        *extra,
+    )
+
+
+def _snapshot_bytes(output_dir: Path, pattern: str) -> dict[str, bytes]:
+    return {path.name: path.read_bytes() for path in sorted(output_dir.glob(pattern))}
+
+
+def test_sharded_fundamentals_build_matches_single_worker(monkeypatch, tmp_path):
+    data_root = tmp_path / "data"
+    _seed_data_root(data_root)
+    _build_weekly(data_root, monkeypatch)
+
+    _build_fundamentals(data_root, monkeypatch, "--output-dir", "serial", "--workers", "1")
+    _build_fundamentals(
+        data_root, monkeypatch, "--output-dir", "sharded", "--workers", "2", "--chunk-size", "1"
+    )
+
+    serial = _snapshot_bytes(data_root / "serial", "pit_fundamentals_*.csv")
+    sharded = _snapshot_bytes(data_root / "sharded", "pit_fundamentals_*.csv")
+    assert len(serial) == 8
+    assert sharded == serial
+    # Shard temp dirs are removed once the snapshots are written.
+    assert not list((data_root / "sharded").glob(".pit_shards_*"))
+
+
+def _rebuilt(output: str) -> set[str]:
+    names = set()
+    for line in output.splitlines():
+        if line.startswith("snapshot: ") and not line.endswith(" unchanged"):
+            names.add(Path(line.split()[1]).name)
+    return names
+
+
+def test_weekly_incremental_rebuild(monkeypatch, tmp_path, capsys):
+    data_root = tmp_path / "data"
+    _seed_data_root(data_root)
+    output_dir = data_root / "universe" / "pit_weekly"
+    _build_weekly(data_root, monkeypatch, "--incremental")
+    first = capsys.readouterr().out
+    built = _snapshot_bytes(output_dir, "pit_2*.csv")
+    assert _rebuilt(first) == set(built) and len(built) == 8
+
+    _build_weekly(data_root, monkeypatch, "--incremental")
+    output = capsys.readouterr().out
+    assert _rebuilt(output) == set()
+    assert "rebuilt snapshots: 0" in output
+
+    # Delisting CCC changes only the snapshots taken after its delisting date.
+    _write_csv(
+        data_root / "universe" / "alpha_symbol_life.csv",
+        ["symbol", "assetType", "ipoDate", "delistingDate"],
+        [
+            ["AAA", "Stock", "2010-01-04", "null"],
+            ["BBB", "Stock", "2012-06-01", "null"],
+            ["CCC", "Stock", "2024-01-20", "2024-02-10"],
+        ],
+    )
+    _build_weekly(data_root, monkeypatch, "--incremental")
+    assert _rebuilt(capsys.readouterr().out) == {"pit_20240216.csv", "pit_20240223.csv"}
+    after = _snapshot_bytes(output_dir, "pit_2*.csv")
+    assert {name for name in built if after[name] != built[name]} == {
+        "pit_20240216.csv",
+        "pit_20240223.csv",
+    }
+
+
+def test_fundamentals_incremental_rebuild(monkeypatch, tmp_path, capsys):
+    data_root = tmp_path / "data"
+    _seed_data_root(data_root)
+    _build_weekly(data_root, monkeypatch)
+    capsys.readouterr()
+    output_dir = data_root / "factors" / "pit_weekly_fundamentals"
+    _build_fundamentals(data_root, monkeypatch, "--incremental")
+    built = _snapshot_bytes(output_dir, "pit_fundamentals_*.csv")
+    assert _rebuilt(capsys.readouterr().out) == set(built) and len(built) == 8
+
+    _build_fundamentals(data_root, monkeypatch, "--incremental")
+    output = capsys.readouterr().out
+    assert _rebuilt(output) == set()
+    assert "rebuilt snapshots: 0" in output
+
+    # A new BBB report first becomes available to the 2024-02-09 snapshot (cutoff 02-08).
+    _write_reports(
+        data_root,
+        "BBB",
+        [
+            {"fiscalDateEnding": "2023-09-30", "reportedDate": "2023-11-08", "totalRevenue": "50", "netIncome": "-5"},
+            {"fiscalDateEnding": "2023-12-31", "reportedDate": "2024-02-05", "totalRevenue": "55", "netIncome": "2"},
+        ],
+    )
+    _build_fundamentals(data_root, monkeypatch, "--incremental")
+    changed = {
+        "pit_fundamentals_20240209.csv",
+        "pit_fundamentals_20240216.csv",
+        "pit_fundamentals_20240223.csv",
+    }
+    assert _rebuilt(capsys.readouterr().out) == changed
+    after = _snapshot_bytes(output_dir, "pit_fundamentals_*.csv")
+    assert {name for name in built if after[name] != built[name]} == changed
+
+
+def test_missing_or_corrupt_manifest_rebuilds_everything(monkeypatch, tmp_path, capsys):
+    data_root = tmp_path / "data"
+    _seed_data_root(data_root)
+    weekly_manifest = data_root / "universe" / "pit_weekly" / "pit_weekly_manifest.json"
+    fundamentals_manifest = (
+        data_root / "factors" / "pit_weekly_fundamentals" / "pit_fundamentals_manifest.json"
+    )
+    _build_weekly(data_root, monkeypatch, "--incremental")
+    _build_fundamentals(data_root, monkeypatch, "--incremental")
+    capsys.readouterr()
+
+    weekly_manifest.unlink()
+    fundamentals_manifest.write_text("{not json", encoding="utf-8")
+    _build_weekly(data_root, monkeypatch, "--incremental")
+    assert len(_rebuilt(capsys.readouterr().out)) == 8
+    _build_fundamentals(data_root, monkeypatch, "--incremental")
+    assert len(_rebuilt(capsys.readouterr().out)) == 8
+    assert json.loads(fundamentals_manifest.read_text(encoding="utf-8"))["snapshots"]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+import json
 from pathlib import Path
 import sys
 
@@ -546,3 +547,28 @@ def test_market_snapshot_writes_watchlist_on_missing_quotes(monkeypatch, tmp_pat
         assert "AAPL" in payload and "MSFT" in payload
     finally:
         session.close()
+
+
+def test_wait_for_quotes_ready_wakes_when_quotes_file_changes(monkeypatch, tmp_path):
+    quotes_path = tmp_path / "quotes.json"
+    quotes_path.write_text(json.dumps(_quotes_payload(["SPY"])), encoding="utf-8")
+    monkeypatch.setattr(pretrade_runner, "_resolve_bridge_root", lambda: tmp_path)
+
+    sleeps: list[float] = []
+
+    def _sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            quotes_path.write_text(json.dumps(_quotes_payload(["SPY", "AAPL", "MSFT"])), encoding="utf-8")
+
+    monkeypatch.setattr(pretrade_runner.time, "sleep", _sleep)
+
+    ok, missing, stale_symbols, waited = pretrade_runner._wait_for_quotes_ready(
+        ["SPY", "AAPL"], 30, 10, 5
+    )
+
+    assert ok is True
+    assert missing == [] and stale_symbols == []
+    # Woken by the rewrite, well before the 5s poll interval elapsed.
+    assert len(sleeps) == 3
+    assert waited == 1
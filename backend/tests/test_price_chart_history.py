@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import datetime as dt
 from pathlib import Path
 import sys
 
@@ -11,6 +12,7 @@ if str(BACKEND_ROOT) not in sys.path:
 
 from app.services import ib_market
 from app.services import price_chart_history
+from app.services import series_index
 
 
 @pytest.fixture()
@@ -212,3 +214,43 @@ def test_intraday_interval_prefers_ib_history_when_available(monkeypatch: pytest
     assert result["error"] is None
     assert len(result["bars"]) == 1
     assert result["bars"][0]["close"] == pytest.approx(188.75)
+
+
+def _bar_date(bar: dict) -> dt.date:
+    return dt.datetime.fromtimestamp(bar["time"], tz=dt.timezone.utc).date()
+
+
+def test_local_fallback_reads_tail_window_and_caches_aggregates(
+    adjusted_data_root: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    path = adjusted_data_root / "999_Alpha_AAPL_Daily.csv"
+    first_day = dt.date(2020, 1, 1)
+    days = [
+        first_day + dt.timedelta(days=offset)
+        for offset in range(3 * 365)
+        if (first_day + dt.timedelta(days=offset)).weekday() < 5
+    ]
+    rows = [(day.isoformat(), 10.0, 11.0, 9.0, 10.5, 100) for day in days]
+    _write_adjusted_daily(path, "AAPL", rows)
+    series_index.write_series_summary(path, days)
+    price_chart_history.clear_local_bars_cache()
+    reads: list[dt.date | None] = []
+    original_read = price_chart_history._read_daily_rows
+    monkeypatch.setattr(
+        price_chart_history,
+        "_read_daily_rows",
+        lambda target, start=None: reads.append(start) or original_read(target, start),
+    )
+
+    weekly = price_chart_history.load_local_adjusted_bars("AAPL", "1W")
+    again = price_chart_history.load_local_adjusted_bars("AAPL", "1W")
+
+    assert again == weekly
+    assert reads == [dt.date(2020, 12, 28)]
+    assert _bar_date(weekly[0]) == dt.date(2021, 1, 1)
+    assert weekly[-1]["volume"] == pytest.approx(100.0 * (days[-1].weekday() + 1))
+
+    _write_adjusted_daily(path, "AAPL", rows[:-1])
+    price_chart_history.load_local_adjusted_bars("AAPL", "1W")
+    assert len(reads) == 2
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import sys
+
+import numpy as np
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.routes import datasets
+from app.services import price_store
+from app.services.price_store import PriceStore
+
+
+def _records() -> dict[datetime, dict]:
+    return {
+        datetime(2024, 1, 2): {
+            "date": "2024-01-02",
+            "open": "10",
+            "high": "11",
+            "low": "9.5",
+            "close": "10.5",
+            "volume": "1000",
+            "symbol": "AAA",
+        },
+        datetime(2024, 1, 3): {
+            "date": "2024-01-03",
+            "open": "10.5",
+            "high": "12",
+            "low": "10",
+            "close": "11.5",
+            "volume": "",
+            "symbol": "AAA",
+        },
+        datetime(2024, 1, 4): {
+            "date": "2024-01-04",
+            "open": "11.5",
+            "high": "12.5",
+            "low": "11",
+            "close": "12",
+            "volume": "1500",
+            "symbol": "AAA",
+        },
+    }
+
+
+def _write_series(data_root: Path) -> Path:
+    csv_path = data_root / "curated_adjusted" / "1_Alpha_AAA_Daily.csv"
+    datasets._write_curated_series(csv_path, _records())
+    return csv_path
+
+
+def test_write_curated_series_mirrors_columnar_store(tmp_path):
+    csv_path = _write_series(tmp_path)
+
+    store_path = price_store.price_store_path(csv_path)
+    assert store_path == tmp_path / "price_store" / "curated_adjusted" / "1_Alpha_AAA_Daily.npy"
+    assert store_path.exists()
+    meta = price_store.read_price_store_meta(csv_path)
+    assert meta["rows"] == 3
+    assert meta["symbol"] == "AAA"
+    assert meta["first_date"] == "2024-01-02"
+    assert meta["last_date"] == "2024-01-04"
+
+    columns = PriceStore().read_columns(csv_path)
+    assert columns["date"].astype("datetime64[D]").astype(str).tolist() == [
+        "2024-01-02",
+        "2024-01-03",
+        "2024-01-04",
+    ]
+    assert columns["close"].tolist() == [10.5, 11.5, 12.0]
+    assert np.isnan(columns["volume"][1])
+
+
+def test_read_columns_slices_requested_window(tmp_path):
+    csv_path = _write_series(tmp_path)
+
+    columns = PriceStore().read_columns(
+        csv_path,
+        ["date", "close"],
+        start=datetime(2024, 1, 3),
+        end=datetime(2024, 1, 3, 23, 59, 59),
+    )
+
+    assert set(columns) == {"date", "close"}
+    assert columns["close"].tolist() == [11.5]
+
+
+def test_store_is_ignored_once_csv_changes(tmp_path):
+    csv_path = _write_series(tmp_path)
+    assert PriceStore().is_fresh(csv_path)
+
+    with csv_path.open("a", encoding="utf-8") as handle:
+        handle.write("2024-01-05,12,13,12,12.5,100,AAA\n")
+
+    assert not PriceStore().is_fresh(csv_path)
+    assert PriceStore().read_frame(csv_path) is None
+
+
+def test_build_from_csv_matches_record_writer(tmp_path):
+    csv_path = _write_series(tmp_path)
+    expected = PriceStore(mmap=False).read_array(csv_path).copy()
+    for path in price_store.price_store_files(csv_path):
+        path.unlink()
+
+    counts = price_store.rebuild_price_store(tmp_path)
+
+    assert counts == {"built": 1, "fresh": 0, "failed": 0}
+    rebuilt = PriceStore(mmap=False).read_array(csv_path)
+    assert rebuilt["date"].tolist() == expected["date"].tolist()
+    np.testing.assert_array_equal(rebuilt["close"], expected["close"])
+    np.testing.assert_array_equal(rebuilt["volume"], expected["volume"])
+
+
+def test_dataset_loaders_read_store_when_enabled(tmp_path, monkeypatch):
+    csv_path = _write_series(tmp_path)
+    start = datetime(2024, 1, 3)
+
+    monkeypatch.setattr(datasets.settings, "price_store_read_enabled", False)
+    csv_candles = datasets._load_candles(csv_path, start, None)
+    csv_line = datasets._load_adjusted_line(csv_path, start, None)
+
+    monkeypatch.setattr(datasets.settings, "price_store_read_enabled", True)
+    monkeypatch.setattr(datasets, "_parse_datetime", lambda value: (_ for _ in ()).throw(AssertionError))
+    store_candles = datasets._load_candles(csv_path, start, None)
+    store_line = datasets._load_adjusted_line(csv_path, start, None)
+
+    assert store_candles == csv_candles
+    assert store_line == csv_line
+
+
+def test_chart_history_reads_store_rows(tmp_path, monkeypatch):
+    from app.services import price_chart_history
+
+    _write_series(tmp_path)
+    monkeypatch.setattr(price_chart_history.settings, "data_root", str(tmp_path))
+    monkeypatch.setattr(price_chart_history.settings, "price_store_read_enabled", False)
+    csv_rows = price_chart_history._read_local_daily_rows("AAA")
+
+    monkeypatch.setattr(price_chart_history.settings, "price_store_read_enabled", True)
+    monkeypatch.setattr(price_chart_history, "iter_series_rows", None)
+    store_rows = price_chart_history._read_local_daily_rows("AAA")
+
+    assert store_rows == csv_rows
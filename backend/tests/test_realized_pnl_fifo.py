@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 import sys
 
+import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -224,8 +225,19 @@ def test_realized_pnl_cache_invalidates_when_new_fill_arrives(monkeypatch):
         )
         session.commit()
 
+        new_calls = {"count": 0}
+        original_new_query = realized_pnl._query_new_fill_rows
+
+        def _spy_new_query(session_obj, *, after_id, through_id):
+            new_calls["count"] += 1
+            return original_new_query(session_obj, after_id=after_id, through_id=through_id)
+
+        monkeypatch.setattr(realized_pnl, "_query_new_fill_rows", _spy_new_query)
+
         second = compute_realized_pnl(session, baseline, cache_ttl_seconds=60.0)
-        assert calls["count"] == 2
+        # Only the fill past the ledger watermark is read; no replay from the baseline.
+        assert calls["count"] == 1
+        assert new_calls["count"] == 1
         assert second.symbol_totals.get("AAPL", 0.0) > first_total
     finally:
         session.close()
@@ -294,3 +306,173 @@ def test_realized_pnl_supports_symbol_scoped_computation():
         assert msft_order.id not in scoped.order_totals
     finally:
         session.close()
+
+
+def _add_fill(session, symbol, side, qty, price, minute, *, commission=0.0, client_order_id=None):
+    order = TradeOrder(
+        run_id=None,
+        client_order_id=client_order_id or f"oi_ledger_{symbol}_{side}_{minute}",
+        symbol=symbol,
+        side=side,
+        quantity=qty,
+        order_type="MKT",
+        status="FILLED",
+        filled_quantity=qty,
+        avg_fill_price=price,
+    )
+    session.add(order)
+    session.flush()
+    fill = TradeFill(
+        order_id=order.id,
+        fill_quantity=qty,
+        fill_price=price,
+        commission=commission,
+        fill_time=datetime(2026, 1, 30, 0, minute, tzinfo=timezone.utc),
+    )
+    session.add(fill)
+    session.commit()
+    return order, fill
+
+
+def _full_recompute(session, baseline):
+    realized_pnl.clear_realized_pnl_cache()
+    return compute_realized_pnl(session, baseline, use_cache=False)
+
+
+def test_realized_pnl_ledger_matches_full_recompute(monkeypatch):
+    session = _make_session()
+    try:
+        baseline = {
+            "created_at": "2026-01-30T00:00:00Z",
+            "items": [
+                {"symbol": "AAPL", "position": 10, "avg_cost": 100.0},
+                {"symbol": "MSFT", "position": -4, "avg_cost": 300.0},
+            ],
+        }
+        _add_fill(session, "AAPL", "SELL", 4, 110.0, 1, commission=0.4)
+        compute_realized_pnl(session, baseline, use_cache=False)
+
+        replayed = {"symbols": []}
+        original_query = realized_pnl._query_fill_rows
+
+        def _spy_query(session_obj, *, baseline_at, symbols=None):
+            replayed["symbols"].append(symbols)
+            return original_query(session_obj, baseline_at=baseline_at, symbols=symbols)
+
+        monkeypatch.setattr(realized_pnl, "_query_fill_rows", _spy_query)
+
+        _add_fill(session, "MSFT", "BUY", 6, 290.0, 2, commission=0.6)
+        _add_fill(session, "AAPL", "SELL", 8, 95.0, 3, commission=0.8)
+        _add_fill(session, "NVDA", "BUY", 5, 50.0, 4)
+        incremental = compute_realized_pnl(session, baseline, use_cache=False)
+        assert replayed["symbols"] == []
+
+        # A late fill stamped before fills already applied replays only its symbol.
+        _add_fill(session, "AAPL", "BUY", 3, 90.0, 2, client_order_id="oi_ledger_late")
+        late = compute_realized_pnl(session, baseline, use_cache=False)
+        assert replayed["symbols"] == [("AAPL",)]
+
+        monkeypatch.setattr(realized_pnl, "_query_fill_rows", original_query)
+        assert incremental.symbol_totals.keys() == {"AAPL", "MSFT", "NVDA"}
+        expected = _full_recompute(session, baseline)
+        assert late.symbol_totals == expected.symbol_totals
+        assert late.order_totals == expected.order_totals
+        assert late.fill_totals == expected.fill_totals
+    finally:
+        session.close()
+
+
+def test_realized_pnl_ledger_replays_symbol_of_updated_fill():
+    session = _make_session()
+    try:
+        baseline = {
+            "created_at": "2026-01-30T00:00:00Z",
+            "items": [{"symbol": "AAPL", "position": 10, "avg_cost": 100.0}],
+        }
+        _, fill = _add_fill(session, "AAPL", "SELL", 2, 110.0, 1)
+        first = compute_realized_pnl(session, baseline, use_cache=False)
+        assert round(first.symbol_totals["AAPL"], 6) == 20.0
+
+        fill.fill_price = 120.0
+        session.commit()
+        updated = compute_realized_pnl(session, baseline, use_cache=False)
+        assert round(updated.symbol_totals["AAPL"], 6) == 40.0
+
+        session.delete(fill)
+        session.commit()
+        deleted = compute_realized_pnl(session, baseline, use_cache=False)
+        assert deleted.symbol_totals == {"AAPL": 0.0}
+        assert deleted.fill_totals == {}
+    finally:
+        session.close()
+
+
+def test_realized_pnl_ledger_resumes_from_file(tmp_path, monkeypatch):
+    session = _make_session()
+    try:
+        baseline = {
+            "created_at": "2026-01-30T00:00:00Z",
+            "items": [{"symbol": "AAPL", "position": 10, "avg_cost": 100.0}],
+        }
+        ledger_path = tmp_path / "realized_pnl_ledger.json"
+        _add_fill(session, "AAPL", "SELL", 2, 110.0, 1, commission=0.2)
+        first = compute_realized_pnl(session, baseline, ledger_path=ledger_path)
+        assert ledger_path.exists()
+
+        # A fresh process only has the file to go on.
+        realized_pnl.clear_realized_pnl_cache()
+        calls = {"count": 0}
+        original_query = realized_pnl._query_fill_rows
+
+        def _spy_query(session_obj, *, baseline_at, symbols=None):
+            calls["count"] += 1
+            return original_query(session_obj, baseline_at=baseline_at, symbols=symbols)
+
+        monkeypatch.setattr(realized_pnl, "_query_fill_rows", _spy_query)
+
+        _add_fill(session, "AAPL", "SELL", 3, 105.0, 2, commission=0.3)
+        resumed = compute_realized_pnl(session, baseline, ledger_path=ledger_path)
+        assert calls["count"] == 0
+        assert resumed.symbol_totals["AAPL"] > first.symbol_totals["AAPL"]
+
+        monkeypatch.setattr(realized_pnl, "_query_fill_rows", original_query)
+        expected = _full_recompute(session, baseline)
+        assert resumed.symbol_totals == expected.symbol_totals
+        assert resumed.fill_totals == expected.fill_totals
+    finally:
+        session.close()
+
+
+def test_realized_pnl_ledger_is_dropped_when_advance_fails(monkeypatch):
+    session = _make_session()
+    try:
+        baseline = {
+            "created_at": "2026-01-30T00:00:00Z",
+            "items": [
+                {"symbol": "AAPL", "position": 10, "avg_cost": 100.0},
+                {"symbol": "MSFT", "position": 10, "avg_cost": 300.0},
+            ],
+        }
+        _add_fill(session, "AAPL", "SELL", 2, 110.0, 1)
+        _add_fill(session, "MSFT", "SELL", 2, 310.0, 5)
+        compute_realized_pnl(session, baseline, use_cache=False)
+
+        # AAPL's new fill is applied in place, then the MSFT replay (late fill) fails.
+        _add_fill(session, "AAPL", "SELL", 3, 120.0, 6)
+        _add_fill(session, "MSFT", "SELL", 1, 320.0, 2, client_order_id="oi_ledger_late")
+        original_replay = realized_pnl._replay
+
+        def _failing_replay(*args, **kwargs):
+            raise RuntimeError("replay failed")
+
+        monkeypatch.setattr(realized_pnl, "_replay", _failing_replay)
+        with pytest.raises(RuntimeError):
+            compute_realized_pnl(session, baseline, use_cache=False)
+        monkeypatch.setattr(realized_pnl, "_replay", original_replay)
+
+        retried = compute_realized_pnl(session, baseline, use_cache=False)
+        expected = _full_recompute(session, baseline)
+        assert retried.symbol_totals == expected.symbol_totals
+        assert retried.fill_totals == expected.fill_totals
+    finally:
+        session.close()
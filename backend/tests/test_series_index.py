@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+import zlib
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.models import Dataset
+from app.routes import datasets as datasets_routes
+from app.services import series_index
+
+START = datetime(2024, 1, 1)
+
+
+def _records(days: list[int]) -> dict[datetime, dict]:
+    records = {}
+    for day in days:
+        timestamp = START + timedelta(days=day)
+        records[timestamp] = {
+            "date": timestamp.strftime("%Y-%m-%d"),
+            "open": "1",
+            "high": "2",
+            "low": "0.5",
+            "close": str(10 + day),
+            "volume": "100",
+            "symbol": "AAA",
+        }
+    return records
+
+
+def test_append_keeps_summary_equal_to_full_rebuild(tmp_path):
+    path = tmp_path / "curated" / "1_AAA.csv"
+    datasets_routes._write_curated_series(path, _records([0, 3, 5]))
+    datasets_routes._append_curated_series(path, _records([6, 9]))
+
+    appended = series_index.read_series_summary(path)
+    assert appended["rows"] == 5
+    assert appended["first_date"].isoformat() == "2024-01-01"
+    assert appended["last_date"].isoformat() == "2024-01-10"
+    assert appended["min_interval_days"] == 1
+    assert appended["crc32"] == zlib.crc32(path.read_bytes())
+
+    series_index.write_series_summary(path, datasets_routes._scan_series_dates(path))
+    rebuilt = series_index.read_series_summary(path)
+    for key in ("rows", "first_date", "last_date", "min_interval_days", "crc32"):
+        assert appended[key] == rebuilt[key]
+
+
+def test_stale_summary_is_ignored_and_rebuilt_once(tmp_path, monkeypatch):
+    path = tmp_path / "curated" / "1_AAA.csv"
+    datasets_routes._write_curated_series(path, _records([0, 2, 4]))
+    with path.open("a", encoding="utf-8", newline="") as handle:
+        handle.write("2024-01-09,1,2,0.5,18,100,AAA\r\n")
+    assert series_index.read_series_summary(path) is None
+
+    scans: list[Path] = []
+    original_scan = datasets_routes._scan_series_dates
+    monkeypatch.setattr(
+        datasets_routes,
+        "_scan_series_dates",
+        lambda target: scans.append(target) or original_scan(target),
+    )
+    assert datasets_routes._calc_min_interval(path) == (2, 4)
+    assert datasets_routes._calc_min_interval(path) == (2, 4)
+    assert scans == [path]
+
+
+def test_quality_and_listing_read_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets_routes.settings, "data_root", str(tmp_path))
+    dataset = Dataset(
+        id=7,
+        name="Alpha_AAA_Daily",
+        frequency="daily",
+        coverage_start="2024-01-01",
+        coverage_end="2024-01-08",
+    )
+    datasets_routes._write_curated_series(
+        datasets_routes._series_path(dataset), _records([0, 1, 2, 7])
+    )
+    datasets_routes._write_curated_series(
+        datasets_routes._series_path(dataset, adjusted=True), _records([0, 1, 2])
+    )
+    monkeypatch.setattr(
+        datasets_routes,
+        "_scan_series_dates",
+        lambda target: (_ for _ in ()).throw(AssertionError("unexpected CSV scan")),
+    )
+
+    summary = datasets_routes._dataset_series_summary(dataset)
+    assert summary["rows"] == 3
+    assert summary["has_adjusted"] is True
+    assert summary["coverage_days"] == 2
+    assert datasets_routes._calc_min_interval(datasets_routes._series_path(dataset)) == (1, 4)
+
+
+def test_range_reads_seek_with_offset_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(series_index, "OFFSET_STRIDE", 8)
+    path = tmp_path / "curated" / "1_AAA.csv"
+    datasets_routes._write_curated_series(path, _records(list(range(40))))
+    datasets_routes._append_curated_series(path, _records(list(range(40, 60))))
+    start = START + timedelta(days=30)
+    end = START + timedelta(days=44)
+
+    rows = list(series_index.iter_series_rows(path, start, end))
+    assert rows[0]["date"] == "2024-01-25"
+    assert rows[-1]["date"] == "2024-02-14"
+    indexed = datasets_routes._load_candles(path, start, end)
+
+    series_index.series_index_path(path).unlink()
+    assert len(list(series_index.iter_series_rows(path, start, end))) == 60
+    assert datasets_routes._load_candles(path, start, end) == indexed
+    assert [candle["close"] for candle in indexed] == [float(10 + day) for day in range(30, 45)]
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.models import Base, TradeOrder, TradeOrderTag, TradeRun
+from app.services.lean_execution import apply_execution_events
+from app.services.trade_order_tags import resolve_order_by_tag, resolve_order_ids_by_tags
+from app.services.trade_orders import create_trade_order, update_trade_order_status
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _tags(session, order_id: int) -> dict[str, str]:
+    rows = session.query(TradeOrderTag).filter(TradeOrderTag.order_id == order_id).all()
+    return {row.kind: row.tag for row in rows}
+
+
+def test_tags_follow_order_writes():
+    session = _session()
+    try:
+        order = TradeOrder(
+            client_order_id="manual-1",
+            symbol="AAPL",
+            side="BUY",
+            quantity=1,
+            status="NEW",
+            params={"event_tag": "direct:1", "broker_order_tag": "manual-1", "order_intent_id": "oi_x"},
+        )
+        session.add(order)
+        session.commit()
+        assert _tags(session, order.id) == {
+            "client": "manual-1",
+            "event": "direct:1",
+            "broker": "manual-1",
+            "intent": "oi_x",
+        }
+
+        order.params = {**order.params, "event_tag": "direct:99"}
+        order.ib_perm_id = 123456
+        session.commit()
+        assert _tags(session, order.id)["event"] == "direct:99"
+        assert _tags(session, order.id)["perm"] == "123456"
+
+        # A newer order carrying the same alias takes it over.
+        newer = TradeOrder(
+            client_order_id="manual-2",
+            symbol="AAPL",
+            side="BUY",
+            quantity=1,
+            status="NEW",
+            params={"event_tag": "direct:99"},
+        )
+        taken = session.query(TradeOrderTag).filter_by(tag="direct:99", kind="event").one()
+        taken_row_id = taken.id
+        session.add(newer)
+        session.commit()
+        assert resolve_order_by_tag(session, "direct:99").id == newer.id
+        # Taken over in place by the upsert rather than deleted and re-inserted.
+        session.expire_all()
+        assert session.query(TradeOrderTag).filter_by(tag="direct:99", kind="event").one().id == taken_row_id
+        assert "event" not in _tags(session, order.id)
+        assert resolve_order_ids_by_tags(session, ["123456", "missing"]) == {"123456": {"perm": order.id}}
+    finally:
+        session.close()
+
+
+def test_update_repairs_missing_tag_rows():
+    session = _session()
+    try:
+        order = TradeOrder(
+            client_order_id="manual-9",
+            symbol="AAPL",
+            side="BUY",
+            quantity=1,
+            status="NEW",
+            params={"event_tag": "direct:9"},
+        )
+        session.add(order)
+        session.commit()
+        # Rows lost (or never written, for orders older than the table).
+        session.query(TradeOrderTag).filter(TradeOrderTag.order_id == order.id).delete()
+        session.commit()
+
+        # A tracked column changes without changing any tag.
+        order.params = {**order.params, "note": "retry"}
+        session.commit()
+        assert _tags(session, order.id) == {"client": "manual-9", "event": "direct:9"}
+    finally:
+        session.close()
+
+
+def test_updating_an_older_order_keeps_a_shared_tag_on_the_newest():
+    session = _session()
+    try:
+        older = TradeOrder(
+            client_order_id="oi_old",
+            symbol="AAPL",
+            side="BUY",
+            quantity=1,
+            status="NEW",
+            params={"order_intent_id": "snapshot:5:0:AAPL"},
+        )
+        session.add(older)
+        session.commit()
+        newer = TradeOrder(
+            client_order_id="oi_new",
+            symbol="AAPL",
+            side="BUY",
+            quantity=1,
+            status="NEW",
+            params={"order_intent_id": "snapshot:5:0:AAPL"},
+        )
+        session.add(newer)
+        session.commit()
+        assert resolve_order_ids_by_tags(session, ["snapshot:5:0:AAPL"]) == {
+            "snapshot:5:0:AAPL": {"intent": newer.id}
+        }
+
+        # Tags unchanged: goes through the after-flush repair.
+        older.params = {**older.params, "note": "retry"}
+        older.status = "SUBMITTED"
+        session.commit()
+        # Another tag changes: goes through the direct sync.
+        older.ib_perm_id = 777
+        session.commit()
+
+        assert resolve_order_ids_by_tags(session, ["snapshot:5:0:AAPL", "777"]) == {
+            "snapshot:5:0:AAPL": {"intent": newer.id},
+            "777": {"perm": older.id},
+        }
+        assert _tags(session, older.id) == {"client": "oi_old", "perm": "777"}
+    finally:
+        session.close()
+
+
+def test_run_orders_only_index_client_and_intent_tags():
+    session = _session()
+    try:
+        run = TradeRun(project_id=1, decision_snapshot_id=1, status="running", params={})
+        session.add(run)
+        session.commit()
+        result = create_trade_order(
+            session,
+            {
+                "client_order_id": f"oi_{run.id}_1",
+                "symbol": "MSFT",
+                "side": "SELL",
+                "quantity": 2,
+                "order_type": "MKT",
+                "params": {"event_tag": "shared"},
+            },
+            run_id=run.id,
+        )
+        session.commit()
+        update_trade_order_status(session, result.order, {"status": "SUBMITTED"})
+        assert _tags(session, result.order.id) == {"client": f"oi_{run.id}_1"}
+    finally:
+        session.close()
+
+
+def test_execution_event_resolves_manual_order_by_event_tag():
+    session = _session()
+    try:
+        order = TradeOrder(
+            client_order_id="manual_3_1770992553631_0111-5m",
+            symbol="AMSC",
+            side="SELL",
+            quantity=9,
+            status="SUBMITTED",
+            params={"event_tag": "legacy-tag"},
+        )
+        session.add(order)
+        session.commit()
+
+        summary = apply_execution_events(
+            [
+                {
+                    "order_id": 5711,
+                    "symbol": "AMSC",
+                    "status": "Filled",
+                    "filled": -9.0,
+                    "fill_price": 31.97,
+                    "direction": "Sell",
+                    "time": "2026-02-13T14:23:15Z",
+                    "tag": "legacy-tag",
+                }
+            ],
+            session=session,
+        )
+        session.refresh(order)
+        assert summary["processed"] == 1
+        assert order.status == "FILLED"
+    finally:
+        session.close()
+
+
+def test_listeners_are_registered_by_importing_trade_orders():
+    script = """
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, TradeOrder, TradeOrderTag
+import app.services.trade_orders  # noqa: F401
+
+engine = create_engine("sqlite:///:memory:")
+Base.metadata.create_all(engine)
+session = sessionmaker(bind=engine)()
+session.add(TradeOrder(client_order_id="m-1", symbol="AAPL", side="BUY", quantity=1, status="NEW"))
+session.commit()
+print(session.query(TradeOrderTag.kind, TradeOrderTag.tag).all())
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[('client', 'm-1')]"
@@ -128,3 +128,55 @@ def test_trade_receipts_sorted_by_order_id_desc(monkeypatch, tmp_path: Path) ->
     assert page.warnings == []
 
     session.close()
+
+
+def test_trade_receipts_sql_page_matches_merged_listing(monkeypatch, tmp_path: Path) -> None:
+    session = _make_session()
+    monkeypatch.setattr(settings, "data_root", str(tmp_path))
+    (tmp_path / "lean_bridge").mkdir(parents=True, exist_ok=True)
+
+    base = datetime(2026, 1, 28, 10, 0, 0, tzinfo=timezone.utc)
+    for idx in range(4):
+        order = create_trade_order(
+            session,
+            {
+                "client_order_id": f"manual-page-{idx}",
+                "symbol": "SPY",
+                "side": "BUY",
+                "quantity": 3,
+                "order_type": "MKT",
+                "params": {"client_order_id_auto": True},
+            },
+        ).order
+        session.commit()
+        for step in range(idx % 3):
+            apply_fill_to_order(
+                session,
+                order,
+                fill_qty=1,
+                fill_price=100.0 + step,
+                fill_time=base.replace(minute=idx * 10 + step),
+                exec_id=f"EXEC-{idx}-{step}",
+            )
+        session.commit()
+
+    def _keys(page):
+        return [(item.kind, item.order_id, item.time, item.exec_id) for item in page.items]
+
+    for mode in ("all", "orders", "fills"):
+        merged = list_trade_receipts(session, limit=100, offset=0, mode=mode)
+        pages = [
+            list_trade_receipts(
+                session,
+                limit=3,
+                offset=offset,
+                mode=mode,
+                ingest_lean_events=False,
+                include_lean_events=False,
+            )
+            for offset in range(0, merged.total, 3)
+        ]
+        assert {page.total for page in pages} == {merged.total}
+        assert [key for page in pages for key in _keys(page)] == _keys(merged)
+
+    session.close()
@@ -12,7 +12,8 @@ if str(BACKEND_ROOT) not in sys.path:
     sys.path.insert(0, str(BACKEND_ROOT))
 
 from app.core.config import settings
-from app.models import Base, TradeFill, TradeOrder, TradeRun
+from app.models import Base, LeanEventCursor, TradeFill, TradeOrder, TradeRun
+from app.services import trade_receipts
 from app.services.trade_orders import create_trade_order
 from app.services.trade_receipts import list_trade_receipts
 
@@ -475,3 +476,63 @@ def test_receipts_ingest_negative_fill_does_not_crash(monkeypatch, tmp_path: Pat
     assert len(fills) == 1
 
     session.close()
+
+
+def test_receipts_ingest_resumes_from_persisted_cursor(monkeypatch, tmp_path: Path) -> None:
+    session = _make_session()
+    monkeypatch.setattr(settings, "data_root", str(tmp_path))
+
+    result = create_trade_order(
+        session,
+        {
+            "client_order_id": "manual-cursor",
+            "symbol": "AAPL",
+            "side": "BUY",
+            "quantity": 3,
+            "order_type": "MKT",
+            "params": {"client_order_id_auto": True},
+        },
+    )
+    session.commit()
+    order = result.order
+
+    bridge_dir = tmp_path / "lean_bridge" / f"direct_{order.id}"
+    bridge_dir.mkdir(parents=True, exist_ok=True)
+    events_path = bridge_dir / "execution_events.jsonl"
+    first = f'{{"status":"PartiallyFilled","filled":1,"fill_price":10.0,"direction":"Buy","time":"2026-01-28T19:25:01Z","tag":"direct:{order.id}"}}'
+    second = f'{{"status":"PartiallyFilled","filled":2,"fill_price":11.0,"direction":"Buy","time":"2026-01-28T19:25:02Z","tag":"direct:{order.id}"}}'
+    # The second line is still being written when the first pass runs.
+    events_path.write_text(first + "\n" + second[:20], encoding="utf-8")
+
+    ingested: list[dict] = []
+    original = trade_receipts._ingest_event
+    monkeypatch.setattr(
+        trade_receipts,
+        "_ingest_event",
+        lambda session, path, payload, *args: ingested.append(payload) or original(session, path, payload, *args),
+    )
+
+    list_trade_receipts(session, limit=50, offset=0, mode="all")
+    assert [item["time"] for item in ingested] == ["2026-01-28T19:25:01Z"]
+    cursor = session.query(LeanEventCursor).one()
+    assert cursor.path == f"direct_{order.id}/execution_events.jsonl"
+    assert cursor.byte_offset == len(first) + 1
+
+    events_path.write_text(first + "\n" + second + "\n", encoding="utf-8")
+    list_trade_receipts(session, limit=50, offset=0, mode="all")
+    list_trade_receipts(session, limit=50, offset=0, mode="all")
+    assert [item["time"] for item in ingested] == ["2026-01-28T19:25:01Z", "2026-01-28T19:25:02Z"]
+
+    fills = session.query(TradeFill).filter(TradeFill.order_id == order.id).order_by(TradeFill.id).all()
+    assert [fill.event_key for fill in fills] == [
+        f"lean:{order.id}:2026-01-28T19:25:01Z",
+        f"lean:{order.id}:2026-01-28T19:25:02Z",
+    ]
+
+    # A truncated (rotated) file is read again from the start; fills stay deduplicated.
+    events_path.write_text(first + "\n", encoding="utf-8")
+    list_trade_receipts(session, limit=50, offset=0, mode="all")
+    assert len(ingested) == 3
+    assert session.query(TradeFill).filter(TradeFill.order_id == order.id).count() == 2
+
+    session.close()
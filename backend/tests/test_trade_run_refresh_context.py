@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.models import Base, TradeFill, TradeOrder, TradeRun
+from app.services import trade_executor
+
+
+def _refresh(monkeypatch, tmp_path: Path, count: int) -> tuple[TradeRun, list[TradeOrder], int, object]:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    symbols = [f"S{idx}" for idx in range(count)]
+    run = TradeRun(
+        project_id=1,
+        decision_snapshot_id=1,
+        mode="paper",
+        status="running",
+        params={
+            "lean_execution": {"source": "short_lived_fallback"},
+            "positions_baseline": {"items": [{"symbol": symbol, "quantity": 0} for symbol in symbols]},
+        },
+    )
+    session.add(run)
+    session.commit()
+    orders = []
+    for idx, symbol in enumerate(symbols):
+        order = TradeOrder(
+            run_id=run.id,
+            client_order_id=f"oi_{run.id}_{idx}",
+            symbol=symbol,
+            side="BUY",
+            quantity=10,
+            status="SUBMITTED",
+            params={},
+        )
+        session.add(order)
+        orders.append(order)
+    session.commit()
+
+    # Even orders are still working at the broker; odd ones already show up in holdings.
+    refreshed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    open_orders = {
+        "items": [{"tag": order.client_order_id, "status": "Submitted"} for order in orders[::2]],
+        "refreshed_at": refreshed_at,
+        "stale": False,
+        "source_detail": "ib_open_orders",
+    }
+    positions = {
+        "items": [{"symbol": order.symbol, "quantity": 10, "avg_cost": 5.0} for order in orders[1::2]],
+        "refreshed_at": refreshed_at,
+        "stale": False,
+    }
+    monkeypatch.setattr(trade_executor, "_resolve_bridge_root", lambda: tmp_path)
+    monkeypatch.setattr(trade_executor, "read_open_orders", lambda *_args, **_kwargs: open_orders)
+    monkeypatch.setattr(trade_executor, "read_positions", lambda *_args, **_kwargs: positions)
+    monkeypatch.setattr(trade_executor, "_lean_submit_blocked_during_warmup", lambda *_args, **_kwargs: False)
+    monkeypatch.setattr(trade_executor, "_lean_no_orders_submitted", lambda *_args, **_kwargs: False)
+
+    selects: list[str] = []
+
+    def _count(_conn, _cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    trade_executor.refresh_trade_run_status(session, run)
+    trade_executor.refresh_trade_run_status(session, run)
+    event.remove(engine, "before_cursor_execute", _count)
+    return run, orders, len(selects), session
+
+
+def test_refresh_reconciles_from_one_load_of_the_run(monkeypatch, tmp_path):
+    _run, small_orders, small_selects, small_session = _refresh(monkeypatch, tmp_path, 4)
+    run, orders, selects, session = _refresh(monkeypatch, tmp_path, 16)
+    try:
+        assert [order.status for order in orders[::2]] == ["SUBMITTED"] * 8
+        assert [order.status for order in orders[1::2]] == ["FILLED"] * 8
+        fills = session.query(TradeFill).all()
+        # The second pass sees the reconciled fills and does not add new ones.
+        assert sorted(fill.order_id for fill in fills) == sorted(order.id for order in orders[1::2])
+        assert all(fill.fill_quantity == 10 for fill in fills)
+        assert run.status == "running"
+        # Per-run cost does not grow with the number of orders.
+        assert selects == small_selects
+        assert selects <= 6
+    finally:
+        session.close()
+        small_session.close()
@@ -0,0 +1,140 @@
+from datetime import date
+from pathlib import Path
+import math
+import sys
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import universe_pipeline as up
+
+
+def _frames():
+    index = pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"])
+    prices = pd.DataFrame(
+        {
+            "AAA": [10.0, 11.0, 12.0, 13.0],
+            "BBB": [float("nan"), 2.0, 2.5, 3.0],
+            "CCC": [50.0, 51.0, float("nan"), 52.0],
+            "ETF": [100.0, 101.0, 102.0, 103.0],
+        },
+        index=index,
+    )
+    volumes = pd.DataFrame(
+        {
+            "AAA": [1000.0, 1200.0, 1100.0, 0.0],
+            "BBB": [float("nan"), 10.0, 10.0, 10.0],
+            "CCC": [5000.0, 5000.0, float("nan"), 5000.0],
+        },
+        index=index,
+    )
+    return prices, volumes
+
+
+def _build(prices, volumes, snapshot_positions, exec_positions, **overrides):
+    params = dict(
+        asset_type_by_symbol={"AAA": "STOCK", "BBB": "STOCK", "CCC": "STOCK", "ETF": "ETF"},
+        allowed_asset_types={"STOCK"},
+        exclude_symbols=set(),
+        symbol_life={},
+        membership_ranges={},
+        min_price=5.0,
+        min_history_days=2,
+        need_volume=True,
+        volume_missing=set(),
+        halt_volume_threshold=0.0,
+        min_avg_volume=100.0,
+        min_avg_dollar_volume=0.0,
+        liquidity_window_days=2,
+    )
+    params.update(overrides)
+    check_dates = [prices.index[pos].date() for pos in snapshot_positions]
+    return up.build_universe_filter_masks(
+        prices,
+        prices,
+        volumes,
+        snapshot_positions,
+        exec_positions,
+        check_dates,
+        **params,
+    )
+
+
+def test_universe_filter_masks_report_reasons_per_symbol():
+    prices, volumes = _frames()
+    masks = _build(prices, volumes, [1, 2], [1, 2])
+
+    active, excluded, counts = masks.evaluate(0, ["ETF", "AAA", "BBB", "CCC"])
+    assert active == ["AAA", "CCC"]
+    assert [(symbol, reason) for symbol, reason, _ in excluded] == [
+        ("ETF", "asset_type"),
+        ("BBB", "min_avg_volume|min_history|min_price"),
+    ]
+    assert excluded[1][2] == 2.0
+    assert counts == [("asset_type", 1), ("min_price", 1), ("min_history", 1), ("min_avg_volume", 1)]
+
+    active, excluded, counts = masks.evaluate(1, ["CCC", "AAA"])
+    assert active == ["AAA"]
+    assert excluded[0][0] == "CCC"
+    assert excluded[0][1] == "missing_rebalance_price|missing_snapshot_price|volume_missing"
+    assert math.isnan(excluded[0][2])
+
+
+def test_universe_filter_masks_double_count_missing_rebalance_bar():
+    prices, volumes = _frames()
+    masks = _build(
+        prices,
+        volumes,
+        [3],
+        [-1],
+        min_history_days=0,
+        need_volume=False,
+        exclude_symbols={"AAA"},
+        symbol_life={"CCC": (date(2024, 2, 1), None)},
+        membership_ranges={"BBB": [(None, date(2024, 1, 4))]},
+    )
+
+    active, excluded, counts = masks.evaluate(0, ["AAA", "BBB", "CCC"])
+    assert active == []
+    assert dict(counts) == {
+        "excluded": 1,
+        "missing_rebalance_price": 6,
+        "not_in_membership": 1,
+        "min_price": 1,
+        "before_ipo": 1,
+    }
+    assert [name for name, _ in counts] == [
+        "excluded",
+        "missing_rebalance_price",
+        "not_in_membership",
+        "min_price",
+        "before_ipo",
+    ]
+    assert excluded[1] == ("BBB", "min_price|missing_rebalance_price|not_in_membership", 3.0)
+
+
+def test_universe_filter_masks_pit_sets_and_halts():
+    prices, volumes = _frames()
+    masks = _build(
+        prices,
+        volumes,
+        [3],
+        [3],
+        allowed_asset_types=set(),
+        min_price=0.0,
+        min_history_days=0,
+        min_avg_volume=0.0,
+        halt_volume_threshold=1.0,
+        pit_sets=[{"AAA", "CCC"}],
+    )
+
+    active, excluded, _ = masks.evaluate(0, ["AAA", "BBB", "CCC", "ETF"])
+    assert active == ["CCC"]
+    assert [(symbol, reason) for symbol, reason, _ in excluded] == [
+        ("AAA", "halted"),
+        ("BBB", "not_in_pit"),
+        ("ETF", "not_in_pit|volume_missing"),
+    ]
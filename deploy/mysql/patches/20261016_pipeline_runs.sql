@@ -0,0 +1,104 @@
+-- 变更说明: 新增 pipeline_runs（pretrade/trade/auto_weekly 统一运行索引）与 pipeline_run_tags（关键字检索用 id 标签），流水线列表改为 SQL 侧过滤 + keyset 分页
+-- 影响范围: pipeline_runs, pipeline_run_tags
+-- 回滚指引: DROP TABLE pipeline_run_tags; DROP TABLE pipeline_runs;
+
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+  id INT NOT NULL AUTO_INCREMENT,
+  trace_id VARCHAR(64) NOT NULL,
+  run_type VARCHAR(32) NOT NULL,
+  source_id INT NOT NULL,
+  project_id INT NOT NULL,
+  status VARCHAR(32) NOT NULL,
+  mode VARCHAR(16) NULL,
+  listed TINYINT(1) NOT NULL DEFAULT 1,
+  created_at DATETIME NULL,
+  started_at DATETIME NULL,
+  ended_at DATETIME NULL,
+  sort_at DATETIME NOT NULL,
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (id),
+  UNIQUE KEY uq_pipeline_runs_trace_id (trace_id),
+  KEY ix_pipeline_runs_project_sort (project_id, sort_at, trace_id),
+  KEY ix_pipeline_runs_project_type_status (project_id, run_type, status)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS pipeline_run_tags (
+  id INT NOT NULL AUTO_INCREMENT,
+  trace_id VARCHAR(64) NOT NULL,
+  kind VARCHAR(16) NOT NULL,
+  tag VARCHAR(64) NOT NULL,
+  PRIMARY KEY (id),
+  UNIQUE KEY uq_pipeline_run_tag (trace_id, kind, tag)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 回填运行索引: 由 pretrade run 触发的 trade run（params.pretrade_run_id 非空）不单独列出（listed = 0）。
+INSERT IGNORE INTO pipeline_runs
+  (trace_id, run_type, source_id, project_id, status, mode, listed, created_at, started_at, ended_at, sort_at)
+SELECT CONCAT('pretrade:', id), 'pretrade', id, project_id, status, NULL, 1, created_at, started_at, ended_at,
+       COALESCE(created_at, started_at, ended_at, UTC_TIMESTAMP())
+FROM pretrade_runs;
+
+INSERT IGNORE INTO pipeline_runs
+  (trace_id, run_type, source_id, project_id, status, mode, listed, created_at, started_at, ended_at, sort_at)
+SELECT CONCAT('trade:', id), 'trade', id, project_id, status, mode,
+       CASE
+         WHEN JSON_EXTRACT(params, '$.pretrade_run_id') IS NULL THEN 1
+         WHEN JSON_UNQUOTE(JSON_EXTRACT(params, '$.pretrade_run_id')) IN ('null', '', '0', 'false') THEN 1
+         ELSE 0
+       END,
+       created_at, started_at, ended_at,
+       COALESCE(created_at, started_at, ended_at, UTC_TIMESTAMP())
+FROM trade_runs;
+
+INSERT IGNORE INTO pipeline_runs
+  (trace_id, run_type, source_id, project_id, status, mode, listed, created_at, started_at, ended_at, sort_at)
+SELECT CONCAT('auto:', id), 'auto_weekly', id, project_id, status, NULL, 1, created_at, started_at, ended_at,
+       COALESCE(created_at, started_at, ended_at, UTC_TIMESTAMP())
+FROM auto_weekly_jobs;
+
+-- 回填标签: run/step/snapshot/trade_run/order/fill/pit，与原先逐条收集的关键字范围一致。
+INSERT IGNORE INTO pipeline_run_tags (trace_id, kind, tag)
+SELECT CONCAT('pretrade:', id), 'run', CAST(id AS CHAR) FROM pretrade_runs
+UNION ALL
+SELECT CONCAT('trade:', id), 'run', CAST(id AS CHAR) FROM trade_runs
+UNION ALL
+SELECT CONCAT('auto:', id), 'run', CAST(id AS CHAR) FROM auto_weekly_jobs;
+
+INSERT IGNORE INTO pipeline_run_tags (trace_id, kind, tag)
+SELECT CONCAT('pretrade:', run_id), 'step', CAST(id AS CHAR)
+FROM pretrade_steps;
+
+INSERT IGNORE INTO pipeline_run_tags (trace_id, kind, tag)
+SELECT t.trace_id, t.kind, t.tag
+FROM (
+  SELECT CONCAT('pretrade:', run_id) AS trace_id, 'snapshot' AS kind,
+         JSON_UNQUOTE(JSON_EXTRACT(artifacts, '$.decision_snapshot_id')) AS tag
+  FROM pretrade_steps
+  WHERE JSON_EXTRACT(artifacts, '$.decision_snapshot_id') IS NOT NULL
+  UNION ALL
+  SELECT CONCAT('pretrade:', run_id), 'trade_run',
+         JSON_UNQUOTE(JSON_EXTRACT(artifacts, '$.trade_run_id'))
+  FROM pretrade_steps
+  WHERE JSON_EXTRACT(artifacts, '$.trade_run_id') IS NOT NULL
+) t
+WHERE t.tag IS NOT NULL AND t.tag <> '' AND t.tag <> 'null' AND t.tag <> '0';
+
+INSERT IGNORE INTO pipeline_run_tags (trace_id, kind, tag)
+SELECT CONCAT('trade:', run_id), 'order', CAST(id AS CHAR)
+FROM trade_orders
+WHERE run_id IS NOT NULL;
+
+INSERT IGNORE INTO pipeline_run_tags (trace_id, kind, tag)
+SELECT CONCAT('trade:', o.run_id), 'fill', CAST(f.id AS CHAR)
+FROM trade_fills f
+JOIN trade_orders o ON o.id = f.order_id
+WHERE o.run_id IS NOT NULL;
+
+INSERT IGNORE INTO pipeline_run_tags (trace_id, kind, tag)
+SELECT CONCAT('auto:', id), 'pit', CAST(pit_weekly_job_id AS CHAR)
+FROM auto_weekly_jobs
+WHERE pit_weekly_job_id IS NOT NULL AND pit_weekly_job_id <> 0
+UNION ALL
+SELECT CONCAT('auto:', id), 'pit', CAST(pit_fundamental_job_id AS CHAR)
+FROM auto_weekly_jobs
+WHERE pit_fundamental_job_id IS NOT NULL AND pit_fundamental_job_id <> 0;
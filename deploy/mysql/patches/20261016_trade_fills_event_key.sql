@@ -0,0 +1,61 @@
+-- 变更说明: 为 trade_fills 增加 event_key 唯一键（lean 成交回报去重），新增 lean_event_cursors 记录 execution_events.jsonl 的读取偏移
+-- 影响范围: trade_fills, lean_event_cursors
+-- 回滚指引: ALTER TABLE trade_fills DROP INDEX uq_trade_fill_event_key, DROP COLUMN event_key; DROP TABLE lean_event_cursors;
+
+SET @col_exists := (
+  SELECT COUNT(*)
+  FROM information_schema.columns
+  WHERE table_schema = DATABASE()
+    AND table_name = 'trade_fills'
+    AND column_name = 'event_key'
+);
+SET @sql := IF(
+  @col_exists = 0,
+  'ALTER TABLE trade_fills ADD COLUMN event_key VARCHAR(128) NULL',
+  'SELECT 1'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 回填历史 lean 成交: 同一 (order_id, event_time) 只给最早的一条写入 event_key，其余保持 NULL。
+UPDATE trade_fills f
+JOIN (
+  SELECT
+    MIN(id) AS id,
+    CONCAT('lean:', order_id, ':', JSON_UNQUOTE(JSON_EXTRACT(params, '$.event_time'))) AS event_key
+  FROM trade_fills
+  WHERE event_key IS NULL
+    AND JSON_UNQUOTE(JSON_EXTRACT(params, '$.event_source')) = 'lean'
+    AND JSON_EXTRACT(params, '$.event_time') IS NOT NULL
+  GROUP BY order_id, JSON_UNQUOTE(JSON_EXTRACT(params, '$.event_time'))
+) k ON k.id = f.id
+LEFT JOIN trade_fills existing ON existing.event_key = k.event_key
+SET f.event_key = k.event_key
+WHERE existing.id IS NULL;
+
+SET @idx_exists := (
+  SELECT COUNT(*)
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE()
+    AND table_name = 'trade_fills'
+    AND index_name = 'uq_trade_fill_event_key'
+);
+SET @sql := IF(
+  @idx_exists = 0,
+  'CREATE UNIQUE INDEX uq_trade_fill_event_key ON trade_fills (event_key)',
+  'SELECT 1'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+CREATE TABLE IF NOT EXISTS lean_event_cursors (
+  id INT NOT NULL AUTO_INCREMENT,
+  path VARCHAR(512) NOT NULL,
+  file_id BIGINT NULL,
+  byte_offset BIGINT NOT NULL DEFAULT 0,
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (id),
+  UNIQUE KEY uq_lean_event_cursor_path (path)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,93 @@
+-- 变更说明: 新增 trade_order_tags（tag/kind -> order_id 归一化索引，执行回报按标签一次索引定位订单），并为 trade_orders(status, run_id)、trade_orders(symbol, created_at)、trade_fills(order_id, fill_time) 增加复合索引
+-- 影响范围: trade_order_tags, trade_orders, trade_fills
+-- 回滚指引: DROP TABLE trade_order_tags; ALTER TABLE trade_orders DROP INDEX ix_trade_orders_status_run, DROP INDEX ix_trade_orders_symbol_created; ALTER TABLE trade_fills DROP INDEX ix_trade_fills_order_fill_time;
+
+CREATE TABLE IF NOT EXISTS trade_order_tags (
+  id INT NOT NULL AUTO_INCREMENT,
+  tag VARCHAR(128) NOT NULL,
+  kind VARCHAR(16) NOT NULL,
+  order_id INT NOT NULL,
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (id),
+  UNIQUE KEY uq_trade_order_tag (tag, kind),
+  UNIQUE KEY uq_trade_order_tag_order_kind (order_id, kind),
+  CONSTRAINT fk_trade_order_tags_order FOREIGN KEY (order_id) REFERENCES trade_orders (id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 回填: 同一 (tag, kind) 只保留最新订单（按 id 倒序插入，INSERT IGNORE 跳过后续冲突）。
+-- event/broker 标签仅记录非 trade run 订单（手工/direct 单），与原先的扫描范围一致。
+INSERT IGNORE INTO trade_order_tags (tag, kind, order_id)
+SELECT TRIM(client_order_id), 'client', id
+FROM trade_orders
+WHERE client_order_id IS NOT NULL AND TRIM(client_order_id) <> ''
+ORDER BY id DESC;
+
+INSERT IGNORE INTO trade_order_tags (tag, kind, order_id)
+SELECT t.tag, t.kind, t.order_id
+FROM (
+  SELECT TRIM(JSON_UNQUOTE(JSON_EXTRACT(params, '$.event_tag'))) AS tag, 'event' AS kind, id AS order_id
+  FROM trade_orders
+  WHERE run_id IS NULL AND JSON_EXTRACT(params, '$.event_tag') IS NOT NULL
+  UNION ALL
+  SELECT TRIM(JSON_UNQUOTE(JSON_EXTRACT(params, '$.broker_order_tag'))), 'broker', id
+  FROM trade_orders
+  WHERE run_id IS NULL AND JSON_EXTRACT(params, '$.broker_order_tag') IS NOT NULL
+  UNION ALL
+  SELECT TRIM(JSON_UNQUOTE(JSON_EXTRACT(params, '$.order_intent_id'))), 'intent', id
+  FROM trade_orders
+  WHERE JSON_EXTRACT(params, '$.order_intent_id') IS NOT NULL
+  UNION ALL
+  SELECT CAST(ib_perm_id AS CHAR), 'perm', id
+  FROM trade_orders
+  WHERE ib_perm_id IS NOT NULL AND ib_perm_id > 0
+) t
+WHERE t.tag IS NOT NULL AND t.tag <> '' AND t.tag <> 'null' AND CHAR_LENGTH(t.tag) <= 128
+ORDER BY t.order_id DESC;
+
+SET @idx_exists := (
+  SELECT COUNT(*)
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE()
+    AND table_name = 'trade_orders'
+    AND index_name = 'ix_trade_orders_status_run'
+);
+SET @sql := IF(
+  @idx_exists = 0,
+  'CREATE INDEX ix_trade_orders_status_run ON trade_orders (status, run_id)',
+  'SELECT 1'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @idx_exists := (
+  SELECT COUNT(*)
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE()
+    AND table_name = 'trade_orders'
+    AND index_name = 'ix_trade_orders_symbol_created'
+);
+SET @sql := IF(
+  @idx_exists = 0,
+  'CREATE INDEX ix_trade_orders_symbol_created ON trade_orders (symbol, created_at)',
+  'SELECT 1'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @idx_exists := (
+  SELECT COUNT(*)
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE()
+    AND table_name = 'trade_fills'
+    AND index_name = 'ix_trade_fills_order_fill_time'
+);
+SET @sql := IF(
+  @idx_exists = 0,
+  'CREATE INDEX ix_trade_fills_order_fill_time ON trade_fills (order_id, fill_time)',
+  'SELECT 1'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from feature_engineering import FeatureConfig
+
+# On-disk cache of per-symbol feature and label frames shared by train_torch/predict_torch.
+#
+# Layout under the cache root:
+#   features/{digest(FeatureConfig)}/{symbol}.npz
+#   labels/{digest(horizon, start_offset, price_column)}/{symbol}.npz
+# Each .npz holds the date index, one array per column (dtype preserved) and a `source`
+# record with the size/mtime/CRC32 of the symbol and benchmark price files plus the symbol
+# life window the frame was computed from. An entry is only reused while that record still
+# matches, so edits to curated_adjusted data invalidate it without any bookkeeping.
+# PIT fundamentals are merged on top of the cached frames by the callers.
+
+FEATURE_CACHE_VERSION = 1
+_CRC_CHUNK = 1024 * 1024
+
+
+def _digest(payload: dict) -> str:
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _safe_symbol(symbol: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in {"-", "_"} else "_" for ch in symbol.upper())
+
+
+def _crc32(path: Path) -> int:
+    crc = 0
+    with path.open("rb") as handle:
+        while True:
+            chunk = handle.read(_CRC_CHUNK)
+            if not chunk:
+                return crc
+            crc = zlib.crc32(chunk, crc)
+
+
+def _format_life(life: tuple[pd.Timestamp | None, pd.Timestamp | None] | None) -> list[str | None]:
+    if not life:
+        return [None, None]
+    return [value.isoformat() if value is not None else None for value in life]
+
+
+class FeatureCache:
+    def __init__(self, root: Path, feat_config: FeatureConfig) -> None:
+        self.root = Path(root)
+        self.feature_dir = self.root / "features" / _digest(
+            {"version": FEATURE_CACHE_VERSION, "features": asdict(feat_config)}
+        )
+        self._fingerprints: dict[Path, dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _label_dir(self, horizon: int, start_offset: int, price_column: str) -> Path:
+        return self.root / "labels" / _digest(
+            {
+                "version": FEATURE_CACHE_VERSION,
+                "horizon": int(horizon),
+                "start_offset": int(start_offset),
+                "price_column": price_column,
+            }
+        )
+
+    def _stat(self, path: Path) -> dict:
+        stat = path.stat()
+        return {"name": path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _fingerprint(self, path: Path) -> dict:
+        cached = self._fingerprints.get(path)
+        if cached is None:
+            cached = {**self._stat(path), "crc32": _crc32(path)}
+            self._fingerprints[path] = cached
+        return cached
+
+    def source(
+        self,
+        symbol_path: Path,
+        benchmark_path: Path,
+        life: tuple[pd.Timestamp | None, pd.Timestamp | None] | None,
+    ) -> dict:
+        """Describe the inputs of one symbol's frames; stats only, CRCs are taken lazily."""
+        return {
+            "symbol": self._stat(symbol_path),
+            "benchmark": self._stat(benchmark_path),
+            "life": _format_life(life),
+            "paths": {"symbol": symbol_path, "benchmark": benchmark_path},
+        }
+
+    def _matches(self, stored: dict, source: dict) -> bool:
+        if stored.get("life") != source["life"]:
+            return False
+        for key in ("symbol", "benchmark"):
+            expected = stored.get(key) or {}
+            current = source[key]
+            if expected.get("name") != current["name"] or expected.get("size") != current["size"]:
+                return False
+            if expected.get("mtime_ns") == current["mtime_ns"]:
+                continue
+            # Touched but possibly unchanged (e.g. a sync that rewrote identical bytes).
+            if expected.get("crc32") != self._fingerprint(source["paths"][key])["crc32"]:
+                return False
+        return True
+
+    def _source_record(self, source: dict) -> dict:
+        return {
+            "symbol": self._fingerprint(source["paths"]["symbol"]),
+            "benchmark": self._fingerprint(source["paths"]["benchmark"]),
+            "life": source["life"],
+        }
+
+    def _read(self, path: Path, source: dict) -> dict[str, np.ndarray] | None:
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as payload:
+                arrays = {name: payload[name] for name in payload.files}
+            stored = json.loads(str(arrays.pop("source")))
+        except (OSError, ValueError, KeyError, json.JSONDecodeError):
+            return None
+        if stored.get("version") != FEATURE_CACHE_VERSION or not self._matches(stored, source):
+            return None
+        return arrays
+
+    def _write(self, path: Path, source: dict, arrays: dict[str, np.ndarray]) -> None:
+        record = {"version": FEATURE_CACHE_VERSION, **self._source_record(source)}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.stem}.tmp.npz")
+        try:
+            with tmp_path.open("wb") as handle:
+                np.savez(handle, source=np.array(json.dumps(record)), **arrays)
+            tmp_path.replace(path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def _count(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def load_features(self, symbol: str, source: dict) -> pd.DataFrame | None:
+        arrays = self._read(self.feature_dir / f"{_safe_symbol(symbol)}.npz", source)
+        self._count(arrays is not None)
+        if arrays is None:
+            return None
+        columns = [str(name) for name in arrays["columns"].tolist()]
+        index = pd.DatetimeIndex(arrays["index"], name=str(arrays["index_name"]) or None)
+        return pd.DataFrame(
+            {name: arrays[f"c{idx}"] for idx, name in enumerate(columns)},
+            index=index,
+            columns=columns,
+        )
+
+    def store_features(self, symbol: str, source: dict, frame: pd.DataFrame) -> None:
+        arrays = {
+            "index": frame.index.to_numpy(dtype="datetime64[ns]"),
+            "index_name": np.array(frame.index.name or ""),
+            "columns": np.array([str(name) for name in frame.columns]),
+        }
+        for idx, name in enumerate(frame.columns):
+            arrays[f"c{idx}"] = frame[name].to_numpy()
+        self._write(self.feature_dir / f"{_safe_symbol(symbol)}.npz", source, arrays)
+
+    def load_label(
+        self, symbol: str, source: dict, horizon: int, start_offset: int, price_column: str
+    ) -> pd.Series | None:
+        path = self._label_dir(horizon, start_offset, price_column) / f"{_safe_symbol(symbol)}.npz"
+        arrays = self._read(path, source)
+        self._count(arrays is not None)
+        if arrays is None:
+            return None
+        index = pd.DatetimeIndex(arrays["index"], name=str(arrays["index_name"]) or None)
+        return pd.Series(arrays["values"], index=index)
+
+    def store_label(
+        self,
+        symbol: str,
+        source: dict,
+        horizon: int,
+        start_offset: int,
+        price_column: str,
+        label: pd.Series,
+    ) -> None:
+        path = self._label_dir(horizon, start_offset, price_column) / f"{_safe_symbol(symbol)}.npz"
+        arrays = {
+            "index": label.index.to_numpy(dtype="datetime64[ns]"),
+            "index_name": np.array(label.index.name or ""),
+            "values": label.to_numpy(),
+        }
+        self._write(path, source, arrays)
+
+
+def load_feature_cache(config: dict, data_root: Path, feat_config: FeatureConfig) -> FeatureCache | None:
+    cache_cfg = config.get("feature_cache", {})
+    if not isinstance(cache_cfg, dict):
+        cache_cfg = {}
+    if not bool(cache_cfg.get("enabled", True)):
+        return None
+    raw_dir = str(cache_cfg.get("dir") or "").strip()
+    root = Path(raw_dir) if raw_dir else data_root / "ml_cache"
+    if not root.is_absolute():
+        root = data_root / root
+    return FeatureCache(root, feat_config)
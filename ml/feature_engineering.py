@@ -90,3 +90,231 @@ def required_lookback(config: FeatureConfig, horizon: int) -> int:
         config.vol_windows
     )
     return max([200, horizon] + list(windows))
+
+
+# Panel mode: the same features computed once for many symbols on a dates × symbols matrix.
+#
+# A symbol's bars are the rows of its own price frame (``bars``; by default the rows where
+# its close is set). Every column is packed so that its bars sit at the top in date order
+# (NaN padding below); the rolling kernels then work on bar positions exactly like the
+# per-symbol pandas code does, with one NumPy pass per feature for the whole block instead
+# of one pandas pass per symbol. A bar with a NaN close stays a row, as it does per symbol.
+
+
+def _pack_panel(valid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(~valid, axis=0, kind="stable")
+    return order, valid.sum(axis=0)
+
+
+def _packed(values: np.ndarray, order: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    packed = np.take_along_axis(values.astype(float), order, axis=0)
+    packed[np.arange(len(packed))[:, None] >= counts[None, :]] = np.nan
+    return packed
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    shifted = np.full(values.shape, np.nan)
+    if periods > 0:
+        shifted[periods:] = values[:-periods]
+    elif periods < 0:
+        shifted[:periods] = values[-periods:]
+    else:
+        shifted[:] = values
+    return shifted
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    rows = np.where(~np.isnan(values), np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return np.take_along_axis(values, rows, axis=0)
+
+
+def _pct_change(values: np.ndarray, periods: int) -> np.ndarray:
+    return values / _shift(values, periods) - 1
+
+
+def _run_lengths(values: np.ndarray) -> np.ndarray:
+    """Length of the run of equal values ending at each row (NaN breaks a run)."""
+    rows = np.arange(len(values))[:, None]
+    starts = np.ones(values.shape, dtype=bool)
+    starts[1:] = values[1:] != values[:-1]
+    first = np.where(starts, rows, 0)
+    np.maximum.accumulate(first, axis=0, out=first)
+    return rows - first + 1
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean over full windows from cumulative sums (centred to limit cancellation)."""
+    valid = ~np.isnan(values)
+    ref = np.nan_to_num(values[:1])
+    sums = np.zeros((len(values) + 1, values.shape[1]))
+    np.cumsum(np.where(valid, values - ref, 0.0), axis=0, out=sums[1:])
+    counts = np.zeros(sums.shape, dtype=int)
+    np.cumsum(valid, axis=0, out=counts[1:])
+    mean = np.full(values.shape, np.nan)
+    if window <= len(values):
+        full = counts[window:] - counts[:-window] == window
+        window_mean = (sums[window:] - sums[:-window]) / window + ref
+        mean[window - 1 :] = np.where(full, window_mean, np.nan)
+    # Constant windows are exact, as in pandas.
+    return np.where(_run_lengths(values) >= window, values, mean)
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sample std over full windows with a sliding Welford update per row."""
+    rows, cols = values.shape
+    out = np.full(values.shape, np.nan)
+    if window < 2:
+        return out
+    nobs = np.zeros(cols)
+    mean = np.zeros(cols)
+    m2 = np.zeros(cols)
+    for row in range(rows):
+        if row >= window:
+            old = values[row - window]
+            ok = ~np.isnan(old)
+            nobs -= ok
+            live = nobs > 0
+            delta = np.where(ok, old - mean, 0.0)
+            new_mean = np.where(live, mean - delta / np.maximum(nobs, 1), 0.0)
+            m2 = np.where(live, m2 - delta * np.where(ok, old - new_mean, 0.0), 0.0)
+            mean = new_mean
+        new = values[row]
+        ok = ~np.isnan(new)
+        nobs += ok
+        delta = np.where(ok, new - mean, 0.0)
+        mean = mean + delta / np.maximum(nobs, 1)
+        m2 = m2 + delta * np.where(ok, new - mean, 0.0)
+        out[row] = np.where(nobs >= window, np.sqrt(np.maximum(m2, 0.0) / (window - 1)), np.nan)
+    out[(_run_lengths(values) >= window) & ~np.isnan(out)] = 0.0
+    return out
+
+
+def _rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling max over full windows from power-of-two window maxima."""
+    span = 1
+    level = values.copy()
+    while span * 2 <= window:
+        level = np.maximum(level, _shift(level, span))
+        span *= 2
+    out = np.maximum(level, _shift(level, window - span)) if window > span else level
+    out[: window - 1] = np.nan
+    return out
+
+
+def _panel_values(frame: pd.DataFrame, index: pd.Index, columns: pd.Index) -> np.ndarray:
+    return frame.reindex(index=index, columns=columns).to_numpy(dtype=float)
+
+
+def _panel_bars(
+    close_values: np.ndarray, bars: pd.DataFrame | None, index: pd.Index, columns: pd.Index
+) -> np.ndarray:
+    if bars is None:
+        return ~np.isnan(close_values)
+    return _panel_values(bars, index, columns) == 1.0
+
+
+def _unpack_long(
+    index: pd.Index,
+    columns: pd.Index,
+    order: np.ndarray,
+    counts: np.ndarray,
+    values: dict[str, np.ndarray],
+) -> pd.DataFrame:
+    rows = np.arange(len(order))[:, None] < counts[None, :]
+    flat_rows = rows.ravel(order="F")
+    data: dict[str, np.ndarray] = {"symbol": np.repeat(columns.to_numpy(dtype=object), counts)}
+    for name, array in values.items():
+        data[name] = array.ravel(order="F")[flat_rows]
+    dates = index[order.ravel(order="F")[flat_rows]]
+    return pd.DataFrame(data, index=pd.Index(dates, name=index.name))
+
+
+def compute_panel_features(
+    close: pd.DataFrame,
+    volume: pd.DataFrame,
+    spy_df: pd.DataFrame,
+    config: FeatureConfig,
+    bars: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """``compute_features`` for every column of a dates × symbols ``close`` panel at once.
+
+    ``bars`` marks the rows of each symbol's price frame (defaults to the set closes).
+    Returns a long frame indexed by date with a ``symbol`` column followed by the feature
+    columns, grouped by symbol (in column order) and sorted by date within a symbol. Rows
+    match what ``compute_features`` returns for each symbol's bars.
+    """
+    close = close.sort_index()
+    index, columns = close.index, close.columns
+    close_values = close.to_numpy(dtype=float)
+    order, counts = _pack_panel(_panel_bars(close_values, bars, index, columns))
+    close_p = _packed(close_values, order, counts)
+    volume_p = _packed(_panel_values(volume, index, columns), order, counts)
+    spy_close = spy_df.sort_index()["close"].reindex(index).to_numpy(dtype=float)
+    spy_p = _ffill(_packed(np.broadcast_to(spy_close[:, None], close_values.shape), order, counts))
+    # pct_change pads a missing close with the previous one, so returns do too.
+    close_f = _ffill(close_p)
+
+    features: dict[str, np.ndarray] = {}
+    returns = _pct_change(close_f, 1)
+
+    for window in config.return_windows:
+        features[f"ret_{window}"] = _pct_change(close_f, window)
+
+    for window in config.ma_windows:
+        features[f"ma_bias_{window}"] = close_p / _rolling_mean(close_p, window) - 1
+
+    for window in config.vol_windows:
+        features[f"vol_{window}"] = _rolling_std(returns, window)
+
+    volume_std = _rolling_std(volume_p, 20)
+    volume_std[volume_std == 0] = np.nan
+    features["vol_z_20"] = (volume_p - _rolling_mean(volume_p, 20)) / volume_std
+
+    for window in (20, 60):
+        stock = features.get(f"ret_{window}")
+        if stock is None:
+            stock = _pct_change(close_f, window)
+        features[f"rs_{window}"] = stock - _pct_change(spy_p, window)
+
+    ma_50 = _rolling_mean(close_p, 50)
+    ma_200 = _rolling_mean(close_p, 200)
+    features["trend_1"] = (close_p > ma_200).astype(int)
+    features["trend_2"] = (ma_50 > ma_200).astype(int)
+
+    features["dd_60"] = 1 - close_p / _rolling_max(close_p, 60)
+    features["ret_1"] = returns
+
+    return _unpack_long(index, columns, order, counts, features)
+
+
+def compute_panel_label(
+    close: pd.DataFrame,
+    spy_df: pd.DataFrame,
+    horizon: int,
+    start_offset: int = 0,
+    prices: pd.DataFrame | None = None,
+    price_column: str = "close",
+    bars: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """``compute_label`` for every column of a dates × symbols ``close`` panel at once.
+
+    ``bars`` is as in ``compute_panel_features``; ``prices`` is the ``price_column`` panel
+    when it is not the close. Rows come out in the same order as ``compute_panel_features``
+    with a ``symbol`` and a ``label`` column.
+    """
+    close = close.sort_index()
+    spy_df = spy_df.sort_index()
+    index, columns = close.index, close.columns
+    close_values = close.to_numpy(dtype=float)
+    order, counts = _pack_panel(_panel_bars(close_values, bars, index, columns))
+    price_values = close_values if prices is None else _panel_values(prices, index, columns)
+    price_p = _packed(price_values, order, counts)
+    spy_price_col = price_column if price_column in spy_df.columns else "close"
+    start_offset = max(int(start_offset), 0)
+    spy_prices = spy_df[spy_price_col]
+    spy_rel = spy_prices.shift(-(start_offset + horizon)) / spy_prices.shift(-start_offset) - 1
+    spy_rel = spy_rel.reindex(index).to_numpy(dtype=float)
+    spy_rel_p = _packed(np.broadcast_to(spy_rel[:, None], close_values.shape), order, counts)
+    rel = _shift(price_p, -(start_offset + horizon)) / _shift(price_p, -start_offset) - 1
+    return _unpack_long(index, columns, order, counts, {"label": rel - spy_rel_p})
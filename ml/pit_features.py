@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from pathlib import Path
 from typing import Iterable
 
@@ -70,6 +71,39 @@ def _coerce_numeric(frame: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame
     return frame
 
 
+def _open_pit_panel(pit_dir: Path):
+    backend_root = Path(__file__).resolve().parents[1] / "backend"
+    if str(backend_root) not in sys.path:
+        sys.path.insert(0, str(backend_root))
+    try:
+        from app.services.pit_fundamentals_panel import PitPanel
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return PitPanel.open(pit_dir)
+
+
+def _read_pit_panel(
+    panel,
+    symbol_set: set[str],
+    start_dt: pd.Timestamp | None,
+    end_dt: pd.Timestamp | None,
+) -> tuple[dict[str, pd.DataFrame], int, int]:
+    frames = panel.read(
+        symbols=symbol_set or None,
+        start=start_dt,
+        end=end_dt,
+        fields=[*PIT_FEATURE_FIELDS, *PIT_EXTRA_FIELDS],
+    )
+    result: dict[str, pd.DataFrame] = {}
+    total_rows = 0
+    total_with_data = 0
+    for symbol, frame in frames.items():
+        total_rows += len(frame)
+        total_with_data += int(frame["has_fundamentals"].fillna(0.0).gt(0).sum())
+        result[symbol] = frame.rename(columns=PIT_RENAME)[PIT_ALL_COLUMNS]
+    return result, total_rows, total_with_data
+
+
 def load_pit_fundamentals(
     pit_dir: Path,
     symbols: Iterable[str] | None = None,
@@ -77,6 +111,7 @@ def load_pit_fundamentals(
     end: str | None = None,
     min_coverage: float = 0.0,
     coverage_action: str = "warn",
+    use_panel: bool = True,
 ) -> tuple[dict[str, pd.DataFrame], list[str], dict[str, float]]:
     if not pit_dir.exists():
         raise RuntimeError(f"missing pit fundamentals dir: {pit_dir}")
@@ -85,10 +120,17 @@ def load_pit_fundamentals(
     end_dt = _parse_date(end)
 
     pit_frames: dict[str, list[pd.DataFrame]] = {}
+    result: dict[str, pd.DataFrame] = {}
     total_rows = 0
     total_with_data = 0
 
-    for path in sorted(pit_dir.glob("pit_fundamentals_*.csv")):
+    # The panel kept by the PIT fundamentals job is only opened while it still matches the CSVs.
+    panel = _open_pit_panel(pit_dir) if use_panel else None
+    if panel is not None:
+        result, total_rows, total_with_data = _read_pit_panel(panel, symbol_set, start_dt, end_dt)
+    snapshot_paths = [] if panel is not None else sorted(pit_dir.glob("pit_fundamentals_*.csv"))
+
+    for path in snapshot_paths:
         snapshot = _read_snapshot(path)
         if snapshot.empty:
             continue
@@ -127,7 +169,6 @@ def load_pit_fundamentals(
             frame = frame[PIT_ALL_COLUMNS]
             pit_frames.setdefault(symbol, []).append(frame)
 
-    result: dict[str, pd.DataFrame] = {}
     for symbol, frames in pit_frames.items():
         combined = pd.concat(frames).sort_index()
         combined = combined[~combined.index.duplicated(keep="last")]
@@ -192,6 +233,10 @@ def apply_pit_features(
         )
     if merged.empty:
         return merged
+    return _finish_pit_merge(merged, pit_fields, policy)
+
+
+def _finish_pit_merge(merged: pd.DataFrame, pit_fields: list[str], policy: str) -> pd.DataFrame:
     if policy == "drop" and "pit_has_fundamentals" in merged.columns:
         merged = merged[merged["pit_has_fundamentals"].fillna(0) > 0]
     missing_fields = [col for col in pit_fields if col != "pit_has_fundamentals"]
@@ -201,3 +246,58 @@ def apply_pit_features(
     if "pit_has_fundamentals" in merged.columns:
         merged["pit_has_fundamentals"] = merged["pit_has_fundamentals"].fillna(0.0)
     return merged
+
+
+def apply_pit_features_long(
+    features: pd.DataFrame,
+    pit_map: dict[str, pd.DataFrame],
+    pit_fields: Iterable[str],
+    sample_on_snapshot: bool,
+    missing_policy: str,
+) -> pd.DataFrame:
+    """``apply_pit_features`` for a long frame of many symbols (date index, ``symbol`` column).
+
+    One join for the whole frame; rows keep their order and come out as the per-symbol
+    calls would give them (a symbol without PIT rows reads as all fields missing).
+    """
+    pit_fields = list(pit_fields)
+    policy = str(missing_policy or "fill_zero").strip().lower()
+    pit_frames = []
+    for symbol in features["symbol"].unique():
+        pit_frame = pit_map.get(symbol)
+        if pit_frame is not None and not pit_frame.empty:
+            pit_frames.append(pit_frame.rename_axis("_date").reset_index().assign(symbol=symbol))
+    if pit_frames:
+        right = pd.concat(pit_frames, ignore_index=True)
+    else:
+        right = pd.DataFrame(
+            {
+                "_date": pd.Series(dtype="datetime64[ns]"),
+                "symbol": pd.Series(dtype=object),
+                **{col: pd.Series(dtype=float) for col in pit_fields},
+            }
+        )
+    pit_columns = [col for col in right.columns if col not in {"_date", "symbol"}]
+    keys = pd.DataFrame(
+        {
+            "_date": features.index.to_numpy(),
+            "symbol": features["symbol"].to_numpy(),
+            "_row": np.arange(len(features)),
+        }
+    )
+    if sample_on_snapshot:
+        matched = keys.merge(right, on=["_date", "symbol"], how="inner")
+        features = features.iloc[matched["_row"].to_numpy()]
+    else:
+        matched = pd.merge_asof(
+            keys.sort_values("_date", kind="stable"),
+            right.sort_values("_date", kind="stable"),
+            on="_date",
+            by="symbol",
+            direction="backward",
+            allow_exact_matches=True,
+        ).sort_values("_row")
+    merged = features.assign(**{col: matched[col].to_numpy() for col in pit_columns})
+    if merged.empty:
+        return merged
+    return _finish_pit_merge(merged, pit_fields, policy)
@@ -15,12 +15,12 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     lgb = None
 
+from feature_cache import load_feature_cache
 from feature_engineering import FeatureConfig, compute_features, required_lookback
 from pit_features import apply_pit_features, load_pit_fundamentals
 from model_io import load_linear_model
 from torch_model import TorchMLP
 
-
 class CancelledError(RuntimeError):
     pass
 
@@ -52,8 +52,22 @@ def _data_root() -> Path:
     return Path.cwd() / "data"
 
 
-def _load_series(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
+def _load_price_store(enabled: object = None):
+    """Columnar price store reader, or ``None`` to read the CSVs (disabled, or no backend)."""
+    backend_root = Path(__file__).resolve().parents[1] / "backend"
+    if str(backend_root) not in sys.path:
+        sys.path.insert(0, str(backend_root))
+    try:
+        from app.services.price_store import load_price_store
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return load_price_store(enabled)
+
+
+def _load_series(path: Path, price_store=None) -> pd.DataFrame:
+    df = price_store.read_frame(path) if price_store is not None else None
+    if df is None:
+        df = pd.read_csv(path)
     df.columns = [col.strip().lower() for col in df.columns]
     df["date"] = pd.to_datetime(df["date"])
     df = df.set_index("date").sort_index()
@@ -159,18 +173,22 @@ def _pick_dataset_file(symbol: str, adjusted_dir: Path, vendor_preference: list[
     vendor_rank = {vendor.upper(): idx for idx, vendor in enumerate(vendor_preference)}
     best = None
     best_score = None
+    matches: list[tuple[int, Path]] = []
     for idx, candidate in enumerate(symbol_candidates):
         pattern_matches = list(adjusted_dir.glob(f"*_{candidate}_*.csv"))
         if not pattern_matches:
             pattern_matches = list(adjusted_dir.glob(f"*_{candidate}.csv"))
-        for path in pattern_matches:
-            vendor, _ = _parse_dataset_name(path)
-            rank = vendor_rank.get(vendor.upper(), len(vendor_rank) + 1)
-            rows = sum(1 for _ in path.open("r", encoding="utf-8", errors="ignore")) - 1
-            score = (idx, rank, -rows)
-            if best_score is None or score < best_score:
-                best = path
-                best_score = score
+        matches.extend((idx, path) for path in pattern_matches)
+    if len(matches) == 1:
+        return matches[0][1]
+    for idx, path in matches:
+        vendor, _ = _parse_dataset_name(path)
+        rank = vendor_rank.get(vendor.upper(), len(vendor_rank) + 1)
+        rows = sum(1 for _ in path.open("r", encoding="utf-8", errors="ignore")) - 1
+        score = (idx, rank, -rows)
+        if best_score is None or score < best_score:
+            best = path
+            best_score = score
     return best
 
 
@@ -294,11 +312,13 @@ def main() -> None:
     spy_path = _pick_dataset_file(benchmark_symbol, adjusted_dir, vendor_pref)
     if not spy_path:
         raise RuntimeError("缺少基准数据")
-    spy_df = _load_series(spy_path)
+    price_store = _load_price_store(config.get("price_store_read_enabled"))
+    spy_df = _load_series(spy_path, price_store)
     life = symbol_life.get(benchmark_symbol)
     if life:
         spy_df = _apply_symbol_life(spy_df, life)
 
+    feature_cache = load_feature_cache(config, data_root, feat_config)
     rows: list[pd.DataFrame] = []
     batch_size = int(torch_config.get("batch_size", 4096)) or 4096
     mean_vec = np.array([payload.mean.get(name, 0.0) for name in payload.features], dtype=np.float32)
@@ -311,15 +331,21 @@ def main() -> None:
         symbol_path = _pick_dataset_file(symbol, adjusted_dir, vendor_pref)
         if not symbol_path:
             continue
-        df = _load_series(symbol_path)
         life = symbol_life.get(symbol)
-        if life:
-            df = _apply_symbol_life(df, life)
-            if df.empty:
-                continue
-        if len(df) < lookback:
+        source = feature_cache.source(symbol_path, spy_path, life) if feature_cache else None
+        features = feature_cache.load_features(symbol, source) if feature_cache else None
+        if features is None:
+            df = _load_series(symbol_path, price_store)
+            if life:
+                df = _apply_symbol_life(df, life)
+                if df.empty:
+                    continue
+            features = compute_features(df, spy_df, feat_config)
+            if feature_cache:
+                feature_cache.store_features(symbol, source, features)
+        # Features keep one row per bar, so this matches the old len(df) check.
+        if len(features) < lookback:
             continue
-        features = compute_features(df, spy_df, feat_config)
         if pit_enabled:
             pit_frame = pit_map.get(symbol)
             features = apply_pit_features(
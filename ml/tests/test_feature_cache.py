@@ -0,0 +1,93 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2] / "ml"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from feature_cache import FeatureCache, load_feature_cache
+from feature_engineering import FeatureConfig, compute_features, compute_label
+
+FEAT_CONFIG = FeatureConfig(return_windows=[5, 20, 60], ma_windows=[20], vol_windows=[10])
+
+
+def _write_prices(path: Path, seed: int, days: int = 260) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2023-01-02", periods=days, name="date")
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, days))
+    frame = pd.DataFrame(
+        {
+            "open": close * 0.99,
+            "high": close * 1.01,
+            "low": close * 0.98,
+            "close": close,
+            "volume": rng.integers(1_000, 5_000, days).astype(float),
+        },
+        index=index,
+    )
+    frame.reset_index().to_csv(path, index=False)
+    return frame
+
+
+def _setup(tmp_path: Path):
+    adjusted = tmp_path / "curated_adjusted"
+    adjusted.mkdir()
+    spy_path = adjusted / "1_Alpha_SPY_Daily.csv"
+    aaa_path = adjusted / "2_Alpha_AAA_Daily.csv"
+    spy = _write_prices(spy_path, 1)
+    aaa = _write_prices(aaa_path, 2)
+    return spy_path, aaa_path, spy, aaa
+
+
+def test_features_and_labels_round_trip(tmp_path):
+    spy_path, aaa_path, spy, aaa = _setup(tmp_path)
+    cache = FeatureCache(tmp_path / "ml_cache", FEAT_CONFIG)
+    source = cache.source(aaa_path, spy_path, None)
+    features = compute_features(aaa, spy, FEAT_CONFIG)
+    label = compute_label(aaa, spy, 20, start_offset=1, price_column="open")
+
+    assert cache.load_features("AAA", source) is None
+    cache.store_features("AAA", source, features)
+    cache.store_label("AAA", source, 20, 1, "open", label)
+
+    reloaded = FeatureCache(tmp_path / "ml_cache", FEAT_CONFIG)
+    source = reloaded.source(aaa_path, spy_path, None)
+    pd.testing.assert_frame_equal(reloaded.load_features("AAA", source), features, check_freq=False)
+    pd.testing.assert_series_equal(
+        reloaded.load_label("AAA", source, 20, 1, "open"), label, check_freq=False, check_names=False
+    )
+    assert reloaded.load_label("AAA", source, 10, 1, "open") is None
+    other_config = FeatureConfig(return_windows=[5], ma_windows=[20], vol_windows=[10])
+    assert FeatureCache(tmp_path / "ml_cache", other_config).load_features("AAA", source) is None
+
+
+def test_cache_invalidates_when_prices_or_life_change(tmp_path):
+    spy_path, aaa_path, spy, aaa = _setup(tmp_path)
+    cache = FeatureCache(tmp_path / "ml_cache", FEAT_CONFIG)
+    cache.store_features("AAA", cache.source(aaa_path, spy_path, None), compute_features(aaa, spy, FEAT_CONFIG))
+
+    # Rewriting identical bytes only bumps the mtime; the CRC keeps the entry valid.
+    aaa_path.write_bytes(aaa_path.read_bytes())
+    stat = aaa_path.stat()
+    os.utime(aaa_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    cache = FeatureCache(tmp_path / "ml_cache", FEAT_CONFIG)
+    assert cache.load_features("AAA", cache.source(aaa_path, spy_path, None)) is not None
+
+    life = (pd.Timestamp("2023-03-01"), None)
+    assert cache.load_features("AAA", cache.source(aaa_path, spy_path, life)) is None
+
+    _write_prices(spy_path, 3)
+    cache = FeatureCache(tmp_path / "ml_cache", FEAT_CONFIG)
+    assert cache.load_features("AAA", cache.source(aaa_path, spy_path, None)) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_load_feature_cache_respects_config(tmp_path):
+    assert load_feature_cache({"feature_cache": {"enabled": False}}, tmp_path, FEAT_CONFIG) is None
+    cache = load_feature_cache({"feature_cache": {"dir": "cache/ml"}}, tmp_path, FEAT_CONFIG)
+    assert cache.root == tmp_path / "cache" / "ml"
+    assert load_feature_cache({}, tmp_path, FEAT_CONFIG).root == tmp_path / "ml_cache"
@@ -0,0 +1,107 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2] / "ml"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from feature_engineering import (
+    FeatureConfig,
+    compute_features,
+    compute_label,
+    compute_panel_features,
+    compute_panel_label,
+)
+
+CONFIG = FeatureConfig(return_windows=[1, 5, 20], ma_windows=[10, 50], vol_windows=[10, 20])
+DATES = pd.bdate_range("2021-01-04", periods=320, name="date")
+
+
+def _frames() -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(7)
+    frames = {}
+    for idx in range(5):
+        close = 40 * np.cumprod(1 + rng.normal(0, 0.02, len(DATES)))
+        volume = rng.integers(1_000, 5_000, len(DATES)).astype(float)
+        if idx == 1:
+            # Suspended stretch: constant closes and volume must give exact zero std.
+            close[120:200] = close[120]
+            volume[120:160] = 2_500.0
+        if idx == 2:
+            volume[rng.integers(0, len(DATES), 15)] = np.nan
+        frame = pd.DataFrame(
+            {"open": close * 0.99, "close": close, "volume": volume}, index=DATES
+        ).iloc[idx * 10 : len(DATES) - idx * 7]
+        if idx == 3:
+            # Missing bars: rolling windows count bars, not calendar rows of the panel.
+            frame = frame.drop(frame.index[rng.choice(len(frame), 30, replace=False)])
+        frames[f"S{idx}"] = frame
+    return frames
+
+
+def _spy() -> pd.DataFrame:
+    close = 100 * np.cumprod(1 + np.random.default_rng(3).normal(0, 0.01, len(DATES)))
+    return pd.DataFrame({"open": close, "close": close}, index=DATES).drop(DATES[[4, 90, 211]])
+
+
+def test_panel_features_match_per_symbol_features():
+    frames = _frames()
+    spy = _spy()
+    close = pd.DataFrame({symbol: frame["close"] for symbol, frame in frames.items()})
+    volume = pd.DataFrame({symbol: frame["volume"] for symbol, frame in frames.items()})
+
+    panel = compute_panel_features(close, volume, spy, CONFIG)
+
+    assert list(panel["symbol"].unique()) == list(frames)
+    for symbol, frame in frames.items():
+        expected = compute_features(frame, spy, CONFIG)
+        got = panel[panel["symbol"] == symbol].drop(columns="symbol")
+        pd.testing.assert_frame_equal(
+            got, expected, check_exact=False, rtol=1e-9, atol=1e-12, check_freq=False
+        )
+
+
+def test_panel_label_matches_per_symbol_label():
+    frames = _frames()
+    spy = _spy()
+    close = pd.DataFrame({symbol: frame["close"] for symbol, frame in frames.items()})
+    opens = pd.DataFrame({symbol: frame["open"] for symbol, frame in frames.items()})
+
+    panel = compute_panel_label(close, spy, 5, start_offset=1, prices=opens, price_column="open")
+
+    for symbol, frame in frames.items():
+        expected = compute_label(frame, spy, 5, start_offset=1, price_column="open")
+        got = panel.loc[panel["symbol"] == symbol, "label"]
+        pd.testing.assert_series_equal(got, expected, check_names=False, check_freq=False)
+
+
+def test_panel_keeps_bars_with_a_missing_close():
+    frames = _frames()
+    spy = _spy()
+    rng = np.random.default_rng(11)
+    for symbol in ("S0", "S4"):
+        frame = frames[symbol].copy()
+        frame.iloc[rng.choice(len(frame), 12, replace=False), frame.columns.get_loc("close")] = np.nan
+        frames[symbol] = frame
+    close = pd.DataFrame({symbol: frame["close"] for symbol, frame in frames.items()})
+    volume = pd.DataFrame({symbol: frame["volume"] for symbol, frame in frames.items()})
+    bars = pd.DataFrame({symbol: pd.Series(True, index=frame.index) for symbol, frame in frames.items()})
+
+    panel = compute_panel_features(close, volume, spy, CONFIG, bars=bars)
+    labels = compute_panel_label(close, spy, 5, bars=bars)
+
+    for symbol, frame in frames.items():
+        expected = compute_features(frame, spy, CONFIG)
+        got = panel[panel["symbol"] == symbol].drop(columns="symbol")
+        pd.testing.assert_frame_equal(
+            got, expected, check_exact=False, rtol=1e-9, atol=1e-12, check_freq=False
+        )
+        pd.testing.assert_series_equal(
+            labels.loc[labels["symbol"] == symbol, "label"],
+            compute_label(frame, spy, 5),
+            check_names=False,
+            check_freq=False,
+        )
@@ -0,0 +1,182 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2] / "ml"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import train_torch
+from feature_cache import FeatureCache
+from feature_engineering import FeatureConfig
+from pit_features import PIT_ALL_COLUMNS
+
+FEAT_CONFIG = FeatureConfig(return_windows=[5, 20], ma_windows=[20], vol_windows=[10])
+SYMBOLS = ["SPY", "AAA", "BBB", "MISSING", "CCC", "DDD"]
+
+
+def _write_prices(path: Path, seed: int, days: int = 240) -> None:
+    rng = np.random.default_rng(seed)
+    close = 50 * np.cumprod(1 + rng.normal(0, 0.01, days))
+    pd.DataFrame(
+        {
+            "date": pd.bdate_range("2023-01-02", periods=days),
+            "open": close * 0.99,
+            "high": close * 1.01,
+            "low": close * 0.98,
+            "close": close,
+            "volume": rng.integers(1_000, 5_000, days).astype(float),
+        }
+    ).to_csv(path, index=False)
+
+
+def _context(tmp_path: Path, feature_cache: FeatureCache | None = None) -> train_torch._PrepareContext:
+    adjusted_dir = tmp_path / "curated_adjusted"
+    adjusted_dir.mkdir(exist_ok=True)
+    for idx, symbol in enumerate(SYMBOLS):
+        if symbol != "MISSING":
+            _write_prices(adjusted_dir / f"{idx + 1}_Alpha_{symbol}_Daily.csv", idx)
+    spy_path = train_torch._pick_dataset_file("SPY", adjusted_dir, ["Alpha"])
+    return train_torch._PrepareContext(
+        adjusted_dir=adjusted_dir,
+        raw_dir=tmp_path / "curated",
+        vendor_pref=["Alpha"],
+        symbol_life={"DDD": (None, pd.Timestamp("2022-12-31"))},
+        spy_path=spy_path,
+        spy_df=train_torch._load_series(spy_path),
+        feat_config=FEAT_CONFIG,
+        horizon=5,
+        label_start_offset=1,
+        label_price="open",
+        train_start=None,
+        pit_enabled=False,
+        pit_map={},
+        pit_fields=[],
+        pit_sample_on_snapshot=True,
+        pit_missing_policy="fill_zero",
+        weight_needs_dv=False,
+        dv_window=1,
+        feature_cache=feature_cache,
+    )
+
+
+def test_parallel_preparation_matches_serial(tmp_path):
+    ctx = _context(tmp_path, FeatureCache(tmp_path / "ml_cache", FEAT_CONFIG))
+    progress_path = tmp_path / "progress.json"
+
+    serial, serial_map, serial_stats = train_torch._prepare_dataset(
+        SYMBOLS, ctx, workers=1, chunk_size=2, progress_path=None, cancel_path=None
+    )
+    ctx.feature_cache = FeatureCache(tmp_path / "ml_cache", FEAT_CONFIG)
+    parallel, parallel_map, parallel_stats = train_torch._prepare_dataset(
+        SYMBOLS, ctx, workers=2, chunk_size=2, progress_path=progress_path, cancel_path=None
+    )
+
+    assert [frame["symbol"].iloc[0] for frame in serial] == ["SPY", "AAA", "BBB", "CCC"]
+    assert list(parallel_map) == list(serial_map)
+    for left, right in zip(serial, parallel):
+        pd.testing.assert_frame_equal(left, right)
+    assert serial_stats == (0, 10)
+    assert parallel_stats == (8, 2)
+    progress = json.loads(progress_path.read_text(encoding="utf-8"))
+    assert progress["phase"] == "prepare_features"
+    assert progress["processed_symbols"] == len(SYMBOLS)
+    assert progress["usable_symbols"] == 4
+    assert progress["progress"] == pytest.approx(0.4)
+
+
+def test_parallel_preparation_honours_cancel(tmp_path):
+    ctx = _context(tmp_path)
+    cancel_path = tmp_path / "cancel"
+    cancel_path.write_text("1", encoding="utf-8")
+    progress_path = tmp_path / "progress.json"
+
+    with pytest.raises(train_torch.CancelledError):
+        train_torch._prepare_dataset(
+            SYMBOLS, ctx, workers=2, chunk_size=2, progress_path=progress_path, cancel_path=cancel_path
+        )
+    assert json.loads(progress_path.read_text(encoding="utf-8"))["phase"] == "canceled"
+
+
+def _pit_map() -> dict[str, pd.DataFrame]:
+    snapshots = pd.bdate_range("2023-03-03", periods=30, freq="W-FRI", name="snapshot_date")
+    frames = {}
+    for idx, symbol in enumerate(("AAA", "CCC")):
+        rng = np.random.default_rng(100 + idx)
+        frame = pd.DataFrame(
+            {col: rng.normal(1.0, 0.1, len(snapshots)) for col in PIT_ALL_COLUMNS}, index=snapshots
+        )
+        frame["pit_has_fundamentals"] = 1.0
+        frame.iloc[::4, frame.columns.get_loc("pit_eps")] = np.nan
+        frames[symbol] = frame
+    return frames
+
+
+@pytest.mark.parametrize("pit", [None, "snapshot", "asof"])
+def test_panel_mode_matches_per_symbol_preparation(tmp_path, pit):
+    ctx = _context(tmp_path)
+    if pit:
+        ctx.pit_enabled = True
+        ctx.pit_map = _pit_map()
+        ctx.pit_fields = PIT_ALL_COLUMNS
+        ctx.pit_sample_on_snapshot = pit == "snapshot"
+    # Raw prices for some symbols only: the others get no dollar volume.
+    ctx.raw_dir.mkdir()
+    for idx, symbol in ((1, "AAA"), (4, "CCC")):
+        _write_prices(ctx.raw_dir / f"{idx + 1}_Alpha_{symbol}_Daily.csv", idx + 20)
+    ctx.weight_needs_dv = True
+    ctx.dv_window = 3
+    expected, expected_map, _ = train_torch._prepare_dataset(
+        SYMBOLS, ctx, workers=1, chunk_size=2, progress_path=None, cancel_path=None
+    )
+    ctx.feature_mode = "panel"
+    ctx.feature_cache = FeatureCache(tmp_path / "ml_cache", FEAT_CONFIG)
+    panel, panel_map, panel_stats = train_torch._prepare_dataset(
+        SYMBOLS, ctx, workers=1, chunk_size=4, progress_path=None, cancel_path=None
+    )
+    cached, _, cached_stats = train_torch._prepare_dataset(
+        SYMBOLS, ctx, workers=1, chunk_size=4, progress_path=None, cancel_path=None
+    )
+
+    # One long frame per chunk of four symbols.
+    assert len(panel) == len(cached) == 2
+    assert list(panel_map) == list(expected_map)
+    for symbol, frame in expected_map.items():
+        pd.testing.assert_frame_equal(panel_map[symbol], frame, check_exact=False, rtol=1e-9)
+    # Per symbol, where dollar_volume_raw lands depends on the first symbol with raw prices.
+    pd.testing.assert_frame_equal(
+        pd.concat(panel), pd.concat(expected), check_exact=False, rtol=1e-9, check_like=True
+    )
+    for right, again in zip(panel, cached):
+        pd.testing.assert_frame_equal(again, right)
+    assert panel_stats == (0, 10)
+    # DDD is delisted before its first bar, so it is never cached.
+    assert cached_stats == (8, 12)
+
+
+def test_panel_mode_keeps_bars_with_a_missing_close(tmp_path, monkeypatch):
+    ctx = _context(tmp_path)
+    load_series = train_torch._load_series
+
+    def _with_missing_closes(path, price_store=None):
+        df = load_series(path, price_store).copy()
+        df.iloc[[40, 41, 120], df.columns.get_loc("close")] = np.nan
+        return df
+
+    monkeypatch.setattr(train_torch, "_load_series", _with_missing_closes)
+    expected, expected_map, _ = train_torch._prepare_dataset(
+        SYMBOLS, ctx, workers=1, chunk_size=1, progress_path=None, cancel_path=None
+    )
+    ctx.feature_mode = "panel"
+    panel, panel_map, _ = train_torch._prepare_dataset(
+        SYMBOLS, ctx, workers=1, chunk_size=6, progress_path=None, cancel_path=None
+    )
+
+    assert len(panel) == 1 and len(panel[0]) == sum(len(frame) for frame in expected)
+    for symbol, frame in expected_map.items():
+        pd.testing.assert_frame_equal(panel_map[symbol], frame, check_exact=False, rtol=1e-9)
+    pd.testing.assert_frame_equal(panel[0], pd.concat(expected), check_exact=False, rtol=1e-9)
@@ -4,6 +4,8 @@ import argparse
 import json
 import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -26,8 +28,16 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     lgb = None
 
-from feature_engineering import FeatureConfig, compute_features, compute_label, required_lookback
-from pit_features import apply_pit_features, load_pit_fundamentals
+from feature_cache import FeatureCache, load_feature_cache
+from feature_engineering import (
+    FeatureConfig,
+    compute_features,
+    compute_label,
+    compute_panel_features,
+    compute_panel_label,
+    required_lookback,
+)
+from pit_features import apply_pit_features, apply_pit_features_long, load_pit_fundamentals
 from model_io import LinearModelPayload, save_linear_model
 try:
     from torch_model import TorchMLP
@@ -130,6 +140,9 @@ def _pick_dataset_file(
     if not candidates:
         return None
 
+    if len(candidates) == 1:
+        return candidates[0]
+
     vendor_rank = {vendor.upper(): idx for idx, vendor in enumerate(vendor_preference)}
     best = None
     best_score = None
@@ -145,8 +158,22 @@ def _pick_dataset_file(
     return best
 
 
-def _load_series(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
+def _load_price_store(enabled: object = None):
+    """Columnar price store reader, or ``None`` to read the CSVs (disabled, or no backend)."""
+    backend_root = Path(__file__).resolve().parents[1] / "backend"
+    if str(backend_root) not in sys.path:
+        sys.path.insert(0, str(backend_root))
+    try:
+        from app.services.price_store import load_price_store
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return load_price_store(enabled)
+
+
+def _load_series(path: Path, price_store=None) -> pd.DataFrame:
+    df = price_store.read_frame(path) if price_store is not None else None
+    if df is None:
+        df = pd.read_csv(path)
     df.columns = [col.strip().lower() for col in df.columns]
     if "date" not in df.columns:
         raise ValueError(f"missing date column: {path}")
@@ -936,6 +963,432 @@ def _train_loop(
     return {"history": history, "best_loss": best_loss}
 
 
+@dataclass
+class _PrepareContext:
+    """Everything the per-symbol preparation needs; sent once to each pool worker."""
+
+    adjusted_dir: Path
+    raw_dir: Path
+    vendor_pref: list[str]
+    symbol_life: dict[str, tuple[pd.Timestamp | None, pd.Timestamp | None]]
+    spy_path: Path
+    spy_df: pd.DataFrame
+    feat_config: FeatureConfig
+    horizon: int
+    label_start_offset: int
+    label_price: str
+    train_start: pd.Timestamp | None
+    pit_enabled: bool
+    pit_map: dict[str, pd.DataFrame]
+    pit_fields: list[str]
+    pit_sample_on_snapshot: bool
+    pit_missing_policy: str
+    weight_needs_dv: bool
+    dv_window: int
+    price_store: object | None = None
+    feature_cache: FeatureCache | None = None
+    feature_mode: str = "symbol"
+
+
+@dataclass
+class _PreparedSymbol:
+    symbol: str
+    score_features: pd.DataFrame | None = None
+    merged: pd.DataFrame | None = None
+    # Panel mode: the symbol's training rows are in its block's long frame.
+    in_block: bool = False
+
+
+@dataclass
+class _SymbolFrames:
+    path: Path
+    life: tuple[pd.Timestamp | None, pd.Timestamp | None] | None
+    source: dict | None = None
+    features: pd.DataFrame | None = None
+    label: pd.Series | None = None
+
+    @property
+    def complete(self) -> bool:
+        return self.features is not None and self.label is not None
+
+
+def _cached_frames(symbol: str, ctx: _PrepareContext) -> _SymbolFrames | None:
+    """Resolve a symbol's price file and whatever the feature cache already holds for it."""
+    symbol_path = _pick_dataset_file(symbol, ctx.adjusted_dir, ctx.vendor_pref)
+    if not symbol_path:
+        return None
+    frames = _SymbolFrames(symbol_path, ctx.symbol_life.get(symbol))
+    feature_cache = ctx.feature_cache
+    if feature_cache:
+        frames.source = feature_cache.source(symbol_path, ctx.spy_path, frames.life)
+        frames.features = feature_cache.load_features(symbol, frames.source)
+        frames.label = feature_cache.load_label(
+            symbol, frames.source, ctx.horizon, ctx.label_start_offset, ctx.label_price
+        )
+    return frames
+
+
+def _load_symbol_prices(frames: _SymbolFrames, ctx: _PrepareContext) -> pd.DataFrame | None:
+    df = _load_series(frames.path, ctx.price_store)
+    if frames.life:
+        df = _apply_symbol_life(df, frames.life)
+        if df.empty:
+            return None
+    return df
+
+
+def _fill_frames(
+    symbol: str,
+    frames: _SymbolFrames,
+    ctx: _PrepareContext,
+    features: pd.DataFrame | None,
+    label: pd.Series | None,
+) -> None:
+    """Take freshly computed frames for whatever the cache missed, and cache them."""
+    feature_cache = ctx.feature_cache
+    if frames.features is None:
+        frames.features = features
+        if feature_cache:
+            feature_cache.store_features(symbol, frames.source, features)
+    if frames.label is None:
+        frames.label = label
+        if feature_cache:
+            feature_cache.store_label(
+                symbol, frames.source, ctx.horizon, ctx.label_start_offset, ctx.label_price, label
+            )
+
+
+def _prepare_symbol(symbol: str, ctx: _PrepareContext) -> _PreparedSymbol:
+    """Load, align and compute one symbol's scoring features and labelled training rows."""
+    frames = _cached_frames(symbol, ctx)
+    if frames is None:
+        return _PreparedSymbol(symbol)
+    if not frames.complete:
+        df = _load_symbol_prices(frames, ctx)
+        if df is None:
+            return _PreparedSymbol(symbol)
+        _fill_frames(
+            symbol,
+            frames,
+            ctx,
+            compute_features(df, ctx.spy_df, ctx.feat_config) if frames.features is None else None,
+            compute_label(
+                df,
+                ctx.spy_df,
+                ctx.horizon,
+                start_offset=ctx.label_start_offset,
+                price_column=ctx.label_price,
+            )
+            if frames.label is None
+            else None,
+        )
+    return _finish_symbol(symbol, frames, ctx)
+
+
+def _prepare_panel_block(
+    symbols: list[str], ctx: _PrepareContext
+) -> tuple[list[_PreparedSymbol], pd.DataFrame | None]:
+    """Panel-mode preparation: the block's rows go through one dates × symbols panel and stay long.
+
+    Cache misses are computed on the panel; the long frame then takes the cached symbols,
+    the labels, the PIT join and the filters as a whole, and comes back as one frame for the
+    block instead of one per symbol.
+    """
+    block: list[tuple[str, _SymbolFrames]] = []
+    prices: dict[str, pd.DataFrame] = {}
+    for symbol in symbols:
+        frames = _cached_frames(symbol, ctx)
+        if frames is None:
+            continue
+        if not frames.complete:
+            df = _load_symbol_prices(frames, ctx)
+            if df is None:
+                continue
+            if df.empty:
+                _fill_frames(
+                    symbol,
+                    frames,
+                    ctx,
+                    compute_features(df, ctx.spy_df, ctx.feat_config),
+                    compute_label(
+                        df,
+                        ctx.spy_df,
+                        ctx.horizon,
+                        start_offset=ctx.label_start_offset,
+                        price_column=ctx.label_price,
+                    ),
+                )
+            else:
+                prices[symbol] = df
+        block.append((symbol, frames))
+    pieces: list[pd.DataFrame] = []
+    if prices:
+        close = pd.DataFrame({symbol: df["close"] for symbol, df in prices.items()}).sort_index()
+        volume = pd.DataFrame({symbol: df["volume"] for symbol, df in prices.items()})
+        # Every row of a symbol's price frame is a bar, as in compute_features.
+        bars = pd.DataFrame({symbol: pd.Series(True, index=df.index) for symbol, df in prices.items()})
+        price_col = ctx.label_price if ctx.label_price in next(iter(prices.values())).columns else "close"
+        label_prices = (
+            pd.DataFrame({symbol: df[price_col] for symbol, df in prices.items()})
+            if price_col != "close"
+            else None
+        )
+        features_long = compute_panel_features(close, volume, ctx.spy_df, ctx.feat_config, bars=bars)
+        labels_long = compute_panel_label(
+            close,
+            ctx.spy_df,
+            ctx.horizon,
+            start_offset=ctx.label_start_offset,
+            prices=label_prices,
+            price_column=ctx.label_price,
+            bars=bars,
+        )
+        if ctx.feature_cache:
+            frames_by_symbol = dict(block)
+            offsets = np.cumsum([0] + [len(prices[symbol]) for symbol in close.columns])
+            for pos, symbol in enumerate(close.columns):
+                frames = frames_by_symbol[symbol]
+                rows = slice(offsets[pos], offsets[pos + 1])
+                _fill_frames(
+                    symbol,
+                    frames,
+                    ctx,
+                    features_long.iloc[rows].drop(columns="symbol") if frames.features is None else None,
+                    labels_long["label"].iloc[rows].rename(None) if frames.label is None else None,
+                )
+        features_long["label"] = labels_long["label"].to_numpy()
+        pieces.append(features_long)
+    for symbol, frames in block:
+        if symbol not in prices:
+            piece = frames.features.copy()
+            piece.insert(0, "symbol", symbol)
+            piece["label"] = frames.label.reindex(piece.index)
+            pieces.append(piece)
+    if not pieces:
+        return [_PreparedSymbol(symbol) for symbol in symbols], None
+    long = pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+    if len(pieces) > 1:
+        # Back to block order, as the per-symbol path would concatenate it.
+        position = {symbol: pos for pos, symbol in enumerate(symbols)}
+        long = long.iloc[np.argsort(long["symbol"].map(position).to_numpy(), kind="stable")]
+    return _finish_panel_block(symbols, [symbol for symbol, _ in block], long, ctx)
+
+
+def _finish_panel_block(
+    symbols: list[str], prepared: list[str], long: pd.DataFrame, ctx: _PrepareContext
+) -> tuple[list[_PreparedSymbol], pd.DataFrame | None]:
+    """``_finish_symbol`` for a whole panel block's long frame."""
+    features = long
+    if ctx.pit_enabled:
+        features = apply_pit_features_long(
+            features,
+            ctx.pit_map,
+            ctx.pit_fields,
+            ctx.pit_sample_on_snapshot,
+            ctx.pit_missing_policy,
+        )
+    if ctx.train_start is not None:
+        features = features[features.index >= ctx.train_start]
+    score_features = features.drop(columns=["symbol", "label"])
+    if "vol_z_20" in score_features.columns:
+        score_features["vol_z_20"] = score_features["vol_z_20"].fillna(0.0)
+    groups = features.groupby("symbol", sort=False).indices
+    results: dict[str, _PreparedSymbol] = {}
+    for symbol in prepared:
+        result = results[symbol] = _PreparedSymbol(symbol)
+        rows = groups.get(symbol)
+        if rows is not None:
+            result.score_features = score_features.iloc[rows]
+        elif ctx.train_start is None:
+            # Left without rows (no PIT snapshot to sample on): an empty frame, as per symbol.
+            result.score_features = long.iloc[0:0].drop(columns=["symbol", "label"])
+    kept = features.dropna()
+    if kept.empty:
+        return [results.get(symbol) or _PreparedSymbol(symbol) for symbol in symbols], None
+    # Columns in the per-symbol order: features, label, dollar volume, symbol.
+    columns = [col for col in kept.columns if col not in {"symbol", "label"}]
+    merged = kept.reindex(columns=[*columns, "label"])
+    dollar_volume = _block_dollar_volume(kept, ctx) if ctx.weight_needs_dv else None
+    if dollar_volume is not None:
+        merged["dollar_volume_raw"] = dollar_volume
+    merged["symbol"] = kept["symbol"].to_numpy()
+    for symbol in merged["symbol"].unique():
+        results[symbol].in_block = True
+    return [results.get(symbol) or _PreparedSymbol(symbol) for symbol in symbols], merged
+
+
+def _block_dollar_volume(rows_frame: pd.DataFrame, ctx: _PrepareContext) -> np.ndarray | None:
+    """Raw dollar volume for each row of a long frame; None when no symbol has raw prices."""
+    values = np.full(len(rows_frame), np.nan)
+    found = False
+    for symbol, rows in rows_frame.groupby("symbol", sort=False).indices.items():
+        raw_path = _pick_dataset_file(symbol, ctx.raw_dir, ctx.vendor_pref)
+        if not raw_path:
+            continue
+        raw_df = _load_series(raw_path, ctx.price_store)
+        life = ctx.symbol_life.get(symbol)
+        if life:
+            raw_df = _apply_symbol_life(raw_df, life)
+        dv_series = raw_df["close"] * raw_df["volume"]
+        if ctx.dv_window > 1:
+            dv_series = dv_series.rolling(window=ctx.dv_window, min_periods=1).mean()
+        values[rows] = dv_series.reindex(rows_frame.index[rows]).to_numpy(dtype=float)
+        found = True
+    return values if found else None
+
+
+def _finish_symbol(symbol: str, frames: _SymbolFrames, ctx: _PrepareContext) -> _PreparedSymbol:
+    result = _PreparedSymbol(symbol)
+    features = frames.features
+    label = frames.label
+    life = frames.life
+    if ctx.pit_enabled:
+        features = apply_pit_features(
+            features,
+            ctx.pit_map.get(symbol),
+            ctx.pit_fields,
+            ctx.pit_sample_on_snapshot,
+            ctx.pit_missing_policy,
+        )
+    if ctx.train_start is not None:
+        features = features[features.index >= ctx.train_start]
+        if features.empty:
+            return result
+    score_features = features.copy()
+    if "vol_z_20" in score_features.columns:
+        score_features["vol_z_20"] = score_features["vol_z_20"].fillna(0.0)
+    result.score_features = score_features
+    merged = features.join(label.rename("label")).dropna()
+    if merged.empty:
+        return result
+    if ctx.weight_needs_dv:
+        raw_path = _pick_dataset_file(symbol, ctx.raw_dir, ctx.vendor_pref)
+        if raw_path:
+            raw_df = _load_series(raw_path, ctx.price_store)
+            if life:
+                raw_df = _apply_symbol_life(raw_df, life)
+            dv_series = raw_df["close"] * raw_df["volume"]
+            if ctx.dv_window > 1:
+                dv_series = dv_series.rolling(window=ctx.dv_window, min_periods=1).mean()
+            merged["dollar_volume_raw"] = dv_series.reindex(merged.index)
+    merged["symbol"] = symbol
+    result.merged = merged
+    return result
+
+
+def _prepare_block(
+    symbols: list[str], ctx: _PrepareContext
+) -> tuple[list[_PreparedSymbol], pd.DataFrame | None]:
+    """Prepared symbols, plus the block's long training frame in panel mode."""
+    if ctx.feature_mode == "panel":
+        return _prepare_panel_block(symbols, ctx)
+    return [_prepare_symbol(symbol, ctx) for symbol in symbols], None
+
+
+_PREPARE_CONTEXT: _PrepareContext | None = None
+
+
+def _init_prepare_worker(ctx: _PrepareContext) -> None:
+    global _PREPARE_CONTEXT
+    _PREPARE_CONTEXT = ctx
+
+
+def _prepare_chunk(
+    symbols: list[str],
+) -> tuple[list[_PreparedSymbol], pd.DataFrame | None, int, int]:
+    ctx = _PREPARE_CONTEXT
+    if ctx is None:
+        raise RuntimeError("prepare worker not initialized")
+    cache = ctx.feature_cache
+    hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
+    results, merged = _prepare_block(symbols, ctx)
+    if cache:
+        return results, merged, cache.hits - hits, cache.misses - misses
+    return results, merged, 0, 0
+
+
+def _prepare_dataset(
+    symbols: list[str],
+    ctx: _PrepareContext,
+    workers: int,
+    chunk_size: int,
+    progress_path: Path | None,
+    cancel_path: Path | None,
+) -> tuple[list[pd.DataFrame], dict[str, pd.DataFrame], tuple[int, int]]:
+    """Run the prepare_features phase, serially or on a process pool.
+
+    With ``workers > 1`` symbols are sent in chunks to a pool whose workers receive the
+    context (benchmark, PIT frames, ...) once. Chunks are consumed in submission order, so
+    the result is the same as the serial loop. In panel mode each chunk's features and labels
+    are computed together on a dates × symbols panel and the chunk's training rows come back
+    as one long frame, so the dataset holds one frame per chunk instead of one per symbol.
+    """
+    dataset: list[pd.DataFrame] = []
+    features_map: dict[str, pd.DataFrame] = {}
+    total_symbols = len(symbols)
+    update_every = max(1, total_symbols // 20) if total_symbols else 1
+    state = {"processed": 0, "usable": 0, "hits": 0, "misses": 0}
+
+    def _consume(results: list[_PreparedSymbol], merged: pd.DataFrame | None) -> None:
+        before = state["processed"]
+        for item in results:
+            if item.score_features is not None:
+                features_map[item.symbol] = item.score_features
+            if item.merged is not None:
+                dataset.append(item.merged)
+            if item.merged is not None or item.in_block:
+                state["usable"] += 1
+            state["processed"] += 1
+        if merged is not None:
+            dataset.append(merged)
+        processed = state["processed"]
+        if processed // update_every > before // update_every or processed == total_symbols:
+            _write_progress(
+                progress_path,
+                {
+                    "phase": "prepare_features",
+                    "progress": min(processed / max(total_symbols, 1), 1.0) * 0.4,
+                    "processed_symbols": processed,
+                    "total_symbols": total_symbols,
+                    "usable_symbols": state["usable"],
+                },
+            )
+
+    chunk_size = max(int(chunk_size), 1)
+    if workers <= 1 or total_symbols <= 1:
+        # Panel mode computes a chunk at a time; per-symbol mode keeps one symbol per step.
+        step = chunk_size if ctx.feature_mode == "panel" else 1
+        for idx in range(0, total_symbols, step):
+            _check_cancel(cancel_path, progress_path)
+            _consume(*_prepare_block(symbols[idx : idx + step], ctx))
+        cache = ctx.feature_cache
+        return dataset, features_map, (cache.hits, cache.misses) if cache else (0, 0)
+
+    chunks = [symbols[idx : idx + chunk_size] for idx in range(0, total_symbols, chunk_size)]
+    pending: deque = deque()
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_prepare_worker, initargs=(ctx,)
+    )
+    try:
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            # Keep a bounded number of chunks in flight so results stream back in order.
+            while next_chunk < len(chunks) and len(pending) < workers * 2:
+                _check_cancel(cancel_path, progress_path)
+                pending.append(executor.submit(_prepare_chunk, chunks[next_chunk]))
+                next_chunk += 1
+            results, merged, hits, misses = pending.popleft().result()
+            state["hits"] += hits
+            state["misses"] += misses
+            _consume(results, merged)
+            _check_cancel(cancel_path, progress_path)
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+    return dataset, features_map, (state["hits"], state["misses"])
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--config", default="ml/config.json")
@@ -1029,132 +1482,50 @@ def main() -> None:
     spy_path = _pick_dataset_file(benchmark_symbol, adjusted_dir, vendor_pref)
     if not spy_path:
         raise RuntimeError(f"未找到基准数据: {benchmark_symbol}")
-    spy_df = _load_series(spy_path)
+    price_store = _load_price_store(config.get("price_store_read_enabled"))
+    spy_df = _load_series(spy_path, price_store)
     life = symbol_life.get(benchmark_symbol)
     if life:
         spy_df = _apply_symbol_life(spy_df, life)
 
-    dataset = []
-    features_map: dict[str, pd.DataFrame] = {}
-    total_symbols = len(symbols)
-    update_every = max(1, total_symbols // 20) if total_symbols else 1
-    processed = 0
-    usable = 0
-    for symbol in symbols:
-        _check_cancel(cancel_path, progress_path)
-        symbol_path = _pick_dataset_file(symbol, adjusted_dir, vendor_pref)
-        if not symbol_path:
-            processed += 1
-            if processed % update_every == 0 or processed == total_symbols:
-                _write_progress(
-                    progress_path,
-                    {
-                        "phase": "prepare_features",
-                        "progress": min(processed / max(total_symbols, 1), 1.0) * 0.4,
-                        "processed_symbols": processed,
-                        "total_symbols": total_symbols,
-                        "usable_symbols": usable,
-                    },
-                )
-            continue
-        df = _load_series(symbol_path)
-        life = symbol_life.get(symbol)
-        if life:
-            df = _apply_symbol_life(df, life)
-            if df.empty:
-                processed += 1
-                if processed % update_every == 0 or processed == total_symbols:
-                    _write_progress(
-                        progress_path,
-                        {
-                            "phase": "prepare_features",
-                            "progress": min(processed / max(total_symbols, 1), 1.0) * 0.4,
-                            "processed_symbols": processed,
-                            "total_symbols": total_symbols,
-                            "usable_symbols": usable,
-                        },
-                    )
-                continue
-        features = compute_features(df, spy_df, feat_config)
-        if pit_enabled:
-            pit_frame = pit_map.get(symbol)
-            features = apply_pit_features(
-                features,
-                pit_frame,
-                pit_fields,
-                pit_sample_on_snapshot,
-                pit_missing_policy,
-            )
-        if train_start is not None:
-            features = features[features.index >= train_start]
-            if features.empty:
-                processed += 1
-                if processed % update_every == 0 or processed == total_symbols:
-                    _write_progress(
-                        progress_path,
-                        {
-                            "phase": "prepare_features",
-                            "progress": min(processed / max(total_symbols, 1), 1.0) * 0.4,
-                            "processed_symbols": processed,
-                            "total_symbols": total_symbols,
-                            "usable_symbols": usable,
-                        },
-                    )
-                continue
-        score_features = features.copy()
-        if "vol_z_20" in score_features.columns:
-            score_features["vol_z_20"] = score_features["vol_z_20"].fillna(0.0)
-        features_map[symbol] = score_features
-        label = compute_label(
-            df,
-            spy_df,
-            horizon,
-            start_offset=label_start_offset,
-            price_column=label_price,
-        )
-        merged = features.join(label.rename("label")).dropna()
-        if merged.empty:
-            processed += 1
-            if processed % update_every == 0 or processed == total_symbols:
-                _write_progress(
-                    progress_path,
-                    {
-                        "phase": "prepare_features",
-                        "progress": min(processed / max(total_symbols, 1), 1.0) * 0.4,
-                        "processed_symbols": processed,
-                        "total_symbols": total_symbols,
-                        "usable_symbols": usable,
-                    },
-                )
-            continue
-        if weight_needs_dv:
-            raw_path = _pick_dataset_file(symbol, raw_dir, vendor_pref)
-            if raw_path:
-                raw_df = _load_series(raw_path)
-                life = symbol_life.get(symbol)
-                if life:
-                    raw_df = _apply_symbol_life(raw_df, life)
-                dv_series = (raw_df["close"] * raw_df["volume"])
-                dv_window = int(weight_cfg.get("dv_window_days") or 1)
-                if dv_window > 1:
-                    dv_series = dv_series.rolling(window=dv_window, min_periods=1).mean()
-                merged["dollar_volume_raw"] = dv_series.reindex(merged.index)
-        merged["symbol"] = symbol
-        dataset.append(merged)
-        usable += 1
-        processed += 1
-        if processed % update_every == 0 or processed == total_symbols:
-            _write_progress(
-                progress_path,
-                {
-                    "phase": "prepare_features",
-                    "progress": min(processed / max(total_symbols, 1), 1.0) * 0.4,
-                    "processed_symbols": processed,
-                    "total_symbols": total_symbols,
-                    "usable_symbols": usable,
-                },
-            )
-
+    feature_mode = str(config.get("feature_mode") or "symbol").strip().lower()
+    if feature_mode not in {"symbol", "panel"}:
+        feature_mode = "symbol"
+    prepare_context = _PrepareContext(
+        adjusted_dir=adjusted_dir,
+        raw_dir=raw_dir,
+        vendor_pref=list(vendor_pref),
+        symbol_life=symbol_life,
+        spy_path=spy_path,
+        spy_df=spy_df,
+        feat_config=feat_config,
+        horizon=horizon,
+        label_start_offset=label_start_offset,
+        label_price=label_price,
+        train_start=train_start,
+        pit_enabled=pit_enabled,
+        pit_map=pit_map,
+        pit_fields=pit_fields,
+        pit_sample_on_snapshot=pit_sample_on_snapshot,
+        pit_missing_policy=pit_missing_policy,
+        weight_needs_dv=weight_needs_dv,
+        dv_window=int(weight_cfg.get("dv_window_days") or 1),
+        price_store=price_store,
+        feature_cache=load_feature_cache(config, data_root, feat_config),
+        feature_mode=feature_mode,
+    )
+    dataset, features_map, cache_stats = _prepare_dataset(
+        symbols,
+        prepare_context,
+        workers=_coerce_int(config.get("prepare_workers"), 1),
+        chunk_size=_coerce_int(
+            config.get("prepare_chunk_size"), 256 if feature_mode == "panel" else 16
+        ),
+        progress_path=progress_path,
+        cancel_path=cancel_path,
+    )
+    if prepare_context.feature_cache:
+        print(f"feature cache: hits={cache_stats[0]} misses={cache_stats[1]}")
     if not dataset:
         raise RuntimeError("未生成有效训练样本")
 
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# Synthetic data root for the hot-path benchmarks (scripts/benchmark_hot_paths.py).
+#
+# The layout mirrors a real DATA_ROOT closely enough for the production loaders to run
+# unchanged on it: curated_adjusted/ daily bars, universe/ lists and weekly PIT snapshots,
+# fundamentals/alpha/ JSON reports, a score file and a sqlite trade database with orders and
+# fills. Everything is drawn from one seeded generator, so the same parameters always give
+# byte-identical inputs and timings stay comparable between commits.
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATASET_VERSION = 1
+DATASET_META_NAME = "benchmark_dataset.json"
+BENCHMARK_SYMBOL = "SPY"
+END_DATE = date(2025, 12, 31)
+
+
+def dataset_params(symbols: int, years: int, seed: int, orders: int) -> dict[str, Any]:
+    return {
+        "version": DATASET_VERSION,
+        "symbols": int(symbols),
+        "years": int(years),
+        "seed": int(seed),
+        "orders": int(orders),
+    }
+
+
+def read_dataset_meta(root: Path) -> dict[str, Any] | None:
+    try:
+        payload = json.loads((root / DATASET_META_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def symbol_names(count: int) -> list[str]:
+    return [f"S{idx:04d}" for idx in range(1, max(int(count), 1) + 1)]
+
+
+def price_path(root: Path, index: int, symbol: str) -> Path:
+    return root / "curated_adjusted" / f"{index}_Alpha_{symbol}_Daily.csv"
+
+
+def _trading_days(years: int) -> pd.DatetimeIndex:
+    start = END_DATE - timedelta(days=int(round(365.25 * max(int(years), 1))))
+    return pd.bdate_range(start, END_DATE, name="date")
+
+
+def _write_prices(root: Path, symbols: list[str], days: pd.DatetimeIndex, rng) -> None:
+    target = root / "curated_adjusted"
+    target.mkdir(parents=True, exist_ok=True)
+    count = len(days)
+    dates = days.strftime("%Y-%m-%d")
+    for index, symbol in enumerate([BENCHMARK_SYMBOL, *symbols], start=1):
+        drift = rng.normal(0.0003, 0.0002)
+        vol = rng.uniform(0.008, 0.03)
+        close = rng.uniform(20, 200) * np.cumprod(1 + rng.normal(drift, vol, count))
+        gap = rng.normal(0, vol / 3, count)
+        open_ = close * (1 + gap)
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2, count)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2, count)))
+        volume = rng.integers(100_000, 5_000_000, count)
+        pd.DataFrame(
+            {
+                "date": dates,
+                "open": open_.round(4),
+                "high": high.round(4),
+                "low": low.round(4),
+                "close": close.round(4),
+                "volume": volume,
+            }
+        ).to_csv(price_path(root, index, symbol), index=False)
+
+
+def _week_pairs(days: pd.DatetimeIndex) -> list[tuple[date, date]]:
+    """(snapshot, rebalance) pairs: the last trading day of a week and the next week's first."""
+    frame = pd.DataFrame({"day": days})
+    frame["week"] = frame["day"].dt.to_period("W-SUN")
+    firsts = frame.groupby("week")["day"].min()
+    lasts = frame.groupby("week")["day"].max()
+    weeks = list(firsts.index)
+    return [
+        (lasts[weeks[idx]].date(), firsts[weeks[idx + 1]].date()) for idx in range(len(weeks) - 1)
+    ]
+
+
+def _write_universe(root: Path, symbols: list[str], days: pd.DatetimeIndex) -> None:
+    universe_dir = root / "universe"
+    universe_dir.mkdir(parents=True, exist_ok=True)
+    first_day = days[0].strftime("%Y-%m-%d")
+    everything = [BENCHMARK_SYMBOL, *symbols]
+    pd.DataFrame(
+        {
+            "symbol": everything,
+            "category": ["BENCHMARK", *[f"THEME_{idx % 5}" for idx in range(len(symbols))]],
+            "region": "US",
+            "asset_class": ["ETF", *["Equity"] * len(symbols)],
+        }
+    ).to_csv(universe_dir / "universe.csv", index=False)
+    pd.DataFrame(
+        {"symbol": symbols, "start_date": first_day, "end_date": "", "source": "benchmark"}
+    ).to_csv(universe_dir / "sp500_membership.csv", index=False)
+    pd.DataFrame(
+        {
+            "symbol": everything,
+            "assetType": ["ETF", *["Stock"] * len(symbols)],
+            "ipoDate": "1990-01-02",
+            "delistingDate": "",
+            "status": "Active",
+        }
+    ).to_csv(universe_dir / "alpha_symbol_life.csv", index=False)
+
+    pit_dir = universe_dir / "pit_weekly"
+    pit_dir.mkdir(parents=True, exist_ok=True)
+    for snapshot_date, rebalance_date in _week_pairs(days):
+        pd.DataFrame(
+            {
+                "symbol": symbols,
+                "snapshot_date": snapshot_date.isoformat(),
+                "rebalance_date": rebalance_date.isoformat(),
+            }
+        ).to_csv(pit_dir / f"pit_{snapshot_date.strftime('%Y%m%d')}.csv", index=False)
+
+
+def _quarter_ends(days: pd.DatetimeIndex) -> list[date]:
+    start = (days[0] - pd.DateOffset(years=1)).normalize()
+    return [item.date() for item in pd.date_range(start, days[-1], freq="QE")]
+
+
+def _write_fundamentals(root: Path, symbols: list[str], days: pd.DatetimeIndex, rng) -> None:
+    base_dir = root / "fundamentals" / "alpha"
+    quarters = _quarter_ends(days)
+    for symbol in symbols:
+        symbol_dir = base_dir / symbol
+        symbol_dir.mkdir(parents=True, exist_ok=True)
+        revenue = rng.uniform(1e8, 5e10) * np.cumprod(1 + rng.normal(0.01, 0.05, len(quarters)))
+        income, balance, cash, earnings, shares = [], [], [], [], []
+        for fiscal, sales in zip(quarters, revenue):
+            reported = (fiscal + timedelta(days=int(rng.integers(20, 45)))).isoformat()
+            fiscal_text = fiscal.isoformat()
+            net = sales * rng.uniform(-0.05, 0.25)
+            assets = sales * rng.uniform(2, 6)
+            income.append(
+                {
+                    "fiscalDateEnding": fiscal_text,
+                    "reportedDate": reported,
+                    "totalRevenue": f"{sales:.0f}",
+                    "grossProfit": f"{sales * rng.uniform(0.2, 0.7):.0f}",
+                    "operatingIncome": f"{sales * rng.uniform(0.0, 0.35):.0f}",
+                    "netIncome": f"{net:.0f}",
+                }
+            )
+            balance.append(
+                {
+                    "fiscalDateEnding": fiscal_text,
+                    "totalAssets": f"{assets:.0f}",
+                    "totalLiabilities": f"{assets * rng.uniform(0.3, 0.8):.0f}",
+                    "totalShareholderEquity": f"{assets * rng.uniform(0.2, 0.6):.0f}",
+                    "cashAndCashEquivalentsAtCarryingValue": f"{assets * rng.uniform(0.02, 0.2):.0f}",
+                }
+            )
+            cash.append(
+                {
+                    "fiscalDateEnding": fiscal_text,
+                    "operatingCashflow": f"{sales * rng.uniform(0.05, 0.3):.0f}",
+                    "capitalExpenditures": f"{sales * rng.uniform(0.01, 0.1):.0f}",
+                    "cashflowFromInvestment": f"{-sales * rng.uniform(0.01, 0.2):.0f}",
+                    "cashflowFromFinancing": f"{sales * rng.normal(0, 0.1):.0f}",
+                }
+            )
+            earnings.append(
+                {
+                    "fiscalDateEnding": fiscal_text,
+                    "reportedDate": reported,
+                    "reportedEPS": f"{net / 1e9:.2f}",
+                }
+            )
+            count = rng.uniform(1e8, 5e9)
+            shares.append(
+                {
+                    "date": fiscal_text,
+                    "shares_outstanding_diluted": f"{count * 1.02:.0f}",
+                    "shares_outstanding_basic": f"{count:.0f}",
+                }
+            )
+        payloads = {
+            "income_statement.json": {"symbol": symbol, "quarterlyReports": income},
+            "balance_sheet.json": {"symbol": symbol, "quarterlyReports": balance},
+            "cash_flow.json": {"symbol": symbol, "quarterlyReports": cash},
+            "earnings.json": {"symbol": symbol, "quarterlyEarnings": earnings},
+            "shares_outstanding.json": {"symbol": symbol, "data": shares},
+        }
+        for name, payload in payloads.items():
+            (symbol_dir / name).write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _write_scores(root: Path, symbols: list[str], days: pd.DatetimeIndex, rng) -> None:
+    target = root / "scores"
+    target.mkdir(parents=True, exist_ok=True)
+    snapshots = [snapshot for snapshot, _rebalance in _week_pairs(days)]
+    frame = pd.DataFrame(
+        {
+            "date": np.repeat([item.isoformat() for item in snapshots], len(symbols)),
+            "symbol": np.tile(symbols, len(snapshots)),
+            "score": rng.normal(0, 1, len(snapshots) * len(symbols)).round(6),
+        }
+    )
+    frame.to_csv(target / "scores.csv", index=False)
+
+
+def benchmark_artifact_dir() -> Path:
+    """`benchmarks/` under the backend's artifact root (ARTIFACT_ROOT), outside the repo tree."""
+    backend_root = PROJECT_ROOT / "backend"
+    if str(backend_root) not in sys.path:
+        sys.path.insert(0, str(backend_root))
+    from app.core.config import settings
+
+    return Path(settings.artifact_root) / "benchmarks"
+
+
+def trade_db_url(root: Path) -> str:
+    return f"sqlite:///{root / 'trade.sqlite'}"
+
+
+def _write_trade_db(root: Path, symbols: list[str], days: pd.DatetimeIndex, orders: int, rng) -> None:
+    backend_root = PROJECT_ROOT / "backend"
+    if str(backend_root) not in sys.path:
+        sys.path.insert(0, str(backend_root))
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models import Base, TradeFill, TradeOrder
+
+    db_path = root / "trade.sqlite"
+    db_path.unlink(missing_ok=True)
+    engine = create_engine(trade_db_url(root))
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    traded = symbols[: max(min(len(symbols), 50), 1)]
+    start = datetime.combine(days[0].date(), datetime.min.time())
+    span = max((days[-1] - days[0]).total_seconds(), 1.0)
+    offsets = np.sort(rng.uniform(0, span, max(int(orders), 0)))
+    positions = {symbol: 0.0 for symbol in traded}
+    session = Session()
+    try:
+        for idx, offset in enumerate(offsets):
+            symbol = traded[int(rng.integers(0, len(traded)))]
+            held = positions[symbol]
+            side = "SELL" if held > 0 and rng.random() < 0.45 else "BUY"
+            quantity = float(rng.integers(1, 50))
+            if side == "SELL":
+                quantity = min(quantity, held)
+            positions[symbol] = held + (quantity if side == "BUY" else -quantity)
+            price = float(rng.uniform(20, 200))
+            created_at = start + timedelta(seconds=float(offset))
+            order = TradeOrder(
+                run_id=None,
+                client_order_id=f"bench_{idx}",
+                symbol=symbol,
+                side=side,
+                quantity=quantity,
+                order_type="MKT",
+                status="FILLED",
+                filled_quantity=quantity,
+                avg_fill_price=price,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            session.add(order)
+            session.flush()
+            session.add(
+                TradeFill(
+                    order_id=order.id,
+                    fill_quantity=quantity,
+                    fill_price=price,
+                    commission=round(quantity * 0.005, 4),
+                    fill_time=created_at + timedelta(seconds=1),
+                    exec_id=f"BENCH-{idx}",
+                )
+            )
+        session.commit()
+    finally:
+        session.close()
+        engine.dispose()
+
+    bridge_root = root / "lean_bridge"
+    bridge_root.mkdir(parents=True, exist_ok=True)
+    baseline = {"created_at": start.isoformat() + "Z", "items": []}
+    (bridge_root / "positions_baseline.json").write_text(json.dumps(baseline), encoding="utf-8")
+
+
+def _build_pit_fundamentals(root: Path) -> None:
+    import subprocess
+
+    subprocess.run(
+        [
+            sys.executable,
+            str(PROJECT_ROOT / "scripts" / "build_pit_fundamentals_snapshots.py"),
+            "--data-root",
+            str(root),
+            "--price-source",
+            "adjusted",
+            "--asset-types",
+            "ALL",
+            "--calendar-source",
+            "spy",
+            "--workers",
+            "1",
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def generate_dataset(
+    root: Path, symbols: int, years: int, seed: int = 7, orders: int = 5000, force: bool = False
+) -> dict[str, Any]:
+    """Write the synthetic data root, unless one with the same parameters is already there."""
+    root = Path(root)
+    params = dataset_params(symbols, years, seed, orders)
+    meta = read_dataset_meta(root)
+    if not force and meta and meta.get("params") == params:
+        return meta
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+
+    rng = np.random.default_rng(int(seed))
+    names = symbol_names(symbols)
+    days = _trading_days(years)
+    _write_prices(root, names, days, rng)
+    _write_universe(root, names, days)
+    _write_fundamentals(root, names, days, rng)
+    _write_scores(root, names, days, rng)
+    _write_trade_db(root, names, days, orders, rng)
+    _build_pit_fundamentals(root)
+
+    meta = {
+        "params": params,
+        "benchmark": BENCHMARK_SYMBOL,
+        "symbols": names,
+        "trading_days": len(days),
+        "start": days[0].strftime("%Y-%m-%d"),
+        "end": days[-1].strftime("%Y-%m-%d"),
+        "snapshots": len(_week_pairs(days)),
+        "generated_at": datetime.utcnow().isoformat(),
+    }
+    (root / DATASET_META_NAME).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return meta
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="生成基准测试用的合成数据目录")
+    parser.add_argument(
+        "--root",
+        default="",
+        help="输出目录（默认 <ARTIFACT_ROOT>/benchmarks/data）",
+    )
+    parser.add_argument("--symbols", type=int, default=200, help="标的数量（不含基准 SPY）")
+    parser.add_argument("--years", type=int, default=5, help="行情年数")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--orders", type=int, default=5000, help="交易库中的订单数（每单一笔成交）")
+    parser.add_argument("--force", action="store_true", help="参数相同也重新生成")
+    args = parser.parse_args()
+    root = Path(args.root) if args.root else benchmark_artifact_dir() / "data"
+    meta = generate_dataset(
+        root.expanduser().resolve(),
+        args.symbols,
+        args.years,
+        seed=args.seed,
+        orders=args.orders,
+        force=args.force,
+    )
+    print(json.dumps({key: value for key, value in meta.items() if key != "symbols"}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_ROOT = PROJECT_ROOT / "scripts"
+for _path in (SCRIPTS_ROOT, PROJECT_ROOT / "ml", PROJECT_ROOT / "backend"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import benchmark_data  # noqa: E402
+
+# Timings for the data and backtest hot paths on a synthetic data root (benchmark_data.py).
+#
+# Every case runs in its own interpreter so its peak RSS is not polluted by the cases before
+# it; the figure covers the case's setup as well (for example the PIT frames that feature
+# preparation needs) and any subprocess or process pool it starts. Seconds are the best of
+# --repeat runs, throughput is items per best second. The result file is plain JSON and
+# --compare prints the ratio against an earlier one, failing on a slowdown beyond
+# --max-regression.
+
+RESULT_VERSION = 1
+CHART_SYMBOLS = 50
+RECEIPT_PAGES = 10
+RECEIPT_PAGE_SIZE = 50
+
+
+@dataclass
+class _Env:
+    root: Path
+    work_dir: Path
+    meta: dict[str, Any]
+    workers: int
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self.meta.get("symbols") or [])
+
+
+@dataclass
+class _Case:
+    unit: str
+    run: Callable[[], int]
+    reset: Callable[[], None] | None = None
+
+
+def _backtest_case(env: _Env) -> _Case:
+    import universe_pipeline
+
+    config_path = env.work_dir / "portfolio_weights.json"
+    config = {
+        "benchmark": benchmark_data.BENCHMARK_SYMBOL,
+        "rebalance": "W",
+        "rebalance_mode": "week_open",
+        "use_pit_weekly": True,
+        "pit_weekly_dir": str(env.root / "universe" / "pit_weekly"),
+        "signal_mode": "ml_scores",
+        "score_csv_path": str(env.root / "scores" / "scores.csv"),
+        "score_top_n": 20,
+        "score_weighting": "score",
+        "output_dir": str(env.work_dir / "backtest"),
+        "record_universe": False,
+    }
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+    universe_path = env.root / "universe" / "universe.csv"
+    days = int(env.meta.get("trading_days") or 0)
+
+    def run() -> int:
+        universe_pipeline.run_backtest(env.root, universe_path, config_path)
+        return (len(env.symbols) + 1) * days
+
+    return _Case("symbol_days", run)
+
+
+def _pit_dir(env: _Env) -> Path:
+    return env.root / "factors" / "pit_weekly_fundamentals"
+
+
+def _train_prepare_case(env: _Env, feature_mode: str) -> _Case:
+    import train_torch
+    from feature_engineering import FeatureConfig
+    from pit_features import load_pit_fundamentals
+
+    adjusted_dir = env.root / "curated_adjusted"
+    symbols = [benchmark_data.BENCHMARK_SYMBOL, *env.symbols]
+    pit_map, pit_fields, _summary = load_pit_fundamentals(_pit_dir(env), env.symbols)
+    spy_path = train_torch._pick_dataset_file(benchmark_data.BENCHMARK_SYMBOL, adjusted_dir, ["Alpha"])
+    ctx = train_torch._PrepareContext(
+        adjusted_dir=adjusted_dir,
+        raw_dir=env.root / "curated",
+        vendor_pref=["Alpha"],
+        symbol_life={},
+        spy_path=spy_path,
+        spy_df=train_torch._load_series(spy_path),
+        feat_config=FeatureConfig(
+            return_windows=[5, 10, 20, 60, 120, 252],
+            ma_windows=[20, 60, 120, 200],
+            vol_windows=[10, 20, 60],
+        ),
+        horizon=20,
+        label_start_offset=1,
+        label_price="open",
+        train_start=None,
+        pit_enabled=True,
+        pit_map=pit_map,
+        pit_fields=pit_fields,
+        pit_sample_on_snapshot=True,
+        pit_missing_policy="fill_zero",
+        weight_needs_dv=False,
+        dv_window=1,
+        feature_mode=feature_mode,
+    )
+    chunk_size = 256 if feature_mode == "panel" else 16
+
+    def run() -> int:
+        train_torch._prepare_dataset(
+            symbols, ctx, workers=env.workers, chunk_size=chunk_size, progress_path=None, cancel_path=None
+        )
+        return len(symbols)
+
+    return _Case("symbols", run)
+
+
+def _pit_load_case(env: _Env, use_panel: bool) -> _Case:
+    from pit_features import load_pit_fundamentals
+
+    def run() -> int:
+        _map, _fields, summary = load_pit_fundamentals(
+            _pit_dir(env), env.symbols, use_panel=use_panel
+        )
+        return int(summary.get("total_rows", 0))
+
+    return _Case("rows", run)
+
+
+def _factor_scores_case(env: _Env) -> _Case:
+    import build_factor_scores
+
+    config = build_factor_scores._load_factor_config(PROJECT_ROOT / "configs" / "factor_scores.json")
+
+    def run() -> int:
+        _symbols, symbol_dates, snapshot_dates = build_factor_scores._load_snapshot_index(
+            env.root / "universe" / "pit_weekly", None, None, {}, set()
+        )
+        scores = build_factor_scores.build_scores(
+            snapshot_dates,
+            symbol_dates,
+            env.root / "curated_adjusted",
+            _pit_dir(env),
+            {},
+            set(),
+            config,
+        )
+        return len(scores)
+
+    return _Case("rows", run)
+
+
+def _pit_fundamentals_case(env: _Env) -> _Case:
+    output_dir = env.work_dir / "pit_weekly_fundamentals"
+
+    def reset() -> None:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    def run() -> int:
+        subprocess.run(
+            [
+                sys.executable,
+                str(SCRIPTS_ROOT / "build_pit_fundamentals_snapshots.py"),
+                "--data-root",
+                str(env.root),
+                "--output-dir",
+                str(output_dir),
+                "--price-source",
+                "adjusted",
+                "--asset-types",
+                "ALL",
+                "--calendar-source",
+                "spy",
+                "--workers",
+                str(env.workers),
+            ],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        return int(env.meta.get("snapshots") or 0) * len(env.symbols)
+
+    return _Case("symbol_snapshots", run, reset)
+
+
+def _trade_session(env: _Env):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.config import settings
+
+    settings.data_root = str(env.root)
+    engine = create_engine(benchmark_data.trade_db_url(env.root))
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    return Session()
+
+
+def _trade_receipts_case(env: _Env) -> _Case:
+    from app.services.realized_pnl import clear_realized_pnl_cache
+    from app.services.realized_pnl_baseline import realized_pnl_ledger_path
+    from app.services.trade_receipts import list_trade_receipts
+
+    session = _trade_session(env)
+    ledger_path = realized_pnl_ledger_path(env.root / "lean_bridge")
+
+    def reset() -> None:
+        clear_realized_pnl_cache()
+        ledger_path.unlink(missing_ok=True)
+        session.expire_all()
+
+    def run() -> int:
+        for page in range(RECEIPT_PAGES):
+            list_trade_receipts(session, limit=RECEIPT_PAGE_SIZE, offset=page * RECEIPT_PAGE_SIZE)
+        return RECEIPT_PAGES
+
+    return _Case("pages", run, reset)
+
+
+def _realized_pnl_case(env: _Env) -> _Case:
+    from app.models import TradeFill
+    from app.services.realized_pnl import clear_realized_pnl_cache, compute_realized_pnl
+
+    session = _trade_session(env)
+    baseline = json.loads((env.root / "lean_bridge" / "positions_baseline.json").read_text(encoding="utf-8"))
+    fills = session.query(TradeFill).count()
+
+    def reset() -> None:
+        # Drop the in-process FIFO ledger too, so every run replays all fills.
+        clear_realized_pnl_cache()
+        session.expire_all()
+
+    def run() -> int:
+        compute_realized_pnl(session, baseline, use_cache=False)
+        return fills
+
+    return _Case("fills", run, reset)
+
+
+def _chart_local_case(env: _Env) -> _Case:
+    from app.core.config import settings
+    from app.services.price_chart_history import clear_local_bars_cache, load_local_adjusted_bars
+
+    settings.data_root = str(env.root)
+    symbols = env.symbols[:CHART_SYMBOLS]
+
+    def run() -> int:
+        for symbol in symbols:
+            for interval in ("1D", "1W", "1M"):
+                load_local_adjusted_bars(symbol, interval)
+        return len(symbols) * 3
+
+    return _Case("requests", run, clear_local_bars_cache)
+
+
+def _dataset_series_case(env: _Env) -> _Case:
+    from app.routes import datasets
+
+    paths = [
+        benchmark_data.price_path(env.root, index, symbol)
+        for index, symbol in enumerate(env.symbols[:CHART_SYMBOLS], start=2)
+    ]
+    end_dt = datetime.strptime(str(env.meta.get("end")), "%Y-%m-%d")
+    start_dt = end_dt - timedelta(days=365)
+
+    def run() -> int:
+        for path in paths:
+            datasets._load_candles(path, start_dt, end_dt)
+            datasets._load_adjusted_line(path, start_dt, end_dt)
+        return len(paths)
+
+    return _Case("series", run)
+
+
+CASES: dict[str, Callable[[_Env], _Case]] = {
+    "universe_backtest": _backtest_case,
+    "train_prepare": lambda env: _train_prepare_case(env, "symbol"),
+    "train_prepare_panel": lambda env: _train_prepare_case(env, "panel"),
+    "pit_features_panel": lambda env: _pit_load_case(env, True),
+    "pit_features_csv": lambda env: _pit_load_case(env, False),
+    "factor_scores": _factor_scores_case,
+    "pit_fundamentals": _pit_fundamentals_case,
+    "trade_receipts": _trade_receipts_case,
+    "realized_pnl": _realized_pnl_case,
+    "chart_local": _chart_local_case,
+    "dataset_series": _dataset_series_case,
+}
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / scale, 1)
+
+
+def run_case(name: str, env: _Env, repeat: int) -> dict[str, Any]:
+    case = CASES[name](env)
+    timings: list[float] = []
+    items = 0
+    for _ in range(max(int(repeat), 1)):
+        if case.reset is not None:
+            case.reset()
+        started = time.perf_counter()
+        items = case.run()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "seconds": round(best, 4),
+        "seconds_all": [round(value, 4) for value in timings],
+        "items": int(items),
+        "unit": case.unit,
+        "throughput": round(items / best, 2) if best > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _spawn_case(name: str, args: argparse.Namespace, root: Path, work_dir: Path) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as tmp:
+        result_path = Path(tmp) / "result.json"
+        command = [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "--run-case",
+            name,
+            "--result-path",
+            str(result_path),
+            "--root",
+            str(root),
+            "--work-dir",
+            str(work_dir / name),
+            "--repeat",
+            str(args.repeat),
+            "--workers",
+            str(args.workers),
+        ]
+        output = None if args.verbose else subprocess.DEVNULL
+        completed = subprocess.run(command, stdout=output, stderr=None if args.verbose else subprocess.PIPE)
+        if completed.returncode != 0 or not result_path.exists():
+            detail = (completed.stderr or b"").decode("utf-8", errors="ignore").strip().splitlines()
+            return {"error": detail[-1] if detail else f"exit code {completed.returncode}"}
+        return json.loads(result_path.read_text(encoding="utf-8"))
+
+
+def _git_commit() -> str:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return completed.stdout.strip()
+
+
+def compare_results(
+    previous: dict[str, Any], current: dict[str, Any], max_regression: float
+) -> tuple[list[str], list[str]]:
+    """Report lines plus the names of cases that slowed down by more than max_regression."""
+    lines = [f"{'case':<22}{'before s':>10}{'after s':>10}{'ratio':>8}{'before MB':>11}{'after MB':>10}"]
+    regressions: list[str] = []
+    if previous.get("dataset") != current.get("dataset"):
+        lines.append("warning: the two runs used different synthetic datasets")
+    before_cases = previous.get("cases") or {}
+    for name, after in (current.get("cases") or {}).items():
+        before = before_cases.get(name) or {}
+        if "seconds" not in after or "seconds" not in before:
+            lines.append(f"{name:<22}{'-':>10}{after.get('seconds', '-')!s:>10}")
+            continue
+        ratio = after["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        lines.append(
+            f"{name:<22}{before['seconds']:>10.3f}{after['seconds']:>10.3f}{ratio:>8.2f}"
+            f"{before.get('peak_rss_mb') or 0:>11.1f}{after.get('peak_rss_mb') or 0:>10.1f}"
+        )
+        if ratio > 1 + max_regression:
+            regressions.append(name)
+    return lines, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="数据与回测热点路径的基准测试")
+    parser.add_argument(
+        "--root",
+        default="",
+        help="合成数据目录（默认 <ARTIFACT_ROOT>/benchmarks/data，参数变化时自动重新生成）",
+    )
+    parser.add_argument("--symbols", type=int, default=200, help="标的数量（不含基准 SPY）")
+    parser.add_argument("--years", type=int, default=5, help="行情年数")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--orders", type=int, default=5000, help="交易库订单数")
+    parser.add_argument(
+        "--cases",
+        default="",
+        help=f"逗号分隔的用例（默认全部）：{','.join(CASES)}",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例重复次数，取最快一次")
+    parser.add_argument("--workers", type=int, default=1, help="支持并行的用例使用的进程数")
+    parser.add_argument("--output", default="", help="结果 JSON（默认 <ARTIFACT_ROOT>/benchmarks/<commit>.json）")
+    parser.add_argument("--compare", default="", help="与之前的结果 JSON 对比")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="--compare 时允许的最大变慢比例，超过则返回非零",
+    )
+    parser.add_argument("--verbose", action="store_true", help="显示各用例的原始输出")
+    parser.add_argument("--run-case", default="", help=argparse.SUPPRESS)
+    parser.add_argument("--result-path", default="", help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    root = Path(args.root) if args.root else benchmark_data.benchmark_artifact_dir() / "data"
+    root = root.expanduser().resolve()
+    if args.run_case:
+        work_dir = Path(args.work_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        work_dir.mkdir(parents=True)
+        env = _Env(root, work_dir, benchmark_data.read_dataset_meta(root) or {}, args.workers)
+        result = run_case(args.run_case, env, args.repeat)
+        Path(args.result_path).write_text(json.dumps(result), encoding="utf-8")
+        return 0
+
+    names = [item.strip() for item in args.cases.split(",") if item.strip()] or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise SystemExit(f"unknown cases: {','.join(unknown)}")
+    meta = benchmark_data.generate_dataset(
+        root, args.symbols, args.years, seed=args.seed, orders=args.orders
+    )
+    commit = _git_commit()
+    payload: dict[str, Any] = {
+        "version": RESULT_VERSION,
+        "generated_at": datetime.utcnow().isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "dataset": meta.get("params"),
+        "repeat": int(args.repeat),
+        "workers": int(args.workers),
+        "cases": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="bench_work_") as work:
+        for name in names:
+            result = _spawn_case(name, args, root, Path(work))
+            payload["cases"][name] = result
+            if "error" in result:
+                print(f"{name}: failed: {result['error']}")
+            else:
+                print(
+                    f"{name}: {result['seconds']:.3f}s {result['throughput']} {result['unit']}/s "
+                    f"peak_rss={result['peak_rss_mb']}MB"
+                )
+
+    output_path = (
+        Path(args.output).expanduser().resolve()
+        if args.output
+        else benchmark_data.benchmark_artifact_dir() / f"{commit or 'latest'}.json"
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"results: {output_path}")
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).expanduser().read_text(encoding="utf-8"))
+        lines, regressions = compare_results(previous, payload, args.max_regression)
+        print("\n".join(lines))
+        if regressions:
+            print(f"regressions: {','.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,7 +5,8 @@ import argparse
 import csv
 import json
 import os
-from collections import OrderedDict, defaultdict
+import sys
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date, datetime
 from pathlib import Path
@@ -14,6 +15,34 @@ from typing import Iterable
 import numpy as np
 import pandas as pd
 
+FUNDAMENTAL_FIELDS = [
+    "gross_profit",
+    "operating_income",
+    "net_income",
+    "total_revenue",
+    "total_shareholder_equity",
+    "total_assets",
+    "free_cashflow",
+    "eps",
+    "reported_eps",
+]
+QUALITY_FIELDS = [
+    "gross_margin",
+    "operating_margin",
+    "net_margin",
+    "roe",
+    "roa",
+    "fcf_margin",
+]
+SCORE_FIELDS = [
+    "score",
+    "score_momentum",
+    "score_quality",
+    "score_value",
+    "score_low_vol",
+    "score_liquidity",
+]
+
 
 @dataclass
 class FactorConfig:
@@ -172,8 +201,22 @@ def _pick_price_file(adjusted_dir: Path, symbol: str) -> Path | None:
     return max(candidates, key=lambda path: path.stat().st_size)
 
 
-def _load_price_metrics(path: Path, config: FactorConfig) -> pd.DataFrame:
-    df = pd.read_csv(path, usecols=["date", "close", "volume"])
+def _load_price_store(enabled: object = None):
+    """Columnar price store reader, or ``None`` to read the CSVs (disabled, or no backend)."""
+    backend_root = Path(__file__).resolve().parents[1] / "backend"
+    if str(backend_root) not in sys.path:
+        sys.path.insert(0, str(backend_root))
+    try:
+        from app.services.price_store import load_price_store
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return load_price_store(enabled)
+
+
+def _load_price_metrics(path: Path, config: FactorConfig, price_store=None) -> pd.DataFrame:
+    df = price_store.read_frame(path, ["close", "volume"]) if price_store is not None else None
+    if df is None:
+        df = pd.read_csv(path, usecols=["date", "close", "volume"])
     df.columns = [col.strip().lower() for col in df.columns]
     df["date"] = pd.to_datetime(df["date"], errors="coerce")
     df = df.dropna(subset=["date", "close"])
@@ -192,47 +235,20 @@ def _safe_div(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
     return numerator / denom
 
 
-def _zscore(series: pd.Series, winsor_z: float) -> pd.Series:
-    series = series.astype(float)
-    mean = series.mean(skipna=True)
-    std = series.std(skipna=True)
-    if std == 0 or np.isnan(std):
-        return pd.Series(0.0, index=series.index)
-    z = (series - mean) / std
+def _zscore_by_date(frame: pd.DataFrame, column: str, winsor_z: float) -> pd.Series:
+    """Cross-sectional z-score of one column within each snapshot date.
+
+    A date whose standard deviation is zero or undefined scores 0.0 for every symbol,
+    including the ones with a missing value.
+    """
+    values = frame[column].astype(float)
+    grouped = values.groupby(frame["date"], sort=False)
+    mean = grouped.transform("mean")
+    std = grouped.transform("std")
+    z = (values - mean) / std
     if winsor_z > 0:
         z = z.clip(lower=-winsor_z, upper=winsor_z)
-    return z
-
-
-class RawWriter:
-    def __init__(self, cache_dir: Path, fieldnames: list[str], max_open: int = 64) -> None:
-        self.cache_dir = cache_dir
-        self.fieldnames = fieldnames
-        self.max_open = max_open
-        self._handles: OrderedDict[str, tuple[Path, csv.DictWriter, object]] = OrderedDict()
-
-    def write(self, date_key: str, row: dict[str, object]) -> None:
-        if date_key in self._handles:
-            path, writer, handle = self._handles.pop(date_key)
-            self._handles[date_key] = (path, writer, handle)
-            writer.writerow(row)
-            return
-        path = self.cache_dir / f"raw_{date_key}.csv"
-        exists = path.exists()
-        handle = path.open("a", encoding="utf-8", newline="")
-        writer = csv.DictWriter(handle, fieldnames=self.fieldnames)
-        if not exists or path.stat().st_size == 0:
-            writer.writeheader()
-        writer.writerow(row)
-        self._handles[date_key] = (path, writer, handle)
-        if len(self._handles) > self.max_open:
-            _, (_, _, old_handle) = self._handles.popitem(last=False)
-            old_handle.close()
-
-    def close(self) -> None:
-        for _, (_, _, handle) in self._handles.items():
-            handle.close()
-        self._handles.clear()
+    return z.mask(std.isna() | (std == 0), 0.0)
 
 
 def _load_fundamentals_snapshot(
@@ -245,15 +261,54 @@ def _load_fundamentals_snapshot(
     path = pit_dir / filename
     if not path.exists():
         return pd.DataFrame()
-    df = pd.read_csv(path)
+    wanted = {"symbol", *FUNDAMENTAL_FIELDS}
+    df = pd.read_csv(path, usecols=lambda col: col.strip() in wanted)
     df.columns = [col.strip() for col in df.columns]
     df["symbol"] = df["symbol"].astype(str).str.upper()
-    df["symbol"] = df["symbol"].apply(lambda sym: _resolve_symbol_alias(sym, snapshot_date, symbol_map))
+    if symbol_map:
+        aliases = {
+            symbol: _resolve_symbol_alias(symbol, snapshot_date, symbol_map)
+            for symbol in df["symbol"].unique()
+        }
+        df["symbol"] = df["symbol"].map(aliases)
     if exclude_symbols:
         df = df[~df["symbol"].isin(exclude_symbols)]
     return df
 
 
+def _load_price_panel(
+    symbol_dates: dict[str, list[date]],
+    adjusted_dir: Path,
+    config: FactorConfig,
+    price_store=None,
+) -> tuple[pd.DataFrame, list[str]]:
+    """Long (date, symbol) table of price metrics as of each symbol's snapshot dates.
+
+    Rows are grouped by date in symbol order, which is the row order of the output.
+    """
+    momentum_fields = [f"ret_{window}" for window in config.momentum_windows]
+    columns = ["close", *momentum_fields, "vol", "adv"]
+    frames: list[pd.DataFrame] = []
+    missing_prices: list[str] = []
+    for idx, (symbol, dates) in enumerate(symbol_dates.items(), start=1):
+        price_path = _pick_price_file(adjusted_dir, symbol)
+        price_df = _load_price_metrics(price_path, config, price_store) if price_path else None
+        if price_df is None or price_df.empty:
+            missing_prices.append(symbol)
+            continue
+        slice_df = price_df.reindex(pd.to_datetime(dates), method="pad")[columns]
+        frames.append(slice_df.assign(symbol=symbol))
+        if idx % 500 == 0:
+            print(f"progress: {idx} / {len(symbol_dates)} symbols")
+    if not frames:
+        return pd.DataFrame(columns=["date", "symbol", "price", *columns[1:]]), missing_prices
+    panel = pd.concat(frames)
+    panel.index.name = "date"
+    panel = panel.reset_index().rename(columns={"close": "price"})
+    panel = panel.sort_values("date", kind="stable", ignore_index=True)
+    return panel, missing_prices
+
+
 def _load_factor_config(path: Path | None) -> FactorConfig:
     if path and path.exists():
         raw = json.loads(path.read_text(encoding="utf-8"))
@@ -287,189 +342,97 @@ def _normalize_weights(weights: dict[str, float]) -> dict[str, float]:
 
 
 def build_scores(
-    snapshot_symbols: dict[date, set[str]],
-    symbol_dates: dict[str, list[date]],
     snapshot_dates: list[date],
+    symbol_dates: dict[str, list[date]],
     adjusted_dir: Path,
     pit_fundamentals_dir: Path,
     symbol_map: dict[str, list[tuple[date | None, date | None, str]]],
     exclude_symbols: set[str],
     config: FactorConfig,
-    cache_dir: Path,
-    output_path: Path,
-    overwrite_cache: bool,
-) -> None:
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    if overwrite_cache:
-        for path in cache_dir.glob("raw_*.csv"):
-            path.unlink()
-
-    momentum_fields = [f"ret_{window}" for window in config.momentum_windows]
-    raw_fields = ["symbol", "date", "price", *momentum_fields, "vol", "adv"]
-
-    writer = RawWriter(cache_dir, raw_fields)
-    missing_prices: list[str] = []
+    price_store=None,
+) -> pd.DataFrame:
+    """Score every (snapshot date, symbol) pair in one columnar pass."""
+    panel, missing_prices = _load_price_panel(symbol_dates, adjusted_dir, config, price_store)
+    if missing_prices:
+        print(f"missing price data: {len(missing_prices)} symbols")
+    if panel.empty:
+        return pd.DataFrame(columns=["date", "symbol", *SCORE_FIELDS])
 
-    for idx, (symbol, dates) in enumerate(symbol_dates.items(), start=1):
-        price_path = _pick_price_file(adjusted_dir, symbol)
-        if price_path is None:
-            missing_prices.append(symbol)
+    present = set(panel["date"].dt.date)
+    fundamentals: list[pd.DataFrame] = []
+    for snapshot_date in snapshot_dates:
+        if snapshot_date not in present:
             continue
-        price_df = _load_price_metrics(price_path, config)
-        if price_df.empty:
-            missing_prices.append(symbol)
+        frame = _load_fundamentals_snapshot(
+            pit_fundamentals_dir, snapshot_date, symbol_map, exclude_symbols
+        )
+        if frame.empty:
             continue
-        date_index = pd.to_datetime(dates)
-        slice_df = price_df.reindex(date_index, method="pad")
-        slice_df = slice_df[["close", *momentum_fields, "vol", "adv"]]
-        for ts, row in slice_df.iterrows():
-            if pd.isna(ts):
-                continue
-            date_key = ts.date().strftime("%Y%m%d")
-            row_values = {field: row.get(field, np.nan) for field in momentum_fields}
-            writer.write(
-                date_key,
-                {
-                    "symbol": symbol,
-                    "date": ts.date().isoformat(),
-                    "price": row.get("close", np.nan),
-                    **row_values,
-                    "vol": row.get("vol", np.nan),
-                    "adv": row.get("adv", np.nan),
-                },
-            )
-        if idx % 500 == 0:
-            print(f"progress: {idx} / {len(symbol_dates)} symbols")
-    writer.close()
-
-    quality_fields = [
-        "gross_margin",
-        "operating_margin",
-        "net_margin",
-        "roe",
-        "roa",
-        "fcf_margin",
-    ]
+        frame = frame.drop_duplicates(subset=["symbol"], keep="last")
+        fundamentals.append(frame.assign(date=pd.Timestamp(snapshot_date)))
+    if fundamentals:
+        merged = panel.merge(pd.concat(fundamentals), on=["date", "symbol"], how="left")
+    else:
+        merged = panel
+    for col in FUNDAMENTAL_FIELDS:
+        if col not in merged.columns:
+            merged[col] = np.nan
+
+    merged["eps_used"] = merged["eps"].fillna(merged["reported_eps"])
+    merged["gross_margin"] = _safe_div(merged["gross_profit"], merged["total_revenue"])
+    merged["operating_margin"] = _safe_div(merged["operating_income"], merged["total_revenue"])
+    merged["net_margin"] = _safe_div(merged["net_income"], merged["total_revenue"])
+    merged["roe"] = _safe_div(merged["net_income"], merged["total_shareholder_equity"])
+    merged["roa"] = _safe_div(merged["net_income"], merged["total_assets"])
+    merged["fcf_margin"] = _safe_div(merged["free_cashflow"], merged["total_revenue"])
+    merged["earnings_yield"] = _safe_div(merged["eps_used"], merged["price"])
+    merged["low_vol"] = -merged["vol"]
+    merged["liquidity"] = np.log1p(merged["adv"].clip(lower=0))
+
+    momentum_z = pd.concat(
+        [
+            _zscore_by_date(merged, f"ret_{window}", config.winsor_z)
+            for window in config.momentum_windows
+        ],
+        axis=1,
+    )
+    quality_z = pd.concat(
+        [_zscore_by_date(merged, field, config.winsor_z) for field in QUALITY_FIELDS], axis=1
+    )
+    scores = pd.DataFrame(
+        {
+            "score_momentum": momentum_z.mean(axis=1, skipna=True),
+            "score_quality": quality_z.mean(axis=1, skipna=True),
+            "score_value": _zscore_by_date(merged, "earnings_yield", config.winsor_z),
+            "score_low_vol": _zscore_by_date(merged, "low_vol", config.winsor_z),
+            "score_liquidity": _zscore_by_date(merged, "liquidity", config.winsor_z),
+        }
+    ).fillna(0.0)
 
     weight_map = _normalize_weights(config.weights)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(
-            handle,
-            fieldnames=[
-                "date",
-                "symbol",
-                "score",
-                "score_momentum",
-                "score_quality",
-                "score_value",
-                "score_low_vol",
-                "score_liquidity",
-            ],
-        )
-        writer.writeheader()
-
-        for snapshot_date in snapshot_dates:
-            date_key = snapshot_date.strftime("%Y%m%d")
-            raw_path = cache_dir / f"raw_{date_key}.csv"
-            if not raw_path.exists():
-                continue
-            raw_df = pd.read_csv(raw_path)
-            if raw_df.empty:
-                continue
-            raw_df["symbol"] = raw_df["symbol"].astype(str).str.upper()
-            raw_df = raw_df[raw_df["symbol"].isin(snapshot_symbols.get(snapshot_date, set()))]
-            if raw_df.empty:
-                continue
+    scores["score"] = (
+        weight_map.get("momentum", 0.0) * scores["score_momentum"]
+        + weight_map.get("quality", 0.0) * scores["score_quality"]
+        + weight_map.get("value", 0.0) * scores["score_value"]
+        + weight_map.get("low_vol", 0.0) * scores["score_low_vol"]
+        + weight_map.get("liquidity", 0.0) * scores["score_liquidity"]
+    )
+    scores.insert(0, "symbol", merged["symbol"])
+    scores.insert(0, "date", merged["date"])
+    return scores[["date", "symbol", *SCORE_FIELDS]]
 
-            fundamentals = _load_fundamentals_snapshot(
-                pit_fundamentals_dir, snapshot_date, symbol_map, exclude_symbols
-            )
-            if not fundamentals.empty:
-                fundamentals = fundamentals.drop_duplicates(subset=["symbol"], keep="last")
-            merged = raw_df.merge(fundamentals, on="symbol", how="left")
-            for col in [
-                "gross_profit",
-                "operating_income",
-                "net_income",
-                "total_revenue",
-                "total_shareholder_equity",
-                "total_assets",
-                "free_cashflow",
-                "eps",
-                "reported_eps",
-            ]:
-                if col not in merged.columns:
-                    merged[col] = np.nan
-            merged["eps_used"] = merged["eps"]
-            eps_missing = merged["eps_used"].isna()
-            if "reported_eps" in merged.columns:
-                merged.loc[eps_missing, "eps_used"] = merged.loc[eps_missing, "reported_eps"]
-
-            merged["gross_margin"] = _safe_div(merged["gross_profit"], merged["total_revenue"])
-            merged["operating_margin"] = _safe_div(merged["operating_income"], merged["total_revenue"])
-            merged["net_margin"] = _safe_div(merged["net_income"], merged["total_revenue"])
-            merged["roe"] = _safe_div(merged["net_income"], merged["total_shareholder_equity"])
-            merged["roa"] = _safe_div(merged["net_income"], merged["total_assets"])
-            merged["fcf_margin"] = _safe_div(merged["free_cashflow"], merged["total_revenue"])
-            merged["earnings_yield"] = _safe_div(merged["eps_used"], merged["price"])
-            merged["low_vol"] = -merged["vol"]
-            merged["liquidity"] = np.log1p(merged["adv"].clip(lower=0))
-
-            momentum_z_cols = []
-            for window in config.momentum_windows:
-                col = f"ret_{window}"
-                z_col = f"z_ret_{window}"
-                merged[z_col] = _zscore(merged[col], config.winsor_z)
-                momentum_z_cols.append(z_col)
-            merged["z_low_vol"] = _zscore(merged["low_vol"], config.winsor_z)
-            merged["z_liquidity"] = _zscore(merged["liquidity"], config.winsor_z)
-            merged["z_earnings_yield"] = _zscore(merged["earnings_yield"], config.winsor_z)
-
-            for field in quality_fields:
-                merged[f"z_{field}"] = _zscore(merged[field], config.winsor_z)
-
-            merged["score_momentum"] = merged[momentum_z_cols].mean(axis=1, skipna=True)
-            merged["score_quality"] = merged[[f"z_{field}" for field in quality_fields]].mean(
-                axis=1, skipna=True
-            )
-            merged["score_value"] = merged["z_earnings_yield"]
-            merged["score_low_vol"] = merged["z_low_vol"]
-            merged["score_liquidity"] = merged["z_liquidity"]
-
-            for col in [
-                "score_momentum",
-                "score_quality",
-                "score_value",
-                "score_low_vol",
-                "score_liquidity",
-            ]:
-                merged[col] = merged[col].fillna(0.0)
-
-            merged["score"] = (
-                weight_map.get("momentum", 0.0) * merged["score_momentum"]
-                + weight_map.get("quality", 0.0) * merged["score_quality"]
-                + weight_map.get("value", 0.0) * merged["score_value"]
-                + weight_map.get("low_vol", 0.0) * merged["score_low_vol"]
-                + weight_map.get("liquidity", 0.0) * merged["score_liquidity"]
-            )
-
-            for _, row in merged.iterrows():
-                writer.writerow(
-                    {
-                        "date": snapshot_date.isoformat(),
-                        "symbol": row["symbol"],
-                        "score": f"{row['score']:.8f}",
-                        "score_momentum": f"{row['score_momentum']:.8f}",
-                        "score_quality": f"{row['score_quality']:.8f}",
-                        "score_value": f"{row['score_value']:.8f}",
-                        "score_low_vol": f"{row['score_low_vol']:.8f}",
-                        "score_liquidity": f"{row['score_liquidity']:.8f}",
-                    }
-                )
 
-    if missing_prices:
-        print(f"missing price data: {len(missing_prices)} symbols")
+def write_scores(scores: pd.DataFrame, output_path: Path, parquet: bool = False) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    text = scores.assign(date=pd.to_datetime(scores["date"]).dt.strftime("%Y-%m-%d"))
+    text.to_csv(output_path, index=False, float_format="%.8f", lineterminator="\r\n")
+    if not parquet:
+        return
+    parquet_path = output_path.with_suffix(".parquet")
+    try:
+        scores.to_parquet(parquet_path, index=False)
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        print(f"parquet skipped: {exc}")
 
 
 def main() -> None:
@@ -517,7 +480,7 @@ def main() -> None:
         "--cache-dir",
         type=str,
         default="",
-        help="临时缓存目录（默认 artifacts/factor_cache）",
+        help="旧版 raw_*.csv 临时缓存目录（默认 artifacts/factor_cache，仅用于清理）",
     )
     parser.add_argument(
         "--output",
@@ -528,7 +491,17 @@ def main() -> None:
     parser.add_argument(
         "--overwrite-cache",
         action="store_true",
-        help="清空缓存目录后重新生成",
+        help="清理缓存目录中旧版遗留的 raw_*.csv",
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="同时在 scores.csv 旁输出同名 .parquet（需要 pyarrow 或 fastparquet）",
+    )
+    parser.add_argument(
+        "--price-store",
+        action="store_true",
+        help="优先从列式 price_store 读取行情（默认读取 PRICE_STORE_READ_ENABLED）",
     )
     args = parser.parse_args()
 
@@ -596,25 +569,27 @@ def main() -> None:
 
     config = _load_factor_config(config_path if config_path.exists() else None)
 
-    snapshot_symbols, symbol_dates, snapshot_dates = _load_snapshot_index(
+    _snapshot_symbols, symbol_dates, snapshot_dates = _load_snapshot_index(
         pit_weekly_dir, start, end, symbol_map, exclude_symbols
     )
     if not snapshot_dates:
         raise SystemExit("no pit snapshots found in range")
 
-    build_scores(
-        snapshot_symbols,
-        symbol_dates,
+    if args.overwrite_cache and cache_dir.exists():
+        for path in cache_dir.glob("raw_*.csv"):
+            path.unlink()
+
+    scores = build_scores(
         snapshot_dates,
+        symbol_dates,
         adjusted_dir,
         pit_fundamentals_dir,
         symbol_map,
         exclude_symbols,
         config,
-        cache_dir,
-        output_path,
-        args.overwrite_cache,
+        price_store=_load_price_store(args.price_store or None),
     )
+    write_scores(scores, output_path, parquet=args.parquet)
 
 
 if __name__ == "__main__":
@@ -5,13 +5,26 @@ import argparse
 import csv
 import json
 import os
+import shutil
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 import pandas as pd
+import pit_manifest
 import trading_calendar
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.services.pit_fundamentals_panel import build_pit_panel  # noqa: E402
+
 
 REPORT_FIELDS = {
     "income_statement": {
@@ -37,6 +50,15 @@ REPORT_FIELDS = {
     },
 }
 
+SYMBOL_INPUT_FILES = (
+    "income_statement.json",
+    "balance_sheet.json",
+    "cash_flow.json",
+    "earnings.json",
+    "shares_outstanding.json",
+)
+_PRICE_TAIL_BYTES = 4096
+
 
 def _resolve_data_root(value: str | None) -> Path:
     if value:
@@ -84,13 +106,33 @@ def _parse_vendor(path: Path) -> str:
     return tokens[0] if tokens else ""
 
 
+def _index_price_files(
+    source_dir: Path,
+) -> tuple[dict[str, list[Path]], dict[str, list[Path]]]:
+    """List source_dir once, keyed the way the `*_{SYM}_*.csv` / `*_{SYM}.csv` globs match."""
+    inner: dict[str, list[Path]] = {}
+    tail: dict[str, list[Path]] = {}
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".csv") or not entry.is_file():
+                continue
+            path = Path(entry.path)
+            parts = path.stem.split("_")
+            for start in range(1, len(parts)):
+                tail.setdefault("_".join(parts[start:]), []).append(path)
+                for stop in range(start + 1, len(parts)):
+                    inner.setdefault("_".join(parts[start:stop]), []).append(path)
+    return inner, tail
+
+
 def _pick_price_file(
-    source_dir: Path, symbol: str, vendor_preference: list[str]
+    price_index: tuple[dict[str, list[Path]], dict[str, list[Path]]],
+    symbol: str,
+    vendor_preference: list[str],
 ) -> Path | None:
     symbol = symbol.upper()
-    candidates = list(source_dir.glob(f"*_{symbol}_*.csv"))
-    if not candidates:
-        candidates = list(source_dir.glob(f"*_{symbol}.csv"))
+    inner, tail = price_index
+    candidates = inner.get(symbol) or tail.get(symbol)
     if not candidates:
         return None
     vendor_rank = {vendor.upper(): idx for idx, vendor in enumerate(vendor_preference)}
@@ -121,6 +163,28 @@ def _load_price_series(path: Path) -> dict[date, float]:
     return series
 
 
+def _price_last_date(path: Path) -> date | None:
+    try:
+        with path.open("rb") as handle:
+            header = handle.readline().decode("utf-8", errors="ignore")
+            handle.seek(0, os.SEEK_END)
+            handle.seek(max(handle.tell() - _PRICE_TAIL_BYTES, 0))
+            lines = handle.read().decode("utf-8", errors="ignore").splitlines()
+    except OSError:
+        return None
+    columns = [item.strip().lower() for item in header.split(",")]
+    if "date" not in columns:
+        return None
+    column = columns.index("date")
+    for line in reversed(lines):
+        cells = line.split(",")
+        if len(cells) > column:
+            parsed = _parse_date(cells[column].strip()[:10])
+            if parsed:
+                return parsed
+    return None
+
+
 def _load_shares_outstanding(
     symbol_dir: Path, preference: str, shares_delay_days: int
 ) -> list[tuple[date, float]]:
@@ -296,53 +360,240 @@ def _select_report(
     return selected, selected_available, selected_source
 
 
+SNAPSHOT_FIELDS = [
+    "symbol",
+    "has_fundamentals",
+    "snapshot_date",
+    "rebalance_date",
+    "fiscal_date",
+    "reported_date",
+    "available_date",
+    "availability_source",
+    "lag_days",
+    "filled_forward",
+    "shares_outstanding",
+    "shares_available_date",
+    "shares_source",
+    "pit_market_cap",
+    "total_revenue",
+    "gross_profit",
+    "operating_income",
+    "net_income",
+    "eps",
+    "reported_eps",
+    "total_assets",
+    "total_liabilities",
+    "total_shareholder_equity",
+    "cash_and_cash_equivalents",
+    "operating_cashflow",
+    "capital_expenditures",
+    "cashflow_from_investment",
+    "cashflow_from_financing",
+    "free_cashflow",
+]
+
+
+@dataclass
+class _BuildContext:
+    fundamentals_dir: Path
+    shard_dir: Path
+    trading_days: list[date]
+    # (snapshot_date, rebalance_date, cutoff_date) of every snapshot being rebuilt.
+    plan: list[tuple[date, date, date]]
+    missing_report_delay_days: int
+    shares_delay_days: int
+    shares_preference: str
+    only_with_data: bool
+
+
+def _build_symbol_rows(
+    symbol: str,
+    price_path: Path | None,
+    plan_indices: list[int],
+    ctx: _BuildContext,
+    trading_index: dict[date, int],
+) -> Iterator[tuple[int, dict[str, object]]]:
+    """Load one symbol's reports, shares and closes once and emit its row for each snapshot."""
+    symbol_dir = ctx.fundamentals_dir / symbol
+    reports = _load_symbol_reports(symbol_dir)
+    shares_series = _load_shares_outstanding(
+        symbol_dir, ctx.shares_preference, ctx.shares_delay_days
+    )
+    prices: dict[date, float] | None = None
+    for plan_index in plan_indices:
+        snapshot_date, rebalance_date, cutoff_date = ctx.plan[plan_index]
+        report, available_date, availability_source = _select_report(
+            reports, cutoff_date, ctx.missing_report_delay_days
+        )
+        has_fundamentals = bool(report)
+        if ctx.only_with_data and not has_fundamentals:
+            continue
+        row: dict[str, object] = {
+            "symbol": symbol,
+            "has_fundamentals": 1 if has_fundamentals else 0,
+            "snapshot_date": snapshot_date.isoformat(),
+            "rebalance_date": rebalance_date.isoformat(),
+        }
+        if report:
+            lag_days = (snapshot_date - available_date).days if available_date else None
+            filled_forward = bool(available_date and available_date < snapshot_date)
+            row.update(
+                {
+                    "fiscal_date": report.get("fiscal_date").isoformat()
+                    if report.get("fiscal_date")
+                    else "",
+                    "reported_date": report.get("reported_date").isoformat()
+                    if report.get("reported_date")
+                    else "",
+                    "available_date": available_date.isoformat() if available_date else "",
+                    "availability_source": availability_source,
+                    "lag_days": lag_days if lag_days is not None else "",
+                    "filled_forward": 1 if filled_forward else 0,
+                }
+            )
+            for key, value in report.items():
+                if key in {"fiscal_date", "reported_date"}:
+                    continue
+                row[key] = value
+            if row.get("eps") in (None, "") and row.get("reported_eps") not in (None, ""):
+                row["eps"] = row.get("reported_eps")
+            op_cf = report.get("operating_cashflow")
+            capex = report.get("capital_expenditures")
+            if op_cf is not None and capex is not None:
+                row["free_cashflow"] = op_cf - capex
+        shares_value, shares_available = _select_shares(shares_series, cutoff_date)
+        if shares_value is not None:
+            row["shares_outstanding"] = shares_value
+            row["shares_available_date"] = shares_available.isoformat() if shares_available else ""
+            row["shares_source"] = f"shares_outstanding_{ctx.shares_preference}"
+            if prices is None:
+                prices = _load_price_series(price_path) if price_path else {}
+            close_val, _ = _resolve_price_close(
+                prices, ctx.trading_days, trading_index, snapshot_date
+            )
+            if close_val is not None:
+                row["pit_market_cap"] = close_val * shares_value
+        yield plan_index, row
+
+
+_BUILD_CONTEXT: _BuildContext | None = None
+_BUILD_TRADING_INDEX: dict[date, int] = {}
+
+
+def _init_build_worker(ctx: _BuildContext) -> None:
+    global _BUILD_CONTEXT, _BUILD_TRADING_INDEX
+    _BUILD_CONTEXT = ctx
+    _BUILD_TRADING_INDEX = {day: idx for idx, day in enumerate(ctx.trading_days)}
+
+
+def _build_chunk(chunk_index: int, tasks: list[tuple[str, Path | None, list[int]]]) -> Path:
+    """Build a contiguous run of symbols into one shard ordered by (snapshot, symbol)."""
+    ctx = _BUILD_CONTEXT
+    if ctx is None:
+        raise RuntimeError("build worker not initialized")
+    rows: list[tuple[int, dict[str, object]]] = []
+    for symbol, price_path, plan_indices in tasks:
+        rows.extend(_build_symbol_rows(symbol, price_path, plan_indices, ctx, _BUILD_TRADING_INDEX))
+    # Stable sort: symbols stay in their sorted order within each snapshot.
+    rows.sort(key=lambda item: item[0])
+    shard_path = ctx.shard_dir / f"shard_{chunk_index:06d}.csv"
+    with shard_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        for plan_index, row in rows:
+            writer.writerow([plan_index, *(row.get(key, "") for key in SNAPSHOT_FIELDS)])
+    return shard_path
+
+
+def _build_shards(
+    ctx: _BuildContext,
+    symbol_plan: dict[str, list[int]],
+    price_paths: dict[str, Path | None],
+    workers: int,
+    chunk_size: int,
+) -> list[Path]:
+    """Build every planned symbol into shards, serially or on a process pool.
+
+    Peak memory is one chunk of symbols per worker: each worker holds a chunk's reports,
+    closes and rows only until its shard is written, and the parent only keeps shard paths.
+    Shards are returned in symbol order so the per-snapshot merge reproduces the serial rows.
+    """
+    symbols = sorted(symbol_plan)
+    chunk_size = max(int(chunk_size), 1)
+    chunks = [
+        [(symbol, price_paths.get(symbol), symbol_plan[symbol]) for symbol in symbols[idx : idx + chunk_size]]
+        for idx in range(0, len(symbols), chunk_size)
+    ]
+    if workers <= 1 or len(chunks) <= 1:
+        _init_build_worker(ctx)
+        return [_build_chunk(idx, chunk) for idx, chunk in enumerate(chunks)]
+
+    shard_paths: list[Path] = []
+    pending: deque = deque()
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_build_worker, initargs=(ctx,)
+    )
+    try:
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < workers * 2:
+                pending.append(executor.submit(_build_chunk, next_chunk, chunks[next_chunk]))
+                next_chunk += 1
+            shard_paths.append(pending.popleft().result())
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+    return shard_paths
+
+
+def _merge_shards(shard_paths: list[Path], plan_count: int) -> Iterator[Iterator[list[str]]]:
+    """Yield, for each planned snapshot in order, an iterator over its rows across shards."""
+    with ExitStack() as stack:
+        readers = [
+            csv.reader(stack.enter_context(path.open("r", encoding="utf-8", newline="")))
+            for path in shard_paths
+        ]
+        heads = [next(reader, None) for reader in readers]
+
+        def _rows(plan_index: int) -> Iterator[list[str]]:
+            marker = str(plan_index)
+            for pos, reader in enumerate(readers):
+                while heads[pos] is not None and heads[pos][0] == marker:
+                    yield heads[pos][1:]
+                    heads[pos] = next(reader, None)
+
+        for plan_index in range(plan_count):
+            rows = _rows(plan_index)
+            yield rows
+            for _ in rows:
+                pass
+
+
+def _snapshot_path(output_dir: Path, snapshot_date: date) -> Path:
+    return output_dir / f"pit_fundamentals_{snapshot_date.strftime('%Y%m%d')}.csv"
+
+
 def _write_snapshot(
     output_dir: Path,
     snapshot_date: date,
-    rebalance_date: date,
-    rows: list[dict[str, object]],
-) -> Path:
+    rows: Iterable[list[str]],
+) -> tuple[Path, int, int]:
+    """Write pre-formatted rows to a temp file next to the snapshot; the caller replaces it."""
     output_dir.mkdir(parents=True, exist_ok=True)
-    filename = output_dir / f"pit_fundamentals_{snapshot_date.strftime('%Y%m%d')}.csv"
-    fields = [
-        "symbol",
-        "has_fundamentals",
-        "snapshot_date",
-        "rebalance_date",
-        "fiscal_date",
-        "reported_date",
-        "available_date",
-        "availability_source",
-        "lag_days",
-        "filled_forward",
-        "shares_outstanding",
-        "shares_available_date",
-        "shares_source",
-        "pit_market_cap",
-        "total_revenue",
-        "gross_profit",
-        "operating_income",
-        "net_income",
-        "eps",
-        "reported_eps",
-        "total_assets",
-        "total_liabilities",
-        "total_shareholder_equity",
-        "cash_and_cash_equivalents",
-        "operating_cashflow",
-        "capital_expenditures",
-        "cashflow_from_investment",
-        "cashflow_from_financing",
-        "free_cashflow",
-    ]
+    filename = _snapshot_path(output_dir, snapshot_date)
     tmp_path = filename.with_suffix(f"{filename.suffix}.tmp")
+    count = 0
+    with_data = 0
+    has_index = SNAPSHOT_FIELDS.index("has_fundamentals")
     with tmp_path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fields)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({key: row.get(key, "") for key in fields})
-    tmp_path.replace(filename)
-    return filename
+        writer = csv.writer(handle)
+        writer.writerow(SNAPSHOT_FIELDS)
+        for values in rows:
+            writer.writerow(values)
+            count += 1
+            if values[has_index] == "1":
+                with_data += 1
+    return tmp_path, count, with_data
 
 
 def _load_asset_types(path: Path) -> dict[str, str]:
@@ -387,6 +638,28 @@ def main() -> int:
         help="trading calendar source override (auto/local/exchange_calendars/lean/spy)",
     )
     parser.add_argument("--vendor-preference", default="Alpha")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="只重建缺失或输入已变化的快照（依据 pit_fundamentals_manifest.json）",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="按标的分片并行构建的进程数（0=自动，最多 8）",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=200,
+        help="每个分片包含的标的数量，决定单个进程的内存上限",
+    )
+    parser.add_argument(
+        "--skip-panel",
+        action="store_true",
+        help="不更新 pit_fundamentals_panel（训练/打分读取的列式索引面板）",
+    )
     args = parser.parse_args()
 
     data_root = _resolve_data_root(args.data_root)
@@ -463,19 +736,129 @@ def main() -> int:
                 if symbol and symbol != "SYMBOL":
                     exclude_symbols.add(symbol)
 
-    cache: dict[str, list[dict]] = {}
-    price_cache: dict[str, dict[date, float]] = {}
-    shares_cache: dict[str, list[tuple[date, float]]] = {}
+    # A snapshot is rebuilt when its pit symbol list, cutoff or any of its symbols' inputs
+    # changed: the fundamentals JSON stats, and the price file up to the snapshot date. Raw
+    # closes are append-only, so only the last covered date is tracked for them; adjusted
+    # files are rewritten on every adjustment and are tracked by their full stat.
+    manifest_path = output_dir / "pit_fundamentals_manifest.json"
+    manifest_settings = {
+        "report_delay_days": int(args.report_delay_days),
+        "missing_report_delay_days": missing_report_delay_days,
+        "shares_delay_days": shares_delay_days,
+        "shares_preference": shares_preference,
+        "price_source": price_source,
+        "only_with_data": bool(args.only_with_data),
+        "asset_types": sorted(asset_type_filter) if apply_asset_filter else [],
+        "vendor_preference": vendor_preference,
+    }
+    settings_key = pit_manifest.digest(manifest_settings)
+    inputs_key = pit_manifest.digest(
+        {
+            "listing": pit_manifest.file_fingerprint(listing_path) if apply_asset_filter else None,
+            "exclude_symbols": sorted(exclude_symbols),
+        }
+    )
+    entries = pit_manifest.load_manifest(manifest_path, settings_key)
+    previous = dict(entries) if args.incremental else {}
+
+    price_index = _index_price_files(price_dir)
+    price_paths: dict[str, Path | None] = {}
+    price_last: dict[str, date | None] = {}
+    symbol_inputs: dict[str, dict[str, object]] = {}
+
+    def _price_path(symbol: str) -> Path | None:
+        if symbol not in price_paths:
+            price_paths[symbol] = _pick_price_file(price_index, symbol, vendor_preference)
+        return price_paths[symbol]
+
+    def _symbol_fingerprint(symbol: str, snapshot_date: date) -> dict[str, object]:
+        if symbol not in symbol_inputs:
+            symbol_dir = fundamentals_dir / symbol
+            path = _price_path(symbol)
+            symbol_inputs[symbol] = {
+                "fundamentals": [
+                    pit_manifest.file_fingerprint(symbol_dir / name) for name in SYMBOL_INPUT_FILES
+                ],
+                "price": pit_manifest.file_fingerprint(path),
+            }
+            if path is not None and price_source == "raw":
+                price_last[symbol] = _price_last_date(path)
+        fingerprint = dict(symbol_inputs[symbol])
+        price = fingerprint["price"]
+        if price and price_source == "raw":
+            last_date = price_last.get(symbol)
+            covered = min(last_date, snapshot_date) if last_date else None
+            fingerprint["price"] = {"name": price["name"], "covered": covered}
+        return fingerprint
+
     total_symbols = 0
     total_with_data = 0
     total_excluded_asset_type = 0
     written = 0
+    skipped = 0
+    reports_log: dict[date, list[str]] = {}
+    plan: list[tuple[date, date, date]] = []
+    pending: list[dict[str, object]] = []
+    symbol_plan: dict[str, list[int]] = {}
+
+    def _report(
+        snapshot_date: date,
+        line: str,
+        total: int,
+        with_data: int,
+        excluded_asset_type: int,
+    ) -> None:
+        ratio = (with_data / total) if total else 0.0
+        lines = [
+            line,
+            "coverage: snapshot="
+            f"{snapshot_date.strftime('%Y%m%d')} total={total} "
+            f"with_data={with_data} ratio={ratio:.4f}",
+        ]
+        if apply_asset_filter:
+            lines.append(
+                f"asset_filter: snapshot={snapshot_date.strftime('%Y%m%d')} "
+                f"excluded={excluded_asset_type}"
+            )
+        reports_log[snapshot_date] = lines
+
     for snapshot_date in sorted(snapshots.keys()):
         rebalance_date, symbols = snapshots[snapshot_date]
         total_symbols += len(symbols)
         cutoff_date = _shift_trading_day(trading_days, snapshot_date, -args.report_delay_days)
-        rows: list[dict[str, object]] = []
-        with_data = 0
+        path = _snapshot_path(output_dir, snapshot_date)
+        entry = previous.get(path.name)
+        current = entry is not None and pit_manifest.output_matches(entry, path)
+        key = pit_manifest.digest(
+            {
+                "inputs": inputs_key,
+                "snapshot_date": snapshot_date.isoformat(),
+                "rebalance_date": rebalance_date.isoformat(),
+                "cutoff_date": cutoff_date.isoformat(),
+                "trading_index": trading_index.get(snapshot_date),
+                "symbols": {
+                    symbol: _symbol_fingerprint(symbol, snapshot_date)
+                    for symbol in symbols
+                    if symbol not in exclude_symbols
+                },
+            }
+        )
+        if current and entry.get("key") == key:
+            with_data = int(entry.get("with_data") or 0)
+            excluded_asset_type = int(entry.get("excluded_asset_type") or 0)
+            total_with_data += with_data
+            total_excluded_asset_type += excluded_asset_type
+            skipped += 1
+            _report(
+                snapshot_date,
+                f"snapshot: {path} symbols={entry.get('rows')} "
+                f"cutoff={cutoff_date.isoformat()} unchanged",
+                len(symbols),
+                with_data,
+                excluded_asset_type,
+            )
+            continue
+        plan_index = len(plan)
         excluded_asset_type = 0
         for symbol in symbols:
             if exclude_symbols and symbol in exclude_symbols:
@@ -485,89 +868,79 @@ def main() -> int:
                 if not asset_type or asset_type not in asset_type_filter:
                     excluded_asset_type += 1
                     continue
-            if symbol not in cache:
-                cache[symbol] = _load_symbol_reports(fundamentals_dir / symbol)
-            reports = cache[symbol]
-            report, available_date, availability_source = _select_report(
-                reports, cutoff_date, missing_report_delay_days
-            )
-            has_fundamentals = bool(report)
-            if has_fundamentals:
-                with_data += 1
-                total_with_data += 1
-            if args.only_with_data and not has_fundamentals:
-                continue
-            row: dict[str, object] = {
-                "symbol": symbol,
-                "has_fundamentals": 1 if has_fundamentals else 0,
-                "snapshot_date": snapshot_date.isoformat(),
-                "rebalance_date": rebalance_date.isoformat(),
+            symbol_plan.setdefault(symbol, []).append(plan_index)
+        plan.append((snapshot_date, rebalance_date, cutoff_date))
+        pending.append(
+            {
+                "path": path,
+                "entry": entry if current else None,
+                "key": key,
+                "total": len(symbols),
+                "excluded_asset_type": excluded_asset_type,
             }
-            if report:
-                lag_days = (snapshot_date - available_date).days if available_date else None
-                filled_forward = bool(available_date and available_date < snapshot_date)
-                row.update(
-                    {
-                        "fiscal_date": report.get("fiscal_date").isoformat()
-                        if report.get("fiscal_date")
-                        else "",
-                        "reported_date": report.get("reported_date").isoformat()
-                        if report.get("reported_date")
-                        else "",
-                        "available_date": available_date.isoformat() if available_date else "",
-                        "availability_source": availability_source,
-                        "lag_days": lag_days if lag_days is not None else "",
-                        "filled_forward": 1 if filled_forward else 0,
-                    }
-                )
-                for key, value in report.items():
-                    if key in {"fiscal_date", "reported_date"}:
-                        continue
-                    row[key] = value
-                if row.get("eps") in (None, "") and row.get("reported_eps") not in (None, ""):
-                    row["eps"] = row.get("reported_eps")
-                op_cf = report.get("operating_cashflow")
-                capex = report.get("capital_expenditures")
-                if op_cf is not None and capex is not None:
-                    row["free_cashflow"] = op_cf - capex
-            if symbol not in shares_cache:
-                shares_cache[symbol] = _load_shares_outstanding(
-                    fundamentals_dir / symbol, shares_preference, shares_delay_days
-                )
-            shares_series = shares_cache[symbol]
-            shares_value, shares_available = _select_shares(shares_series, cutoff_date)
-            if shares_value is not None:
-                row["shares_outstanding"] = shares_value
-                row["shares_available_date"] = (
-                    shares_available.isoformat() if shares_available else ""
-                )
-                row["shares_source"] = f"shares_outstanding_{shares_preference}"
-                if symbol not in price_cache:
-                    price_path = _pick_price_file(price_dir, symbol, vendor_preference)
-                    price_cache[symbol] = _load_price_series(price_path) if price_path else {}
-                close_val, _ = _resolve_price_close(
-                    price_cache[symbol], trading_days, trading_index, snapshot_date
-                )
-                if close_val is not None:
-                    row["pit_market_cap"] = close_val * shares_value
-            rows.append(row)
-        path = _write_snapshot(output_dir, snapshot_date, rebalance_date, rows)
-        ratio = (with_data / len(symbols)) if symbols else 0.0
-        total_excluded_asset_type += excluded_asset_type
-        written += 1
-        print(f"snapshot: {path} symbols={len(rows)} cutoff={cutoff_date.isoformat()}")
-        print(
-            "coverage: snapshot="
-            f"{snapshot_date.strftime('%Y%m%d')} total={len(symbols)} "
-            f"with_data={with_data} ratio={ratio:.4f}"
         )
-        if apply_asset_filter:
-            print(
-                f"asset_filter: snapshot={snapshot_date.strftime('%Y%m%d')} "
-                f"excluded={excluded_asset_type}"
-            )
 
-    if not written:
+    if plan:
+        workers = int(args.workers) if args.workers > 0 else min(os.cpu_count() or 1, 8)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        shard_dir = Path(tempfile.mkdtemp(prefix=".pit_shards_", dir=output_dir))
+        try:
+            ctx = _BuildContext(
+                fundamentals_dir=fundamentals_dir,
+                shard_dir=shard_dir,
+                trading_days=trading_days,
+                plan=plan,
+                missing_report_delay_days=missing_report_delay_days,
+                shares_delay_days=shares_delay_days,
+                shares_preference=shares_preference,
+                only_with_data=bool(args.only_with_data),
+            )
+            shard_paths = _build_shards(ctx, symbol_plan, price_paths, workers, args.chunk_size)
+            for (snapshot_date, rebalance_date, cutoff_date), item, rows in zip(
+                plan, pending, _merge_shards(shard_paths, len(plan))
+            ):
+                tmp_path, row_count, with_data = _write_snapshot(output_dir, snapshot_date, rows)
+                content = pit_manifest.content_digest(tmp_path)
+                path = item["path"]
+                entry = item["entry"]
+                if entry and entry.get("content") == content:
+                    tmp_path.unlink()
+                    skipped += 1
+                    suffix = " unchanged"
+                else:
+                    tmp_path.replace(path)
+                    written += 1
+                    suffix = ""
+                excluded_asset_type = int(item["excluded_asset_type"])
+                entries[path.name] = {
+                    "key": item["key"],
+                    "content": content,
+                    "snapshot_date": snapshot_date.isoformat(),
+                    "rebalance_date": rebalance_date.isoformat(),
+                    "cutoff_date": cutoff_date.isoformat(),
+                    "rows": row_count,
+                    "with_data": with_data,
+                    "excluded_asset_type": excluded_asset_type,
+                    "output": pit_manifest.file_fingerprint(path),
+                }
+                total_with_data += with_data
+                total_excluded_asset_type += excluded_asset_type
+                _report(
+                    snapshot_date,
+                    f"snapshot: {path} symbols={row_count} cutoff={cutoff_date.isoformat()}{suffix}",
+                    int(item["total"]),
+                    with_data,
+                    excluded_asset_type,
+                )
+        finally:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+    for snapshot_date in sorted(reports_log):
+        for line in reports_log[snapshot_date]:
+            print(line)
+
+    entries = {name: item for name, item in entries.items() if (output_dir / name).exists()}
+    pit_manifest.save_manifest(manifest_path, settings_key, manifest_settings, entries)
+    if not written and not skipped:
         raise RuntimeError("no snapshots generated")
     total_ratio = (total_with_data / total_symbols) if total_symbols else 0.0
     print(
@@ -605,7 +978,16 @@ def main() -> int:
     tmp_meta = meta_path.with_suffix(".tmp")
     tmp_meta.write_text(json.dumps(meta_payload, ensure_ascii=False, indent=2), encoding="utf-8")
     tmp_meta.replace(meta_path)
-    print(f"total snapshots: {written}")
+    print(f"total snapshots: {written + skipped}")
+    if args.incremental:
+        print(f"rebuilt snapshots: {written}")
+    if not args.skip_panel:
+        panel_stats = build_pit_panel(output_dir)
+        print(
+            "pit panel: rows={rows} symbols={symbols} reused={reused} parsed={parsed}".format(
+                **panel_stats
+            )
+        )
     return 0
 
 
@@ -9,6 +9,7 @@ from datetime import date, datetime
 from pathlib import Path
 from typing import Iterable
 
+import pit_manifest
 import trading_calendar
 
 
@@ -175,11 +176,15 @@ def _filter_symbols(
     return sorted(result)
 
 
+def _snapshot_path(output_dir: Path, snapshot_date: date) -> Path:
+    return output_dir / f"pit_{snapshot_date.strftime('%Y%m%d')}.csv"
+
+
 def _write_snapshot(
     output_dir: Path, snapshot_date: date, rebalance_date: date, symbols: Iterable[str]
 ) -> Path:
     output_dir.mkdir(parents=True, exist_ok=True)
-    filename = output_dir / f"pit_{snapshot_date.strftime('%Y%m%d')}.csv"
+    filename = _snapshot_path(output_dir, snapshot_date)
     tmp_path = filename.with_suffix(f"{filename.suffix}.tmp")
     with tmp_path.open("w", encoding="utf-8", newline="") as handle:
         writer = csv.DictWriter(handle, fieldnames=["symbol", "snapshot_date", "rebalance_date"])
@@ -218,6 +223,11 @@ def main() -> int:
     parser.add_argument("--require-data", action="store_true")
     parser.add_argument("--vendor-preference", default="Alpha")
     parser.add_argument("--symbol-map", default="")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="只重建缺失或输入已变化的快照（依据 pit_weekly_manifest.json）",
+    )
     args = parser.parse_args()
 
     data_root = _resolve_data_root(args.data_root)
@@ -314,23 +324,82 @@ def main() -> int:
             symbol_map_path = str(candidate)
     symbol_map = _load_symbol_map(Path(symbol_map_path)) if symbol_map_path else {}
 
+    # Settings change what every snapshot means, so a mismatch drops the whole manifest;
+    # input fingerprints are folded into each snapshot key instead, so that a new symbol life
+    # file only rewrites the snapshots whose symbol lists actually change.
+    manifest_path = output_dir / "pit_weekly_manifest.json"
+    manifest_settings = {
+        "asset_type": args.asset_type.strip(),
+        "require_data": bool(args.require_data),
+        "snapshot_rule": calendar_meta["snapshot_rule"],
+    }
+    settings_key = pit_manifest.digest(manifest_settings)
+    inputs_key = pit_manifest.digest(
+        {
+            "symbol_life": pit_manifest.file_fingerprint(symbol_life_file),
+            "symbol_map": pit_manifest.file_fingerprint(Path(symbol_map_path))
+            if symbol_map_path
+            else None,
+            "available_symbols": pit_manifest.digest(sorted(available_symbols))
+            if available_symbols is not None
+            else None,
+        }
+    )
+    entries = pit_manifest.load_manifest(manifest_path, settings_key)
+    previous = dict(entries) if args.incremental else {}
+
     index_map = {day: idx for idx, day in enumerate(trading_days)}
     written = 0
+    skipped = 0
     for rebalance_date in rebalance_dates:
         idx = index_map.get(rebalance_date)
         if idx is None or idx == 0:
             continue
         snapshot_date = trading_days[idx - 1]
+        path = _snapshot_path(output_dir, snapshot_date)
+        key = pit_manifest.digest(
+            {
+                "inputs": inputs_key,
+                "snapshot_date": snapshot_date.isoformat(),
+                "rebalance_date": rebalance_date.isoformat(),
+            }
+        )
+        entry = previous.get(path.name)
+        current = entry is not None and pit_manifest.output_matches(entry, path)
+        if current and entry.get("key") == key:
+            skipped += 1
+            print(f"snapshot: {path} symbols={entry.get('symbols')} unchanged")
+            continue
         symbols = _filter_symbols(life, snapshot_date, available_symbols, symbol_map)
         if not symbols:
+            entries.pop(path.name, None)
             continue
-        path = _write_snapshot(output_dir, snapshot_date, rebalance_date, symbols)
-        written += 1
-        print(f"snapshot: {path} symbols={len(symbols)}")
-
-    if not written:
+        content = pit_manifest.digest(
+            {"rebalance_date": rebalance_date.isoformat(), "symbols": symbols}
+        )
+        if current and entry.get("content") == content:
+            skipped += 1
+            print(f"snapshot: {path} symbols={len(symbols)} unchanged")
+        else:
+            path = _write_snapshot(output_dir, snapshot_date, rebalance_date, symbols)
+            written += 1
+            print(f"snapshot: {path} symbols={len(symbols)}")
+        entries[path.name] = {
+            "key": key,
+            "content": content,
+            "snapshot_date": snapshot_date.isoformat(),
+            "rebalance_date": rebalance_date.isoformat(),
+            "symbols": len(symbols),
+            "output": pit_manifest.file_fingerprint(path),
+        }
+
+    entries = {name: item for name, item in entries.items() if (output_dir / name).exists()}
+    pit_manifest.save_manifest(manifest_path, settings_key, manifest_settings, entries)
+    if not written and not skipped:
         raise RuntimeError("no snapshots generated")
-    print(f"total snapshots: {written}")
+    print(f"total snapshots: {written + skipped}")
+    if args.incremental:
+        print(f"rebuilt snapshots: {written}")
     return 0
 
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.services.price_store import rebuild_price_store  # noqa: E402
+
+
+def _resolve_data_root(value: str | None) -> Path:
+    if value:
+        return Path(value).expanduser().resolve()
+    env_root = os.getenv("DATA_ROOT")
+    if env_root:
+        return Path(env_root).expanduser().resolve()
+    default_root = Path("/data/share/stock/data")
+    if default_root.exists():
+        return default_root
+    return Path.cwd() / "data"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="回填 curated/curated_adjusted 的列式 price_store")
+    parser.add_argument("--data-root", type=str, default="")
+    parser.add_argument(
+        "--folders",
+        type=str,
+        default="curated,curated_adjusted",
+        help="需要回填的目录，逗号分隔",
+    )
+    args = parser.parse_args()
+
+    data_root = _resolve_data_root(args.data_root)
+    folders = [item.strip() for item in args.folders.split(",") if item.strip()]
+    counts = rebuild_price_store(data_root, folders)
+    print(json.dumps(counts, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+# Shared bookkeeping for the incremental PIT snapshot builders.
+#
+# A manifest lives next to the snapshots it describes and records, per snapshot file, the
+# digest of the inputs it was built from plus the size/mtime of the file that was written.
+# A snapshot is only skipped while both still match; anything else (missing file, edited
+# file, changed inputs, different build settings) is rebuilt.
+
+MANIFEST_VERSION = 1
+
+
+def file_fingerprint(path: Path | None) -> dict[str, Any] | None:
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return {"name": path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def digest(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def content_digest(path: Path) -> str:
+    hasher = hashlib.sha1()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def load_manifest(path: Path, settings_key: str) -> dict[str, dict[str, Any]]:
+    """Return the snapshot entries of a manifest built with the same settings, else {}."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    if payload.get("version") != MANIFEST_VERSION or payload.get("settings_key") != settings_key:
+        return {}
+    snapshots = payload.get("snapshots")
+    return snapshots if isinstance(snapshots, dict) else {}
+
+
+def save_manifest(
+    path: Path, settings_key: str, settings: dict[str, Any], snapshots: dict[str, dict[str, Any]]
+) -> None:
+    payload = {
+        "version": MANIFEST_VERSION,
+        "settings_key": settings_key,
+        "settings": settings,
+        "snapshots": {name: snapshots[name] for name in sorted(snapshots)},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(
+        json.dumps(payload, ensure_ascii=False, indent=2, default=str), encoding="utf-8"
+    )
+    tmp_path.replace(path)
+
+
+def output_matches(entry: dict[str, Any] | None, path: Path) -> bool:
+    if not entry:
+        return False
+    stored = entry.get("output")
+    return bool(stored) and stored == file_fingerprint(path)
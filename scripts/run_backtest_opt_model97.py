@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 import json
 import time
 from pathlib import Path
@@ -20,6 +21,7 @@ from app.services.backtest_opt_runner import (
     parse_pct,
     select_core_params,
 )
+from app.services.backtest_opt_sweep import add_sweep_arguments, promote_sweep_candidates
 
 BASE_URL = "http://192.168.1.31:8021"
 PROJECT_ID = 18
@@ -106,6 +108,10 @@ def load_manifest_state() -> tuple[dict[int, dict[str, Any]], set[int]]:
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    add_sweep_arguments(parser)
+    args = parser.parse_args()
+
     ARTIFACT_ROOT.mkdir(parents=True, exist_ok=True)
     base_params = fetch_base_params()
     base_algo = base_params.get("algorithm_parameters") or {}
@@ -118,6 +124,12 @@ def main() -> None:
         for item in candidates
         if build_signature(item) not in existing_signatures
     ]
+    pending = promote_sweep_candidates(
+        pending,
+        lambda item: {**base_algo, **item},
+        args,
+        manifest=MANIFEST,
+    )
     remaining = max(0, TOTAL_RUNS - len(launched_params))
     pending = pending[:remaining]
 
@@ -10,6 +10,7 @@ from urllib.request import Request, urlopen
 from urllib.error import HTTPError, URLError
 
 from app.services.backtest_opt_cagr import build_grid
+from app.services.backtest_opt_sweep import add_sweep_arguments, promote_sweep_candidates
 from app.services.defensive_policy import DEFAULT_BENCHMARK, DEFAULT_DEFENSIVE_BASKET
 
 API = "http://127.0.0.1:8021"
@@ -138,6 +139,8 @@ def _load_existing_params() -> set[str]:
         if not line.strip():
             continue
         row = json.loads(line)
+        if "sweep" in row:
+            continue
         params = row.get("params") or {}
         seen.add(json.dumps(params, sort_keys=True))
     return seen
@@ -146,6 +149,7 @@ def _load_existing_params() -> set[str]:
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--limit", type=int, default=0, help="仅提交前N条，0为全量")
+    add_sweep_arguments(parser)
     args = parser.parse_args()
 
     grid = build_grid({"max_exposure": 0.45, "vol_target": 0.055, "max_weight": 0.033})
@@ -153,11 +157,15 @@ def main() -> None:
         grid = grid[: args.limit]
 
     seen = _load_existing_params()
+    grid = [item for item in grid if json.dumps(item, sort_keys=True) not in seen]
+    grid = promote_sweep_candidates(
+        grid,
+        lambda item: build_payload(item)["params"]["algorithm_parameters"],
+        args,
+        manifest=OUT,
+    )
     inflight: list[int] = []
     for item in grid:
-        item_key = json.dumps(item, sort_keys=True)
-        if item_key in seen:
-            continue
         while len(inflight) >= MAX_INFLIGHT:
             time.sleep(5)
             inflight = [rid for rid in inflight if not is_done(rid)]
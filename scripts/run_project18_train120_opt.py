@@ -9,6 +9,7 @@ from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
 from app.services.backtest_opt_train120 import build_grid, build_perturbations
+from app.services.backtest_opt_sweep import add_sweep_arguments, promote_sweep_candidates
 from app.services.defensive_policy import DEFAULT_BENCHMARK, DEFAULT_DEFENSIVE_BASKET
 
 API = "http://127.0.0.1:8021"
@@ -67,6 +68,8 @@ def _load_existing_params(path: Path) -> set[str]:
         if not line.strip():
             continue
         row = json.loads(line)
+        if "sweep" in row:
+            continue
         params = row.get("params") or {}
         seen.add(_param_key(params))
     return seen
@@ -133,6 +136,7 @@ def is_done(run_id: int) -> bool:
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--limit", type=int, default=0, help="仅提交前N条，0为全量")
+    add_sweep_arguments(parser)
     args = parser.parse_args()
 
     baseline = fetch_baseline_params(BASELINE_RUN_ID)
@@ -150,10 +154,15 @@ def main() -> None:
         batch = batch[: args.limit]
 
     seen = _load_existing_params(OUT)
+    batch = [item for item in batch if _param_key(item) not in seen]
+    batch = promote_sweep_candidates(
+        batch,
+        lambda item: build_payload(item, baseline, scores_path)["params"]["algorithm_parameters"],
+        args,
+        manifest=OUT,
+    )
     inflight: list[int] = _load_inflight_runs(OUT, is_done)
     for item in batch:
-        if _param_key(item) in seen:
-            continue
         while len(inflight) >= MAX_INFLIGHT:
             time.sleep(5)
             inflight = [rid for rid in inflight if not is_done(rid)]
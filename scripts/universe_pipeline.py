@@ -6,16 +6,17 @@ import json
 import math
 import os
 import re
+import sys
 import time
 import urllib.parse
 import urllib.request
 from bisect import bisect_right
 from collections import deque
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Iterable
 
-
 DEFAULT_SP500_URL = (
     "https://datahub.io/core/s-and-p-500-companies/r/constituents.csv"
 )
@@ -184,6 +185,18 @@ def _coerce_bool(value: object, default: bool = False) -> bool:
     return default
 
 
+def _load_price_store(enabled: object = None):
+    """Columnar price store reader, or ``None`` to read the CSVs (disabled, or no backend)."""
+    backend_root = Path(__file__).resolve().parents[1] / "backend"
+    if str(backend_root) not in sys.path:
+        sys.path.insert(0, str(backend_root))
+    try:
+        from app.services.price_store import load_price_store
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return load_price_store(enabled)
+
+
 def _parse_float_list(value: object) -> list[float]:
     if value is None:
         return []
@@ -1269,6 +1282,233 @@ def active_in_ranges(ranges: list[tuple[date | None, date | None]], check: date)
     return False
 
 
+UNIVERSE_FILTER_REASONS = (
+    "asset_type",
+    "excluded",
+    "not_in_pit",
+    "before_ipo",
+    "after_delist",
+    "not_in_membership",
+    "missing_rebalance_price",
+    "missing_snapshot_price",
+    "min_price",
+    "min_history",
+    "volume_missing",
+    "halted",
+    "min_avg_volume",
+    "min_avg_dollar_volume",
+)
+
+
+@dataclass
+class UniverseFilterMasks:
+    """Rebalance-row × symbol exclusion masks for every universe filter reason.
+
+    Row ``r`` lines up with the ``r``-th entry passed to ``build_universe_filter_masks``
+    and columns with ``prices.columns``. ``missing_exec`` flags rows without a rebalance
+    bar, where the scalar filter reported ``missing_rebalance_price`` twice per symbol.
+    """
+
+    columns: list[str]
+    column_pos: dict[str, int]
+    reasons: object
+    snapshot_prices: object
+    missing_exec: object
+
+    def evaluate(
+        self, row: int, pool: list[str]
+    ) -> tuple[list[str], list[tuple[str, str, float]], list[tuple[str, int]]]:
+        import numpy as np
+
+        if not pool:
+            return [], [], []
+        cols = np.fromiter((self.column_pos[symbol] for symbol in pool), dtype=np.int64, count=len(pool))
+        hits = self.reasons[:, row, cols]
+        excluded = hits.any(axis=0)
+        counts = hits.sum(axis=1)
+        missing_idx = UNIVERSE_FILTER_REASONS.index("missing_rebalance_price")
+        if self.missing_exec[row]:
+            counts[missing_idx] *= 2
+        # Report counts in first-occurrence order so filter_counts keeps the key order the
+        # per-symbol loop produced.
+        firsts = []
+        for reason_idx in np.flatnonzero(counts):
+            firsts.append((int(np.argmax(hits[reason_idx])), int(reason_idx)))
+        ordered_counts = [
+            (UNIVERSE_FILTER_REASONS[reason_idx], int(counts[reason_idx]))
+            for _, reason_idx in sorted(firsts)
+        ]
+        active = [symbol for symbol, drop in zip(pool, excluded.tolist()) if not drop]
+        excluded_rows: list[tuple[str, str, float]] = []
+        snapshot_row = self.snapshot_prices[row]
+        for pos in np.flatnonzero(excluded):
+            labels = sorted(
+                UNIVERSE_FILTER_REASONS[reason_idx]
+                for reason_idx in np.flatnonzero(hits[:, pos])
+            )
+            excluded_rows.append((pool[pos], "|".join(labels), float(snapshot_row[cols[pos]])))
+        return active, excluded_rows, ordered_counts
+
+
+def build_universe_filter_masks(
+    prices,
+    trade_prices,
+    volumes,
+    snapshot_positions: list[int],
+    exec_positions: list[int],
+    check_dates: list[date],
+    *,
+    asset_type_by_symbol: dict[str, str],
+    allowed_asset_types: set[str],
+    exclude_symbols: set[str],
+    symbol_life: dict[str, tuple[date | None, date | None]],
+    membership_ranges: dict[str, list[tuple[date | None, date | None]]],
+    pit_sets: list[set[str]] | None = None,
+    min_price: float = 0.0,
+    min_history_days: int = 0,
+    need_volume: bool = False,
+    volume_missing: set[str] | None = None,
+    halt_volume_threshold: float = 0.0,
+    min_avg_volume: float = 0.0,
+    min_avg_dollar_volume: float = 0.0,
+    liquidity_window_days: int = 20,
+) -> UniverseFilterMasks:
+    import numpy as np
+
+    columns = [str(symbol) for symbol in prices.columns]
+    column_pos = {symbol: idx for idx, symbol in enumerate(columns)}
+    n_rows = len(snapshot_positions)
+    n_cols = len(columns)
+    masks = np.zeros((len(UNIVERSE_FILTER_REASONS), n_rows, n_cols), dtype=bool)
+
+    def mask(reason: str):
+        return masks[UNIVERSE_FILTER_REASONS.index(reason)]
+
+    snap_pos = np.asarray(snapshot_positions, dtype=np.int64).clip(min=0)
+    exec_pos = np.asarray(exec_positions, dtype=np.int64)
+    missing_exec = exec_pos < 0
+    price_values = prices.to_numpy(dtype=float)
+    trade_values = trade_prices.reindex(columns=prices.columns).to_numpy(dtype=float)
+    snapshot_values = price_values[snap_pos] if n_rows else np.empty((0, n_cols))
+
+    if allowed_asset_types:
+        blocked = np.array(
+            [
+                asset_type_by_symbol.get(symbol, "UNKNOWN") not in allowed_asset_types
+                for symbol in columns
+            ],
+            dtype=bool,
+        )
+        mask("asset_type")[:] = blocked
+    mask("excluded")[:] = np.array([symbol in exclude_symbols for symbol in columns], dtype=bool)
+
+    if pit_sets is not None:
+        in_pit = np.zeros((n_rows, n_cols), dtype=bool)
+        for row, members in enumerate(pit_sets):
+            hit = [column_pos[symbol] for symbol in members if symbol in column_pos]
+            if hit:
+                in_pit[row, hit] = True
+        mask("not_in_pit")[:] = ~in_pit
+
+    checks = np.array(check_dates, dtype="datetime64[D]").reshape(-1, 1)
+    ipo = np.array(
+        [(symbol_life.get(symbol) or (None, None))[0] or np.datetime64("NaT") for symbol in columns],
+        dtype="datetime64[D]",
+    )
+    delist = np.array(
+        [(symbol_life.get(symbol) or (None, None))[1] or np.datetime64("NaT") for symbol in columns],
+        dtype="datetime64[D]",
+    )
+    mask("before_ipo")[:] = checks < ipo
+    mask("after_delist")[:] = checks > delist
+
+    # Date-by-symbol membership bitmap: a symbol is a member on a check date when any of its
+    # ranges covers it; symbols without ranges are never filtered for membership.
+    not_member = mask("not_in_membership")
+    check_days = checks[:, 0]
+    for symbol, ranges in membership_ranges.items():
+        col = column_pos.get(symbol)
+        if col is None or not ranges:
+            continue
+        active = np.zeros(n_rows, dtype=bool)
+        for start, end in ranges:
+            covered = np.ones(n_rows, dtype=bool)
+            if start:
+                covered &= check_days >= np.datetime64(start, "D")
+            if end:
+                covered &= check_days <= np.datetime64(end, "D")
+            active |= covered
+        not_member[:, col] = ~active
+
+    trade_at_exec = np.full((n_rows, n_cols), np.nan)
+    if n_rows:
+        has_exec = ~missing_exec
+        trade_at_exec[has_exec] = trade_values[exec_pos[has_exec]]
+    mask("missing_rebalance_price")[:] = np.isnan(trade_at_exec)
+    snapshot_missing = np.isnan(snapshot_values)
+    mask("missing_snapshot_price")[:] = snapshot_missing
+    if min_price > 0:
+        with np.errstate(invalid="ignore"):
+            mask("min_price")[:] = ~snapshot_missing & (snapshot_values < min_price)
+    if min_history_days > 0 and n_rows:
+        valid_counts = np.cumsum(~np.isnan(price_values), axis=0)
+        mask("min_history")[:] = valid_counts[snap_pos] < min_history_days
+
+    if need_volume:
+        missing_cols = np.ones(n_cols, dtype=bool)
+        if volumes is not None and not volumes.empty:
+            missing_cols = np.array(
+                [
+                    symbol in (volume_missing or set()) or symbol not in volumes.columns
+                    for symbol in columns
+                ],
+                dtype=bool,
+            )
+        volume_mask = np.broadcast_to(missing_cols, (n_rows, n_cols)).copy()
+        if volumes is not None and not volumes.empty and n_rows:
+            volume_values = volumes.reindex(columns=prices.columns).to_numpy(dtype=float)
+            dollar_values = volume_values * price_values
+            snapshot_volume = volume_values[snap_pos]
+            avg_volume = np.empty((n_rows, n_cols))
+            avg_dollar = np.empty((n_rows, n_cols))
+            for row, pos in enumerate(snap_pos.tolist()):
+                start = max(0, pos - liquidity_window_days + 1)
+                for target, source in ((avg_volume, volume_values), (avg_dollar, dollar_values)):
+                    window = source[start : pos + 1]
+                    valid = ~np.isnan(window)
+                    total = np.where(valid, window, 0.0).sum(axis=0)
+                    count = valid.sum(axis=0)
+                    target[row] = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+            present = ~missing_cols
+            volume_mask |= present & np.isnan(snapshot_volume)
+            with np.errstate(invalid="ignore"):
+                if halt_volume_threshold > 0:
+                    mask("halted")[:] = (
+                        present & ~np.isnan(snapshot_volume) & (snapshot_volume <= halt_volume_threshold)
+                    )
+                if min_avg_volume > 0:
+                    mask("min_avg_volume")[:] = present & (
+                        np.isnan(avg_volume) | (avg_volume < min_avg_volume)
+                    )
+                if min_avg_dollar_volume > 0:
+                    mask("min_avg_dollar_volume")[:] = present & (
+                        np.isnan(avg_dollar) | (avg_dollar < min_avg_dollar_volume)
+                    )
+        mask("volume_missing")[:] = volume_mask
+
+    # Asset-type exclusions short-circuit every other check for that symbol.
+    blocked_rows = mask("asset_type").copy()
+    for idx in range(1, len(UNIVERSE_FILTER_REASONS)):
+        masks[idx] &= ~blocked_rows
+    return UniverseFilterMasks(
+        columns=columns,
+        column_pos=column_pos,
+        reasons=masks,
+        snapshot_prices=snapshot_values,
+        missing_exec=missing_exec,
+    )
+
+
 def calc_metrics(series, risk_free: float) -> dict[str, float]:
     if series.empty:
         return {}
@@ -1334,6 +1574,14 @@ def run_backtest(data_root: Path, universe_path: Path, config_path: Path) -> Pat
     ] or ["Alpha"]
     if price_source_policy != "adjusted_only":
         price_source_policy = "adjusted_only"
+    price_store = _load_price_store(weights_cfg.get("price_store_read_enabled"))
+
+    def read_price_frame(path: Path):
+        if price_store is not None:
+            stored = price_store.read_frame(path)
+            if stored is not None:
+                return stored
+        return pd.read_csv(path)
     signal_mode = str(weights_cfg.get("signal_mode") or "theme_weights").strip().lower()
     if signal_mode not in {"theme_weights", "ml_scores"}:
         raise SystemExit("signal_mode must be theme_weights or ml_scores")
@@ -1724,7 +1972,7 @@ def run_backtest(data_root: Path, universe_path: Path, config_path: Path) -> Pat
             if price_source_policy == "adjusted_only":
                 missing_adjusted.append(mapped_symbol)
             continue
-        df = pd.read_csv(path)
+        df = read_price_frame(path)
         column_map = {col.lower(): col for col in df.columns}
         date_col = column_map.get("date")
         close_col = column_map.get("close")
@@ -1792,7 +2040,7 @@ def run_backtest(data_root: Path, universe_path: Path, config_path: Path) -> Pat
     if benchmark_series is None or benchmark_series.dropna().empty:
         benchmark_path, _, _ = resolve_symbol_path(benchmark.upper(), benchmark_symbol)
         if benchmark_path and benchmark_path.exists():
-            bench_df = pd.read_csv(benchmark_path)
+            bench_df = read_price_frame(benchmark_path)
             bench_column_map = {col.lower(): col for col in bench_df.columns}
             bench_date_col = bench_column_map.get("date")
             bench_price_col = bench_column_map.get("close")
@@ -1917,7 +2165,6 @@ def run_backtest(data_root: Path, universe_path: Path, config_path: Path) -> Pat
         )
     min_history_days = int(weights_cfg.get("min_history_days") or 0)
     min_price = float(weights_cfg.get("min_price") or 0.0)
-    valid_counts = prices.notna().cumsum()
     cost_cfg = weights_cfg.get("costs", {}) if isinstance(weights_cfg.get("costs"), dict) else {}
     plugin_costs = plugins.get("costs") if isinstance(plugins.get("costs"), dict) else {}
     if plugin_costs:
@@ -2276,141 +2523,84 @@ def run_backtest(data_root: Path, universe_path: Path, config_path: Path) -> Pat
                 current_drawdown_52w = max(0.0, 1.0 - drawdown_equity / peak_52w)
         drawdown_start_idx = end_idx
 
-    for idx, rebalance in enumerate(rebalance_dates):
+    # Resolve snapshot/execution bars for every rebalance up front so the universe filters
+    # can be evaluated as whole-matrix masks instead of per-symbol scalar lookups.
+    rebalance_snapshot_dates: list[date] = []
+    rebalance_snapshot_positions: list[int] = []
+    rebalance_exec_positions: list[int] = []
+    for rebalance in rebalance_dates:
         snapshot_date = pit_snapshot_map.get(rebalance, rebalance)
-        check_date = snapshot_date
-        snapshot_ts = pd.Timestamp(snapshot_date)
-        snapshot_idx = prices.index.get_indexer([snapshot_ts], method="pad")
-        if not snapshot_idx.size or snapshot_idx[0] < 0:
-            continue
-        snapshot_pos = snapshot_idx[0]
+        snapshot_idx = prices.index.get_indexer([pd.Timestamp(snapshot_date)], method="pad")
+        rebalance_snapshot_dates.append(snapshot_date)
+        rebalance_snapshot_positions.append(int(snapshot_idx[0]) if snapshot_idx.size else -1)
         # For forward-looking snapshots, the pit rebalance date can be beyond the last available
         # bar in our daily dataset (e.g., Friday snapshot + next Monday rebalance). In that case,
         # we pad execution-time checks to the last available bar so we can still emit weights.
         rebalance_ts = pd.Timestamp(rebalance)
-        rebalance_exec_ts = rebalance_ts if rebalance_ts in trade_prices.index else None
-        if rebalance_exec_ts is None and allow_future_rebalance and not trade_prices.index.empty:
+        exec_idx = trade_prices.index.get_indexer([rebalance_ts])
+        exec_pos = int(exec_idx[0]) if exec_idx.size else -1
+        if exec_pos < 0 and allow_future_rebalance and not trade_prices.index.empty:
             padded = trade_prices.index.get_indexer([rebalance_ts], method="pad")
             if padded.size and padded[0] >= 0:
-                rebalance_exec_ts = trade_prices.index[padded[0]]
-        counts_at_snapshot = (
-            valid_counts.iloc[snapshot_pos] if min_history_days > 0 else None
-        )
-        snapshot_prices = prices.iloc[snapshot_pos]
-        window_start = max(0, snapshot_pos - liquidity_window_days + 1)
-        window_prices = prices.iloc[window_start : snapshot_pos + 1]
-        avg_volume = None
-        avg_dollar = None
-        snapshot_volumes = None
-        if need_volume and volumes is not None and not volumes.empty:
-            window_volumes = volumes.iloc[window_start : snapshot_pos + 1]
-            avg_volume = window_volumes.mean()
-            avg_dollar = (window_volumes * window_prices).mean()
-            snapshot_volumes = volumes.iloc[snapshot_pos]
-        active_symbols = []
+                exec_pos = int(padded[0])
+        rebalance_exec_positions.append(exec_pos)
+    filter_masks = build_universe_filter_masks(
+        prices,
+        trade_prices,
+        volumes,
+        rebalance_snapshot_positions,
+        rebalance_exec_positions,
+        rebalance_snapshot_dates,
+        asset_type_by_symbol=asset_type_by_symbol,
+        allowed_asset_types=allowed_asset_types,
+        exclude_symbols=exclude_symbols,
+        symbol_life=symbol_life,
+        membership_ranges=membership_ranges,
+        pit_sets=(
+            [pit_map.get(rebalance, set()) for rebalance in rebalance_dates]
+            if pit_used and not pit_universe_only
+            else None
+        ),
+        min_price=min_price,
+        min_history_days=min_history_days,
+        need_volume=need_volume,
+        volume_missing=volume_missing,
+        halt_volume_threshold=halt_volume_threshold,
+        min_avg_volume=min_avg_volume,
+        min_avg_dollar_volume=min_avg_dollar_volume,
+        liquidity_window_days=liquidity_window_days,
+    )
+
+    for idx, rebalance in enumerate(rebalance_dates):
+        snapshot_date = rebalance_snapshot_dates[idx]
+        snapshot_pos = rebalance_snapshot_positions[idx]
+        if snapshot_pos < 0:
+            continue
+        exec_pos = rebalance_exec_positions[idx]
+        rebalance_exec_ts = trade_prices.index[exec_pos] if exec_pos >= 0 else None
         if pit_used and pit_universe_only:
             symbol_pool = pit_map.get(rebalance, set())
             if symbol_pool:
                 symbol_pool = symbol_pool.intersection(price_symbol_set)
         else:
             symbol_pool = prices.columns
-        for symbol in symbol_pool:
-            reasons: list[str] = []
-            asset_type = asset_type_by_symbol.get(symbol, "UNKNOWN")
-            if allowed_asset_types and asset_type not in allowed_asset_types:
-                reasons.append("asset_type")
-                filter_counts["asset_type"] = filter_counts.get("asset_type", 0) + 1
-                if record_universe:
-                    snapshot_price = snapshot_prices.get(symbol)
-                    universe_excluded.append(
-                        {
-                            "symbol": symbol,
-                            "snapshot_date": snapshot_date.isoformat(),
-                            "rebalance_date": rebalance.isoformat(),
-                            "reason": "asset_type",
-                            "snapshot_price": f"{snapshot_price:.6f}"
-                            if snapshot_price is not None and not math.isnan(snapshot_price)
-                            else "",
-                        }
-                    )
-                continue
-            if symbol in exclude_symbols:
-                reasons.append("excluded")
-            if pit_used and not pit_universe_only and symbol not in pit_map.get(rebalance, set()):
-                reasons.append("not_in_pit")
-            life = symbol_life.get(symbol)
-            if life:
-                ipo, delist = life
-                if ipo and check_date < ipo:
-                    reasons.append("before_ipo")
-                if delist and check_date > delist:
-                    reasons.append("after_delist")
-            ranges = membership_ranges.get(symbol)
-            if ranges and not active_in_ranges(ranges, check_date):
-                reasons.append("not_in_membership")
-            if rebalance_exec_ts is None:
-                reasons.append("missing_rebalance_price")
-            price = (
-                trade_prices.at[rebalance_exec_ts, symbol]
-                if rebalance_exec_ts is not None
-                and rebalance_exec_ts in trade_prices.index
-                and symbol in trade_prices.columns
-                else float("nan")
-            )
-            if math.isnan(price):
-                reasons.append("missing_rebalance_price")
-            snapshot_price = snapshot_prices.get(symbol)
-            if snapshot_price is None or math.isnan(snapshot_price):
-                reasons.append("missing_snapshot_price")
-            if min_price > 0 and snapshot_price is not None and not math.isnan(snapshot_price):
-                if snapshot_price < min_price:
-                    reasons.append("min_price")
-            if min_history_days > 0 and counts_at_snapshot is not None:
-                if counts_at_snapshot.get(symbol, 0) < min_history_days:
-                    reasons.append("min_history")
-            if need_volume:
-                if symbol in volume_missing or volumes is None or symbol not in volumes.columns:
-                    reasons.append("volume_missing")
-                else:
-                    snapshot_volume = (
-                        snapshot_volumes.get(symbol) if snapshot_volumes is not None else None
-                    )
-                    if snapshot_volume is None or math.isnan(snapshot_volume):
-                        reasons.append("volume_missing")
-                    if (
-                        halt_volume_threshold > 0
-                        and snapshot_volume is not None
-                        and not math.isnan(snapshot_volume)
-                        and snapshot_volume <= halt_volume_threshold
-                    ):
-                        reasons.append("halted")
-                    if min_avg_volume > 0 and avg_volume is not None:
-                        avg_vol = avg_volume.get(symbol)
-                        if avg_vol is None or math.isnan(avg_vol) or avg_vol < min_avg_volume:
-                            reasons.append("min_avg_volume")
-                    if min_avg_dollar_volume > 0 and avg_dollar is not None:
-                        avg_dv = avg_dollar.get(symbol)
-                        if avg_dv is None or math.isnan(avg_dv) or avg_dv < min_avg_dollar_volume:
-                            reasons.append("min_avg_dollar_volume")
-
-            if reasons:
-                for reason in reasons:
-                    filter_counts[reason] = filter_counts.get(reason, 0) + 1
-                if record_universe:
-                    universe_excluded.append(
-                        {
-                            "symbol": symbol,
-                            "snapshot_date": snapshot_date.isoformat(),
-                            "rebalance_date": rebalance.isoformat(),
-                            "reason": "|".join(sorted(set(reasons))),
-                            "snapshot_price": f"{snapshot_price:.6f}"
-                            if snapshot_price is not None and not math.isnan(snapshot_price)
-                            else "",
-                        }
-                    )
-                continue
-            active_symbols.append(symbol)
-            if record_universe:
+        active_symbols, excluded_rows, reason_counts = filter_masks.evaluate(idx, list(symbol_pool))
+        for reason, count in reason_counts:
+            filter_counts[reason] = filter_counts.get(reason, 0) + count
+        if record_universe:
+            for symbol, reason, snapshot_price in excluded_rows:
+                universe_excluded.append(
+                    {
+                        "symbol": symbol,
+                        "snapshot_date": snapshot_date.isoformat(),
+                        "rebalance_date": rebalance.isoformat(),
+                        "reason": reason,
+                        "snapshot_price": f"{snapshot_price:.6f}"
+                        if not math.isnan(snapshot_price)
+                        else "",
+                    }
+                )
+            for symbol in active_symbols:
                 universe_records.append(
                     {
                         "symbol": symbol,